@@ -1,17 +1,35 @@
 # backend package
+# 하위 모듈은 이름을 처음 사용할 때 import (backend.tcpio.listener 처럼 가벼운 모듈만 쓸 때
+# MySQL 드라이버 / 시리얼 / FSM 전체를 읽지 않도록 - 서버 시작 시간 단축)
 
-from .mission.mission import Mission
-from .mission.mission_status import MissionStatus
-from .mission.mission_db import MissionDB
-from .mission.mission_manager import MissionManager
-from .truck_fsm.truck_fsm_manager import TruckFSMManager
-from .truck_fsm.truck_controller import TruckController
-from .serialio.device_manager import DeviceManager
-from .serialio.belt_controller import BeltController
-from .serialio.gate_controller import GateController
-from .tcpio.tcp_server import TCPServer
-from .tcpio.truck_command_sender import TruckCommandSender
-from .main_controller.main_controller import MainController
-from .auth.auth_manager import AuthManager
-from .truck_status.truck_status_manager import TruckStatusManager
-from .truck_status.truck_status_db import TruckStatusDB 
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    "Mission": ".mission.mission",
+    "MissionStatus": ".mission.mission_status",
+    "MissionDB": ".mission.mission_db",
+    "MissionManager": ".mission.mission_manager",
+    "TruckFSMManager": ".truck_fsm.truck_fsm_manager",
+    "TruckController": ".truck_fsm.truck_controller",
+    "DeviceManager": ".serialio.device_manager",
+    "BeltController": ".serialio.belt_controller",
+    "GateController": ".serialio.gate_controller",
+    "TCPServer": ".tcpio.tcp_server",
+    "TruckCommandSender": ".tcpio.truck_command_sender",
+    "MainController": ".main_controller.main_controller",
+    "AuthManager": ".auth.auth_manager",
+    "TruckStatusManager": ".truck_status.truck_status_manager",
+    "TruckStatusDB": ".truck_status.truck_status_db",
+    "TrackTopology": ".track.track_topology",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,4 @@
+# analytics package
+
+from .mission_kpi import MissionKPITracker, get_mission_kpi_tracker
+from .battery_model import BatteryModel, ChargePlanner, get_battery_model
@@ -0,0 +1,235 @@
+# backend/analytics/battery_model.py
+
+import threading
+import time
+
+from .mission_kpi import PHASE_KEYS
+
+# 학습 전 기본값
+DEFAULT_DRAIN_PER_SECOND = 0.05   # 주행 / 작업 중 소모율 (%/초)
+DEFAULT_CHARGE_PER_SECOND = 0.5   # 충전 속도 (%/초)
+DEFAULT_PHASE_SECONDS = {          # KPI 집계가 없을 때 쓰는 미션 단계별 예상 소요 시간 (초)
+    "to_loading": 30.0,
+    "loading": 20.0,
+    "to_unloading": 40.0,
+    "unloading": 20.0,
+    "return": 30.0,
+}
+
+# KPI 단계 평균 캐시 유효 시간 (초) - 새 미션이 완료되면 바로 다시 계산
+PHASE_SECONDS_TTL = 30.0
+
+# 미션 단계가 아닐 때의 소모 구간 이름
+IDLE_KEY = "idle"
+OVERALL_KEY = "overall"
+
+
+class BatteryModel:
+    """
+    트럭별 배터리 소모 모델 (온라인 학습)
+
+    연속된 배터리 보고 두 개 사이의 감소량 / 경과 시간을 미션 단계별 소모율로 보고
+    지수 이동 평균으로 갱신한다. 처음 보는 트럭은 history_source(battery_status 히스토리)로
+    전체 소모율 / 충전 속도를 먼저 맞춘다.
+    """
+
+    def __init__(self, alpha=0.2, reserve_level=30, history_source=None, clock=time.time):
+        self.alpha = alpha
+        self.reserve_level = reserve_level   # 미션 종료 시점에 남아 있어야 하는 최소 잔량 (%)
+        self.history_source = history_source
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.rates = {}         # truck_id → {구간: 소모율}
+        self.charge_rates = {}  # truck_id → 충전 속도
+        self.last_sample = {}   # truck_id → (시각, 잔량, 구간, 충전 여부)
+
+    def set_history_source(self, history_source):
+        """history_source(truck_id) → battery_status 히스토리 행 (최신순)"""
+        self.history_source = history_source
+
+    # -------------------------------- 학습 --------------------------------
+
+    def observe(self, truck_id, level, phase=None, is_charging=False, now=None):
+        """배터리 보고 하나 반영"""
+        now = now or self.clock()
+        key = PHASE_KEYS.get(getattr(phase, "value", phase), IDLE_KEY)
+        self._seed_once(truck_id)
+
+        with self.lock:
+            previous = self.last_sample.get(truck_id)
+            self.last_sample[truck_id] = (now, level, key, is_charging)
+            if previous is None:
+                return
+            last_time, last_level, last_key, was_charging = previous
+            elapsed = now - last_time
+            if elapsed <= 0 or level == last_level:
+                return
+            if is_charging and was_charging and level > last_level:
+                self._update_charge(truck_id, (level - last_level) / elapsed)
+            elif not is_charging and not was_charging and level < last_level:
+                rate = (last_level - level) / elapsed
+                self._update_rate(truck_id, last_key, rate)
+                self._update_rate(truck_id, OVERALL_KEY, rate)
+
+    def fit_history(self, truck_id, rows):
+        """battery_status 히스토리로 전체 소모율 / 충전 속도 초기 추정"""
+        samples = sorted(
+            (row["timestamp"], float(row["battery_level"]), row.get("truck_status") == "CHARGING")
+            for row in rows
+            if row.get("battery_level") is not None and row.get("timestamp") is not None
+        )
+        drained = charged = drain_seconds = charge_seconds = 0.0
+        for (t0, l0, c0), (t1, l1, c1) in zip(samples, samples[1:]):
+            elapsed = (t1 - t0).total_seconds()
+            if elapsed <= 0 or c0 != c1:
+                continue
+            if not c0 and l1 < l0:
+                drained += l0 - l1
+                drain_seconds += elapsed
+            elif c0 and l1 > l0:
+                charged += l1 - l0
+                charge_seconds += elapsed
+
+        with self.lock:
+            if drain_seconds:
+                self.rates.setdefault(truck_id, {})[OVERALL_KEY] = drained / drain_seconds
+            if charge_seconds:
+                self.charge_rates[truck_id] = charged / charge_seconds
+
+    # -------------------------------- 예측 --------------------------------
+
+    def drain_rate(self, truck_id, key=OVERALL_KEY):
+        rates = self.rates.get(truck_id, {})
+        return rates.get(key) or rates.get(OVERALL_KEY) or DEFAULT_DRAIN_PER_SECOND
+
+    def charge_rate(self, truck_id):
+        return self.charge_rates.get(truck_id) or DEFAULT_CHARGE_PER_SECOND
+
+    def predict_mission_drain(self, truck_id, phase_seconds=None):
+        """미션 하나를 끝까지 수행하는 데 필요한 예상 소모량 (%)"""
+        phase_seconds = phase_seconds or DEFAULT_PHASE_SECONDS
+        return sum(self.drain_rate(truck_id, key) * seconds for key, seconds in phase_seconds.items())
+
+    def can_complete_missions(self, truck_id, level, phase_seconds=None, missions=1):
+        """missions 건을 수행한 뒤에도 예비 잔량 이상 남는지"""
+        return level - self.predict_mission_drain(truck_id, phase_seconds) * missions >= self.reserve_level
+
+    def last_level(self, truck_id):
+        sample = self.last_sample.get(truck_id)
+        return sample[1] if sample else None
+
+    def known_trucks(self):
+        return sorted(self.last_sample)
+
+    def seconds_to_charge(self, truck_id, level, target):
+        return max(0.0, target - level) / self.charge_rate(truck_id)
+
+    def get_status(self, truck_id, level=None, phase_seconds=None):
+        status = {
+            "drain_per_second": {key: round(rate, 4) for key, rate in self.rates.get(truck_id, {}).items()},
+            "charge_per_second": round(self.charge_rate(truck_id), 4),
+            "mission_drain": round(self.predict_mission_drain(truck_id, phase_seconds), 2),
+            "reserve_level": self.reserve_level
+        }
+        if level is not None:
+            status["level"] = level
+            status["can_complete_next_mission"] = self.can_complete_missions(truck_id, level, phase_seconds)
+        return status
+
+    # -------------------------------------------------------------------------------
+
+    def _update_rate(self, truck_id, key, rate):
+        rates = self.rates.setdefault(truck_id, {})
+        current = rates.get(key)
+        rates[key] = rate if current is None else current + self.alpha * (rate - current)
+
+    def _update_charge(self, truck_id, rate):
+        current = self.charge_rates.get(truck_id)
+        self.charge_rates[truck_id] = rate if current is None else current + self.alpha * (rate - current)
+
+    def _seed_once(self, truck_id):
+        if not self.history_source or truck_id in self.last_sample:
+            return
+        try:
+            self.fit_history(truck_id, self.history_source(truck_id) or [])
+        except Exception as e:
+            print(f"[⚠️ 배터리 모델 초기화 실패] {truck_id}: {e}")
+
+
+class ChargePlanner:
+    """
+    선제 충전 계획
+
+    - 다음 미션을 예비 잔량 이상으로 마칠 수 없으면 수요와 관계없이 충전
+    - 대기 미션이 low_demand_waiting 이하(수요 적음)면 완충 전까지 기회 충전
+    - 대기 미션이 쌓여 있으면 missions_ahead 건을 수행할 만큼만 충전하고 바로 복귀
+    """
+
+    def __init__(self, model, kpi_tracker=None, full_level=100, low_demand_waiting=0, missions_ahead=2,
+                 clock=time.monotonic):
+        self.model = model
+        self.kpi_tracker = kpi_tracker
+        self.full_level = full_level
+        self.low_demand_waiting = low_demand_waiting
+        self.missions_ahead = missions_ahead
+        self.clock = clock
+        self._phase_cache = None  # (완료 수, 계산 시각, 단계 소요 시간)
+
+    def phase_seconds(self):
+        """
+        최근 1시간 KPI 평균 단계 소요 시간 (대기 시간 제외, 없으면 기본값)
+        배터리 보고마다 불리므로 완료 미션 수가 같고 PHASE_SECONDS_TTL 안이면 이전 요약을 재사용
+        """
+        if not self.kpi_tracker:
+            return dict(DEFAULT_PHASE_SECONDS)
+        completed = self.kpi_tracker.completed_count
+        now = self.clock()
+        cached = self._phase_cache
+        if cached and cached[0] == completed and now - cached[1] < PHASE_SECONDS_TTL:
+            return dict(cached[2])
+
+        phase_seconds = dict(DEFAULT_PHASE_SECONDS)
+        phases = self.kpi_tracker.get_summary(3600)["missions"]["phases"]
+        for key in phase_seconds:
+            if key in phases:
+                phase_seconds[key] = phases[key]["avg"]
+        self._phase_cache = (completed, now, phase_seconds)
+        return dict(phase_seconds)
+
+    def can_accept_mission(self, truck_id, level):
+        return self.model.can_complete_missions(truck_id, level, self.phase_seconds())
+
+    def should_charge(self, truck_id, level, waiting_missions=0):
+        if level >= self.full_level:
+            return False
+        if not self.can_accept_mission(truck_id, level):
+            return True
+        return waiting_missions <= self.low_demand_waiting
+
+    def charge_done(self, truck_id, level, waiting_missions=0):
+        if level >= self.full_level:
+            return True
+        if waiting_missions <= self.low_demand_waiting:
+            return False
+        return self.model.can_complete_missions(truck_id, level, self.phase_seconds(), self.missions_ahead)
+
+    def plan(self, truck_id, level, waiting_missions=0):
+        """현재 판단 근거 (REST 조회용)"""
+        phase_seconds = self.phase_seconds()
+        plan = self.model.get_status(truck_id, level, phase_seconds)
+        plan["should_charge"] = self.should_charge(truck_id, level, waiting_missions)
+        plan["seconds_to_full"] = round(self.model.seconds_to_charge(truck_id, level, self.full_level), 1)
+        return plan
+
+
+# -------------------------------------------------------------------------------
+
+_battery_model = None
+
+
+def get_battery_model():
+    """프로세스 공용 배터리 소모 모델 (FSM / REST 가 공유)"""
+    global _battery_model
+    if _battery_model is None:
+        _battery_model = BatteryModel()
+    return _battery_model
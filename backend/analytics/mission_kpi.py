@@ -0,0 +1,251 @@
+# backend/analytics/mission_kpi.py
+
+import threading
+import time
+from collections import deque
+
+# 미션 단계 → KPI 구간 이름
+PHASE_KEYS = {
+    "TO_LOADING": "to_loading",
+    "AT_LOADING": "loading",
+    "TO_UNLOADING": "to_unloading",
+    "AT_UNLOADING": "unloading",
+    "RETURNING": "return",
+}
+KPI_PHASES = ("queue_wait",) + tuple(PHASE_KEYS.values())
+
+# 미션이 끝난 것으로 보는 단계 (복귀 완료)
+_END_PHASES = ("COMPLETED", "NONE")
+
+# 트럭 상태 → 가동률 분류
+_STATE_CATEGORIES = {"IDLE": "idle", "CHARGING": "charging", "EMERGENCY": "emergency"}
+
+DEFAULT_WINDOWS = (900, 3600, 8 * 3600)
+
+
+def _value(member):
+    return getattr(member, "value", member)
+
+
+def _stats(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "avg": round(sum(ordered) / len(ordered), 1),
+        "p90": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))], 1),
+        "max": round(ordered[-1], 1),
+        "count": len(ordered)
+    }
+
+
+class _IntervalLog:
+    """엔티티 하나의 (시작, 끝, 분류) 구간 기록 - 최대 보관 기간 밖의 구간은 버린다"""
+
+    def __init__(self):
+        self.closed = deque()
+        self.current = None  # (분류, 시작)
+
+    def switch(self, category, now):
+        if self.current:
+            if self.current[0] == category:
+                return
+            self.closed.append((self.current[1], now, self.current[0]))
+        self.current = (category, now)
+
+    def prune(self, horizon):
+        while self.closed and self.closed[0][1] < horizon:
+            self.closed.popleft()
+
+    def totals(self, start, now):
+        totals = {}
+        intervals = list(self.closed)
+        if self.current:
+            intervals.append((self.current[1], now, self.current[0]))
+        for begin, end, category in intervals:
+            overlap = min(end, now) - max(begin, start)
+            if overlap > 0:
+                totals[category] = totals.get(category, 0.0) + overlap
+        return totals
+
+
+class MissionKPITracker:
+    """
+    미션 KPI 집계기 (FSM / 미션 이벤트를 스트리밍으로 받아 증분 계산)
+
+    - 미션별 단계 소요 시간: 대기(queue_wait), 적재 이동, 적재, 하역 이동, 하역, 복귀
+    - 트럭 가동률: 작업 중 / 대기 / 충전 시간 비율
+    - 설비 점유율: 디스펜서 / 벨트 / 게이트 사용 시간 비율
+    조회 시 지정한 기간(rolling window) 안의 값만 집계한다.
+    """
+
+    def __init__(self, max_window=max(DEFAULT_WINDOWS), max_missions=1000, clock=time.time):
+        self.max_window = max_window
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.pending = {}       # mission_id → {"created_at", "assigned_at", "truck_id"}
+        self.active = {}        # truck_id → 진행 중인 미션 기록
+        self.completed = deque(maxlen=max_missions)
+        self.completed_count = 0  # 누적 완료 수 (요약 캐시 무효화용)
+        self.truck_states = {}  # truck_id → _IntervalLog
+        self.facilities = {}    # facility_id → _IntervalLog
+
+    # -------------------------------- 미션 이벤트 --------------------------------
+
+    def on_mission_created(self, mission_id, created_at=None):
+        with self.lock:
+            self.pending.setdefault(mission_id, {})["created_at"] = created_at or self.clock()
+
+    def on_mission_assigned(self, mission_id, truck_id, assigned_at=None, created_at=None):
+        with self.lock:
+            info = self.pending.setdefault(mission_id, {})
+            if created_at:
+                info.setdefault("created_at", created_at)
+            info["assigned_at"] = assigned_at or self.clock()
+            info["truck_id"] = truck_id
+
+    def on_mission_cancelled(self, mission_id):
+        with self.lock:
+            self.pending.pop(mission_id, None)
+            for truck_id, record in list(self.active.items()):
+                if record["mission_id"] == mission_id:
+                    del self.active[truck_id]
+
+    # -------------------------------- 트럭 / 설비 관측 --------------------------------
+
+    def observe_truck(self, truck_id, state, mission_id, phase, now=None):
+        """FSM 이벤트 처리 후 트럭 상태 관측 - 상태 / 단계 변화만 반영"""
+        now = now or self.clock()
+        state, phase = _value(state), _value(phase)
+        with self.lock:
+            self._log(self.truck_states, truck_id).switch(_STATE_CATEGORIES.get(state, "busy"), now)
+
+            record = self.active.get(truck_id)
+            if mission_id and (record is None or record["mission_id"] != mission_id):
+                if record:
+                    self._finish(truck_id, record, now)
+                record = self._start(truck_id, mission_id, now)
+
+            if record is None:
+                return
+            if phase != record["phase"]:
+                self._add_phase_time(record, now)
+                record["phase"] = phase
+                if phase in _END_PHASES and not mission_id:
+                    self._finish(truck_id, record, now)
+
+    def set_facility_busy(self, facility_id, busy, now=None):
+        now = now or self.clock()
+        with self.lock:
+            self._log(self.facilities, facility_id).switch("busy" if busy else "idle", now)
+
+    # -------------------------------- 조회 --------------------------------
+
+    def get_summary(self, window_seconds=3600):
+        """최근 window_seconds 구간 KPI"""
+        now = self.clock()
+        start = now - window_seconds
+        with self.lock:
+            self._prune(now)
+            missions = [record for record in self.completed if record["completed_at"] >= start]
+            trucks = {truck_id: log.totals(start, now) for truck_id, log in self.truck_states.items()}
+            facilities = {facility_id: log.totals(start, now) for facility_id, log in self.facilities.items()}
+
+        phases = {
+            key: _stats([record["phases"][key] for record in missions if key in record["phases"]])
+            for key in KPI_PHASES
+        }
+        phases = {key: value for key, value in phases.items() if value}
+        bottleneck = max(phases.items(), key=lambda item: item[1]["avg"], default=(None, None))
+
+        return {
+            "window_seconds": window_seconds,
+            "missions": {
+                "completed": len(missions),
+                "throughput_per_hour": round(len(missions) * 3600 / window_seconds, 2),
+                "cycle_time": _stats([record["cycle_time"] for record in missions]),
+                "phases": phases
+            },
+            "bottleneck": {"phase": bottleneck[0], "avg": bottleneck[1]["avg"]} if bottleneck[0] else None,
+            "trucks": {truck_id: self._ratios(totals) for truck_id, totals in trucks.items()},
+            "facilities": {
+                facility_id: round(totals.get("busy", 0.0) / max(sum(totals.values()), 1e-9), 3)
+                for facility_id, totals in facilities.items()
+            }
+        }
+
+    def get_recent_missions(self, limit=50):
+        """최근 완료 미션 limit 건 (최신 순) - limit 은 1 이상"""
+        if limit < 1:
+            raise ValueError("limit 은 1 이상이어야 합니다")
+        with self.lock:
+            return list(self.completed)[-limit:][::-1]
+
+    # -------------------------------------------------------------------------------
+
+    @staticmethod
+    def _log(logs, key):
+        if key not in logs:
+            logs[key] = _IntervalLog()
+        return logs[key]
+
+    @staticmethod
+    def _ratios(totals):
+        total = sum(totals.values())
+        if total <= 0:
+            return {}
+        return {category: round(seconds / total, 3) for category, seconds in totals.items()}
+
+    def _start(self, truck_id, mission_id, now):
+        info = self.pending.pop(mission_id, {})
+        assigned_at = info.get("assigned_at", now)
+        record = {
+            "mission_id": mission_id,
+            "truck_id": truck_id,
+            "assigned_at": assigned_at,
+            "phase": None,
+            "phase_since": now,
+            "phases": {}
+        }
+        if "created_at" in info:
+            record["phases"]["queue_wait"] = max(0.0, assigned_at - info["created_at"])
+        self.active[truck_id] = record
+        return record
+
+    def _add_phase_time(self, record, now):
+        key = PHASE_KEYS.get(record["phase"])
+        if key:
+            record["phases"][key] = record["phases"].get(key, 0.0) + (now - record["phase_since"])
+        record["phase_since"] = now
+
+    def _finish(self, truck_id, record, now):
+        self._add_phase_time(record, now)
+        self.active.pop(truck_id, None)
+        self.completed_count += 1
+        self.completed.append({
+            "mission_id": record["mission_id"],
+            "truck_id": truck_id,
+            "completed_at": now,
+            "cycle_time": round(now - record["assigned_at"], 1),
+            "phases": {key: round(value, 1) for key, value in record["phases"].items()}
+        })
+
+    def _prune(self, now):
+        horizon = now - self.max_window
+        for log in list(self.truck_states.values()) + list(self.facilities.values()):
+            log.prune(horizon)
+        while self.completed and self.completed[0]["completed_at"] < horizon:
+            self.completed.popleft()
+
+
+# -------------------------------------------------------------------------------
+
+_tracker = None
+
+
+def get_mission_kpi_tracker():
+    """프로세스 공용 KPI 집계기 (FSM / 미션 매니저 / REST 가 공유)"""
+    global _tracker
+    if _tracker is None:
+        _tracker = MissionKPITracker()
+    return _tracker
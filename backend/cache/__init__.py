@@ -0,0 +1,3 @@
+# cache package
+
+from .state_versions import StateVersions, get_state_versions, DOMAIN_TRUCKS, DOMAIN_MISSIONS, DOMAIN_FACILITIES
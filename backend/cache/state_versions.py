@@ -0,0 +1,50 @@
+# backend/cache/state_versions.py
+
+import threading
+
+# 상태 도메인 - 매니저가 변경 시 버전을 올린다
+DOMAIN_TRUCKS = "trucks"
+DOMAIN_MISSIONS = "missions"
+DOMAIN_FACILITIES = "facilities"
+
+
+class StateVersions:
+    """
+    도메인별 상태 버전 카운터
+
+    매니저가 상태를 바꿀 때마다 bump() 하고, 조회 쪽(응답 캐시 등)은 snapshot() 이 같으면
+    이전 결과를 그대로 재사용한다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._versions = {}
+
+    def bump(self, domain):
+        with self.lock:
+            version = self._versions.get(domain, 0) + 1
+            self._versions[domain] = version
+            return version
+
+    def get(self, domain):
+        return self._versions.get(domain, 0)
+
+    def snapshot(self, domains):
+        """여러 도메인 버전을 한 번에 (캐시 키 비교용 tuple)"""
+        with self.lock:
+            return tuple(self._versions.get(domain, 0) for domain in domains)
+
+    def as_dict(self):
+        with self.lock:
+            return dict(self._versions)
+
+
+_state_versions = None
+
+
+def get_state_versions():
+    """프로세스 공용 상태 버전 카운터"""
+    global _state_versions
+    if _state_versions is None:
+        _state_versions = StateVersions()
+    return _state_versions
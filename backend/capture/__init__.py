@@ -0,0 +1,4 @@
+# capture package
+# (TrafficReplayer 는 tcpio 를 import 하므로 backend.capture.traffic_replayer 에서 직접 import)
+
+from .traffic_recorder import TrafficRecorder, read_capture, get_traffic_recorder, install_traffic_recorder
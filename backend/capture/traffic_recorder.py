@@ -0,0 +1,239 @@
+# backend/capture/traffic_recorder.py
+
+import mmap
+import os
+import struct
+import threading
+import time
+
+# 레코드 종류 (0 은 세그먼트 끝 - mmap 으로 미리 잡은 영역은 0 으로 채워져 있음)
+KIND_END = 0
+KIND_STREAM = 1      # 스트림 정의 (data = 스트림 이름)
+KIND_TCP_OPEN = 2    # 트럭 TCP 연결
+KIND_TCP_CLOSE = 3   # 트럭 TCP 연결 종료
+KIND_TCP_IN = 4      # 트럭 → 서버 프레임
+KIND_TCP_OUT = 5     # 서버 → 트럭 프레임
+KIND_SERIAL_IN = 6   # 장치 → 서버 한 줄
+KIND_SERIAL_OUT = 7  # 서버 → 장치 한 줄
+
+KIND_NAMES = {
+    KIND_STREAM: "STREAM",
+    KIND_TCP_OPEN: "TCP_OPEN",
+    KIND_TCP_CLOSE: "TCP_CLOSE",
+    KIND_TCP_IN: "TCP_IN",
+    KIND_TCP_OUT: "TCP_OUT",
+    KIND_SERIAL_IN: "SERIAL_IN",
+    KIND_SERIAL_OUT: "SERIAL_OUT"
+}
+
+CAPTURE_MAGIC = b"DCAP"
+CAPTURE_FORMAT = 1
+SEGMENT_PATTERN = "capture-{:06d}.dcap"
+
+# 세그먼트 헤더: 매직 + 포맷 버전 + 세그먼트 번호 + 시작 시각(벽시계) + 녹화 시작 후 경과(ns)
+_SEGMENT_HEADER = struct.Struct("<4sHIdQ")
+# 레코드: 녹화 시작 후 경과(ns, monotonic) + 종류 + 스트림 번호 + 데이터 길이
+_RECORD = struct.Struct("<QBHH")
+
+MAX_RECORD_DATA = 0xFFFF
+
+
+def tcp_stream(addr):
+    """TCP 연결의 스트림 이름"""
+    return f"tcp:{addr[0]}:{addr[1]}"
+
+
+def serial_stream(port):
+    """시리얼 포트의 스트림 이름"""
+    return f"serial:{port}"
+
+
+class TrafficRecorder:
+    """
+    통신 녹화기 (mmap 세그먼트 + 순환)
+
+    TCP 프레임과 시리얼 한 줄을 monotonic 시각과 함께 바이너리 레코드로 기록한다.
+    세그먼트 파일은 segment_size 만큼 미리 잡아 mmap 으로 쓰고 (기록 = 메모리 복사),
+    가득 차면 다음 세그먼트로 넘어가며 max_segments 개를 넘는 오래된 파일은 지운다.
+    스트림(연결 / 포트) 이름은 번호로 한 번만 기록하고, 세그먼트마다 다시 정의해 파일 하나만으로도 읽을 수 있다.
+    """
+
+    def __init__(self, directory, segment_size=16 * 1024 * 1024, max_segments=8, clock=time.monotonic_ns):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.started_ns = clock()
+        self.records = 0
+        self.dropped = 0
+        self._streams = {}     # 스트림 이름 → 번호
+        self._segment_index = 0
+        self._file = None
+        self._map = None
+        self._offset = 0
+        os.makedirs(directory, exist_ok=True)
+        existing = segment_files(directory)
+        if existing:
+            self._segment_index = _segment_index_of(existing[-1])  # 이전 녹화 뒤에 이어서 번호 매김
+        with self.lock:
+            self._open_segment()
+        print(f"[🎥 통신 녹화 시작] {directory} (세그먼트 {segment_size // 1024}KB × {max_segments})")
+
+    # -------------------------------- 기록 --------------------------------
+
+    def record(self, kind, stream, data=b""):
+        """레코드 하나 기록 (stream: 스트림 이름, data: bytes 또는 str)"""
+        if isinstance(data, str):
+            data = data.encode()
+        if len(data) > MAX_RECORD_DATA:
+            data = data[:MAX_RECORD_DATA]
+        now_ns = self.clock() - self.started_ns
+        with self.lock:
+            if self._map is None:
+                return
+            stream_id = self._streams.get(stream)
+            if stream_id is None:
+                if len(self._streams) >= 0xFFFF:
+                    self._streams.clear()  # 번호가 모자라면 새로 매김 (이후 레코드에서 다시 정의)
+                stream_id = len(self._streams) + 1
+                self._streams[stream] = stream_id
+                self._write(KIND_STREAM, stream_id, now_ns, stream.encode())
+            self._write(kind, stream_id, now_ns, data)
+            self.records += 1
+
+    def close(self):
+        with self.lock:
+            self._close_segment()
+        print(f"[🎥 통신 녹화 종료] 레코드 {self.records}건 (누락 {self.dropped}건)")
+
+    # -------------------------------------------------------------------------------
+
+    def _write(self, kind, stream_id, now_ns, data):
+        size = _RECORD.size + len(data)
+        if self._offset + size > self.segment_size:
+            self._rotate(now_ns)
+            if self._offset + size > self.segment_size:
+                self.dropped += 1  # 빈 세그먼트에도 들어가지 않는 레코드
+                return
+        end = self._offset + size
+        self._map[self._offset:end] = _RECORD.pack(now_ns, kind, stream_id, len(data)) + data
+        self._offset = end
+
+    def _rotate(self, now_ns):
+        self._close_segment()
+        self._open_segment(now_ns)
+        # 새 세그먼트에 스트림 정의를 다시 기록
+        for stream, stream_id in self._streams.items():
+            data = stream.encode()
+            end = self._offset + _RECORD.size + len(data)
+            if end > self.segment_size:
+                break
+            self._map[self._offset:end] = _RECORD.pack(now_ns, KIND_STREAM, stream_id, len(data)) + data
+            self._offset = end
+
+    def _open_segment(self, now_ns=0):
+        self._segment_index += 1
+        path = os.path.join(self.directory, SEGMENT_PATTERN.format(self._segment_index))
+        try:
+            self._file = open(path, "w+b")
+            self._file.truncate(self.segment_size)
+            self._map = mmap.mmap(self._file.fileno(), self.segment_size)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] 녹화 세그먼트 생성 실패: {e} - 녹화 중단")
+            self._offset = 0
+            self._close_segment()
+            return
+        self._map[:_SEGMENT_HEADER.size] = _SEGMENT_HEADER.pack(
+            CAPTURE_MAGIC, CAPTURE_FORMAT, self._segment_index, time.time(), now_ns
+        )
+        self._offset = _SEGMENT_HEADER.size
+        self._prune()
+
+    def _close_segment(self):
+        """mmap 해제 후 쓴 만큼만 남기고 파일 크기 축소"""
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            try:
+                self._file.truncate(self._offset)
+            except OSError:
+                pass
+            self._file.close()
+            self._file = None
+
+    def _prune(self):
+        files = segment_files(self.directory)
+        for path in files[:max(0, len(files) - self.max_segments)]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"[⚠️ 녹화 세그먼트 삭제 실패] {path}: {e}")
+
+
+# -------------------------------- 읽기 --------------------------------
+
+def segment_files(directory):
+    """디렉토리의 세그먼트 파일 (번호 순)"""
+    try:
+        names = [name for name in os.listdir(directory) if name.startswith("capture-") and name.endswith(".dcap")]
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in sorted(names)]
+
+
+def _segment_index_of(path):
+    try:
+        return int(os.path.basename(path)[len("capture-"):-len(".dcap")])
+    except ValueError:
+        return 0
+
+
+def read_capture(source):
+    """
+    녹화 파일 / 디렉토리를 읽어 (경과 ns, 종류, 스트림 이름, data) 를 시간 순으로 돌려줌.
+    녹화 중 종료되어 0 으로 남은 꼬리나 잘린 레코드에서 그 세그먼트 읽기를 멈춘다.
+    """
+    paths = segment_files(source) if os.path.isdir(source) else [source]
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _SEGMENT_HEADER.size:
+            continue
+        magic, version, _, _, _ = _SEGMENT_HEADER.unpack_from(data)
+        if magic != CAPTURE_MAGIC or version != CAPTURE_FORMAT:
+            print(f"[⚠️ 녹화 파일 형식 오류] {path}")
+            continue
+
+        streams = {}
+        offset = _SEGMENT_HEADER.size
+        while offset + _RECORD.size <= len(data):
+            now_ns, kind, stream_id, length = _RECORD.unpack_from(data, offset)
+            end = offset + _RECORD.size + length
+            if kind == KIND_END or end > len(data):
+                break
+            payload = data[offset + _RECORD.size:end]
+            offset = end
+            if kind == KIND_STREAM:
+                streams[stream_id] = payload.decode(errors="replace")
+                continue
+            yield now_ns, kind, streams.get(stream_id, f"stream:{stream_id}"), payload
+
+
+# -------------------------------- 프로세스 녹화기 --------------------------------
+
+_traffic_recorder = None
+
+
+def get_traffic_recorder():
+    """설치된 녹화기 (녹화하지 않으면 None)"""
+    return _traffic_recorder
+
+
+def install_traffic_recorder(recorder):
+    """녹화기 설치 / 해제 (None) - 이전 녹화기 반환"""
+    global _traffic_recorder
+    previous, _traffic_recorder = _traffic_recorder, recorder
+    return previous
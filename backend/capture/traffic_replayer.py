@@ -0,0 +1,125 @@
+# backend/capture/traffic_replayer.py
+
+import time
+
+from backend.capture.traffic_recorder import (
+    read_capture, KIND_TCP_OPEN, KIND_TCP_CLOSE, KIND_TCP_IN, KIND_TCP_OUT, KIND_SERIAL_IN, KIND_SERIAL_OUT
+)
+from backend.tcpio.tcp_server import TCPServer
+
+
+class ReplaySocket:
+    """재생용 소켓 - 서버가 보내는 프레임을 모아 두기만 함"""
+
+    def __init__(self):
+        self.sent = []
+
+    def sendall(self, data):
+        self.sent.append(bytes(data))
+
+    def gettimeout(self):
+        return None
+
+    def settimeout(self, timeout):
+        pass
+
+    def shutdown(self, how):
+        pass
+
+    def close(self):
+        pass
+
+
+def _addr_of(stream):
+    """'tcp:<host>:<port>' → (host, port)"""
+    host, _, port = stream[len("tcp:"):].rpartition(":")
+    try:
+        return host, int(port)
+    except ValueError:
+        return host, 0
+
+
+class TrafficReplayer:
+    """
+    통신 녹화 재생기
+
+    녹화된 트럭 프레임을 TCPServer.handle_frame 으로 녹화 순서 그대로 한 스레드에서 넣는다
+    (소켓 / 수신 스레드 없음 → 같은 녹화는 항상 같은 순서로 처리). speed=1.0 이면 녹화 시각 간격대로,
+    speed=None 이면 대기 없이 최대 속도로 재생한다 (실제 근무 시간대 녹화를 벤치마크 부하로 사용).
+    inject_serial=True 면 녹화된 장치 응답 줄을 같은 포트의 가상 시리얼(FakeSerial) 수신 버퍼에 넣는다.
+    """
+
+    def __init__(self, app_controller, speed=1.0, inject_serial=False, clock=time.monotonic, sleep=time.sleep):
+        self.app = app_controller
+        self.speed = speed
+        self.inject_serial = inject_serial
+        self.clock = clock
+        self.sleep = sleep
+        self.server = TCPServer(app_controller=app_controller)  # start() 하지 않음 - 생존 감시 스레드도 없음
+
+    def replay(self, source):
+        """녹화 파일 / 디렉토리 재생 - 통계 dict 반환"""
+        stats = {"tcp_frames": 0, "serial_in": 0, "serial_out": 0, "recorded_out": 0,
+                 "replayed_out": 0, "connections": 0, "elapsed": 0.0}
+        sockets = {}
+        connections = {}
+        first_ns = None
+        started = self.clock()
+        try:
+            for now_ns, kind, stream, data in read_capture(source):
+                if first_ns is None:
+                    first_ns = now_ns
+                self._wait_until(started, (now_ns - first_ns) / 1e9)
+
+                if kind == KIND_TCP_OPEN or (kind == KIND_TCP_IN and stream not in connections):
+                    if stream in connections:
+                        self.server.connections.close(connections[stream])
+                    sockets[stream] = ReplaySocket()
+                    connections[stream] = self.server.connections.open(_addr_of(stream), sockets[stream])
+                    stats["connections"] += 1
+                if kind == KIND_TCP_IN:
+                    self.server.handle_frame(connections[stream], data)
+                    stats["tcp_frames"] += 1
+                elif kind == KIND_TCP_CLOSE and stream in connections:
+                    self.server.connections.close(connections.pop(stream))
+                elif kind == KIND_TCP_OUT:
+                    stats["recorded_out"] += 1
+                elif kind == KIND_SERIAL_IN:
+                    stats["serial_in"] += 1
+                    if self.inject_serial:
+                        self._inject_serial(stream[len("serial:"):], data.decode(errors="replace"))
+                elif kind == KIND_SERIAL_OUT:
+                    stats["serial_out"] += 1
+        finally:
+            # 재생이 끝난 연결은 오프라인(비상) 처리하지 않음
+            self.server.liveness.stop()
+            if self.server.command_sender:
+                self.server.command_sender.retransmit.stop()
+            self.server.connections.clear()
+
+        stats["replayed_out"] = sum(len(sock.sent) for sock in sockets.values())
+        stats["elapsed"] = self.clock() - started
+        print(f"[▶️ 녹화 재생 완료] 트럭 프레임 {stats['tcp_frames']}건 / 연결 {stats['connections']}개, "
+              f"서버 송신 {stats['replayed_out']}건 (녹화 {stats['recorded_out']}건), {stats['elapsed']:.2f}초")
+        return stats
+
+    # -------------------------------------------------------------------------------
+
+    def _wait_until(self, started, offset):
+        if not self.speed:
+            return
+        delay = started + offset / self.speed - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+
+    def _inject_serial(self, port, line):
+        device_manager = getattr(self.app, "device_manager", None)
+        interfaces = getattr(device_manager, "interfaces", {}) if device_manager else {}
+        for interface in interfaces.values():
+            ser = interface.ser
+            if getattr(interface, "port", None) == port and hasattr(ser, "buffer"):
+                with ser.lock:
+                    ser.buffer.append((line + "\n").encode())
+                    ser.in_waiting = len(ser.buffer)
+                return True
+        return False
@@ -0,0 +1,4 @@
+# db package
+
+from .migrations import apply_migrations
+from .retention import HistoryRetention, HistoryArchiver
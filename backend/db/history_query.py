@@ -0,0 +1,65 @@
+# backend/db/history_query.py
+
+from datetime import datetime
+
+# timestamp 컬럼을 bucket_seconds 단위 구간 시작(epoch 초)으로 내림 - %s 자리에 구간 크기 두 번 전달
+BUCKET_EXPR = "FLOOR(UNIX_TIMESTAMP({column}) / %s) * %s"
+
+
+def bucket_expr(column="timestamp"):
+    return BUCKET_EXPR.format(column=column)
+
+
+def merge_level_buckets(*row_sets):
+    """
+    구간별 (bucket_start, min, avg, max, samples) 행을 합쳐 구간 시작 순으로 반환
+    (원본 테이블과 분 단위 집계 테이블 결과를 표본 수 가중 평균으로 병합)
+    """
+    merged = {}
+    for rows in row_sets:
+        for row in rows:
+            start = int(row["bucket_start"])
+            samples = int(row["samples"] or 0)
+            if samples == 0:
+                continue
+            current = merged.get(start)
+            if current is None:
+                merged[start] = {
+                    "t": start,
+                    "min": float(row["min_level"]),
+                    "avg": float(row["avg_level"]),
+                    "max": float(row["max_level"]),
+                    "samples": samples
+                }
+                continue
+            total = current["samples"] + samples
+            current["avg"] = (current["avg"] * current["samples"] + float(row["avg_level"]) * samples) / total
+            current["min"] = min(current["min"], float(row["min_level"]))
+            current["max"] = max(current["max"], float(row["max_level"]))
+            current["samples"] = total
+
+    result = [merged[start] for start in sorted(merged)]
+    for bucket in result:
+        bucket["avg"] = round(bucket["avg"], 2)
+    return result
+
+
+def time_in_state(rows, since, until, state_key="status"):
+    """
+    상태 변화 행(시간 오름차순)으로 [since, until) 구간 상태별 체류 시간(초) 계산
+    첫 행이 since 이전이면 since 부터 그 상태로 본다.
+    """
+    durations = {}
+    current_state = None
+    current_start = since
+    for row in rows:
+        timestamp = max(row["timestamp"], since)
+        if current_state is not None and timestamp > current_start:
+            durations[current_state] = durations.get(current_state, 0.0) + (timestamp - current_start).total_seconds()
+        current_state = row[state_key]
+        current_start = timestamp
+
+    end = min(until, datetime.now())
+    if current_state is not None and end > current_start:
+        durations[current_state] = durations.get(current_state, 0.0) + (end - current_start).total_seconds()
+    return {state: round(seconds, 1) for state, seconds in durations.items()}
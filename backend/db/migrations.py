@@ -0,0 +1,55 @@
+# backend/db/migrations.py
+
+import mysql.connector
+
+# 이미 적용된 것과 같은 결과로 보고 넘어가는 오류
+# 1050: 테이블 존재, 1060: 컬럼 중복, 1061: 인덱스 이름 중복, 1091: 삭제할 인덱스/컬럼 없음
+IGNORABLE_ERRORS = {1050, 1060, 1061, 1091}
+
+
+def apply_migrations(conn, component, migrations):
+    """
+    컴포넌트별 스키마 마이그레이션 적용 - 새로 적용한 버전 목록 반환
+
+    migrations: [(버전, 설명, [SQL, ...]), ...] (버전 오름차순)
+    적용 이력은 schema_migrations 테이블에 (component, version) 으로 기록한다.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            component VARCHAR(50),
+            version INT,
+            description VARCHAR(200),
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (component, version)
+        ) ENGINE=InnoDB;
+    """)
+    cursor.execute(
+        "SELECT COALESCE(MAX(version), 0) FROM schema_migrations WHERE component = %s",
+        (component,)
+    )
+    current_version = cursor.fetchone()[0]
+
+    applied = []
+    for version, description, statements in migrations:
+        if version <= current_version:
+            continue
+
+        for sql in statements:
+            try:
+                cursor.execute(sql)
+            except mysql.connector.Error as err:
+                if err.errno not in IGNORABLE_ERRORS:
+                    raise
+                print(f"[ℹ️ 마이그레이션 건너뜀] {component} v{version}: {err.msg}")
+
+        cursor.execute(
+            "INSERT INTO schema_migrations (component, version, description) VALUES (%s, %s, %s)",
+            (component, version, description)
+        )
+        conn.commit()
+        applied.append(version)
+        print(f"[🛠️ 스키마 마이그레이션] {component} v{version}: {description}")
+
+    cursor.close()
+    return applied
@@ -0,0 +1,109 @@
+# backend/db/retention.py
+
+import csv
+import gzip
+import os
+import threading
+from datetime import datetime, timedelta
+
+
+def day_start(value):
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def retention_cutoff(days, now=None):
+    """보관 기간(일) → 하루 단위로 맞춘 삭제 기준 시각"""
+    return day_start((now or datetime.now()) - timedelta(days=days))
+
+
+class HistoryArchiver:
+    """삭제 전 하루치 히스토리를 <directory>/<table>/<YYYY-MM-DD>.csv.gz 로 보관"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def archive(self, table, day, columns, rows):
+        if not rows:
+            return
+        table_dir = os.path.join(self.directory, table)
+        os.makedirs(table_dir, exist_ok=True)
+        path = os.path.join(table_dir, f"{day:%Y-%m-%d}.csv.gz")
+        # 하루 단위로 한 번에 처리하므로 재실행 시 덮어써도 같은 내용
+        with gzip.open(path, "wt", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+
+
+def drop_day_partitions(conn, table, cutoff, archiver=None, before_drop=None):
+    """
+    cutoff 이전 히스토리를 하루 단위 구간으로 일괄 삭제 - 삭제한 행 수 반환
+
+    하루 구간마다 before_drop(cursor, start, end) (집계 등) → 보관 → 삭제를 한 트랜잭션으로 처리하므로
+    중간에 멈춰도 다음 실행에서 같은 구간을 다시 처리하면 된다.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT MIN(timestamp) FROM {table}")
+    oldest = cursor.fetchone()[0]
+    deleted = 0
+
+    day = day_start(oldest) if oldest else cutoff
+    while day < cutoff:
+        end = min(day + timedelta(days=1), cutoff)
+        if before_drop:
+            before_drop(cursor, day, end)
+        if archiver:
+            cursor.execute(f"SELECT * FROM {table} WHERE timestamp >= %s AND timestamp < %s", (day, end))
+            rows = cursor.fetchall()
+            archiver.archive(table, day, [column[0] for column in cursor.description], rows)
+        cursor.execute(f"DELETE FROM {table} WHERE timestamp >= %s AND timestamp < %s", (day, end))
+        deleted += cursor.rowcount
+        conn.commit()
+        day = end
+
+    cursor.close()
+    return deleted
+
+
+class HistoryRetention:
+    """
+    히스토리 보관 정책 주기 실행기
+
+    databases 의 각 DB 객체에 apply_retention(archiver=...) 를 주기적으로 호출한다.
+    (TruckStatusDB / FacilityStatusDB 가 테이블별 보관 기간과 집계 방식을 정의)
+    """
+
+    def __init__(self, databases, interval_seconds=3600, archive_dir=None):
+        self.databases = list(databases)
+        self.interval_seconds = interval_seconds
+        self.archiver = HistoryArchiver(archive_dir) if archive_dir else None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        summary = {}
+        for db in self.databases:
+            try:
+                summary.update(db.apply_retention(archiver=self.archiver))
+            except Exception as e:
+                print(f"[ERROR] 히스토리 보관 정책 실행 실패 ({type(db).__name__}): {e}")
+        removed = {table: count for table, count in summary.items() if count}
+        if removed:
+            print(f"[🧹 히스토리 정리] {removed}")
+        return summary
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"[🧹 히스토리 보관 정책 시작] {self.interval_seconds}초 주기")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(self.interval_seconds)
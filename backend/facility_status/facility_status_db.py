@@ -2,14 +2,90 @@ import mysql.connector
 from datetime import datetime
 from typing import Optional, List, Dict
 
+from backend.db.migrations import apply_migrations
+from backend.db.retention import drop_day_partitions, retention_cutoff
+from backend.db.history_query import bucket_expr
+
+# 시설 상태 히스토리 보관 기간 (일) - 현재 상태는 *_latest 테이블에 남는다
+RAW_RETENTION_DAYS = 30
+
+# since 를 지정하지 않은 범위 조회의 시작 시각
+HISTORY_EPOCH = datetime(2000, 1, 1)
+
+# 최신 상태 테이블 정의: 히스토리 테이블 → (키 컬럼, 상태 컬럼)
+LATEST_TABLES = {
+    "gate_status": ("gate_id", ("state", "operation")),
+    "belt_status": ("belt_id", ("state", "operation", "container_state")),
+    "dispenser_status": ("dispenser_id", ("state", "position", "operation")),
+}
+
+
+def _create_latest_sql(table):
+    key, columns = LATEST_TABLES[table]
+    column_defs = ",\n".join(f"            {column} VARCHAR(50)" for column in columns)
+    return f"""
+        CREATE TABLE IF NOT EXISTS {table}_latest (
+            {key} VARCHAR(50) PRIMARY KEY,
+{column_defs},
+            timestamp DATETIME
+        ) ENGINE=InnoDB
+    """
+
+
+def _backfill_latest_sql(table):
+    # 기존 히스토리에서 시설별 마지막 행으로 채우기
+    key, columns = LATEST_TABLES[table]
+    names = ", ".join((key,) + columns + ("timestamp",))
+    selected = ", ".join(f"h.{name}" for name in (key,) + columns + ("timestamp",))
+    return f"""
+        REPLACE INTO {table}_latest ({names})
+        SELECT {selected}
+        FROM {table} h
+        JOIN (SELECT {key}, MAX(id) AS last_id FROM {table} GROUP BY {key}) latest_row
+          ON h.id = latest_row.last_id
+    """
+
+
+def _upsert_latest_sql(table):
+    key, columns = LATEST_TABLES[table]
+    names = ", ".join((key,) + columns)
+    placeholders = ", ".join(["%s"] * (len(columns) + 1))
+    updates = ", ".join(f"{column} = VALUES({column})" for column in columns + ("timestamp",))
+    return f"""
+        INSERT INTO {table}_latest ({names}, timestamp)
+        VALUES ({placeholders}, NOW())
+        ON DUPLICATE KEY UPDATE {updates}
+    """
+
+
+# 스키마 마이그레이션 (버전, 설명, SQL 목록)
+MIGRATIONS = [
+    (1, "시설 상태 히스토리 (시설 ID, timestamp) 복합 인덱스", [
+        "CREATE INDEX idx_gate_time ON gate_status (gate_id, timestamp)",
+        "CREATE INDEX idx_belt_time ON belt_status (belt_id, timestamp)",
+        "CREATE INDEX idx_dispenser_time ON dispenser_status (dispenser_id, timestamp)"
+    ]),
+    (2, "시설별 최신 상태 테이블 (*_status_latest)", [
+        sql
+        for table in LATEST_TABLES
+        for sql in (_create_latest_sql(table), _backfill_latest_sql(table))
+    ]),
+    (3, "보관 정책용 timestamp 인덱스", [
+        f"CREATE INDEX idx_{table}_time ON {table} (timestamp)"
+        for table in LATEST_TABLES
+    ]),
+]
+
 class FacilityStatusDB:
-    def __init__(self, host="localhost", user="root", password="jinhyuk2dacibul", database="dust"):
+    def __init__(self, host="localhost", user="root", password="jinhyuk2dacibul", database="dust",
+                 raw_retention_days=RAW_RETENTION_DAYS):
         self.connection_params = {
             'host': host,
             'user': user,
             'password': password,
             'database': database
         }
+        self.raw_retention_days = raw_retention_days
         self.init_db()
 
     def get_connection(self):
@@ -54,6 +130,10 @@ class FacilityStatusDB:
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
                 ) ENGINE=InnoDB;
             """)
+            conn.commit()
+            
+            # 인덱스 / 최신 상태 테이블 마이그레이션
+            apply_migrations(conn, "facility_status", MIGRATIONS)
             
             # 초기 상태 데이터 생성
             cursor.execute("""
@@ -76,6 +156,22 @@ class FacilityStatusDB:
                 VALUES ('DISPENSER', 'CLOSED', 'ROUTE_A', 'IDLE')
             """)
             
+            # 최신 상태 테이블에 아직 행이 없을 때만 초기값 추가
+            cursor.execute("""
+                INSERT IGNORE INTO gate_status_latest (gate_id, state, operation, timestamp)
+                VALUES ('GATE_A', 'CLOSED', 'IDLE', NOW()), ('GATE_B', 'CLOSED', 'IDLE', NOW())
+            """)
+            
+            cursor.execute("""
+                INSERT IGNORE INTO belt_status_latest (belt_id, state, operation, container_state, timestamp)
+                VALUES ('BELT', 'STOPPED', 'IDLE', 'EMPTY', NOW())
+            """)
+            
+            cursor.execute("""
+                INSERT IGNORE INTO dispenser_status_latest (dispenser_id, state, position, operation, timestamp)
+                VALUES ('DISPENSER', 'CLOSED', 'ROUTE_A', 'IDLE', NOW())
+            """)
+            
             conn.commit()
             cursor.close()
             conn.close()
@@ -92,6 +188,8 @@ class FacilityStatusDB:
             cursor.execute("DELETE FROM gate_status")
             cursor.execute("DELETE FROM belt_status")
             cursor.execute("DELETE FROM dispenser_status")
+            for table in LATEST_TABLES:
+                cursor.execute(f"DELETE FROM {table}_latest")
             conn.commit()
             cursor.close()
             conn.close()
@@ -105,9 +203,10 @@ class FacilityStatusDB:
             conn = self.get_connection()
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO gate_status (gate_id, state, operation)
-                VALUES (%s, %s, %s)
+                INSERT INTO gate_status (gate_id, state, operation, timestamp)
+                VALUES (%s, %s, %s, NOW())
             """, (gate_id, state, operation))
+            cursor.execute(_upsert_latest_sql("gate_status"), (gate_id, state, operation))
             conn.commit()
             cursor.close()
             conn.close()
@@ -121,9 +220,10 @@ class FacilityStatusDB:
             conn = self.get_connection()
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO belt_status (belt_id, state, operation, container_state)
-                VALUES (%s, %s, %s, %s)
+                INSERT INTO belt_status (belt_id, state, operation, container_state, timestamp)
+                VALUES (%s, %s, %s, %s, NOW())
             """, (belt_id, state, operation, container_state))
+            cursor.execute(_upsert_latest_sql("belt_status"), (belt_id, state, operation, container_state))
             conn.commit()
             cursor.close()
             conn.close()
@@ -137,9 +237,10 @@ class FacilityStatusDB:
             conn = self.get_connection()
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO dispenser_status (dispenser_id, state, position, operation)
-                VALUES (%s, %s, %s, %s)
+                INSERT INTO dispenser_status (dispenser_id, state, position, operation, timestamp)
+                VALUES (%s, %s, %s, %s, NOW())
             """, (dispenser_id, state, position, operation))
+            cursor.execute(_upsert_latest_sql("dispenser_status"), (dispenser_id, state, position, operation))
             conn.commit()
             cursor.close()
             conn.close()
@@ -154,10 +255,8 @@ class FacilityStatusDB:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("""
                 SELECT gate_id, state, operation, timestamp
-                FROM gate_status
+                FROM gate_status_latest
                 WHERE gate_id = %s
-                ORDER BY timestamp DESC
-                LIMIT 1
             """, (gate_id,))
             row = cursor.fetchone()
             cursor.close()
@@ -174,10 +273,8 @@ class FacilityStatusDB:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("""
                 SELECT belt_id, state, operation, container_state, timestamp
-                FROM belt_status
+                FROM belt_status_latest
                 WHERE belt_id = %s
-                ORDER BY timestamp DESC
-                LIMIT 1
             """, (belt_id,))
             row = cursor.fetchone()
             cursor.close()
@@ -194,10 +291,8 @@ class FacilityStatusDB:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("""
                 SELECT dispenser_id, state, position, operation, timestamp
-                FROM dispenser_status
+                FROM dispenser_status_latest
                 WHERE dispenser_id = %s
-                ORDER BY timestamp DESC
-                LIMIT 1
             """, (dispenser_id,))
             row = cursor.fetchone()
             cursor.close()
@@ -208,64 +303,85 @@ class FacilityStatusDB:
             return None
 
     # 게이트 상태 히스토리 조회
-    def get_gate_history(self, gate_id: str, limit: int = 100) -> List[Dict]:
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT gate_id, state, operation, timestamp
-                FROM gate_status
-                WHERE gate_id = %s
+    def get_gate_history(self, gate_id: str, limit: int = 100,
+                         since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
+        return self._get_history("gate_status", gate_id, limit, since, until, "게이트 히스토리 조회")
+
+    # 벨트 상태 히스토리 조회
+    def get_belt_history(self, belt_id: str, limit: int = 100,
+                         since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
+        return self._get_history("belt_status", belt_id, limit, since, until, "벨트 히스토리 조회")
+            
+    # 디스펜서 상태 히스토리 조회
+    def get_dispenser_history(self, dispenser_id: str, limit: int = 100,
+                              since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
+        return self._get_history("dispenser_status", dispenser_id, limit, since, until, "디스펜서 히스토리 조회")
+
+    # 구간별 상태 횟수 집계 - [{"t": 구간 시작(epoch 초), "counts": {상태: 횟수}}]
+    def get_state_buckets(self, table: str, facility_id: str, since: datetime, until: datetime,
+                          bucket_seconds: int) -> List[Dict]:
+        key, _ = LATEST_TABLES[table]
+        rows = self._fetch_all(f"""
+            SELECT {bucket_expr("timestamp")} AS bucket_start, state, COUNT(*) AS count
+            FROM {table}
+            WHERE {key} = %s AND timestamp >= %s AND timestamp < %s
+            GROUP BY bucket_start, state
+            ORDER BY bucket_start
+        """, (bucket_seconds, bucket_seconds, facility_id, since, until), f"{table} 구간 집계")
+
+        buckets = {}
+        for row in rows:
+            start = int(row["bucket_start"])
+            bucket = buckets.setdefault(start, {"t": start, "counts": {}})
+            bucket["counts"][row["state"]] = int(row["count"])
+        return [buckets[start] for start in sorted(buckets)]
+
+    def _get_history(self, table: str, facility_id: str, limit: int,
+                     since: Optional[datetime], until: Optional[datetime], label: str) -> List[Dict]:
+        key, columns = LATEST_TABLES[table]
+        selected = ", ".join((key,) + columns + ("timestamp",))
+        if since is None and until is None:
+            return self._fetch_all(f"""
+                SELECT {selected}
+                FROM {table}
+                WHERE {key} = %s
                 ORDER BY timestamp DESC
                 LIMIT %s
-            """, (gate_id, limit))
-            result = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            return result
-        except mysql.connector.Error as err:
-            print(f"[ERROR] 게이트 히스토리 조회 실패: {err}")
-            return []
+            """, (facility_id, limit), label)
 
-    # 벨트 상태 히스토리 조회
-    def get_belt_history(self, belt_id: str, limit: int = 100) -> List[Dict]:
+        return self._fetch_all(f"""
+            SELECT {selected}
+            FROM {table}
+            WHERE {key} = %s AND timestamp >= %s AND timestamp < %s
+            ORDER BY timestamp DESC
+            LIMIT %s
+        """, (facility_id, since or HISTORY_EPOCH, until or datetime.now(), limit), label)
+
+    def _fetch_all(self, query: str, params: tuple, label: str) -> List[Dict]:
         try:
             conn = self.get_connection()
             cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT belt_id, state, operation, container_state, timestamp
-                FROM belt_status
-                WHERE belt_id = %s
-                ORDER BY timestamp DESC
-                LIMIT %s
-            """, (belt_id, limit))
+            cursor.execute(query, params)
             result = cursor.fetchall()
             cursor.close()
             conn.close()
             return result
         except mysql.connector.Error as err:
-            print(f"[ERROR] 벨트 히스토리 조회 실패: {err}")
+            print(f"[ERROR] {label} 실패: {err}")
             return []
-            
-    # 디스펜서 상태 히스토리 조회
-    def get_dispenser_history(self, dispenser_id: str, limit: int = 100) -> List[Dict]:
+
+    # 보관 기간이 지난 히스토리 정리
+    def apply_retention(self, now: Optional[datetime] = None, archiver=None) -> Dict[str, int]:
+        cutoff = retention_cutoff(self.raw_retention_days, now)
+        summary = {}
         try:
             conn = self.get_connection()
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT dispenser_id, state, position, operation, timestamp
-                FROM dispenser_status
-                WHERE dispenser_id = %s
-                ORDER BY timestamp DESC
-                LIMIT %s
-            """, (dispenser_id, limit))
-            result = cursor.fetchall()
-            cursor.close()
+            for table in LATEST_TABLES:
+                summary[table] = drop_day_partitions(conn, table, cutoff, archiver)
             conn.close()
-            return result
         except mysql.connector.Error as err:
-            print(f"[ERROR] 디스펜서 히스토리 조회 실패: {err}")
-            return []
+            print(f"[ERROR] 시설 상태 히스토리 정리 실패: {err}")
+        return summary
 
     def close(self):
         print("[DEBUG] FacilityStatusDB 리소스 정리 완료")
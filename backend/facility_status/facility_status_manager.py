@@ -1,14 +1,18 @@
 from typing import Dict, Optional, List
 from datetime import datetime
 from .facility_status_db import FacilityStatusDB
+from backend.cache.state_versions import get_state_versions, DOMAIN_FACILITIES
 
 class FacilityStatusManager:
-    def __init__(self, db: FacilityStatusDB):
+    def __init__(self, db: FacilityStatusDB, serve_from_memory: bool = False):
         self.facility_status_db = db
+        self.serve_from_memory = serve_from_memory  # 장치 상태를 직접 갱신받는 실행 중인 인스턴스면 조회 시 DB 생략
         self.gate_status = {}
         self.belt_status = {}
         self.dispenser_status = {}  # 디스펜서 상태 추가
         self.command_sender = None  # 트럭 명령 전송자
+        self.journal = None  # 상태 저널 (재시작 복구용)
+        self.versions = get_state_versions()  # 상태 버전 (응답 캐시 무효화)
     
     # -------------------------------- 트럭 명령 전송자 설정 --------------------------------
     
@@ -27,6 +31,35 @@ class FacilityStatusManager:
         else:
             print("[❌ 명령 전송자 누락] command_sender가 None으로 설정되었습니다.")
     
+    # -------------------------------- 상태 저널 --------------------------------
+    
+    def set_journal(self, journal):
+        """상태 저널 설정"""
+        self.journal = journal
+    
+    def restore_from_journal(self, facilities: Dict[str, dict]):
+        """저널에서 복구한 시설 상태를 메모리에 적용 (DB 초기화 없이)"""
+        status_maps = {
+            "GATE": self.gate_status,
+            "BELT": self.belt_status,
+            "DISPENSER": self.dispenser_status
+        }
+        for facility_id, record in facilities.items():
+            status_map = status_maps.get(record.get("facility_type"))
+            if status_map is None:
+                continue
+            status = {key: value for key, value in record.items() if key not in ("facility_type", "facility_id")}
+            status["timestamp"] = datetime.fromtimestamp(record["timestamp"])
+            status_map[facility_id] = status
+            print(f"[📒 시설 상태 복구] {facility_id}: {status.get('state')}")
+        self.versions.bump(DOMAIN_FACILITIES)
+    
+    def _record_facility_change(self, facility_type: str, facility_id: str, status: dict):
+        """시설 상태 변경 기록 - 저널 기록 및 상태 버전 증가"""
+        if self.journal:
+            self.journal.record_facility(facility_type, facility_id, status)
+        self.versions.bump(DOMAIN_FACILITIES)
+    
     # -------------------------------- 시설 상태 초기화 --------------------------------
     
     def reset_all_facilities(self):
@@ -63,11 +96,16 @@ class FacilityStatusManager:
             "timestamp": datetime.now()
         }
         
+        self._record_facility_change("GATE", gate_id, self.gate_status[gate_id])
+        
         # 상태 변화 로깅
         print(f"[🚪 게이트 상태] {gate_id}: {state} (동작: {operation})")
     
     def get_gate_status(self, gate_id: str) -> dict:
         """게이트 상태 조회 - DB에서 최신 상태를 가져와 메모리 업데이트"""
+        if self.serve_from_memory and gate_id in self.gate_status:
+            return dict(self.gate_status[gate_id])  # 호출자가 바꿔도 메모리 상태는 그대로
+        
         # DB에서 최신 상태 조회
         gate_data = self.facility_status_db.get_latest_gate_status(gate_id)
         
@@ -88,7 +126,7 @@ class FacilityStatusManager:
         # 메모리 상태 업데이트
         self.gate_status[gate_id] = gate_status
         
-        return gate_status
+        return dict(gate_status)
     
     # -------------------------------- 벨트 상태 관리 --------------------------------
     
@@ -110,11 +148,16 @@ class FacilityStatusManager:
             "timestamp": datetime.now()
         }
         
+        self._record_facility_change("BELT", belt_id, self.belt_status[belt_id])
+        
         # 상태 변화 로깅
         print(f"[🧭 벨트 상태] {belt_id}: {state} (동작: {operation}, 컨테이너: {container_state})")
     
     def get_belt_status(self, belt_id: str) -> dict:
         """벨트 상태 조회 - DB에서 최신 상태를 가져와 메모리 업데이트"""
+        if self.serve_from_memory and belt_id in self.belt_status:
+            return dict(self.belt_status[belt_id])  # 호출자가 바꿔도 메모리 상태는 그대로
+        
         # DB에서 최신 상태 조회
         belt_data = self.facility_status_db.get_latest_belt_status(belt_id)
         
@@ -137,7 +180,7 @@ class FacilityStatusManager:
         # 메모리 상태 업데이트
         self.belt_status[belt_id] = belt_status
         
-        return belt_status
+        return dict(belt_status)
     
     # -------------------------------- 디스펜서 상태 관리 --------------------------------
     
@@ -159,6 +202,8 @@ class FacilityStatusManager:
             "timestamp": datetime.now()
         }
         
+        self._record_facility_change("DISPENSER", dispenser_id, self.dispenser_status[dispenser_id])
+        
         # 상태 변화 로깅
         print(f"[🔄 디스펜서 상태] {dispenser_id}: {state} (위치: {position}, 동작: {operation})")
         
@@ -222,6 +267,9 @@ class FacilityStatusManager:
     
     def get_dispenser_status(self, dispenser_id: str) -> dict:
         """디스펜서 상태 조회 - DB에서 최신 상태를 가져와 메모리 업데이트"""
+        if self.serve_from_memory and dispenser_id in self.dispenser_status:
+            return dict(self.dispenser_status[dispenser_id])  # 호출자가 바꿔도 메모리 상태는 그대로
+        
         # DB에서 최신 상태 조회
         dispenser_data = self.facility_status_db.get_latest_dispenser_status(dispenser_id)
         
@@ -244,7 +292,7 @@ class FacilityStatusManager:
         # 메모리 상태 업데이트
         self.dispenser_status[dispenser_id] = dispenser_status
         
-        return dispenser_status
+        return dict(dispenser_status)
     
     # -------------------------------- 모든 시설 상태 조회 --------------------------------
     
@@ -271,17 +319,26 @@ class FacilityStatusManager:
     
     # -------------------------------- 히스토리 조회 --------------------------------
     
-    def get_gate_history(self, gate_id: str, limit: int = 100) -> List[Dict]:
+    def get_gate_history(self, gate_id: str, limit: int = 100,
+                         since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
         """게이트 히스토리 조회"""
-        return self.facility_status_db.get_gate_history(gate_id, limit)
+        return self.facility_status_db.get_gate_history(gate_id, limit, since, until)
     
-    def get_belt_history(self, belt_id: str, limit: int = 100) -> List[Dict]:
+    def get_belt_history(self, belt_id: str, limit: int = 100,
+                         since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
         """벨트 히스토리 조회"""
-        return self.facility_status_db.get_belt_history(belt_id, limit)
+        return self.facility_status_db.get_belt_history(belt_id, limit, since, until)
         
-    def get_dispenser_history(self, dispenser_id: str, limit: int = 100) -> List[Dict]:
+    def get_dispenser_history(self, dispenser_id: str, limit: int = 100,
+                              since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
         """디스펜서 히스토리 조회"""
-        return self.facility_status_db.get_dispenser_history(dispenser_id, limit)
+        return self.facility_status_db.get_dispenser_history(dispenser_id, limit, since, until)
+    
+    def get_state_buckets(self, facility_type: str, facility_id: str, since: datetime, until: datetime,
+                          bucket_seconds: int) -> List[Dict]:
+        """구간별 상태 횟수 집계 (facility_type: gate / belt / dispenser)"""
+        table = f"{facility_type.lower()}_status"
+        return self.facility_status_db.get_state_buckets(table, facility_id, since, until, bucket_seconds)
     
     def close(self):
         """리소스 정리"""
@@ -0,0 +1,3 @@
+# faults package
+
+from .fault_injector import FaultInjector, get_fault_injector
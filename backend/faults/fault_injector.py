@@ -0,0 +1,222 @@
+# backend/faults/fault_injector.py
+
+import random
+import socket
+import threading
+import time
+
+# 경로별로 설정할 수 있는 장애 (latency 는 지연 시간 분포 - 숫자 또는 {"dist": ...})
+PATH_OPTIONS = {
+    "tcp_out": ("latency", "drop_rate", "partial_rate", "disconnect_rate"),   # 서버 → 트럭
+    "tcp_in": ("latency", "drop_rate", "disconnect_rate"),                    # 트럭 → 서버
+    "serial": ("latency", "drop_rate", "missing_ack_rate", "garble_rate"),    # 장치 → 서버 응답 줄
+}
+
+GARBLE_CHARS = "#?~*%"
+
+
+class _PathFaults:
+    """경로 하나의 장애 설정과 통계"""
+
+    def __init__(self, path, options):
+        unknown = set(options) - set(PATH_OPTIONS[path])
+        if unknown:
+            raise ValueError(f"{path} 에 없는 장애 설정: {', '.join(sorted(unknown))}")
+        for key in options:
+            if key.endswith("_rate") and not 0.0 <= float(options[key]) <= 1.0:
+                raise ValueError(f"{path}.{key} 는 0~1 사이여야 합니다")
+
+        # 지연 분포는 장치 모델과 같은 형식 (serialio 패키지와 순환 import 되지 않도록 여기서 import)
+        from backend.serialio.device_models import make_latency
+
+        self.options = dict(options)
+        self.latency = make_latency(options["latency"]) if "latency" in options else None
+        self.rates = {key: float(value) for key, value in options.items() if key.endswith("_rate")}
+        self.attempts = 0
+        self.delivered = 0
+        self.faults = {}
+        self.added_delay = 0.0
+        self.recoveries = []
+        self.failing_since = {}   # 스트림 → 첫 장애 시각 (다음 정상 전달까지 복구 중)
+
+    def report(self):
+        recoveries = self.recoveries
+        return {
+            "attempts": self.attempts,
+            "delivered": self.delivered,
+            "faults": dict(self.faults),
+            "loss_rate": round(1.0 - self.delivered / self.attempts, 4) if self.attempts else 0.0,
+            "added_delay": round(self.added_delay, 3),
+            "recovery": {
+                "count": len(recoveries),
+                "mean": round(sum(recoveries) / len(recoveries), 3) if recoveries else None,
+                "max": round(max(recoveries), 3) if recoveries else None,
+            },
+            "unrecovered": len(self.failing_since),
+        }
+
+
+class FaultInjector:
+    """
+    통신 장애 주입기
+
+    TCP 송신(Connection.write) / TCP 수신(TCPServer.handle_client) / 시리얼 응답(SerialInterface.read_response)
+    경로에 지연, 유실, 잘린 프레임, 연결 끊김, 깨진 줄, ACK 누락을 확률로 주입한다.
+    경로마다 시도 / 정상 전달 / 장애 수와, 장애가 시작된 뒤 같은 연결(포트)에서 다음 정상 전달까지
+    걸린 시간(복구 시간)을 모아 report() 로 돌려준다. 설정이 없으면 active 가 False 라 호출부는 바로 통과한다.
+    """
+
+    def __init__(self, config=None, clock=time.monotonic, sleep=time.sleep):
+        self.lock = threading.Lock()
+        self.clock = clock
+        self.sleep = sleep
+        self.active = False
+        self.config = {}
+        self.paths = {}
+        self.rng = random.Random()
+        self.configure(config or {})
+
+    def configure(self, config):
+        """
+        장애 설정 교체 (통계 초기화)
+        예: {"tcp_out": {"latency": {"dist": "uniform", "low": 0.05, "high": 0.3}, "drop_rate": 0.1},
+             "serial": {"missing_ack_rate": 0.2}, "seed": 7}
+        """
+        config = dict(config or {})
+        seed = config.pop("seed", None)
+        unknown = set(config) - set(PATH_OPTIONS)
+        if unknown:
+            raise ValueError(f"알 수 없는 장애 경로: {', '.join(sorted(unknown))}")
+        paths = {path: _PathFaults(path, options or {}) for path, options in config.items()}
+        # 검증이 모두 끝난 뒤에만 교체 (잘못된 seed 로 설정 일부만 바뀌지 않도록)
+        try:
+            rng = random.Random(seed)
+        except TypeError:
+            raise ValueError(f"seed 는 숫자 또는 문자열이어야 합니다: {seed!r}")
+
+        with self.lock:
+            self.paths = paths
+            self.config = dict(config, seed=seed) if seed is not None else config
+            self.rng = rng
+            self.active = bool(paths)
+        if paths:
+            print(f"[💥 장애 주입] 설정: {self.config}")
+        return self.config
+
+    def clear(self):
+        self.configure({})
+        print("[💥 장애 주입] 해제")
+
+    def report(self):
+        with self.lock:
+            return {
+                "active": self.active,
+                "config": self.config,
+                "paths": {path: faults.report() for path, faults in self.paths.items()},
+            }
+
+    # -------------------------------- 경로별 주입 --------------------------------
+
+    def tcp_out(self, connection, data):
+        """송신 프레임 - 보낼 바이트 반환 (None 이면 보내지 않음). 연결 끊김은 OSError"""
+        fault, delay = self._decide("tcp_out", connection.addr, ("disconnect_rate", "drop_rate", "partial_rate"))
+        if delay:
+            self.sleep(delay)
+        if fault == "disconnect_rate":
+            self._shutdown(connection)
+            raise ConnectionResetError("주입된 연결 끊김")
+        if fault == "drop_rate":
+            return None
+        if fault == "partial_rate":
+            return data[:self._randint(1, max(1, len(data) - 1))]
+        return data
+
+    def tcp_in(self, connection, data):
+        """수신 프레임 - 처리할 바이트 반환 (None 이면 버림)"""
+        fault, delay = self._decide("tcp_in", connection.addr, ("disconnect_rate", "drop_rate"))
+        if delay:
+            self.sleep(delay)
+        if fault == "disconnect_rate":
+            self._shutdown(connection)
+            return None
+        if fault == "drop_rate":
+            return None
+        return data
+
+    def serial_in(self, port, line, clock=None):
+        """장치 응답 줄 - 읽은 것으로 처리할 줄 반환 (None 이면 못 받은 것으로 처리)"""
+        now = clock.now if clock else self.clock
+        fault, delay = self._decide("serial", port, ("drop_rate", "missing_ack_rate", "garble_rate"),
+                                    now=now, applies=lambda key: key != "missing_ack_rate" or line.startswith("ACK:"))
+        if delay:
+            (clock.sleep if clock else self.sleep)(delay)
+        if fault in ("drop_rate", "missing_ack_rate"):
+            return None
+        if fault == "garble_rate":
+            return self._garble(line)
+        return line
+
+    # -------------------------------------------------------------------------------
+
+    def _decide(self, path, stream, fault_keys, now=None, applies=None):
+        """(장애 이름 또는 None, 지연 초) - 통계와 복구 시간도 여기서 기록"""
+        with self.lock:
+            faults = self.paths.get(path)
+            if faults is None:
+                return None, 0.0
+            now = (now or self.clock)()
+            faults.attempts += 1
+            delay = faults.latency.sample(self.rng) if faults.latency else 0.0
+            faults.added_delay += delay
+
+            fault = None
+            for key in fault_keys:
+                rate = faults.rates.get(key)
+                if rate and (applies is None or applies(key)) and self.rng.random() < rate:
+                    fault = key
+                    break
+
+            if fault:
+                name = fault[:-len("_rate")]
+                faults.faults[name] = faults.faults.get(name, 0) + 1
+                faults.failing_since.setdefault(stream, now)
+            else:
+                faults.delivered += 1
+                started = faults.failing_since.pop(stream, None)
+                if started is not None:
+                    faults.recoveries.append(now + delay - started)
+            return fault, delay
+
+    def _randint(self, low, high):
+        with self.lock:
+            return self.rng.randint(low, high)
+
+    def _garble(self, line):
+        with self.lock:
+            chars = list(line) or [" "]
+            for _ in range(max(1, len(chars) // 4)):
+                chars[self.rng.randrange(len(chars))] = self.rng.choice(GARBLE_CHARS)
+            return "".join(chars)
+
+    @staticmethod
+    def _shutdown(connection):
+        try:
+            connection.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+# -------------------------------- 프로세스 단일 주입기 --------------------------------
+
+_fault_injector = None
+_fault_injector_lock = threading.Lock()
+
+
+def get_fault_injector():
+    """프로세스 전체에서 공유하는 장애 주입기 (기본은 비활성)"""
+    global _fault_injector
+    if _fault_injector is None:
+        with _fault_injector_lock:
+            if _fault_injector is None:
+                _fault_injector = FaultInjector()
+    return _fault_injector
@@ -0,0 +1,3 @@
+# fleet package
+
+from .fleet_registry import FleetRegistry, get_fleet_registry, ID_EXTENDED, RESERVED_CODES
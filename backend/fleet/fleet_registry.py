@@ -0,0 +1,214 @@
+# backend/fleet/fleet_registry.py
+
+import re
+import threading
+from datetime import datetime
+
+from backend.cache.state_versions import get_state_versions, DOMAIN_TRUCKS
+
+# 프로토콜 헤더의 1바이트 ID 중 트럭에 줄 수 없는 값
+# 0x00: 미지정, 0x04: GUI, 0x10: SERVER, 0xFE: 확장 ID 표시, 0xFF: 예약
+ID_EXTENDED = 0xFE
+RESERVED_CODES = {0x00, 0x04, 0x10, ID_EXTENDED, 0xFF}
+MAX_SHORT_CODE = 0xFF
+MAX_EXTENDED_CODE = 0xFFFF
+
+# 저장소가 비어 있을 때 등록하는 기본 트럭 (기존 TRUCK_01~03 ↔ 0x01~0x03 유지)
+DEFAULT_FLEET = ("TRUCK_01", "TRUCK_02", "TRUCK_03")
+
+_NUMBERED_ID = re.compile(r"^TRUCK_(\d+)$")
+
+
+def truck_name_for_code(code):
+    """프로토콜 ID → 자동 등록 트럭 이름 (0x07 → TRUCK_07)"""
+    return f"TRUCK_{code:02d}"
+
+
+class FleetRegistry:
+    """
+    트럭 목록 + 프로토콜 ID 할당
+
+    트럭마다 프로토콜 ID 를 하나 할당한다. 1바이트 ID(예약값 제외 최대 250대)를 먼저 쓰고,
+    모두 쓰면 allow_extended 일 때 256 이상의 16비트 확장 ID 를 준다(확장 ID 프레임 사용).
+    store(load_fleet / save_fleet_truck) 가 있으면 등록 내용을 저장한다.
+    REST / 상태 관리자 / GUI 는 하드코딩된 트럭 목록 대신 truck_ids() 를 순회한다.
+    """
+
+    def __init__(self, store=None, auto_register=True, allow_extended=True, default_trucks=DEFAULT_FLEET):
+        self.lock = threading.Lock()
+        self.auto_register = auto_register    # 처음 보는 프로토콜 ID 로 접속한 트럭을 자동 등록
+        self.allow_extended = allow_extended
+        self.versions = get_state_versions()
+        self.store = None
+        self._by_id = {}     # truck_id → 등록 정보
+        self._by_code = {}   # 프로토콜 ID → truck_id
+        for truck_id in default_trucks:
+            self._add(truck_id, self._allocate_code(truck_id))
+        if store is not None:
+            self.attach_store(store)
+
+    def attach_store(self, store):
+        """저장된 목록으로 교체하고, 저장소가 비어 있으면 현재 목록을 저장"""
+        self.store = store
+        try:
+            rows = store.load_fleet() or []
+        except Exception as e:
+            print(f"[⚠️ 트럭 목록 불러오기 실패] {e}")
+            return
+
+        with self.lock:
+            if rows:
+                self._by_id.clear()
+                self._by_code.clear()
+                for row in rows:
+                    self._add(row["truck_id"], int(row["protocol_id"]), row.get("name"),
+                              bool(row.get("active", True)), row.get("registered_at"))
+            records = [dict(record) for record in self._by_id.values()]
+        if not rows:
+            for record in records:
+                self._save(record)
+        self.versions.bump(DOMAIN_TRUCKS)
+        print(f"[🚚 트럭 목록] {len(records)}대 등록됨")
+
+    # -------------------------------- 등록 --------------------------------
+
+    def register(self, truck_id, protocol_id=None, name=None):
+        """트럭 등록 (이미 있으면 활성화만) - 등록 정보 반환"""
+        with self.lock:
+            record = self._by_id.get(truck_id)
+            if record is not None:
+                if protocol_id is not None and protocol_id != record["protocol_id"]:
+                    raise ValueError(f"{truck_id} 는 이미 프로토콜 ID {record['protocol_id']} 로 등록되어 있습니다")
+                changed = not record["active"]
+                record["active"] = True
+            else:
+                if protocol_id is None:
+                    protocol_id = self._allocate_code(truck_id)
+                else:
+                    self._check_code(protocol_id)
+                record = self._add(truck_id, protocol_id, name)
+                changed = True
+            record = dict(record)
+
+        if changed:
+            self._save(record)
+            self.versions.bump(DOMAIN_TRUCKS)
+            print(f"[🚚 트럭 등록] {truck_id} (프로토콜 ID {record['protocol_id']})")
+        return record
+
+    def deactivate(self, truck_id):
+        """운행 목록에서 제외 (프로토콜 ID 는 재사용하지 않도록 유지)"""
+        with self.lock:
+            record = self._by_id.get(truck_id)
+            if record is None or not record["active"]:
+                return False
+            record["active"] = False
+            record = dict(record)
+        self._save(record)
+        self.versions.bump(DOMAIN_TRUCKS)
+        return True
+
+    # -------------------------------- 조회 --------------------------------
+
+    def code_of(self, truck_id):
+        """truck_id → 프로토콜 ID (미등록이면 None)"""
+        record = self._by_id.get(truck_id)
+        return record["protocol_id"] if record else None
+
+    def truck_of(self, code):
+        """프로토콜 ID → truck_id (미등록이면 None - 조회만 하고 등록하지 않음)"""
+        return self._by_code.get(code)
+
+    def admit(self, code):
+        """
+        처음 보는 프로토콜 ID 로 접속한 트럭을 TRUCK_<ID> 로 자동 등록 (auto_register 일 때)
+        미지정(0x00) / 예약(0xFF 등) / 범위 밖 ID 는 등록하지 않음 - truck_id 또는 None
+        """
+        truck_id = self._by_code.get(code)
+        if truck_id is not None or not self.auto_register or code is None:
+            return truck_id
+        if code in RESERVED_CODES or not 0 < code <= MAX_EXTENDED_CODE:
+            print(f"[⚠️ 트럭 자동 등록 거부] 사용할 수 없는 프로토콜 ID: {code}")
+            return None
+        truck_id = truck_name_for_code(code)
+        try:
+            self.register(truck_id, code)
+        except ValueError as e:
+            print(f"[⚠️ 트럭 자동 등록 실패] 프로토콜 ID {code}: {e}")
+            return None
+        return truck_id
+
+    def truck_ids(self, active_only=True):
+        """등록된 트럭 ID (프로토콜 ID 순)"""
+        with self.lock:
+            records = sorted(self._by_id.values(), key=lambda r: r["protocol_id"])
+        return [r["truck_id"] for r in records if r["active"] or not active_only]
+
+    def records(self, active_only=False):
+        with self.lock:
+            records = sorted(self._by_id.values(), key=lambda r: r["protocol_id"])
+            return [dict(r) for r in records if r["active"] or not active_only]
+
+    def __contains__(self, truck_id):
+        record = self._by_id.get(truck_id)
+        return bool(record and record["active"])
+
+    def __len__(self):
+        return len(self.truck_ids())
+
+    # -------------------------------------------------------------------------------
+
+    def _add(self, truck_id, code, name=None, active=True, registered_at=None):
+        record = {
+            "truck_id": truck_id,
+            "protocol_id": code,
+            "name": name or truck_id,
+            "active": active,
+            "registered_at": registered_at or datetime.now()
+        }
+        self._by_id[truck_id] = record
+        self._by_code[code] = truck_id
+        return record
+
+    def _check_code(self, code):
+        if code in RESERVED_CODES or not 0 < code <= MAX_EXTENDED_CODE:
+            raise ValueError(f"사용할 수 없는 프로토콜 ID: {code}")
+        if code > MAX_SHORT_CODE and not self.allow_extended:
+            raise ValueError(f"확장 ID 가 비활성화되어 있습니다: {code}")
+        if code in self._by_code:
+            raise ValueError(f"프로토콜 ID {code} 는 {self._by_code[code]} 가 사용 중입니다")
+
+    def _allocate_code(self, truck_id):
+        """TRUCK_<n> 이면 n 을 우선 사용, 아니면 비어 있는 가장 작은 1바이트 ID → 확장 ID"""
+        match = _NUMBERED_ID.match(truck_id)
+        if match:
+            preferred = int(match.group(1))
+            if 0 < preferred <= MAX_SHORT_CODE and preferred not in RESERVED_CODES and preferred not in self._by_code:
+                return preferred
+        for code in range(1, MAX_SHORT_CODE + 1):
+            if code not in RESERVED_CODES and code not in self._by_code:
+                return code
+        if self.allow_extended:
+            for code in range(MAX_SHORT_CODE + 1, MAX_EXTENDED_CODE + 1):
+                if code not in self._by_code:
+                    return code
+        raise ValueError("할당할 수 있는 프로토콜 ID 가 없습니다")
+
+    def _save(self, record):
+        if not self.store:
+            return
+        try:
+            self.store.save_fleet_truck(record)
+        except Exception as e:
+            print(f"[⚠️ 트럭 목록 저장 실패] {record['truck_id']}: {e}")
+
+
+_fleet_registry = None
+
+
+def get_fleet_registry():
+    """프로세스 공용 트럭 목록 (프로토콜 / REST / 상태 관리자가 공유)"""
+    global _fleet_registry
+    if _fleet_registry is None:
+        _fleet_registry = FleetRegistry()
+    return _fleet_registry
@@ -0,0 +1,3 @@
+# journal package
+
+from .state_journal import StateJournal
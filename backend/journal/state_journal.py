@@ -0,0 +1,273 @@
+# backend/journal/state_journal.py
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+from backend.truck_fsm.truck_state import TruckContext
+
+# 레코드 종류 - 모두 엔티티 단위 전체 상태 upsert 이므로 재적용해도 결과가 같다
+REC_TRUCK = 1
+REC_MISSION = 2
+REC_FACILITY = 3
+
+JOURNAL_FILE = "state.journal"
+SNAPSHOT_FILE = "state.snapshot"
+
+JOURNAL_MAGIC = b"DJL1"
+SNAPSHOT_MAGIC = b"DJS1"
+
+# 저널 파일 헤더: 매직 + 세대 번호 (스냅샷이 어느 세대까지 반영했는지 구분)
+_FILE_HEADER = struct.Struct("<4sQ")
+# 레코드: crc32 + (종류, 기록 시각, 페이로드 길이) + JSON 페이로드
+_CRC = struct.Struct("<I")
+_META = struct.Struct("<BdI")
+# 스냅샷: 매직 + 세대 번호 + crc32 + 페이로드 길이
+_SNAPSHOT_HEADER = struct.Struct("<4sQII")
+
+
+def _encode(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _empty_state():
+    return {"trucks": {}, "missions": {}, "facilities": {}}
+
+
+# -------------------------------- 트럭 컨텍스트 변환 --------------------------------
+
+def context_to_record(context):
+    """TruckContext → 저널 레코드 (monotonic 시각은 재시작 후 의미가 없으므로 제외)"""
+    record = context.to_dict()
+    del record["last_update_time"]
+    return record
+
+
+def context_from_record(record):
+    """저널 레코드 → TruckContext"""
+    return TruckContext.from_dict(record)
+
+
+class StateJournal:
+    """
+    상태 저널 (append-only 바이너리 로그 + 주기적 스냅샷)
+
+    - FSM 전이 / 미션 변경 / 시설 상태 변경을 엔티티 전체 상태 레코드로 덧붙여 기록한다
+    - snapshot_interval 건마다 현재 상태를 스냅샷으로 원자적으로 교체하고 저널을 새 세대로 비운다
+    - 시작 시 스냅샷 + 이후 저널만 재생하므로 복구 시간이 로그 길이에 비례하지 않는다
+    - 마지막 레코드가 잘린 경우(쓰기 중 종료) crc / 길이 검사로 걸러내고 그 지점부터 이어 쓴다
+    """
+
+    def __init__(self, directory, snapshot_interval=500, fsync=False):
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync  # True 면 레코드마다 디스크 동기화 (정전 대비, 느림)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.lock = threading.Lock()
+        self.state = _empty_state()
+        self._truck_snapshots = {}  # truck_id → 마지막으로 기록한 context.snapshot() (last_update_time 제외)
+        self.generation = 1
+        self.records_since_snapshot = 0
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+
+    # -------------------------------- 복구 --------------------------------
+
+    def recover(self):
+        """스냅샷 + 저널 재생으로 마지막 상태 복원 - {"trucks", "missions", "facilities"} 반환"""
+        started = time.perf_counter()
+        with self.lock:
+            replayed = self._recover_locked()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"[📒 저널 복구] 트럭 {len(self.state['trucks'])}대, 시설 {len(self.state['facilities'])}개, "
+              f"미션 {len(self.state['missions'])}건 (저널 {replayed}건 재생, {elapsed_ms:.1f}ms)")
+        return self.state
+
+    def _recover_locked(self):
+        self._close_file()
+        snapshot_generation, self.state = self._load_snapshot()
+        self._truck_snapshots.clear()
+        replayed, valid_offset, journal_generation = self._replay(snapshot_generation)
+
+        if journal_generation is None:
+            # 저널이 없거나 이미 스냅샷에 반영된 세대 - 새 세대로 시작
+            self.generation = snapshot_generation + 1
+            self._start_journal()
+        else:
+            self.generation = journal_generation
+            self._file = open(self.journal_path, "r+b")
+            self._file.truncate(valid_offset)
+            self._file.seek(valid_offset)
+        self.records_since_snapshot = replayed
+        return replayed
+
+    def has_state(self):
+        return bool(self.state["trucks"] or self.state["facilities"])
+
+    # -------------------------------- 기록 --------------------------------
+
+    def record_truck(self, context):
+        """트럭 FSM 컨텍스트 기록 - 마지막 기록과 같으면 생략 (비교는 snapshot 튜플로, 바뀐 경우만 레코드 생성)"""
+        snapshot = context.snapshot()[:-1]
+        if self._truck_snapshots.get(context.truck_id) == snapshot:
+            return
+        record = context_to_record(context)
+        self._truck_snapshots[context.truck_id] = snapshot
+        if self.state["trucks"].get(record["truck_id"]) == record:
+            return
+        self._append(REC_TRUCK, record)
+
+    def record_mission(self, mission):
+        """미션 상태 변경 기록"""
+        self._append(REC_MISSION, {
+            "mission_id": mission.mission_id,
+            "status": mission.status.name,
+            "assigned_truck_id": mission.assigned_truck_id,
+            # 재시작 후 KPI 대기 / 사이클 시간을 이어서 계산하기 위한 시각 (epoch 초)
+            "created_at": mission.timestamp_created.timestamp() if mission.timestamp_created else None,
+            "assigned_at": mission.timestamp_assigned.timestamp() if mission.timestamp_assigned else None
+        })
+
+    def record_facility(self, facility_type, facility_id, status):
+        """시설 상태 변경 기록 (facility_type: GATE / BELT / DISPENSER)"""
+        record = {key: value for key, value in status.items() if key != "timestamp"}
+        record["facility_type"] = facility_type
+        record["facility_id"] = facility_id
+        self._append(REC_FACILITY, record)
+
+    def snapshot(self):
+        """현재 상태를 스냅샷으로 저장하고 저널을 비움"""
+        with self.lock:
+            if self._file is None:
+                self._recover_locked()
+            self._write_snapshot()
+
+    def close(self):
+        with self.lock:
+            self._close_file()
+
+    # -------------------------------------------------------------------------------
+
+    def _append(self, record_type, data):
+        payload = _encode(data)
+        timestamp = time.time()
+        meta = _META.pack(record_type, timestamp, len(payload))
+        frame = _CRC.pack(zlib.crc32(meta + payload)) + meta + payload
+
+        try:
+            with self.lock:
+                if self._file is None:
+                    # recover() 전에 기록하면 기존 상태를 덮어쓰지 않도록 먼저 복원
+                    self._recover_locked()
+                self._file.write(frame)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                self._apply(self.state, record_type, data, timestamp)
+
+                self.records_since_snapshot += 1
+                if self.records_since_snapshot >= self.snapshot_interval:
+                    self._write_snapshot()
+        except OSError as e:
+            print(f"[ERROR] 저널 기록 실패: {e}")
+
+    @staticmethod
+    def _apply(state, record_type, data, timestamp):
+        if record_type == REC_TRUCK:
+            state["trucks"][data["truck_id"]] = data
+        elif record_type == REC_MISSION:
+            state["missions"][data["mission_id"]] = data
+        elif record_type == REC_FACILITY:
+            data = dict(data, timestamp=timestamp)
+            state["facilities"][data["facility_id"]] = data
+
+    def _write_snapshot(self):
+        payload = _encode(self.state)
+        header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, self.generation, zlib.crc32(payload), len(payload))
+
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header + payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # 스냅샷이 현재 세대를 모두 반영했으므로 다음 세대 저널로 교체
+        self.generation += 1
+        self._close_file()
+        self._start_journal()
+        self.records_since_snapshot = 0
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0, _empty_state()
+
+        try:
+            magic, generation, crc, length = _SNAPSHOT_HEADER.unpack_from(data)
+            payload = data[_SNAPSHOT_HEADER.size:_SNAPSHOT_HEADER.size + length]
+            if magic != SNAPSHOT_MAGIC or len(payload) != length or zlib.crc32(payload) != crc:
+                raise ValueError("스냅샷 검증 실패")
+            state = json.loads(payload)
+        except (struct.error, ValueError) as e:
+            print(f"[⚠️ 저널 스냅샷 손상] {e} - 저널만 재생합니다")
+            return 0, _empty_state()
+
+        for key, value in _empty_state().items():
+            state.setdefault(key, value)
+        return generation, state
+
+    def _replay(self, snapshot_generation):
+        """저널 재생 - (재생 건수, 마지막 정상 레코드 끝 위치, 저널 세대 또는 None)"""
+        try:
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0, 0, None
+
+        if len(data) < _FILE_HEADER.size:
+            return 0, 0, None
+        magic, generation = _FILE_HEADER.unpack_from(data)
+        if magic != JOURNAL_MAGIC or generation <= snapshot_generation:
+            return 0, 0, None
+
+        offset = _FILE_HEADER.size
+        header_size = _CRC.size + _META.size
+        replayed = 0
+        while offset + header_size <= len(data):
+            (crc,) = _CRC.unpack_from(data, offset)
+            record_type, timestamp, length = _META.unpack_from(data, offset + _CRC.size)
+            end = offset + header_size + length
+            if end > len(data):
+                break
+            meta_and_payload = data[offset + _CRC.size:end]
+            if zlib.crc32(meta_and_payload) != crc:
+                break
+            try:
+                record = json.loads(meta_and_payload[_META.size:])
+            except ValueError:
+                break
+            self._apply(self.state, record_type, record, timestamp)
+            replayed += 1
+            offset = end
+
+        if offset < len(data):
+            print(f"[⚠️ 저널 꼬리 손상] {len(data) - offset}바이트 잘라냄 (정상 레코드 {replayed}건)")
+        return replayed, offset, generation
+
+    def _start_journal(self):
+        self._file = open(self.journal_path, "wb")
+        self._file.write(_FILE_HEADER.pack(JOURNAL_MAGIC, self.generation))
+        self._file.flush()
+
+    def _close_file(self):
+        if self._file:
+            self._file.close()
+            self._file = None
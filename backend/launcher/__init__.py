@@ -0,0 +1,4 @@
+# launcher package
+
+from .startup_timer import StartupTimer
+from .server_launcher import ServerLauncher
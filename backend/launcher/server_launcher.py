@@ -0,0 +1,283 @@
+# backend/launcher/server_launcher.py
+
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.launcher.startup_timer import StartupTimer
+from backend.tcpio.listener import open_listener
+
+DB_PARAMS = {
+    "host": "localhost",
+    "user": "root",
+    "password": "jinhyuk2dacibul",
+    "database": "dust",
+}
+
+
+class ServerLauncher:
+    """
+    메인 서버 런처
+
+    1. TCP 리스닝 소켓부터 연다 - 이때부터 트럭 연결은 커널 backlog 에 쌓인다
+    2. DB 3개 초기화, 시리얼 포트 열기, 상태 저널 복구, REST(Flask) import 를 스레드 풀에서 동시에 진행
+    3. MainController 를 조립하고 (DB / DeviceManager 는 2 의 결과 재사용) accept 루프 시작
+    4. REST 서버, 히스토리 정리, 대기 미션 확인은 트럭 수락이 시작된 뒤에
+
+    각 단계 소요 시간은 timer(StartupTimer) 에 남고 start() 끝에 출력된다.
+    """
+
+    def __init__(self, host="0.0.0.0", port=8001, port_map=None, use_fake=False, fake_devices=None,
+                 device_models=None, fault_injection=None, debug=False, db_params=None,
+                 journal_dir=None, journal_snapshot_interval=500,
+                 retention_interval=3600, history_archive_dir=None,
+                 capture_dir=None, capture_segment_mb=16, capture_max_segments=8,
+                 rest_host="0.0.0.0", rest_port=5001, rest_server="waitress", rest_threads=8, rest_backlog=64):
+        self.host = host
+        self.port = port
+        self.port_map = port_map or {}
+        self.use_fake = use_fake
+        self.fake_devices = fake_devices or []
+        self.device_models = device_models
+        self.fault_injection = fault_injection
+        self.debug = debug
+        self.db_params = dict(db_params or DB_PARAMS)
+        self.journal_dir = journal_dir
+        self.journal_snapshot_interval = journal_snapshot_interval
+        self.retention_interval = retention_interval
+        self.history_archive_dir = history_archive_dir
+        self.capture_dir = capture_dir
+        self.capture_segment_mb = capture_segment_mb
+        self.capture_max_segments = capture_max_segments
+        self.rest_host = rest_host
+        self.rest_port = rest_port
+        self.rest_server = rest_server
+        self.rest_threads = rest_threads
+        self.rest_backlog = rest_backlog
+
+        self.timer = StartupTimer()
+        self.listener = None
+        self.server = None
+        self.main_controller = None
+        self.mission_db = None
+        self.truck_status_db = None
+        self.facility_status_db = None
+        self.facility_status_manager = None
+        self.state_journal = None
+        self.history_retention = None
+        self.traffic_recorder = None
+        self.restored_from_journal = False
+        self._rest_app = None
+        self._pool = None
+
+    # -------------------------------- 시작 --------------------------------
+
+    def start(self):
+        """트럭 accept 루프까지 시작하고 반환 (REST 서버는 serve_rest / start_rest 로)"""
+        timer = self.timer
+
+        with timer.phase("tcp_listen"):
+            self.listener = open_listener(self.host, self.port)
+            self.port = self.listener.getsockname()[1]
+        timer.mark("tcp_listening")
+        print(f"[🚀 TCP 포트 열림] {self.host}:{self.port} - 초기화가 끝나면 accept 시작")
+
+        with timer.phase("capture_faults"):
+            self._start_capture_and_faults()
+
+        self._pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="startup")
+        mission_db = self._pool.submit(timer.run, "mission_db", self._open_mission_db)
+        truck_status_db = self._pool.submit(timer.run, "truck_status_db", self._open_truck_status_db)
+        facility_status_db = self._pool.submit(timer.run, "facility_status_db", self._open_facility_status_db)
+        devices = self._pool.submit(timer.run, "serial_ports", self._open_devices)
+        journal = self._pool.submit(timer.run, "journal_recover", self._recover_journal)
+        # FSM / 미션 / 트럭 상태 모듈 import 도 DB 를 기다리는 동안 미리
+        core = self._pool.submit(timer.run, "import_core", importlib.import_module,
+                                 "backend.main_controller.main_controller")
+        # Flask 는 트럭 처리에 필요 없으므로 import 만 미리 걸어 두고 기다리지 않음
+        if self.rest_port:
+            self._rest_app = self._pool.submit(timer.run, "rest_import", self._import_rest_app)
+
+        with timer.phase("init_wait"):
+            recovered_state = journal.result()
+            self.mission_db = mission_db.result()
+            self.truck_status_db = truck_status_db.result()
+            self.facility_status_db = facility_status_db.result()
+            device_manager = devices.result()
+            core.result()
+
+        with timer.phase("main_controller"):
+            self._build_main_controller(device_manager, recovered_state)
+
+        with timer.phase("tcp_accept"):
+            from backend.tcpio.tcp_server import TCPServer
+
+            self.server = TCPServer(self.host, self.port, self.main_controller)
+            threading.Thread(target=self.server.start, args=(self.listener,), daemon=True).start()
+        timer.mark("tcp_accepting")
+
+        # 트럭 수락 이후 작업 - 시작 시간에 포함하지 않음
+        self._pool.submit(self._log_waiting_missions)
+        if self.retention_interval:
+            self._start_retention()
+        self._pool.shutdown(wait=False)
+
+        timer.print_report()
+        return self.server
+
+    def start_rest(self):
+        """REST 서버를 데몬 스레드로 시작"""
+        self._require_rest_app()
+        thread = threading.Thread(target=self.serve_rest, daemon=True)
+        thread.start()
+        return thread
+
+    def serve_rest(self):
+        """REST 서버 실행 (블로킹) - Flask import 가 끝날 때까지 기다림"""
+        from backend.rest_api.wsgi_server import serve
+
+        flask_server, init_tcp_server_reference = self._require_rest_app().result()
+        init_tcp_server_reference(self.server)
+        self.timer.mark("rest_ready")
+        print(f"[메인 서버 시작됨] TCP 서버: {self.host}:{self.port}, Flask 서버: {self.rest_host}:{self.rest_port}")
+        serve(flask_server, host=self.rest_host, port=self.rest_port, server=self.rest_server,
+              threads=self.rest_threads, backlog=self.rest_backlog)
+
+    def _require_rest_app(self):
+        """Flask import Future - rest_port 없이 만들었거나 start() 전이면 RuntimeError"""
+        if self._rest_app is None:
+            reason = "rest_port 가 설정되지 않았습니다" if not self.rest_port else "start() 를 먼저 호출해야 합니다"
+            raise RuntimeError(f"REST 서버를 시작할 수 없습니다: {reason}")
+        return self._rest_app
+
+    # -------------------------------- 종료 --------------------------------
+
+    def shutdown(self):
+        """실행 중인 미션 취소 후 TCP 서버 / 보관 정책 / 저널 / 녹화 / DB 정리"""
+        if self.main_controller and self.mission_db:
+            from backend.mission.mission import Mission
+
+            print("[⚠️ 실행 중인 미션 취소 중...]")
+            waiting_missions = self.mission_db.get_waiting_missions()
+            for mission_data in waiting_missions:
+                mission = Mission.from_row(mission_data)
+                self.main_controller.mission_manager.cancel_mission(mission.mission_id)
+            print(f"[✅ {len(waiting_missions)}개의 미션이 취소되었습니다.]")
+
+        if self.server:
+            self.server.stop()
+        elif self.listener:
+            self.listener.close()
+        if self.history_retention:
+            self.history_retention.stop()
+        if self.state_journal:
+            self.state_journal.snapshot()  # 다음 시작 시 저널 재생 없이 스냅샷만 읽도록
+            self.state_journal.close()
+        if self.traffic_recorder:
+            from backend.capture.traffic_recorder import install_traffic_recorder
+
+            install_traffic_recorder(None)
+            self.traffic_recorder.close()
+        for db in (self.mission_db, self.truck_status_db, self.facility_status_db):
+            if db is not None:
+                db.close()
+
+    # -------------------------------- 초기화 작업 (스레드 풀) --------------------------------
+
+    def _open_mission_db(self):
+        from backend.mission.mission_db import MissionDB
+        return MissionDB(**self.db_params)
+
+    def _open_truck_status_db(self):
+        from backend.truck_status.truck_status_db import TruckStatusDB
+        return TruckStatusDB(**self.db_params)
+
+    def _open_facility_status_db(self):
+        from backend.facility_status.facility_status_db import FacilityStatusDB
+        return FacilityStatusDB(**self.db_params)
+
+    def _open_devices(self):
+        # 시설 상태 매니저는 DB 가 열린 뒤 set_facility_status_manager 로 연결
+        from backend.serialio.device_manager import DeviceManager
+        return DeviceManager(port_map=self.port_map, use_fake=self.use_fake, fake_devices=self.fake_devices,
+                             debug=self.debug, device_models=self.device_models)
+
+    def _recover_journal(self):
+        if not self.journal_dir:
+            return None
+        from backend.journal.state_journal import StateJournal
+
+        self.state_journal = StateJournal(self.journal_dir, snapshot_interval=self.journal_snapshot_interval)
+        recovered_state = self.state_journal.recover()
+        self.restored_from_journal = self.state_journal.has_state()
+        return recovered_state
+
+    def _import_rest_app(self):
+        app_module = importlib.import_module("backend.rest_api.app")
+        return app_module.flask_server, app_module.init_tcp_server_reference
+
+    def _start_capture_and_faults(self):
+        if self.capture_dir:
+            from backend.capture.traffic_recorder import TrafficRecorder, install_traffic_recorder
+
+            self.traffic_recorder = TrafficRecorder(self.capture_dir,
+                                                    segment_size=self.capture_segment_mb * 1024 * 1024,
+                                                    max_segments=self.capture_max_segments)
+            install_traffic_recorder(self.traffic_recorder)
+        if self.fault_injection:
+            from backend.faults.fault_injector import get_fault_injector
+
+            get_fault_injector().configure(self.fault_injection)
+
+    def _build_main_controller(self, device_manager, recovered_state):
+        from backend.facility_status.facility_status_manager import FacilityStatusManager
+        from backend.main_controller.main_controller import MainController
+        from backend.rest_api.managers import register_main_controller
+
+        # 트럭 상태 초기화 - 복구할 저널 상태가 없을 때만 리셋
+        if not self.restored_from_journal:
+            self.truck_status_db.reset_all_statuses()
+
+        # 시설 상태 매니저 (장치 컨트롤러가 직접 갱신하므로 조회는 메모리 상태 사용)
+        self.facility_status_manager = FacilityStatusManager(self.facility_status_db, serve_from_memory=True)
+        device_manager.set_facility_status_manager(self.facility_status_manager)
+
+        self.main_controller = MainController(
+            port_map=self.port_map,
+            use_fake=self.use_fake,
+            fake_devices=self.fake_devices,
+            debug=self.debug,
+            facility_status_manager=self.facility_status_manager,
+            journal=self.state_journal,
+            device_manager=device_manager,
+            mission_db=self.mission_db,
+            status_db=self.truck_status_db
+        )
+
+        if self.restored_from_journal:
+            # 저널에서 FSM 컨텍스트 / 시설 상태 복원
+            self.main_controller.restore_from_journal(recovered_state)
+        else:
+            # 앱의 트럭 상태 / 시설 상태 초기화 (메모리에 있는 상태도 초기화)
+            self.main_controller.truck_status_manager.reset_all_trucks()
+            self.facility_status_manager.reset_all_facilities()
+
+        # REST API 가 MainController 의 매니저 / 장치 컨트롤러를 그대로 사용하도록 등록
+        register_main_controller(self.main_controller)
+
+    def _start_retention(self):
+        from backend.db.retention import HistoryRetention
+
+        self.history_retention = HistoryRetention(
+            [self.truck_status_db, self.facility_status_db],
+            interval_seconds=self.retention_interval,
+            archive_dir=self.history_archive_dir
+        )
+        self.history_retention.start()
+
+    def _log_waiting_missions(self):
+        try:
+            waiting_missions = self.mission_db.get_waiting_missions()
+            print(f"[ℹ️ 기존 미션 발견] 총 {len(waiting_missions)}개의 대기 중인 미션이 있습니다.")
+        except Exception as e:
+            print(f"[⚠️ 기존 미션 확인 실패] {e}")
@@ -0,0 +1,61 @@
+# backend/launcher/startup_timer.py
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    서버 시작 단계별 소요 시간
+
+    단계는 여러 스레드에서 동시에 잴 수 있다 (병렬 초기화면 단계 합계보다 전체 시간이 짧음).
+    mark() 는 "TCP 리스닝 시작" 처럼 한 시점까지 걸린 시간을 기록한다.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.lock = threading.Lock()
+        self.phases = {}   # 이름 → (시작 오프셋, 소요 시간)
+        self.marks = {}    # 이름 → 시작 후 경과 시간
+
+    def elapsed(self):
+        return self.clock() - self.started
+
+    @contextmanager
+    def phase(self, name):
+        begin = self.clock()
+        try:
+            yield
+        finally:
+            end = self.clock()
+            with self.lock:
+                self.phases[name] = (begin - self.started, end - begin)
+
+    def run(self, name, func, *args, **kwargs):
+        """func 실행 시간을 name 단계로 기록하고 결과 반환 (스레드 풀 작업용)"""
+        with self.phase(name):
+            return func(*args, **kwargs)
+
+    def mark(self, name):
+        with self.lock:
+            self.marks[name] = self.elapsed()
+
+    def report(self):
+        with self.lock:
+            phases = sorted(self.phases.items(), key=lambda item: item[1][0])
+            return {
+                "total": round(self.elapsed(), 4),
+                "phases": {name: {"start": round(start, 4), "duration": round(duration, 4)}
+                           for name, (start, duration) in phases},
+                "marks": {name: round(value, 4) for name, value in sorted(self.marks.items(), key=lambda item: item[1])},
+            }
+
+    def print_report(self):
+        report = self.report()
+        print(f"[⏱️ 시작 시간] 전체 {report['total'] * 1000:.0f}ms")
+        for name, phase in report["phases"].items():
+            print(f"  - {name:<22} +{phase['start'] * 1000:6.0f}ms  {phase['duration'] * 1000:6.0f}ms")
+        for name, value in report["marks"].items():
+            print(f"  * {name:<22} {value * 1000:7.0f}ms")
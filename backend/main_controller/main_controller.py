@@ -10,32 +10,36 @@ from backend.truck_status.truck_status_db import TruckStatusDB
 from backend.truck_status.truck_status_manager import TruckStatusManager
 
 from backend.tcpio.truck_command_sender import TruckCommandSender
+from backend.tcpio.connection_registry import ConnectionRegistry
 from backend.truck_fsm.truck_fsm_manager import TruckFSMManager
 from backend.truck_fsm.truck_controller import TruckController
 
+from backend.journal.state_journal import context_from_record
+from backend.fleet.fleet_registry import get_fleet_registry
+
 
 class MainController:
-    def __init__(self, port_map, use_fake=False, fake_devices=None, debug=False, facility_status_manager=None):
+    def __init__(self, port_map, use_fake=False, fake_devices=None, debug=False, facility_status_manager=None, journal=None,
+                 device_clock=None, device_models=None, device_manager=None, mission_db=None, status_db=None):
         # 디버그 모드 설정
         self.debug = debug
         
         # 시설 상태 관리자 저장
         self.facility_status_manager = facility_status_manager
         
-        # 명령 전송자 설정 추적 변수 추가
-        self.command_sender_initialized = False
-        
-        # Serial 연결 및 장치 컨트롤러 생성
-        self.device_manager = DeviceManager(
+        # Serial 연결 및 장치 컨트롤러 생성 (런처가 미리 연 DeviceManager / DB 가 있으면 그대로 사용)
+        self.device_manager = device_manager or DeviceManager(
             port_map=port_map, 
             use_fake=use_fake, 
             fake_devices=fake_devices, 
             debug=debug, 
-            facility_status_manager=facility_status_manager
+            facility_status_manager=facility_status_manager,
+            device_clock=device_clock,
+            device_models=device_models
         )
 
         # Mission DB 초기화
-        self.mission_db = MissionDB(
+        self.mission_db = mission_db or MissionDB(
             host="localhost",
             user="root",
             password="jinhyuk2dacibul",
@@ -44,13 +48,18 @@ class MainController:
         self.mission_manager = MissionManager(self.mission_db)
 
         # TruckStatusDB 초기화
-        self.status_db = TruckStatusDB(
+        self.status_db = status_db or TruckStatusDB(
             host="localhost",
             user="root",
             password="jinhyuk2dacibul",
             database="dust"
         )
-        self.truck_status_manager = TruckStatusManager(self.status_db)
+        # 트럭 목록 / 프로토콜 ID 할당을 DB 에 저장
+        self.fleet = get_fleet_registry()
+        self.fleet.attach_store(self.status_db)
+
+        # 트럭 메시지로 직접 갱신되므로 REST 조회도 메모리 상태로 응답
+        self.truck_status_manager = TruckStatusManager(self.status_db, serve_from_memory=True)
 
         # 장치 컨트롤러 가져오기
         self.belt_controller = self.device_manager.get_controller("BELT")
@@ -85,51 +94,48 @@ class MainController:
             truck_status_manager=self.truck_status_manager
         )
 
+        # 배터리 소모 모델 - 처음 보는 트럭은 배터리 히스토리로 초기 추정
+        self.truck_fsm_manager.fsm.battery_model.set_history_source(
+            lambda truck_id: self.status_db.get_battery_history(truck_id, 500)
+        )
+
         # 트럭 컨트롤러 - 새 버전 사용
         self.truck_controller = TruckController(self.truck_fsm_manager)
         self.truck_controller.set_status_manager(self.truck_status_manager)
 
-        # 초기 TruckCommandSender 설정
-        self.set_truck_commander({})
+        # 상태 저널 연결 (FSM 전이 / 미션 / 시설 상태 기록)
+        self.journal = journal
+        if journal:
+            self.truck_fsm_manager.fsm.set_journal(journal)
+            self.mission_manager.set_journal(journal)
+            if facility_status_manager:
+                facility_status_manager.set_journal(journal)
+
+        # 트럭 연결 레지스트리 + 명령 전송자 (TCP 서버와 공유, 프로세스 동안 하나만 사용)
+        self.connections = ConnectionRegistry()
+        self.command_sender = TruckCommandSender(self.connections)
+        self.command_sender.set_truck_status_manager(self.truck_status_manager)
+        self.truck_fsm_manager.set_commander(self.command_sender)
+        if self.facility_status_manager:
+            self.facility_status_manager.set_command_sender(self.command_sender)
 
         print("[✅ MainController 초기화 완료]")
 
-    # 트럭 명령 전송자 설정
-    def set_truck_commander(self, truck_socket_map: dict):
-        """트럭 명령 전송자 설정"""
-        # 이미 초기화되었는지 확인
-        if self.command_sender_initialized and truck_socket_map:
-            # truck_socket_map이 비어있지 않은 경우만 업데이트
-            commander = TruckCommandSender(truck_socket_map)
-            # TCP 서버 참조 설정
-            if hasattr(self, 'tcp_server'):
-                commander.set_tcp_server(self.tcp_server)
-            # 상태 관리자 참조 설정 유지
-            if hasattr(self, 'truck_status_manager'):
-                commander.set_truck_status_manager(self.truck_status_manager)
-            self.truck_fsm_manager.set_commander(commander)
-            return
-            
-        # 최초 설정 또는 맵이 비어있는 초기화인 경우
-        commander = TruckCommandSender(truck_socket_map)
-        
-        # TCP 서버 참조 설정
-        if hasattr(self, 'tcp_server'):
-            commander.set_tcp_server(self.tcp_server)
-            print("[✅ TCP 서버 참조 설정] commander에 tcp_server 참조가 설정되었습니다.")
-        
-        self.truck_fsm_manager.set_commander(commander)
-        
-        # 시설 상태 관리자에도 명령 전송자 설정 (최초 한 번만)
-        if self.facility_status_manager and not self.command_sender_initialized:
-            self.facility_status_manager.set_command_sender(commander)
-            
-            # 상태 관리자 참조도 설정 - 안전하게 확인
-            if hasattr(self, 'truck_status_manager'):
-                commander.set_truck_status_manager(self.truck_status_manager)
-            
-            print("[✅ 명령 전송자 설정] facility_status_manager에 명령 전송자 설정 완료")
-            self.command_sender_initialized = True
+    # 저널 복구 상태 적용
+    def restore_from_journal(self, state: dict):
+        """StateJournal.recover() 결과로 미션 / 트럭 컨텍스트 / 시설 상태 복원"""
+        contexts = {
+            truck_id: context_from_record(record)
+            for truck_id, record in state.get("trucks", {}).items()
+        }
+        # 미션 먼저 - 끝난 미션을 가리키는 컨텍스트로 설비 예약을 다시 잡지 않도록
+        self.mission_manager.restore_from_journal(state.get("missions", {}), contexts)
+        self.truck_fsm_manager.fsm.restore_contexts(contexts)
+        for truck_id, context in contexts.items():
+            self.truck_status_manager.set_fsm_state(truck_id, context.state.value)
+
+        if self.facility_status_manager:
+            self.facility_status_manager.restore_from_journal(state.get("facilities", {}))
 
     # 메시지 처리
     def handle_message(self, msg: dict):
@@ -161,6 +167,14 @@ class MainController:
         else:
             print("[⚠️ 경고] sender가 없는 메시지")
 
+    # 트럭 오프라인 처리 (TCP 서버의 생존 감시가 호출)
+    def handle_truck_offline(self, truck_id, reason=None):
+        """통신이 끊긴 트럭을 FSM 에 통보"""
+        try:
+            self.truck_fsm_manager.handle_truck_offline(truck_id, reason)
+        except Exception as e:
+            print(f"[⚠️ 오프라인 처리 오류] {truck_id}: {e}")
+
     # 수동 벨트 제어 명령 처리
     def _handle_manual_belt_command(self, cmd: str):
         """수동 벨트 제어"""
@@ -224,7 +238,5 @@ class MainController:
         self.tcp_server = tcp_server
         print("[✅ TCP 서버 참조 설정] MainController에 tcp_server 참조가 설정되었습니다.")
         
-        # 기존 명령 전송자가 있으면 TCP 서버 참조도 설정
-        if hasattr(self.truck_fsm_manager, 'command_sender') and self.truck_fsm_manager.command_sender:
-            self.truck_fsm_manager.command_sender.set_tcp_server(tcp_server)
-            print("[✅ TCP 서버 참조 설정] 기존 command_sender에 tcp_server 참조가 설정되었습니다.") 
\ No newline at end of file
+        # 명령 전송자에도 TCP 서버 참조 설정
+        self.command_sender.set_tcp_server(tcp_server)
\ No newline at end of file
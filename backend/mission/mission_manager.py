@@ -2,6 +2,9 @@ from typing import List, Optional
 from .mission import Mission
 from .mission_status import MissionStatus
 from .mission_db import MissionDB
+from backend.analytics.mission_kpi import get_mission_kpi_tracker
+from backend.cache.state_versions import get_state_versions, DOMAIN_MISSIONS
+from backend.truck_fsm.truck_state import MissionPhase, TruckState
 from datetime import datetime
 
 
@@ -9,12 +12,57 @@ class MissionManager:
     def __init__(self, db: MissionDB):
         self.db = db
         self.command_sender = None
+        self.journal = None
+        self.kpi_tracker = get_mission_kpi_tracker()
+        self.versions = get_state_versions()
 
     # ------------------ 커맨더 설정 ----------------------------
 
     def set_command_sender(self, command_sender):
         self.command_sender = command_sender
 
+    # ------------------ 상태 저널 설정 ----------------------------
+
+    def set_journal(self, journal):
+        self.journal = journal
+
+    # 미션 변경 기록 - 저널 기록 및 미션 상태 버전 증가 (응답 캐시 무효화)
+    def _record_mission_change(self, mission: Mission) -> None:
+        if self.journal:
+            self.journal.record_mission(mission)
+        self.versions.bump(DOMAIN_MISSIONS)
+
+    # 저널에서 미션 상태 복원 - 진행 중 미션은 KPI 집계기에 다시 등록하고,
+    # 이미 끝났거나 다른 트럭에 배정된 미션을 가리키는 트럭 컨텍스트는 미션을 비우고 대기 상태로 되돌린다
+    # (충전 / 비상 상태는 유지 - 비상은 RESET 으로만 해제)
+    def restore_from_journal(self, missions: dict, contexts: dict = None) -> int:
+        restored = 0
+        for mission_id, record in missions.items():
+            if record["status"] == MissionStatus.WAITING.name:
+                self.kpi_tracker.on_mission_created(mission_id, record.get("created_at"))
+                restored += 1
+            elif record["status"] == MissionStatus.ASSIGNED.name:
+                self.kpi_tracker.on_mission_assigned(
+                    mission_id, record.get("assigned_truck_id"),
+                    assigned_at=record.get("assigned_at"), created_at=record.get("created_at")
+                )
+                restored += 1
+
+        for truck_id, context in (contexts or {}).items():
+            record = missions.get(context.mission_id) if context.mission_id else None
+            if record is None:
+                continue
+            if record["status"] != MissionStatus.ASSIGNED.name or record.get("assigned_truck_id") != truck_id:
+                print(f"[📒 미션 복구] {truck_id}: 미션 {context.mission_id} 은 {record['status']} - 트럭 미션 해제")
+                context.mission_id = None
+                context.mission_phase = MissionPhase.NONE
+                context.target_position = None
+                if context.state not in (TruckState.CHARGING, TruckState.EMERGENCY):
+                    context.state = TruckState.IDLE
+
+        print(f"[📒 미션 복구] 진행 중 미션 {restored}건")
+        return restored
+
     # ------------------ 미션 생성 ----------------------------
 
     def create_mission(self, mission_id: str, cargo_type: str, cargo_amount: float,
@@ -43,6 +91,8 @@ class MissionManager:
             )
             
             if self.db.save_mission(mission_data):
+                self._record_mission_change(mission)
+                self.kpi_tracker.on_mission_created(mission.mission_id, mission.timestamp_created.timestamp())
                 self._notify_trucks_of_waiting_missions()
                 print(f"[✅ 미션 생성 완료] {mission.mission_id}")
                 return mission
@@ -82,6 +132,12 @@ class MissionManager:
             )
             
             if self.db.save_mission(mission_data):
+                self._record_mission_change(mission)
+                self.kpi_tracker.on_mission_assigned(
+                    mission_id, truck_id,
+                    assigned_at=mission.timestamp_assigned.timestamp(),
+                    created_at=mission.timestamp_created.timestamp() if mission.timestamp_created else None
+                )
                 print(f"[✅ 미션 할당 완료] {mission_id} → {truck_id}")
                 return True
             
@@ -138,6 +194,9 @@ class MissionManager:
                 timestamp_completed=timestamp_completed
             )
             
+            if save_result or update_result:
+                self._record_mission_change(mission)
+            
             if save_result and update_result:
                 print(f"[✅ 미션 완료 처리] {mission_id} (DB 저장 및 업데이트 성공)")
                 return True
@@ -185,6 +244,8 @@ class MissionManager:
             )
             
             if self.db.save_mission(mission_data):
+                self._record_mission_change(mission)
+                self.kpi_tracker.on_mission_cancelled(mission_id)
                 self._notify_trucks_of_waiting_missions()
                 print(f"[✅ 미션 취소 완료] {mission_id}")
                 return True
@@ -222,15 +283,16 @@ class MissionManager:
             print(f"  - 미션 ID: {mission.mission_id}, 출발지: {mission.source}")
         return waiting_missions
 
-    def get_assigned_and_waiting_missions(self) -> dict:
-        """할당 및 대기 중인 미션 조회 - 딕셔너리 형태로 반환"""
+    def get_assigned_and_waiting_missions(self, serialize=None) -> dict:
+        """할당 및 대기 중인 미션 조회 - 딕셔너리 형태로 반환 (serialize 기본값: Mission.to_dict)"""
+        serialize = serialize or Mission.to_dict
         mission_rows = self.db.get_assigned_and_waiting_missions()
         missions = [Mission.from_row(row) for row in mission_rows]
         
         # 미션 ID를 키로 하는 딕셔너리로 변환
         mission_dict = {}
         for mission in missions:
-            mission_dict[mission.mission_id] = mission.to_dict()
+            mission_dict[mission.mission_id] = serialize(mission)
         
         return mission_dict
 
@@ -243,7 +305,7 @@ class MissionManager:
         waiting_missions = self.get_waiting_missions()
         if waiting_missions:
             print(f"[📢 미션 알림] 대기 중인 미션 {len(waiting_missions)}개가 있습니다.")
-            for truck_id in self.command_sender.truck_sockets.keys():
+            for truck_id in self.command_sender.connected_trucks():
                 self.command_sender.send(truck_id, "MISSIONS_AVAILABLE", {
                     "count": len(waiting_missions)
                 })
@@ -1,5 +1,11 @@
 # backend/rest_api 패키지
-
-from backend.rest_api.app import flask_server
+# (flask_server 는 처음 사용할 때 import - managers 만 쓰는 런처가 Flask 를 기다리지 않도록)
 
 __all__ = ['flask_server']
+
+
+def __getattr__(name):
+    if name == "flask_server":
+        from backend.rest_api.app import flask_server
+        return flask_server
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,11 +5,16 @@ from backend.rest_api.routes.mission_api import mission_api
 from backend.rest_api.routes.facility_api import facility_api
 from backend.rest_api.routes.system_api import system_api, set_tcp_server_instance
 from backend.rest_api.routes.log_api import log_api
+from backend.rest_api.routes.analytics_api import analytics_api
 from backend.rest_api.managers import cleanup_managers
+from backend.rest_api.json_codec import FastJSONProvider
 
 # Flask 웹 서버 인스턴스 생성
 flask_server = Flask(__name__)
 
+# JSON 직렬화 - orjson 이 있으면 사용 (없으면 표준 json)
+flask_server.json = FastJSONProvider(flask_server)
+
 # CORS 설정 추가 (필요시 주석 해제)
 # from flask_cors import CORS
 # CORS(flask_server)
@@ -20,6 +25,7 @@ flask_server.register_blueprint(mission_api, url_prefix='/api')
 flask_server.register_blueprint(facility_api, url_prefix='/api')
 flask_server.register_blueprint(system_api, url_prefix='/api/system')
 flask_server.register_blueprint(log_api, url_prefix='/api')
+flask_server.register_blueprint(analytics_api, url_prefix='/api')
 
 # 디버깅용 경로 출력 함수 추가
 def print_registered_routes():
@@ -0,0 +1,104 @@
+# backend/rest_api/history_args.py
+
+import math
+from datetime import datetime, timedelta
+
+# bucket 지정 시 from 이 없으면 사용할 기본 조회 구간
+DEFAULT_BUCKET_WINDOW = timedelta(hours=24)
+# 한 응답에 담을 최대 구간 수
+MAX_BUCKETS = 5000
+
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time_arg(value):
+    """ISO 8601 문자열 또는 epoch 초 → datetime (없으면 None)"""
+    if value is None or value == "":
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = None
+    if seconds is not None:
+        # inf / nan / 범위 밖 epoch 는 fromtimestamp 가 OverflowError / OSError 를 내므로 같은 400 으로
+        if not math.isfinite(seconds):
+            raise ValueError(f"시간 값이 올바르지 않습니다: {value}")
+        try:
+            return datetime.fromtimestamp(seconds)
+        except (ValueError, OverflowError, OSError):
+            raise ValueError(f"시간 값이 범위를 벗어났습니다: {value}")
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"시간 형식이 올바르지 않습니다: {value}")
+    # DB 는 로컬 시간 DATETIME 이므로 시간대 정보는 로컬 시간으로 변환 후 제거
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def parse_bucket_arg(value):
+    """'30s' / '15m' / '1h' / '1d' 또는 초 단위 숫자 → 초 (없거나 공백뿐이면 None)"""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if not value:
+        return None
+    try:
+        if value[-1] in _UNIT_SECONDS:
+            seconds = int(float(value[:-1]) * _UNIT_SECONDS[value[-1]])
+        else:
+            seconds = int(value)
+    except (ValueError, OverflowError):
+        raise ValueError(f"bucket 형식이 올바르지 않습니다: {value}")
+    if seconds <= 0:
+        raise ValueError("bucket 은 0보다 커야 합니다")
+    return seconds
+
+
+def parse_history_args(args, default_limit=100):
+    """
+    히스토리 조회 공통 인자 (from, to, bucket, limit) 해석
+    반환: {"since", "until", "bucket_seconds", "limit"} - 잘못된 값이면 ValueError
+    """
+    since = parse_time_arg(args.get("from"))
+    until = parse_time_arg(args.get("to"))
+    bucket_seconds = parse_bucket_arg(args.get("bucket"))
+    try:
+        limit = int(args.get("limit", default_limit))
+    except (TypeError, ValueError):
+        raise ValueError("limit 은 정수여야 합니다")
+    if limit < 1:
+        raise ValueError("limit 은 1 이상이어야 합니다")
+
+    if bucket_seconds:
+        until = until or datetime.now()
+        try:
+            since = since or until - DEFAULT_BUCKET_WINDOW
+        except OverflowError:
+            raise ValueError("to 가 너무 이릅니다")
+        if (until - since).total_seconds() / bucket_seconds > MAX_BUCKETS:
+            raise ValueError(f"구간 수가 너무 많습니다 (최대 {MAX_BUCKETS}개) - bucket 을 늘리세요")
+    if since and until and since >= until:
+        raise ValueError("from 은 to 보다 이전이어야 합니다")
+
+    return {"since": since, "until": until, "bucket_seconds": bucket_seconds, "limit": limit}
+
+
+def require_range(query, default_window=DEFAULT_BUCKET_WINDOW):
+    """집계 API 용 - from/to 가 없으면 최근 default_window 구간으로 채움"""
+    until = query["until"] or datetime.now()
+    try:
+        since = query["since"] or until - default_window
+    except OverflowError:
+        raise ValueError("to 가 너무 이릅니다")
+    return since, until
+
+
+def bucket_response(subject_id, since, until, bucket_seconds, buckets):
+    """구간 집계 응답 (시간은 epoch 초)"""
+    return {
+        "id": subject_id,
+        "from": int(since.timestamp()),
+        "to": int(until.timestamp()),
+        "bucket_seconds": bucket_seconds,
+        "buckets": buckets
+    }
@@ -0,0 +1,88 @@
+# backend/rest_api/json_codec.py
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 - 없으면 표준 json 사용
+    orjson = None
+
+
+def _default(value):
+    """기본 인코더가 모르는 타입 변환 (DB 집계값 Decimal, Enum 등)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"JSON 으로 변환할 수 없는 타입: {type(value).__name__}")
+
+
+if orjson:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj):
+        """obj → JSON bytes (datetime 은 ISO 8601)"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def loads(data):
+        return orjson.loads(data)
+else:
+    def dumps(obj):
+        """obj → JSON bytes (datetime 은 ISO 8601)"""
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(data):
+        return json.loads(data)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON 제공자 - jsonify / dict 반환 모두 dumps() 사용"""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+# -------------------------------- 스키마 기반 인코더 --------------------------------
+
+def mission_record(mission):
+    """Mission → 응답 dict (Mission.to_dict 와 같은 모양, datetime 변환은 인코더에 맡김)"""
+    return {
+        "mission_id": mission.mission_id,
+        "cargo_type": mission.cargo_type,
+        "cargo_amount": mission.cargo_amount,
+        "source": mission.source,
+        "destination": mission.destination,
+        "status": {
+            "code": mission.status.name,
+            "label": mission.status.value
+        },
+        "assigned_truck_id": mission.assigned_truck_id,
+        "timestamp_created": mission.timestamp_created,
+        "timestamp_assigned": mission.timestamp_assigned,
+        "timestamp_completed": mission.timestamp_completed,
+    }
+
+
+def json_bytes_response(body, status=200):
+    """이미 인코딩된 JSON bytes 로 Flask 응답 생성"""
+    from flask import current_app
+    return current_app.response_class(body, status=status, mimetype="application/json")
+
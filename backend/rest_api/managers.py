@@ -5,16 +5,51 @@ from backend.mission.mission_db import MissionDB
 from backend.facility_status.facility_status_manager import FacilityStatusManager
 from backend.facility_status.facility_status_db import FacilityStatusDB
 
-# 전역 상태 관리 인스턴스
+# 서비스 레지스트리 - 실행 중인 MainController 가 가진 인스턴스를 REST API 가 그대로 사용
+# (등록된 서비스가 없을 때만 app.py 단독 실행용 인스턴스를 직접 생성)
+_services = {}
+
+# 레지스트리에 등록되지 않아 여기서 직접 만든 인스턴스 (종료 시 정리 대상)
 truck_status_manager = None
 mission_manager = None
 facility_status_manager = None
 
+# ------------------ 서비스 등록 ----------------------------
+
+def register_services(**services):
+    """서비스 인스턴스 등록 (truck_status_manager, mission_manager, facility_status_manager, main_controller ...)"""
+    for name, service in services.items():
+        if service is not None:
+            _services[name] = service
+    print(f"[🔗 REST 서비스 등록] {', '.join(sorted(_services))}")
+
+
+def register_main_controller(main_controller):
+    """MainController 가 소유한 매니저 / 장치 컨트롤러를 REST API 에 연결"""
+    register_services(
+        main_controller=main_controller,
+        truck_status_manager=main_controller.truck_status_manager,
+        mission_manager=main_controller.mission_manager,
+        facility_status_manager=main_controller.facility_status_manager,
+        device_manager=main_controller.device_manager
+    )
+
+
+def get_service(name):
+    """등록된 서비스 조회 (없으면 None)"""
+    return _services.get(name)
+
+
+def clear_services():
+    _services.clear()
+
 # ------------------ 초기화 함수 ----------------------------
 
 def get_truck_status_manager():
     """TruckStatusManager 초기화"""
     global truck_status_manager
+    if "truck_status_manager" in _services:
+        return _services["truck_status_manager"]
     if truck_status_manager is None:
         print("[DEBUG] TruckStatusManager 초기화")
         status_db = TruckStatusDB(
@@ -30,6 +65,8 @@ def get_truck_status_manager():
 def get_mission_manager():
     """MissionManager 초기화"""
     global mission_manager
+    if "mission_manager" in _services:
+        return _services["mission_manager"]
     if mission_manager is None:
         print("[DEBUG] MissionManager 초기화")
         mission_db = MissionDB(
@@ -45,6 +82,8 @@ def get_mission_manager():
 def get_facility_status_manager():
     """FacilityStatusManager 초기화"""
     global facility_status_manager
+    if "facility_status_manager" in _services:
+        return _services["facility_status_manager"]
     if facility_status_manager is None:
         print("[DEBUG] FacilityStatusManager 초기화")
         facility_db = FacilityStatusDB(
@@ -60,7 +99,7 @@ def get_facility_status_manager():
 # ------------------ 종료 함수 ----------------------------
 
 def cleanup_managers():
-    """애플리케이션 종료 시 리소스 정리"""
+    """애플리케이션 종료 시 리소스 정리 - 등록된 서비스는 소유자(MainController / 런처)가 정리"""
     global truck_status_manager, mission_manager, facility_status_manager
     if truck_status_manager is not None:
         print("[DEBUG] TruckStatusManager 종료")
@@ -71,8 +110,8 @@ def cleanup_managers():
         print("[DEBUG] MissionManager 종료")
         mission_manager.db.close()
         mission_manager = None
-        
+
     if facility_status_manager is not None:
         print("[DEBUG] FacilityStatusManager 종료")
         facility_status_manager.close()
-        facility_status_manager = None 
\ No newline at end of file
+        facility_status_manager = None
@@ -0,0 +1,107 @@
+# backend/rest_api/response_cache.py
+
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request
+
+from backend.cache.state_versions import get_state_versions
+from backend.rest_api.managers import get_service
+
+# MainController 가 등록되지 않은 단독 실행에서는 다른 프로세스가 DB 를 바꿔도 버전이 오르지 않으므로
+# 버전과 관계없이 이 시간(초)이 지나면 다시 계산
+STANDALONE_TTL = 1.0
+
+
+class ResponseCache:
+    """
+    읽기 API 응답 캐시
+
+    (요청 경로, 도메인 버전) 이 같고 TTL 이 지나지 않았으면 이전 응답 bytes 를 그대로 돌려준다.
+    응답마다 본문 해시로 ETag 를 붙이고 If-None-Match 가 같으면 304 로 응답한다.
+    """
+
+    def __init__(self, versions=None, clock=time.monotonic):
+        self.versions = versions or get_state_versions()
+        self.clock = clock
+        self.lock = threading.Lock()
+        self._entries = {}  # key → (버전, 생성 시각, 본문, ETag)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, domains, ttl=None):
+        """유효한 캐시 항목이면 (본문, ETag), 아니면 None"""
+        version = self.versions.snapshot(domains)
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and (ttl is None or self.clock() - entry[1] < ttl):
+                self.hits += 1
+                return entry[2], entry[3]
+        return None
+
+    def store(self, key, domains, body, version=None):
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        with self.lock:
+            self.misses += 1
+            self._entries[key] = (version if version is not None else self.versions.snapshot(domains),
+                                  self.clock(), body, etag)
+        return etag
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """프로세스 공용 응답 캐시"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+def _etag_response(response, etag):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"  # 클라이언트는 매번 ETag 로 재검증
+    if request.if_none_match.contains(etag):
+        response.status_code = 304
+        response.set_data(b"")
+    return response
+
+
+def cached_response(*domains, ttl=None):
+    """
+    GET 뷰 응답 캐시 데코레이터
+
+    domains 의 버전이 바뀌거나 ttl(초)이 지나면 뷰를 다시 실행한다.
+    200 응답만 캐시하며 쿼리 문자열이 다르면 별도 항목으로 캐시한다.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_response_cache()
+            key = request.full_path
+            effective_ttl = ttl
+            if get_service("main_controller") is None:
+                effective_ttl = min(ttl or STANDALONE_TTL, STANDALONE_TTL)
+
+            cached = cache.lookup(key, domains, effective_ttl)
+            if cached:
+                body, etag = cached
+                response = current_app.response_class(body, mimetype="application/json")
+                return _etag_response(response, etag)
+
+            # 뷰 실행 전 버전을 잡아 두어 실행 중 바뀐 상태는 다음 요청에서 다시 계산
+            version = cache.versions.snapshot(domains)
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            etag = cache.store(key, domains, response.get_data(), version)
+            return _etag_response(response, etag)
+        return wrapper
+    return decorator
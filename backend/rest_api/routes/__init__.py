@@ -3,4 +3,5 @@ from backend.rest_api.routes.truck_api import truck_api
 from backend.rest_api.routes.mission_api import mission_api
 from backend.rest_api.routes.facility_api import facility_api
 from backend.rest_api.routes.system_api import system_api, set_tcp_server_instance
-from backend.rest_api.routes.log_api import log_api 
\ No newline at end of file
+from backend.rest_api.routes.log_api import log_api 
+from backend.rest_api.routes.analytics_api import analytics_api
@@ -0,0 +1,59 @@
+from flask import Blueprint, jsonify, request
+from backend.analytics.mission_kpi import get_mission_kpi_tracker, DEFAULT_WINDOWS
+from backend.analytics.battery_model import get_battery_model, ChargePlanner
+from backend.rest_api.managers import get_mission_manager
+from backend.rest_api.history_args import parse_bucket_arg
+
+# 미션 KPI 분석 API 블루프린트 생성
+analytics_api = Blueprint('analytics_api', __name__)
+
+# ------------------ 미션 KPI API ----------------------------
+
+# 최근 구간 KPI 요약 (window=15m / 1h / 8h, 기본 1시간)
+@analytics_api.route("/analytics/kpi", methods=["GET"])
+def get_mission_kpi():
+    tracker = get_mission_kpi_tracker()
+    try:
+        window_seconds = parse_bucket_arg(request.args.get("window")) or 3600
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if window_seconds > tracker.max_window:
+        return jsonify({"error": f"window 는 최대 {tracker.max_window}초까지 조회할 수 있습니다"}), 400
+    return jsonify(tracker.get_summary(window_seconds))
+
+
+# 조회 가능한 기본 구간 전체 요약
+@analytics_api.route("/analytics/kpi/windows", methods=["GET"])
+def get_mission_kpi_windows():
+    tracker = get_mission_kpi_tracker()
+    return jsonify({str(window): tracker.get_summary(window) for window in DEFAULT_WINDOWS})
+
+
+# 최근 완료 미션별 단계 소요 시간
+@analytics_api.route("/analytics/missions", methods=["GET"])
+def get_recent_mission_kpi():
+    try:
+        limit = int(request.args.get("limit", 50))
+    except ValueError:
+        return jsonify({"error": "limit 은 정수여야 합니다"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit 은 1 이상이어야 합니다"}), 400
+    return jsonify(get_mission_kpi_tracker().get_recent_missions(limit))
+
+
+# ------------------ 배터리 예측 API ----------------------------
+
+# 트럭별 배터리 소모 모델 및 충전 계획
+@analytics_api.route("/analytics/battery", methods=["GET"])
+def get_battery_forecast():
+    model = get_battery_model()
+    planner = ChargePlanner(model, get_mission_kpi_tracker())
+    waiting_missions = len(get_mission_manager().get_waiting_missions())
+    return jsonify({
+        "waiting_missions": waiting_missions,
+        "phase_seconds": planner.phase_seconds(),
+        "trucks": {
+            truck_id: planner.plan(truck_id, model.last_level(truck_id), waiting_missions)
+            for truck_id in model.known_trucks()
+        }
+    })
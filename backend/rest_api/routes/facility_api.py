@@ -1,7 +1,10 @@
 from flask import Blueprint, jsonify, request
-from backend.rest_api.managers import get_facility_status_manager
+from backend.rest_api.managers import get_facility_status_manager, get_service
+from backend.rest_api.history_args import parse_history_args, bucket_response
+from backend.cache.state_versions import DOMAIN_FACILITIES
+from backend.rest_api.response_cache import cached_response
+from backend.rest_api.json_codec import dumps, json_bytes_response
 from backend.serialio.device_manager import DeviceManager
-from backend.main_controller.main_controller import MainController
 
 # 시설 관련 API 블루프린트 생성
 facility_api = Blueprint('facility_api', __name__)
@@ -13,34 +16,35 @@ belt_controller = None
 dispenser_controller = None
 
 def get_controllers():
-    """필요한 컨트롤러들을 초기화합니다."""
-    global device_manager, gate_controllers, belt_controller, dispenser_controller
+    """필요한 컨트롤러들을 초기화합니다.
     
-    # 이미 초기화됐으면 반환
-    if device_manager is not None:
-        return
+    MainController 가 레지스트리에 등록되어 있으면 그 DeviceManager 를 그대로 사용하고
+    (시리얼 포트를 두 번 열지 않음), 없을 때(app.py 단독 실행)만 가상 장치로 만든다.
+    """
+    global device_manager, gate_controllers, belt_controller, dispenser_controller
     
-    # 현재 운영 환경에 맞는 포트맵 설정
-    # 실제 배포 환경에서는 설정 파일이나 환경 변수에서 읽어오도록 수정
-    port_map = {
-        "GATE_A": "/dev/ttyUSB0",
-        "GATE_B": "/dev/ttyUSB1",
-        "BELT": "/dev/ttyUSB2",
-        "DISPENSER": "/dev/ttyUSB3"
-    }
+    shared_device_manager = get_service("device_manager")
     
-    # 상태 관리자 참조
-    facility_status_manager = get_facility_status_manager()
+    # 이미 같은 장치 관리자로 초기화됐으면 반환
+    if device_manager is not None and (shared_device_manager is None or device_manager is shared_device_manager):
+        return
     
-    # 장치 관리자 초기화 (가능하면 MainController에서 가져옴)
     try:
-        # 테스트 환경에서는 가짜 장치 사용
-        use_fake = True  # 실제 환경에서는 False로 설정
-        device_manager = DeviceManager(
-            port_map=port_map,
-            use_fake=use_fake,
-            facility_status_manager=facility_status_manager
-        )
+        if shared_device_manager is not None:
+            device_manager = shared_device_manager
+        else:
+            # 단독 실행 - 가상 장치 사용
+            port_map = {
+                "GATE_A": "/dev/ttyUSB0",
+                "GATE_B": "/dev/ttyUSB1",
+                "BELT": "/dev/ttyUSB2",
+                "DISPENSER": "/dev/ttyUSB3"
+            }
+            device_manager = DeviceManager(
+                port_map=port_map,
+                use_fake=True,
+                facility_status_manager=get_facility_status_manager()
+            )
         
         # 게이트 컨트롤러 참조
         gate_controllers = {
@@ -71,10 +75,11 @@ def get_controllers():
 
 # 전체 시설 상태 조회
 @facility_api.route("/facilities", methods=["GET"])
+@cached_response(DOMAIN_FACILITIES)
 def get_all_facilities():
     manager = get_facility_status_manager()
     facilities = manager.get_all_facilities()
-    return jsonify(facilities)
+    return json_bytes_response(dumps(facilities))
 
 # 특정 게이트 상태 조회
 @facility_api.route("/facilities/gates/<gate_id>", methods=["GET"])
@@ -127,29 +132,41 @@ def get_all_dispensers():
     dispensers = {k: v for k, v in facilities.items() if k.startswith("DISPENSER")}
     return jsonify(dispensers)
 
-# 게이트 히스토리 조회
-@facility_api.route("/facilities/gates/<gate_id>/history", methods=["GET"])
-def get_gate_history(gate_id):
+# 히스토리 조회 공통 처리 - bucket 이 있으면 구간별 상태 횟수 집계 반환
+def _facility_history(facility_type, facility_id, history_getter):
     manager = get_facility_status_manager()
-    limit = request.args.get('limit', default=100, type=int)
-    history = manager.get_gate_history(gate_id, limit)
+    try:
+        query = parse_history_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if query["bucket_seconds"]:
+        buckets = manager.get_state_buckets(
+            facility_type, facility_id, query["since"], query["until"], query["bucket_seconds"]
+        )
+        if facility_type == "gate":
+            # 게이트 개방 횟수 (시간당 사이클 등 차트용)
+            for bucket in buckets:
+                bucket["open_cycles"] = bucket["counts"].get("OPENED", 0)
+        return jsonify(bucket_response(facility_id, query["since"], query["until"], query["bucket_seconds"], buckets))
+
+    history = history_getter(facility_id, query["limit"], query["since"], query["until"])
     return jsonify(history)
 
+# 게이트 히스토리 조회 (?from=&to=&limit= 또는 ?bucket=1h)
+@facility_api.route("/facilities/gates/<gate_id>/history", methods=["GET"])
+def get_gate_history(gate_id):
+    return _facility_history("gate", gate_id, get_facility_status_manager().get_gate_history)
+
 # 벨트 히스토리 조회
 @facility_api.route("/facilities/belt/<belt_id>/history", methods=["GET"])
 def get_belt_history(belt_id):
-    manager = get_facility_status_manager()
-    limit = request.args.get('limit', default=100, type=int)
-    history = manager.get_belt_history(belt_id, limit)
-    return jsonify(history)
+    return _facility_history("belt", belt_id, get_facility_status_manager().get_belt_history)
 
 # 디스펜서 히스토리 조회
 @facility_api.route("/facilities/dispenser/<dispenser_id>/history", methods=["GET"])
 def get_dispenser_history(dispenser_id):
-    manager = get_facility_status_manager()
-    limit = request.args.get('limit', default=100, type=int)
-    history = manager.get_dispenser_history(dispenser_id, limit)
-    return jsonify(history)
+    return _facility_history("dispenser", dispenser_id, get_facility_status_manager().get_dispenser_history)
 
 # ------------------ 시설 제어 API ----------------------------
 
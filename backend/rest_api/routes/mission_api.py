@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify, request
 from backend.rest_api.managers import get_mission_manager
+from backend.cache.state_versions import DOMAIN_MISSIONS
+from backend.rest_api.response_cache import cached_response
+from backend.rest_api.json_codec import dumps, json_bytes_response, mission_record
 
 # 미션 관련 API 블루프린트 생성
 mission_api = Blueprint('mission_api', __name__)
@@ -7,14 +10,15 @@ mission_api = Blueprint('mission_api', __name__)
 # ------------------ 미션 API ----------------------------
 
 @mission_api.route("/missions", methods=["GET"])
+@cached_response(DOMAIN_MISSIONS)
 def get_all_missions():
     """전체 미션 조회"""
     manager = get_mission_manager()
-    missions = manager.get_assigned_and_waiting_missions()
-    return jsonify({
+    missions = manager.get_assigned_and_waiting_missions(serialize=mission_record)
+    return json_bytes_response(dumps({
         "success": True,
         "missions": missions
-    })
+    }))
 
 
 @mission_api.route("/missions/<mission_id>", methods=["GET"])
@@ -23,7 +27,7 @@ def get_mission(mission_id):
     manager = get_mission_manager()
     mission = manager.find_mission_by_id(mission_id)
     if mission:
-        return jsonify(mission.to_dict())
+        return jsonify(mission_record(mission))
     return jsonify({"error": "Mission not found"}), 404
 
 
@@ -3,6 +3,9 @@ from backend.tcpio.tcp_server import TCPServer
 import threading
 import time
 import traceback
+from backend.rest_api.response_cache import cached_response
+from backend.rest_api.managers import get_service
+from backend.faults.fault_injector import get_fault_injector
 
 # 블루프린트 생성
 system_api = Blueprint('system_api', __name__)
@@ -122,6 +125,7 @@ def restart_tcp_server():
     })
 
 @system_api.route('/status', methods=['GET'])
+@cached_response(ttl=1.0)  # 연결 목록은 버전 카운터가 없어 짧은 TTL 로만 캐시
 def get_system_status():
     """시스템 상태 조회
     
@@ -176,4 +180,49 @@ def get_tcp_server_status():
             "connected_clients": [f"{addr[0]}:{addr[1]}" for addr in _tcp_server_instance.clients.keys()] if hasattr(_tcp_server_instance, 'clients') else [],
             "connected_trucks": list(_tcp_server_instance.truck_sockets.keys()) if hasattr(_tcp_server_instance, 'truck_sockets') else []
         }
-    }) 
\ No newline at end of file
+    })
+
+@system_api.route('/faults', methods=['GET'])
+def get_fault_report():
+    """장애 주입 상태 / 통계 조회
+    
+    경로별 시도·정상 전달·장애 수, 손실률, 복구 시간과 게이트 강제 열림 통계를 반환합니다.
+    """
+    report = get_fault_injector().report()
+    report["gates"] = _gate_open_stats()
+    return jsonify({"success": True, "report": report})
+
+@system_api.route('/faults', methods=['PUT'])
+def configure_faults():
+    """장애 주입 설정 (기존 설정과 통계는 교체)
+    
+    예: {"tcp_out": {"drop_rate": 0.1, "latency": 0.2}, "serial": {"missing_ack_rate": 0.3}, "seed": 1}
+    """
+    config = request.get_json(silent=True)
+    if not isinstance(config, dict):
+        return jsonify({"success": False, "message": "JSON 객체로 장애 설정을 보내야 합니다."}), 400
+    try:
+        applied = get_fault_injector().configure(config)
+    except (ValueError, KeyError, TypeError) as e:
+        return jsonify({"success": False, "message": f"장애 설정 오류: {e}"}), 400
+    return jsonify({"success": True, "config": applied})
+
+@system_api.route('/faults', methods=['DELETE'])
+def clear_faults():
+    """장애 주입 해제"""
+    injector = get_fault_injector()
+    report = injector.report()
+    injector.clear()
+    return jsonify({"success": True, "report": report})
+
+def _gate_open_stats():
+    """등록된 DeviceManager 의 게이트 컨트롤러별 강제 열림 통계"""
+    device_manager = get_service("device_manager")
+    if device_manager is None:
+        return {}
+    stats = {}
+    for device_id, controller in device_manager.controllers.items():
+        open_stats = getattr(controller, "open_stats", None)
+        if isinstance(open_stats, dict):
+            stats[device_id] = dict(open_stats, forced_wait=round(open_stats["forced_wait"], 3))
+    return stats
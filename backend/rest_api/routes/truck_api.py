@@ -1,45 +1,64 @@
 from flask import Blueprint, jsonify, request
 from backend.rest_api.managers import get_truck_status_manager
+from backend.rest_api.history_args import parse_history_args, require_range, bucket_response
+from backend.cache.state_versions import DOMAIN_TRUCKS
+from backend.rest_api.response_cache import cached_response
+from backend.rest_api.json_codec import dumps, json_bytes_response
+from backend.fleet.fleet_registry import get_fleet_registry
 
 # 트럭 관련 API 블루프린트 생성
 truck_api = Blueprint('truck_api', __name__)
 
+# ------------------ 트럭 목록 API ----------------------------
+
+# 등록된 트럭 목록 (?all=1 이면 운행 중지된 트럭 포함)
+@truck_api.route("/trucks/fleet", methods=["GET"])
+def get_fleet():
+    include_inactive = request.args.get("all") in ("1", "true")
+    records = get_fleet_registry().records(active_only=not include_inactive)
+    return jsonify({"success": True, "trucks": records, "count": len(records)})
+
+# 트럭 등록 - {"truck_id": "TRUCK_04", "protocol_id": 5(선택), "name": ...}
+@truck_api.route("/trucks/fleet", methods=["POST"])
+def register_fleet_truck():
+    data = request.get_json(silent=True) or {}
+    truck_id = data.get("truck_id")
+    if not truck_id:
+        return jsonify({"success": False, "message": "truck_id 가 필요합니다"}), 400
+    try:
+        record = get_fleet_registry().register(truck_id, data.get("protocol_id"), data.get("name"))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 409
+    return jsonify({"success": True, "truck": record}), 201
+
+# 운행 목록에서 제외
+@truck_api.route("/trucks/fleet/<truck_id>", methods=["DELETE"])
+def deactivate_fleet_truck(truck_id):
+    if not get_fleet_registry().deactivate(truck_id):
+        return jsonify({"success": False, "message": f"{truck_id} 는 운행 중인 등록 트럭이 아닙니다"}), 404
+    return jsonify({"success": True, "truck_id": truck_id})
+
+
+def _fill_fleet_defaults(trucks, default):
+    """보고가 없는 등록 트럭을 기본값으로 채움 (default(truck_id) → dict)"""
+    for truck_id in get_fleet_registry().truck_ids():
+        if truck_id not in trucks:
+            trucks[truck_id] = default(truck_id)
+    return trucks
+
 # ------------------ 트럭 상태 API ----------------------------
 
 # 전체 트럭 상태 조회
 @truck_api.route("/trucks", methods=["GET"])
+@cached_response(DOMAIN_TRUCKS)
 def get_all_trucks():
     manager = get_truck_status_manager()
-    trucks = manager.get_all_trucks()
-    
-    # 기본값 설정 - 미등록 트럭 정보
-    default_trucks = {
-        "TRUCK_01": {
-            "battery": {"level": 100.0, "is_charging": False},
-            "position": {"location": "STANDBY", "status": "IDLE"},
-            "fsm_state": "IDLE"
-        },
-        "TRUCK_02": {
-            "battery": {"level": 0.0, "is_charging": False},
-            "position": {"location": "UNKNOWN", "status": "IDLE"},
-            "fsm_state": "IDLE"
-        },
-        "TRUCK_03": {
-            "battery": {"level": 0.0, "is_charging": False},
-            "position": {"location": "UNKNOWN", "status": "IDLE"},
-            "fsm_state": "IDLE"
-        }
-    }
-    
-    # 트럭 데이터가 없는 경우 기본 상태 반환
-    if not trucks:
-        trucks = default_trucks
-    else:
-        # TRUCK_02, TRUCK_03이 없을 경우 추가
-        if "TRUCK_02" not in trucks:
-            trucks["TRUCK_02"] = default_trucks["TRUCK_02"]
-        if "TRUCK_03" not in trucks:
-            trucks["TRUCK_03"] = default_trucks["TRUCK_03"]
+    # 상태 보고가 없는 등록 트럭은 기본 상태로 표시
+    trucks = _fill_fleet_defaults(manager.get_all_trucks() or {}, lambda truck_id: {
+        "battery": {"level": 0.0, "is_charging": False},
+        "position": {"location": "UNKNOWN", "status": "IDLE"},
+        "fsm_state": "IDLE"
+    })
     
     # 응답 형식 통일 - position 객체에는 항상 location과 status 키가 있어야 함
     for truck_id, truck_data in trucks.items():
@@ -49,7 +68,7 @@ def get_all_trucks():
         if "run_state" in position:
             position["status"] = position.pop("run_state")
     
-    return jsonify(trucks)
+    return json_bytes_response(dumps(trucks))
 
 # 특정 트럭 상태 조회
 @truck_api.route("/trucks/<truck_id>", methods=["GET"])
@@ -73,32 +92,13 @@ def get_truck(truck_id):
 
 # 모든 트럭의 위치 조회
 @truck_api.route("/trucks/positions", methods=["GET"])
+@cached_response(DOMAIN_TRUCKS)
 def get_all_truck_positions():
     manager = get_truck_status_manager()
-    trucks = manager.get_all_trucks()
-    
-    # 기본값 설정 - 미등록 트럭 정보
-    default_trucks = {
-        "TRUCK_01": {
-            "position": {"location": "STANDBY", "status": "IDLE"}
-        },
-        "TRUCK_02": {
-            "position": {"location": "UNKNOWN", "status": "IDLE"}
-        },
-        "TRUCK_03": {
-            "position": {"location": "UNKNOWN", "status": "IDLE"}
-        }
-    }
-    
-    # 트럭 데이터가 없는 경우 기본 상태 반환
-    if not trucks:
-        trucks = default_trucks
-    else:
-        # TRUCK_02, TRUCK_03이 없을 경우 추가
-        if "TRUCK_02" not in trucks:
-            trucks["TRUCK_02"] = default_trucks["TRUCK_02"]
-        if "TRUCK_03" not in trucks:
-            trucks["TRUCK_03"] = default_trucks["TRUCK_03"]
+    # 상태 보고가 없는 등록 트럭은 위치 미확인으로 표시
+    trucks = _fill_fleet_defaults(manager.get_all_trucks() or {}, lambda truck_id: {
+        "position": {"location": "UNKNOWN", "status": "IDLE"}
+    })
     
     # 응답 형식 통일
     for truck_id, truck_data in trucks.items():
@@ -138,26 +138,11 @@ def get_truck_position(truck_id):
 
 # 모든 트럭의 배터리 상태 조회
 @truck_api.route("/trucks/batteries", methods=["GET"])
+@cached_response(DOMAIN_TRUCKS)
 def get_all_truck_batteries():
     manager = get_truck_status_manager()
-    trucks = manager.get_all_trucks()
-    
-    # 기본값 설정 - 미등록 트럭은 빈 데이터로 표시
-    default_trucks = {
-        "TRUCK_01": {"battery": {"level": 100.0, "is_charging": False}},
-        "TRUCK_02": {"battery": {}},  # 빈 객체로 반환 (GUI에서 처리)
-        "TRUCK_03": {"battery": {}}   # 빈 객체로 반환 (GUI에서 처리)
-    }
-    
-    # 트럭 데이터가 없는 경우 기본 상태 반환
-    if not trucks:
-        trucks = default_trucks
-    else:
-        # TRUCK_02, TRUCK_03이 없을 경우 빈 배터리 객체 추가
-        if "TRUCK_02" not in trucks:
-            trucks["TRUCK_02"] = {"battery": {}}
-        if "TRUCK_03" not in trucks:
-            trucks["TRUCK_03"] = {"battery": {}}
+    # 상태 보고가 없는 등록 트럭은 빈 배터리 객체로 표시 (GUI에서 처리)
+    trucks = _fill_fleet_defaults(manager.get_all_trucks() or {}, lambda truck_id: {"battery": {}})
     
     response_data = {
         truck_id: truck["battery"]
@@ -176,7 +161,7 @@ def get_truck_battery(truck_id):
     
     # 트럭 데이터가 없거나 배터리 정보가 없는 경우 기본 상태 반환
     if not truck or "battery" not in truck:
-        if truck_id == "TRUCK_01":  # TRUCK_01은 기본값이 다름
+        if truck_id in get_fleet_registry():  # 등록된 트럭은 완충 상태로 시작
             default_battery["level"] = 100.0
         return jsonify(default_battery)
     
@@ -200,6 +185,68 @@ def update_truck_battery(truck_id):
         print(f"[ERROR] 배터리 업데이트 실패: {e}")
         return jsonify({"error": str(e)}), 500
 
+# ------------------ 트럭 히스토리 API ----------------------------
+
+# 배터리 히스토리 (?from=&to=&limit= 또는 ?bucket=15m 으로 구간별 min/avg/max)
+@truck_api.route("/trucks/<truck_id>/battery/history", methods=["GET"])
+def get_truck_battery_history(truck_id):
+    manager = get_truck_status_manager()
+    try:
+        query = parse_history_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if query["bucket_seconds"]:
+        buckets = manager.get_battery_buckets(truck_id, query["since"], query["until"], query["bucket_seconds"])
+        return jsonify(bucket_response(truck_id, query["since"], query["until"], query["bucket_seconds"], buckets))
+
+    history = manager.get_battery_history(truck_id, query["limit"], query["since"], query["until"])
+    return jsonify(history)
+
+# 위치 히스토리 (?from=&to=&limit=)
+@truck_api.route("/trucks/<truck_id>/position/history", methods=["GET"])
+def get_truck_position_history(truck_id):
+    manager = get_truck_status_manager()
+    try:
+        query = parse_history_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    history = manager.get_position_history(truck_id, query["limit"], query["since"], query["until"])
+    return jsonify(history)
+
+# 주행 상태별 체류 시간 (?from=&to=, 기본 최근 24시간)
+@truck_api.route("/trucks/<truck_id>/time_in_state", methods=["GET"])
+def get_truck_time_in_state(truck_id):
+    manager = get_truck_status_manager()
+    try:
+        since, until = require_range(parse_history_args(request.args))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "id": truck_id,
+        "from": int(since.timestamp()),
+        "to": int(until.timestamp()),
+        "seconds": manager.get_time_in_state(truck_id, since, until)
+    })
+
+# 미션별 배터리 소모율 (?from=&to=, 기본 최근 24시간)
+@truck_api.route("/trucks/<truck_id>/battery/drain", methods=["GET"])
+def get_truck_battery_drain(truck_id):
+    manager = get_truck_status_manager()
+    try:
+        since, until = require_range(parse_history_args(request.args))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "id": truck_id,
+        "from": int(since.timestamp()),
+        "to": int(until.timestamp()),
+        "missions": manager.get_battery_drain_by_mission(truck_id, since, until)
+    })
+
 # 하위 호환성을 위한 이전 엔드포인트 (리디렉션)
 @truck_api.route("/truck_position", methods=["GET"])
 def legacy_get_truck_position():
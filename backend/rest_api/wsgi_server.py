@@ -0,0 +1,87 @@
+# backend/rest_api/wsgi_server.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+try:
+    import waitress
+except ImportError:  # 선택 의존성 - 없으면 내장 스레드 풀 서버 사용
+    waitress = None
+
+SERVER_WAITRESS = "waitress"
+SERVER_POOLED = "pooled"
+SERVER_DEV = "dev"
+
+
+class _PooledRequestHandler(WSGIRequestHandler):
+    # 요청마다 연결을 닫음 - keep-alive 연결이 작업 스레드를 계속 붙잡지 않도록
+    # (클래스에 직접 지정해 두면 multithread 서버라도 werkzeug 가 HTTP/1.1 로 바꾸지 않음)
+    protocol_version = "HTTP/1.0"
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    고정 크기 스레드 풀 WSGI 서버 (werkzeug 기반)
+
+    werkzeug 의 threaded 모드는 요청마다 스레드를 새로 만들어 대시보드 폭주 시 스레드가 무한히 늘어난다.
+    여기서는 threads 개의 작업 스레드만 요청을 처리하고 나머지는 소켓 backlog 에서 대기하므로
+    같은 프로세스의 TCP 트럭 메시지 처리 스레드가 GIL 을 얻을 기회가 보장된다.
+    """
+
+    # 요청은 작업 스레드 풀에서 동시에 처리됨 (environ["wsgi.multithread"])
+    multithread = True
+
+    def __init__(self, host, port, app, threads=8, backlog=64):
+        self.request_queue_size = backlog
+        super().__init__(host, port, app, handler=_PooledRequestHandler)
+        self.threads = threads
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="rest-api")
+        # 작업 스레드 수만큼만 요청을 받아들임 (나머지는 커널 backlog 에 남김)
+        self._slots = threading.BoundedSemaphore(threads)
+
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+def serve(app, host="0.0.0.0", port=5001, server=SERVER_WAITRESS, threads=8, backlog=64):
+    """
+    REST API 서버 실행 (블로킹)
+
+    - waitress: 운영용 멀티스레드 WSGI 서버 (설치된 경우)
+    - pooled: 내장 고정 스레드 풀 서버 (waitress 가 없을 때 대체)
+    - dev: Flask 개발 서버
+    모두 같은 프로세스의 스레드에서 실행되므로 MainController 가 가진 매니저 객체를 그대로 공유한다.
+    """
+    if server == SERVER_WAITRESS and waitress is None:
+        print("[⚠️ waitress 없음] 내장 스레드 풀 서버로 실행합니다 (pip install waitress 권장)")
+        server = SERVER_POOLED
+
+    print(f"[🌐 REST API 서버] {server} 모드, {host}:{port}, 작업 스레드 {threads}개")
+    if server == SERVER_WAITRESS:
+        waitress.serve(app, host=host, port=port, threads=threads, backlog=backlog, ident="dust-api")
+    elif server == SERVER_POOLED:
+        httpd = PooledWSGIServer(host, port, app, threads=threads, backlog=backlog)
+        try:
+            httpd.serve_forever()
+        finally:
+            httpd.server_close()
+    elif server == SERVER_DEV:
+        app.run(host=host, port=port, debug=False, use_reloader=False, threaded=True)
+    else:
+        raise ValueError(f"알 수 없는 REST 서버 모드: {server}")
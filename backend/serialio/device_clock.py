@@ -0,0 +1,84 @@
+# backend/serialio/device_clock.py
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class RealClock:
+    """실제 시간 - 지연 응답은 타이머 스레드로 처리"""
+
+    virtual = False
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def call_later(self, delay, callback, *args):
+        timer = threading.Timer(max(0.0, delay), callback, args=args)
+        timer.daemon = True  # 메인 스레드 종료 시 자동 종료
+        timer.start()
+        return timer
+
+
+class VirtualClock:
+    """
+    가상 시간 - sleep / advance 로만 시간이 흐른다
+
+    call_later 로 예약한 콜백은 시간이 그 시각을 지날 때 호출한 스레드에서 순서대로 실행된다.
+    가상 장치와 SerialInterface 가 같은 시계를 쓰면 응답 대기(read_response)가 sleep 으로
+    시간을 앞당기면서 장치 응답을 받게 되어, 수십 초짜리 장치 동작도 테스트에서는 즉시 끝난다.
+    """
+
+    virtual = True
+
+    def __init__(self, start=0.0):
+        self._now = start
+        self._heap = []   # (실행 시각, 순번, callback, args)
+        self._order = itertools.count()
+        self.lock = threading.RLock()
+
+    def now(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def call_later(self, delay, callback, *args):
+        with self.lock:
+            heapq.heappush(self._heap, (self._now + max(0.0, delay), next(self._order), callback, args))
+
+    def advance(self, seconds):
+        """seconds 만큼 시간을 진행하며 그 사이 예약된 콜백 실행 - 실행한 콜백 수 반환"""
+        target = self._now + max(0.0, seconds)
+        fired = 0
+        while True:
+            with self.lock:
+                if not self._heap or self._heap[0][0] > target:
+                    self._now = target
+                    return fired
+                when, _, callback, args = heapq.heappop(self._heap)
+                self._now = max(self._now, when)
+            callback(*args)
+            fired += 1
+
+    def run_until_idle(self, limit=3600.0):
+        """예약된 콜백이 없을 때까지 (최대 limit 초) 진행"""
+        deadline = self._now + limit
+        fired = 0
+        while True:
+            with self.lock:
+                if not self._heap or self._heap[0][0] > deadline:
+                    return fired
+                next_time = self._heap[0][0]
+            fired += self.advance(next_time - self._now)
+
+    def pending(self):
+        with self.lock:
+            return len(self._heap)
+
+
+REAL_CLOCK = RealClock()
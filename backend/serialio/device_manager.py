@@ -4,10 +4,12 @@ from .belt_controller import BeltController
 from .gate_controller import GateController
 from .dispenser_controller import DispenserController
 from .serial_interface import SerialInterface
+from .device_models import build_device_models
 from typing import Dict, Type, Any, Optional, List
 import serial
 import time
 import importlib
+from concurrent.futures import ThreadPoolExecutor
 
 # FakeSerial 클래스 임포트
 try:
@@ -32,13 +34,18 @@ except ImportError:
 
 
 class DeviceManager:
-    def __init__(self, port_map: dict, use_fake=False, fake_devices=None, debug=False, facility_status_manager=None):
+    def __init__(self, port_map: dict, use_fake=False, fake_devices=None, debug=False, facility_status_manager=None,
+                 device_clock=None, device_models=None):
         self.controllers = {}
         self.interfaces = {}
         self.use_fake = use_fake
         self.fake_devices = fake_devices or []
         self.debug = debug
         self.facility_status_manager = facility_status_manager
+        # 가상 장치 설정 - device_clock: 공용 시계 (VirtualClock 이면 가상 시간)
+        # device_models: 장치 모델 설정 dict (None 이면 FakeSerial 기본 모델)
+        self.device_clock = device_clock
+        self.device_models = device_models
         
         if use_fake and not fake_devices:
             print(f"[DeviceManager] 시리얼 관리자 초기화 - 모든 장치 가상 모드")
@@ -62,11 +69,12 @@ class DeviceManager:
             if len(devices) > 1:
                 print(f"[DeviceManager ⚠️] 포트 {port}에 여러 장치가 매핑됨: {devices}")
                 
+        # 서로 다른 포트는 동시에 연다 (실제 장치는 포트마다 여는 시간이 걸림)
+        self.open_ports(port_map)
+
         # 모든 장치 컨트롤러 생성
         for device_id, port in port_map.items():
-            device_use_fake = use_fake
-            if fake_devices:
-                device_use_fake = device_id in fake_devices
+            device_use_fake = self._uses_fake(device_id)
             
             controller = self.create_controller(device_id, port, device_use_fake)
             if controller:
@@ -75,6 +83,26 @@ class DeviceManager:
         
         print(f"[DeviceManager] 등록된 컨트롤러: {list(self.controllers.keys())}")
 
+    def _uses_fake(self, device_id):
+        if self.fake_devices:
+            return device_id in self.fake_devices
+        return self.use_fake
+
+    # 포트 병렬 열기
+    def open_ports(self, port_map: dict):
+        """port_map 의 포트 인터페이스를 스레드로 동시에 생성 (하나라도 실패하면 그 예외를 그대로 올림)"""
+        targets = sorted({(port, self._uses_fake(device_id)) for device_id, port in port_map.items()})
+        if len(targets) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="serial-open") as pool:
+            list(pool.map(lambda target: self.get_or_create_interface(*target), targets))
+
+    # 시설 상태 매니저 연결 (런처가 장치를 먼저 연 뒤 나중에 설정)
+    def set_facility_status_manager(self, facility_status_manager):
+        self.facility_status_manager = facility_status_manager
+        for controller in self.controllers.values():
+            controller.facility_status_manager = facility_status_manager
+
     # 시리얼 인터페이스 생성 또는 재사용
     def get_or_create_interface(self, port: str, use_fake=False):
         key = f"{port}_{use_fake}"
@@ -84,7 +112,10 @@ class DeviceManager:
             return self.interfaces[key]
         
         # 새 인터페이스 생성 (디버그 모드 전달)
-        interface = SerialInterface(port, use_fake=use_fake, debug=self.debug)
+        models = None
+        if use_fake and self.device_models is not None:
+            models = build_device_models(self.device_models)
+        interface = SerialInterface(port, use_fake=use_fake, debug=self.debug, clock=self.device_clock, models=models)
         self.interfaces[key] = interface
         print(f"[DeviceManager] 새 인터페이스 생성: {port} ({'가상' if use_fake else '실제'} 모드)")
         return interface
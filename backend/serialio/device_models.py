@@ -0,0 +1,274 @@
+# backend/serialio/device_models.py
+
+import math
+import random
+import re
+
+
+# -------------------------------- 지연 시간 분포 --------------------------------
+
+def _seconds(value, name):
+    """지연 시간 설정값 검증 - 0 이상의 유한한 초"""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"지연 시간 {name} 은 숫자여야 합니다: {value!r}")
+    if not math.isfinite(seconds) or seconds < 0:
+        raise ValueError(f"지연 시간 {name} 은 0 이상의 유한한 값이어야 합니다: {value!r}")
+    return seconds
+
+
+class FixedLatency:
+    def __init__(self, value):
+        self.value = _seconds(value, "value")
+
+    def sample(self, rng):
+        return self.value
+
+    def __repr__(self):
+        return f"FixedLatency({self.value})"
+
+
+class UniformLatency:
+    def __init__(self, low, high):
+        self.low = _seconds(low, "low")
+        self.high = _seconds(high, "high")
+        if self.low > self.high:
+            raise ValueError(f"지연 시간 low({self.low}) 가 high({self.high}) 보다 큽니다")
+
+    def sample(self, rng):
+        return rng.uniform(self.low, self.high)
+
+    def __repr__(self):
+        return f"UniformLatency({self.low}, {self.high})"
+
+
+class NormalLatency:
+    """정규 분포 (minimum 아래로는 자름)"""
+
+    def __init__(self, mean, stddev, minimum=0.0):
+        self.mean = _seconds(mean, "mean")
+        self.stddev = _seconds(stddev, "stddev")
+        self.minimum = _seconds(minimum, "minimum")
+
+    def sample(self, rng):
+        return max(self.minimum, rng.gauss(self.mean, self.stddev))
+
+    def __repr__(self):
+        return f"NormalLatency({self.mean}, {self.stddev})"
+
+
+LATENCY_TYPES = {
+    "fixed": lambda spec: FixedLatency(spec["value"]),
+    "uniform": lambda spec: UniformLatency(spec["low"], spec["high"]),
+    "normal": lambda spec: NormalLatency(spec["mean"], spec["stddev"], spec.get("minimum", 0.0)),
+}
+
+
+def make_latency(spec):
+    """
+    지연 시간 설정 → 분포 객체
+    - 숫자: 고정 지연
+    - dict: {"dist": "uniform", "low": 0.3, "high": 0.8} / {"dist": "normal", "mean": 3.0, "stddev": 0.5}
+    음수 / 무한대 / NaN / low > high 는 ValueError
+    """
+    if hasattr(spec, "sample"):
+        return spec
+    if isinstance(spec, (int, float)):
+        return FixedLatency(spec)
+    if isinstance(spec, dict):
+        dist = spec.get("dist", "fixed")
+        if dist not in LATENCY_TYPES:
+            raise ValueError(f"알 수 없는 지연 분포: {dist}")
+        try:
+            return LATENCY_TYPES[dist](spec)
+        except KeyError as e:
+            raise ValueError(f"지연 분포 {dist} 설정에 {e.args[0]} 값이 없습니다")
+    raise ValueError(f"지연 시간 설정 오류: {spec!r}")
+
+
+# -------------------------------- 장치 모델 --------------------------------
+
+class DeviceModel:
+    """
+    가상 장치 모델 기본 클래스
+
+    FakeSerial 이 받은 명령 한 줄을 handles() 로 확인한 뒤 handle() 에 넘긴다.
+    응답은 respond(지연, 줄) 로 FakeSerial 의 시계에 예약하고, failure_rate 확률로 명령을 무시한다 (ACK 없음).
+    """
+
+    name = "DEVICE"
+
+    def __init__(self, failure_rate=0.0, rng=None):
+        self.failure_rate = failure_rate
+        self.rng = rng or random.Random()
+        self.serial = None
+        self.commands = 0
+        self.failures = 0
+
+    def attach(self, serial):
+        self.serial = serial
+
+    def handles(self, command):
+        raise NotImplementedError("자식 클래스에서 구현해야 합니다")
+
+    def handle(self, command):
+        """명령 처리 - 장애가 나면 응답 없이 무시"""
+        self.commands += 1
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            self.failures += 1
+            print(f"[FakeSerial:{self.serial.name}] {self.name} 모델 장애 - '{command}' 응답 없음")
+            return
+        self.execute(command)
+
+    def execute(self, command):
+        raise NotImplementedError("자식 클래스에서 구현해야 합니다")
+
+    def respond(self, delay, line):
+        """delay 초 뒤 응답 한 줄 (0 이하면 즉시)"""
+        if delay <= 0:
+            self.serial._enqueue_response(line)
+        else:
+            self.serial.clock.call_later(delay, self.serial._enqueue_response, line)
+
+    def sample(self, latency):
+        return latency.sample(self.rng)
+
+
+class GateModel(DeviceModel):
+    """게이트 - 열림 / 닫힘에 actuation 시간이 걸리고 ACK 뒤 상태 메시지를 보냄"""
+
+    name = "GATE"
+    COMMAND = re.compile(r'(GATE_[ABC])_(\w+)', re.IGNORECASE)
+
+    def __init__(self, open_time=0.5, close_time=0.5, status_delay=0.1, failure_rate=0.0, rng=None):
+        super().__init__(failure_rate, rng)
+        self.open_time = make_latency(open_time)
+        self.close_time = make_latency(close_time)
+        self.status_delay = make_latency(status_delay)
+        self.states = {}  # gate_id → OPENED / CLOSED
+
+    def handles(self, command):
+        return bool(self.COMMAND.match(command)) or command in ("OPEN", "CLOSE")
+
+    def execute(self, command):
+        match = self.COMMAND.match(command)
+        if match:
+            gate_id, action = match.group(1).upper(), match.group(2).upper()
+            ack = f"ACK:{gate_id}_{'OPENED' if action == 'OPEN' else 'CLOSED'}"
+        else:
+            # 게이트 ID 없는 OPEN / CLOSE 는 포트 이름으로 게이트 결정
+            gate_id, action = self.serial._extract_gate_id_from_name(), command
+            ack = f"ACK:{gate_id}_{action}:SUCCESS"
+        if action not in ("OPEN", "CLOSE"):
+            return
+
+        delay = self.sample(self.open_time if action == "OPEN" else self.close_time)
+        state = "OPENED" if action == "OPEN" else "CLOSED"
+        self.serial.clock.call_later(delay, self.states.__setitem__, gate_id, state)
+        self.respond(delay, ack)
+        self.respond(delay + self.sample(self.status_delay), f"STATUS:{gate_id}:{state}")
+
+
+class BeltModel(DeviceModel):
+    """벨트 - RUN 은 즉시 ACK, 잠시 뒤 RUNNING, run_time 뒤 STOPPED"""
+
+    name = "BELT"
+
+    def __init__(self, start_delay=0.1, run_time=20.0, failure_rate=0.0, rng=None):
+        super().__init__(failure_rate, rng)
+        self.start_delay = make_latency(start_delay)
+        self.run_time = make_latency(run_time)
+        self.state = "STOPPED"
+
+    def handles(self, command):
+        return command in ("BELT_RUN", "BELT_STOP", "BELTOFF", "BELT_EMRSTOP", "EMRSTOP")
+
+    def execute(self, command):
+        if command == "BELT_RUN":
+            self.respond(0, "ACK:BELT_RUN:SUCCESS")
+            start = self.sample(self.start_delay)
+            self.respond(start, "STATUS:BELT:RUNNING")
+            self.respond(start + self.sample(self.run_time), "STATUS:BELT:STOPPED")
+            self.state = "RUNNING"
+        elif command in ("BELT_STOP", "BELTOFF"):
+            self.respond(0, "ACK:BELT_STOP:SUCCESS")
+            self.state = "STOPPED"
+        else:
+            self.respond(0, "ACK:BELT_EMRSTOP:SUCCESS")
+            self.state = "EMERGENCY_STOP"
+
+
+class DispenserModel(DeviceModel):
+    """
+    디스펜서 - DI_OPEN 후 open_time 뒤 ACK, loaded_times 의 각 시각에 LOADED 상태 보고
+    (실제 장치처럼 LOADED 를 여러 번 보내는 경우를 표현 - 기본값은 기존 가상 장치와 같음)
+    """
+
+    name = "DISPENSER"
+    COMMAND = re.compile(r'DISPENSER_(DI_\w+)', re.IGNORECASE)
+
+    def __init__(self, open_time=0.0, close_time=0.0, move_time=0.0, loaded_times=(0.0, 0.0, 0.0, 0.0, 1.0, 2.0),
+                 failure_rate=0.0, rng=None, on_open=None):
+        super().__init__(failure_rate, rng)
+        self.open_time = make_latency(open_time)
+        self.close_time = make_latency(close_time)
+        self.move_time = make_latency(move_time)
+        self.loaded_times = [make_latency(t) for t in loaded_times]
+        self.on_open = on_open  # on_open(model) - 열림 명령 후 호출
+        self.state = "CLOSED"
+        self.position = "ROUTE_A"
+
+    def handles(self, command):
+        return bool(self.COMMAND.match(command)) or "DI_" in command
+
+    def execute(self, command):
+        match = self.COMMAND.match(command)
+        command = match.group(1) if match else command
+
+        if "DI_OPEN" in command:
+            self.state = "OPENED"
+            opened = self.sample(self.open_time)
+            self.respond(opened, "ACK:DI_OPENED:OK")
+            for latency in self.loaded_times:
+                self.respond(opened + self.sample(latency), "STATUS:DISPENSER:LOADED")
+            if self.on_open:
+                self.on_open(self)
+        elif "DI_CLOSE" in command:
+            self.state = "CLOSED"
+            self.respond(self.sample(self.close_time), "ACK:DI_CLOSED:OK")
+        elif "DI_LEFT_TURN" in command:
+            self.respond(0, "ACK:DI_LEFT_TURN:OK")
+        elif "DI_RIGHT_TURN" in command:
+            self.respond(0, "ACK:DI_RIGHT_TURN:OK")
+        elif "DI_STOP_TURN" in command:
+            self.respond(0, "ACK:DI_STOP_TURN:OK")
+        elif "DI_LOC_ROUTE_A" in command:
+            self.position = "ROUTE_A"
+            self.respond(self.sample(self.move_time), "ACK:DI_LOC_A:OK")
+        elif "DI_LOC_ROUTE_B" in command:
+            self.position = "ROUTE_B"
+            self.respond(self.sample(self.move_time), "ACK:DI_LOC_B:OK")
+
+
+MODEL_TYPES = {
+    "dispenser": DispenserModel,
+    "gate": GateModel,
+    "belt": BeltModel,
+}
+
+
+def build_device_models(config, seed=None):
+    """
+    설정 dict → 모델 목록 (디스펜서 → 게이트 → 벨트 순서로 명령 확인)
+    예: {"gate": {"open_time": {"dist": "normal", "mean": 3.0, "stddev": 0.5}, "failure_rate": 0.05},
+         "belt": {"run_time": 20}}
+    설정에 없는 장치는 모델을 만들지 않음 (그 장치 명령에는 응답 없음), "seed" 키로 난수 고정
+    """
+    rng = random.Random(config.get("seed", seed))
+    models = []
+    for key, model_type in MODEL_TYPES.items():
+        if key in config:
+            options = dict(config[key] or {})
+            models.append(model_type(rng=random.Random(rng.random()), **options))
+    return models
@@ -1,6 +1,5 @@
 # backend/serialio/gate_controller.py
 
-import time
 from .serial_controller import SerialController
 
 class GateController(SerialController):
@@ -13,6 +12,8 @@ class GateController(SerialController):
         self.operations_in_progress = {}
         self.current_gate_id = None  # 현재 작업 중인 게이트 ID
         self.facility_status_manager = facility_status_manager
+        # 열림 통계 - 응답 없이 강제 열림으로 처리한 횟수와 그 전까지 응답을 기다린 시간
+        self.open_stats = {"opens": 0, "forced_opens": 0, "forced_wait": 0.0}
         
     # ----------------------- 명령 전송 -----------------------
     
@@ -150,6 +151,8 @@ class GateController(SerialController):
         self.current_gate_id = gate_id
         
         # 명령 전송 - 표준화된 프로토콜 사용
+        self.open_stats["opens"] += 1
+        started = self.interface.clock.now()
         self.interface.send_command(gate_id, "OPEN")
         
         # 응답 대기
@@ -176,6 +179,8 @@ class GateController(SerialController):
                 print(f"[강제 상태 변경] {gate_id} - 응답 실패로 강제로 OPENED 상태로 설정")
                 self._update_gate_status(gate_id, "OPENED", "FORCED_OPEN")
                 success = True
+                self.open_stats["forced_opens"] += 1
+                self.open_stats["forced_wait"] += self.interface.clock.now() - started
                 
                 # facility_status_manager 실패 상태 업데이트
                 if self.facility_status_manager:
@@ -240,7 +245,7 @@ class GateController(SerialController):
                 if not response:
                     print(f"[게이트 닫힘 응답 없음] {gate_id} - 재시도...")
                     # 약간의 지연 후 재시도
-                    time.sleep(1.0)
+                    self.interface.sleep(1.0)
                     self.interface.send_command(gate_id, "CLOSE")
                     response = self.interface.read_response(timeout=timeout)
                     success = self._is_success_response(response, gate_id, "CLOSE")
@@ -261,7 +266,7 @@ class GateController(SerialController):
                             # 실패시 세 번째 시도
                             if not response:
                                 print(f"[게이트 닫힘 응답 없음] {gate_id} - 마지막 시도...")
-                                time.sleep(2.0)  # 더 긴 지연
+                                self.interface.sleep(2.0)  # 더 긴 지연
                                 self.interface.send_command(gate_id, "CLOSE")
                                 response = self.interface.read_response(timeout=timeout)
                                 success = self._is_success_response(response, gate_id, "CLOSE")
@@ -1,14 +1,19 @@
 # backend/serialio/serial_interface.py
 
 import serial
-import time
 from backend.serialio.fake_serial import FakeSerial
+from backend.serialio.device_clock import REAL_CLOCK
+from backend.faults.fault_injector import get_fault_injector
+from backend.capture.traffic_recorder import get_traffic_recorder, serial_stream, KIND_SERIAL_IN, KIND_SERIAL_OUT
 
 class SerialInterface:
-    def __init__(self, port="/dev/ttyUSB0", baudrate=9600, use_fake=False, debug=False):
+    def __init__(self, port="/dev/ttyUSB0", baudrate=9600, use_fake=False, debug=False, clock=None, models=None):
         self.debug = debug
+        self.port = port
+        # 응답 대기 / 재시도 대기에 쓰는 시계 (가상 장치와 같은 VirtualClock 을 주면 가상 시간으로 동작)
+        self.clock = clock or REAL_CLOCK
         if use_fake:
-            self.ser = FakeSerial(name=port, debug=debug)
+            self.ser = FakeSerial(name=port, debug=debug, clock=self.clock, models=models)
         else:
             self.ser = serial.Serial(port, baudrate, timeout=1)
 
@@ -18,11 +23,13 @@ class SerialInterface:
     def send_command(self, target: str, action: str):
         command = self.build_command(target, action)
         print(f"[Serial Send] {command.strip()}")
+        self._record(KIND_SERIAL_OUT, command.strip())
         self.ser.write(command.encode())
 
     # 단순 텍스트 명령 전송
     def write(self, msg: str):
         try:
+            self._record(KIND_SERIAL_OUT, msg)
             self.ser.write((msg + '\n').encode())
         except Exception as e:
             print(f"[SerialInterface 오류] write 실패: {e}")
@@ -278,15 +285,15 @@ class SerialInterface:
 
     # 응답 수신
     def read_response(self, timeout=5):
-        start_time = time.time()
+        start_time = self.clock.now()
         wait_count = 0
         
         print(f"[SerialInterface] 응답 대기 시작 (최대 {timeout}초)")
         
-        while time.time() - start_time < timeout:
+        while self.clock.now() - start_time < timeout:
             # 주기적으로 대기 중임을 표시
             if wait_count % 20 == 0:  # 2초마다 로그
-                print(f"[SerialInterface] 응답 대기 중... (경과: {time.time() - start_time:.1f}초)")
+                print(f"[SerialInterface] 응답 대기 중... (경과: {self.clock.now() - start_time:.1f}초)")
             wait_count += 1
             
             if self.ser.in_waiting:
@@ -294,8 +301,14 @@ class SerialInterface:
                     # 반복문으로 여러 줄이 왔을 때 처리 가능하도록
                     line = self.ser.readline().decode().strip()
                     if not line:
-                        time.sleep(0.1)
+                        self.clock.sleep(0.1)
                         continue
+                    injector = get_fault_injector()
+                    if injector.active:
+                        line = injector.serial_in(self.port, line, self.clock)
+                        if line is None:
+                            continue
+                    self._record(KIND_SERIAL_IN, line)
                     
                     # 추가 응답이 있는지 확인하고 긴급 처리 (LOADED 메시지)
                     if hasattr(self.ser, 'buffer'):
@@ -343,10 +356,10 @@ class SerialInterface:
                     
                 except Exception as e:
                     print(f"[SerialInterface 오류] 응답 읽기 실패: {e}")
-                    time.sleep(0.1)
+                    self.clock.sleep(0.1)
                     continue
                     
-            time.sleep(0.1)
+            self.clock.sleep(0.1)
             
         print(f"[SerialInterface ⚠️] 응답 시간 초과 ({timeout}초)")
         return None
@@ -354,9 +367,9 @@ class SerialInterface:
     # 응답 확인만 하고 삭제하지 않음
     def peek_response(self, timeout=0.1):
         """응답 데이터가 있는지 확인하고 있으면 읽어오되, 큐에서 제거하지 않음"""
-        start_time = time.time()
+        start_time = self.clock.now()
         
-        while time.time() - start_time < timeout:
+        while self.clock.now() - start_time < timeout:
             if self.ser.in_waiting:
                 try:
                     line = self.ser.readline().decode().strip()
@@ -375,10 +388,20 @@ class SerialInterface:
                 except Exception as e:
                     print(f"[SerialInterface 오류] peek_response 실패: {e}")
                     
-            time.sleep(0.01)
+            self.clock.sleep(0.01)
             
         return None
 
+    # 재시도 간격 대기 (장치 시계 기준)
+    def sleep(self, seconds):
+        self.clock.sleep(seconds)
+
+    # 통신 녹화 (녹화기가 설치된 경우만)
+    def _record(self, kind, line):
+        recorder = get_traffic_recorder()
+        if recorder is not None:
+            recorder.record(kind, serial_stream(self.port), line)
+
     # 시리얼 연결 종료
     def close(self):
         if self.ser:
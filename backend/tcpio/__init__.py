@@ -1,4 +1,25 @@
 # tcpio package
+# (이름을 처음 사용할 때 import - listener 만 쓰는 런처가 TCPServer → MainController 를 읽지 않도록)
 
-from .truck_command_sender import TruckCommandSender
-from .tcp_server import TCPServer
+import importlib
+
+_EXPORTS = {
+    "ConnectionRegistry": ".connection_registry",
+    "Connection": ".connection_registry",
+    "LivenessMonitor": ".liveness_monitor",
+    "RetransmitQueue": ".retransmit_queue",
+    "TruckCommandSender": ".truck_command_sender",
+    "TCPServer": ".tcp_server",
+    "open_listener": ".listener",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,7 +1,9 @@
 # backend/tcpio/clinet.py
 
+import itertools
 import socket
 from .protocol import TCPProtocol
+from .connection_registry import SeqWindow
 
 class TCPClient:
     def __init__(self, host="127.0.0.1", port=8000):
@@ -10,6 +12,9 @@ class TCPClient:
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.sock.settimeout(5)
         self.connected = False
+        self.version = TCPProtocol.PROTOCOL_V1  # negotiate() 로 v2 협상
+        self.received = SeqWindow()
+        self._seq = itertools.count(1)
 
     def connect(self):
         if self.connected:
@@ -20,6 +25,8 @@ class TCPClient:
             self.sock.settimeout(5)
             self.sock.connect((self.host, self.port))
             self.connected = True
+            self.version = TCPProtocol.PROTOCOL_V1
+            self.received = SeqWindow()
             print(f"[TCP 연결] {self.host}:{self.port}")
             return True
         except Exception as e:
@@ -27,12 +34,28 @@ class TCPClient:
             print(f"[TCP 오류] 연결 실패: {e}")
             return False
 
-    def send_command(self, sender: str, receiver: str, cmd: str, payload: dict):
+    def negotiate(self, sender: str, version: int = TCPProtocol.PROTOCOL_VERSION):
+        """HELLO 로 프로토콜 버전 협상 - 서버 응답의 버전을 이후 프레임에 사용"""
+        self.send_command(sender, "SERVER", "HELLO", {"version": version})
+        response = self.read_response()
+        if response and response.get("cmd") == "HEARTBEAT_ACK":
+            self.version = response.get("payload", {}).get("version", TCPProtocol.PROTOCOL_V1)
+        print(f"[TCP 협상] v{self.version}")
+        return self.version
+
+    def send_command(self, sender: str, receiver: str, cmd: str, payload: dict, seq: int = None):
         if not self.connected and not self.connect():
             print("[TCP 오류] 연결되지 않아 메시지를 전송할 수 없습니다")
             return
             
-        message = TCPProtocol.build_message(sender, receiver, cmd, payload)
+        if self.version >= TCPProtocol.PROTOCOL_V2:
+            # v2 - ACK 요청 (seq 를 지정하면 같은 번호로 재전송)
+            if seq is None:
+                seq = (next(self._seq) - 1) % 0xFFFF + 1
+            message = TCPProtocol.build_message(sender, receiver, cmd, payload,
+                                                seq=seq, flags=TCPProtocol.FLAG_ACK_REQUEST)
+        else:
+            message = TCPProtocol.build_message(sender, receiver, cmd, payload)
         try:
             self.sock.sendall(message)
             print(f"[TCP Send] 명령: {cmd}, 페이로드: {payload}")
@@ -53,8 +76,8 @@ class TCPClient:
                 self.connected = False
                 return None
                 
-            # 헤더에서 페이로드 길이 추출
-            _, _, _, payload_len = header_data[0], header_data[1], header_data[2], header_data[3]
+            # 헤더에서 페이로드 길이 추출 (확장 ID / v2 seq 포함)
+            payload_len = header_data[3] + TCPProtocol.extension_length(header_data, self.version)
             
             # 페이로드 읽기
             payload_data = b''
@@ -67,8 +90,14 @@ class TCPClient:
             
             # 전체 메시지 파싱
             raw_data = header_data + payload_data
-            parsed = TCPProtocol.parse_message(raw_data)
+            parsed = TCPProtocol.parse_message(raw_data, self.version)
             print(f"[TCP Read] {parsed}")
+            
+            # v2 - ACK 요청 프레임은 바로 응답, 재전송으로 다시 온 프레임은 duplicate 표시
+            seq = parsed.get("seq")
+            if seq and parsed.get("flags", 0) & TCPProtocol.FLAG_ACK_REQUEST:
+                self.sock.sendall(TCPProtocol.build_ack(parsed["receiver"], parsed["sender"], seq))
+                parsed["duplicate"] = self.received.is_duplicate(seq)
             return parsed
         except Exception as e:
             self.connected = False
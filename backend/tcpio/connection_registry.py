@@ -0,0 +1,196 @@
+# backend/tcpio/connection_registry.py
+
+import itertools
+import threading
+import time
+from collections import deque
+
+from backend.capture.traffic_recorder import get_traffic_recorder, tcp_stream, KIND_TCP_OUT
+from backend.faults.fault_injector import get_fault_injector
+
+EVENT_CONNECTED = "CONNECTED"
+EVENT_DISCONNECTED = "DISCONNECTED"
+
+
+class SeqWindow:
+    """최근 받은 v2 순번 (재전송으로 다시 온 프레임 걸러내기)"""
+
+    def __init__(self, size=256):
+        self._order = deque()
+        self._seen = set()
+        self.size = size
+
+    def is_duplicate(self, seq):
+        """처음 본 순번이면 기록하고 False, 이미 본 순번이면 True"""
+        if seq in self._seen:
+            return True
+        self._seen.add(seq)
+        self._order.append(seq)
+        if len(self._order) > self.size:
+            self._seen.discard(self._order.popleft())
+        return False
+
+
+class Connection:
+    """트럭 TCP 연결 하나 (소켓 + 세대 번호 + 송신 잠금 + 프로토콜 버전)"""
+
+    def __init__(self, addr, sock):
+        self.addr = addr
+        self.sock = sock
+        self.temp_id = f"TEMP_{addr[1]}"  # 트럭 ID 를 알기 전 표시용 ID
+        self.truck_ids = set()
+        self.generation = 0
+        self.opened_at = time.time()
+        self.send_lock = threading.Lock()  # 여러 스레드의 sendall 이 섞이지 않도록
+        self.version = 1                   # HELLO 협상 전에는 v1
+        self.received = SeqWindow()        # v2 - 트럭이 보낸 순번
+        self._seq = itertools.count(1)
+
+    def next_seq(self):
+        """v2 송신 순번 (1~65535 순환, 0 은 재전송 없는 프레임용)"""
+        return (next(self._seq) - 1) % 0xFFFF + 1
+
+    def sendall(self, data):
+        with self.send_lock:
+            self.write(data)
+
+    def write(self, data):
+        """송신 (send_lock 을 잡은 상태에서 호출) - 통신 녹화 중이면 기록, 장애 주입 중이면 적용"""
+        injector = get_fault_injector()
+        if injector.active:
+            data = injector.tcp_out(self, data)
+            if data is None:
+                return
+        recorder = get_traffic_recorder()
+        if recorder is not None:
+            recorder.record(KIND_TCP_OUT, tcp_stream(self.addr), data)
+        self.sock.sendall(data)
+
+    def __repr__(self):
+        return f"Connection({self.addr}, trucks={sorted(self.truck_ids)}, gen={self.generation})"
+
+
+class ConnectionRegistry:
+    """
+    트럭 연결 레지스트리 (스레드 안전)
+
+    truck_id → Connection 조회는 dict 한 번으로 끝나고, 트럭이 (재)연결될 때마다
+    세대 번호가 올라간다. 연결 / 해제 시 리스너에게 (이벤트, truck_id, Connection) 을 알린다.
+    명령 전송자는 이 객체 하나를 계속 참조하므로 연결이 바뀌어도 새로 만들 필요가 없다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._by_addr = {}    # addr → Connection
+        self._by_truck = {}   # truck_id → Connection
+        self._generation = 0
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """callback(event, truck_id, connection) - 잠금 밖에서 호출됨"""
+        self._listeners.append(callback)
+
+    # -------------------------------- 연결 관리 --------------------------------
+
+    def open(self, addr, sock):
+        """새 클라이언트 연결 등록 (트럭 ID 는 첫 메시지에서 bind)"""
+        connection = Connection(addr, sock)
+        with self.lock:
+            self._by_addr[addr] = connection
+        return connection
+
+    def bind(self, truck_id, connection):
+        """truck_id 를 연결에 묶음 - 이미 같은 연결이면 아무것도 하지 않음"""
+        with self.lock:
+            current = self._by_truck.get(truck_id)
+            if current is connection:
+                return False
+            if current is not None:
+                current.truck_ids.discard(truck_id)  # 재연결 - 이전 소켓에서 떼어냄
+            self._generation += 1
+            connection.generation = self._generation
+            connection.truck_ids.add(truck_id)
+            self._by_truck[truck_id] = connection
+        print(f"[🔗 등록] 트럭 '{truck_id}' 소켓 등록 (세대 {connection.generation})")
+        self._emit(EVENT_CONNECTED, truck_id, connection)
+        return True
+
+    def auto_bind(self, truck_id):
+        """
+        트럭 ID 를 모르는 연결 중 가장 최근 것에 truck_id 를 묶음
+        다른 트럭이 묶인 연결은 빼앗지 않음 (그 트럭 명령이 엉뚱한 소켓으로 가지 않도록) - 없으면 None
+        """
+        with self.lock:
+            unbound = [c for c in self._by_addr.values() if not c.truck_ids]
+            if not unbound:
+                return None
+            connection = max(unbound, key=lambda c: c.opened_at)
+        self.bind(truck_id, connection)
+        return connection
+
+    def close(self, connection):
+        """연결 해제 - 이 연결에 묶인 트럭들은 (재연결되지 않았다면) 해제 이벤트 발생"""
+        with self.lock:
+            if self._by_addr.get(connection.addr) is connection:
+                del self._by_addr[connection.addr]
+            released = []
+            for truck_id in list(connection.truck_ids):
+                if self._by_truck.get(truck_id) is connection:
+                    del self._by_truck[truck_id]
+                    released.append(truck_id)
+            connection.truck_ids.clear()
+        for truck_id in released:
+            print(f"[🔌 트럭 연결 종료] {truck_id}")
+            self._emit(EVENT_DISCONNECTED, truck_id, connection)
+        return released
+
+    def clear(self):
+        with self.lock:
+            connections = list(self._by_addr.values())
+        for connection in connections:
+            self.close(connection)
+
+    # -------------------------------- 조회 --------------------------------
+
+    def get(self, truck_id):
+        return self._by_truck.get(truck_id)
+
+    def is_connected(self, truck_id):
+        return truck_id in self._by_truck
+
+    def generation(self, truck_id):
+        """현재 연결 세대 번호 (연결되어 있지 않으면 None)"""
+        connection = self._by_truck.get(truck_id)
+        return connection.generation if connection else None
+
+    def truck_ids(self):
+        with self.lock:
+            return list(self._by_truck)
+
+    def connections(self):
+        with self.lock:
+            return list(self._by_addr.values())
+
+    def truck_id_of(self, connection):
+        """연결에 묶인 트럭 ID 하나 (없으면 None)"""
+        with self.lock:
+            return next(iter(sorted(connection.truck_ids)), None)
+
+    def sockets(self):
+        """truck_id → socket 스냅샷 (트럭 ID 를 모르는 연결은 TEMP_<포트>)"""
+        with self.lock:
+            snapshot = {c.temp_id: c.sock for c in self._by_addr.values() if not c.truck_ids}
+            snapshot.update((truck_id, c.sock) for truck_id, c in self._by_truck.items())
+            return snapshot
+
+    def __len__(self):
+        return len(self._by_truck)
+
+    # -------------------------------------------------------------------------------
+
+    def _emit(self, event, truck_id, connection):
+        for callback in list(self._listeners):
+            try:
+                callback(event, truck_id, connection)
+            except Exception as e:
+                print(f"[⚠️ 연결 이벤트 처리 오류] {event} {truck_id}: {e}")
@@ -0,0 +1,47 @@
+# backend/tcpio/listener.py
+# (표준 라이브러리만 사용 - 런처가 다른 모듈을 import 하기 전에 TCP 포트부터 열 수 있도록)
+
+import socket
+import time
+
+# 재시작 직후 트럭들이 한꺼번에 다시 연결해도 accept 전까지 커널이 받아 둘 연결 수
+LISTEN_BACKLOG = 64
+
+
+def _new_socket():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # SO_REUSEADDR 및 SO_REUSEPORT 옵션 설정 (가능한 경우)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        # SO_REUSEPORT는 일부 플랫폼에서만 지원
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    except (AttributeError, OSError):
+        # 지원하지 않는 플랫폼에서는 무시
+        pass
+    # 소켓 타임아웃 설정
+    sock.settimeout(1.0)  # 1초 타임아웃으로 accept 대기
+    return sock
+
+
+def open_listener(host, port, backlog=LISTEN_BACKLOG):
+    """
+    리스닝 소켓 생성 (bind + listen)
+
+    listen 직후부터 커널이 트럭 연결을 받아 backlog 에 쌓아 두므로, 런처는 이 소켓을 먼저 열고
+    나머지 초기화가 끝난 뒤 TCPServer.start(listener=...) 로 accept 루프를 시작한다.
+    """
+    server_sock = _new_socket()
+    # 바인딩 시도
+    try:
+        server_sock.bind((host, port))
+    except OSError as e:
+        server_sock.close()
+        if "Address already in use" not in str(e):
+            raise
+        print(f"[⚠️ 포트 {port} 사용 중] 5초 후 다시 시도...")
+        time.sleep(5)
+        server_sock = _new_socket()
+        server_sock.bind((host, port))
+
+    server_sock.listen(backlog)
+    return server_sock
@@ -0,0 +1,266 @@
+# backend/tcpio/liveness_monitor.py
+
+import heapq
+import itertools
+import socket
+import threading
+import time
+
+from backend.tcpio.protocol import TCPProtocol
+from backend.tcpio.connection_registry import EVENT_CONNECTED, EVENT_DISCONNECTED
+
+# 오프라인 사유
+REASON_TIMEOUT = "TIMEOUT"            # 하트비트 체크에 max_misses 번 응답 없음 (체크 미지원 트럭은 silent_timeout 동안 수신 없음)
+REASON_DISCONNECTED = "DISCONNECTED"  # 소켓이 닫히고 reconnect_grace 안에 재접속하지 않음
+
+# 트럭 펌웨어 보고 주기 (firmware/truck/*.ino)
+STATUS_REPORT_INTERVAL = 10.0  # STATUS_REPORT_INTERVAL = 10000ms - 배터리 / 상태 보고 간격
+LOAD_DWELL = 10.0              # LOAD_A / LOAD_B 도착 후 delay(10000) - 그동안 아무 프레임도 보내지 않음
+
+# 기본값 - 보고 3번을 놓치고 적재 대기까지 겹쳐도 조용한 것으로 보지 않도록
+DEFAULT_IDLE_TIMEOUT = 3 * STATUS_REPORT_INTERVAL + LOAD_DWELL
+DEFAULT_PROBE_INTERVAL = 5.0
+DEFAULT_MAX_MISSES = 3
+SILENT_OFFLINE_FACTOR = 2      # 체크 미지원 트럭은 idle_timeout 의 2배 동안 조용하면 오프라인
+DEFAULT_RECONNECT_GRACE = 5.0  # 펌웨어는 loop() 마다 reconnectToServer() - 순간 끊김은 몇 초 안에 재접속
+
+
+class LivenessMonitor:
+    """
+    트럭 생존 감시 (타이머 힙 + 스레드 하나)
+
+    트럭마다 힙에 마감 시각을 하나씩 둔다. 프레임을 받을 때는 touch() 로 마지막 수신 시각만 바꾸고
+    (힙 연산 없음), 마감 시각이 되면 그때 수신 시각을 보고 다시 예약하거나 HEARTBEAT_CHECK 를 보낸다.
+
+    하트비트 체크는 HELLO 로 버전을 협상해 enable_probes() 된 트럭에만 보낸다. 이 트럭이
+    idle_timeout 동안 조용하면 probe_interval 간격으로 체크를 보내고, max_misses 번 연속 응답이 없으면
+    오프라인으로 판단해 소켓을 닫고 리스너에게 알린다 (약 idle_timeout + probe_interval * max_misses 초).
+    현재 펌웨어처럼 체크에 응답하지 못하는 트럭은 idle_timeout 에 경고를 남기고, silent_timeout
+    (기본 idle_timeout * SILENT_OFFLINE_FACTOR) 동안 계속 조용하면 같은 방식으로 오프라인 처리한다.
+
+    소켓이 닫혀도 바로 오프라인으로 알리지 않고 reconnect_grace 초 뒤로 마감을 잡는다.
+    그 안에 같은 트럭이 다시 접속하면 (track) 오프라인 처리 없이 감시를 이어간다.
+    """
+
+    def __init__(self, connections, idle_timeout=DEFAULT_IDLE_TIMEOUT, probe_interval=DEFAULT_PROBE_INTERVAL,
+                 max_misses=DEFAULT_MAX_MISSES, reconnect_grace=DEFAULT_RECONNECT_GRACE, silent_timeout=None,
+                 clock=time.monotonic):
+        self.connections = connections
+        self.idle_timeout = idle_timeout
+        self.probe_interval = probe_interval
+        self.max_misses = max_misses
+        self.reconnect_grace = reconnect_grace
+        self.silent_timeout = silent_timeout if silent_timeout is not None else idle_timeout * SILENT_OFFLINE_FACTOR
+        self.clock = clock
+        self.cond = threading.Condition()
+        self._heap = []       # (마감 시각, 순번, truck_id, token)
+        self._trucks = {}     # truck_id → {"last_seen", "misses", "silent", "probes", "disconnected", "token"}
+        self._tokens = itertools.count()
+        self._listeners = []
+        self._running = False
+        self._closed = False  # stop() 이후에는 연결 이벤트 무시
+        self._thread = None
+        connections.add_listener(self._on_connection_event)
+
+    def add_listener(self, callback):
+        """callback(truck_id, reason) - 감시 스레드(또는 연결 종료 스레드)에서 호출됨"""
+        self._listeners.append(callback)
+
+    # -------------------------------- 감시 대상 --------------------------------
+
+    def track(self, truck_id):
+        """감시 시작 (이미 감시 중이면 수신 시각만 갱신 - 새 연결이므로 체크 협상은 다시 받음)"""
+        now = self.clock()
+        with self.cond:
+            state = self._trucks.get(truck_id)
+            if state is not None and not state["disconnected"]:
+                state["last_seen"] = now
+                state["misses"] = 0
+                state["silent"] = False
+                state["probes"] = False
+                return
+            if state is not None:
+                print(f"[🔌 트럭 재접속] {truck_id} - 유예 시간 안에 다시 연결됨 (오프라인 처리 안 함)")
+            token = next(self._tokens)
+            self._trucks[truck_id] = {"last_seen": now, "misses": 0, "silent": False, "probes": False,
+                                      "disconnected": False, "token": token}
+            heapq.heappush(self._heap, (now + self.idle_timeout, token, truck_id, token))
+            self.cond.notify()
+
+    def touch(self, truck_id):
+        """프레임 수신 - 수신 시각 갱신 (감시 중이 아니면 무시)"""
+        state = self._trucks.get(truck_id)
+        if state is not None and not state["disconnected"]:
+            state["last_seen"] = self.clock()
+            state["misses"] = 0
+            state["silent"] = False
+
+    def enable_probes(self, truck_id):
+        """HEARTBEAT_CHECK 에 응답하는 트럭 (HELLO 버전 협상) - 무응답 시 오프라인 판단 대상"""
+        state = self._trucks.get(truck_id)
+        if state is None or state["probes"]:
+            return False
+        state["probes"] = True
+        return True
+
+    def probes_enabled(self, truck_id):
+        state = self._trucks.get(truck_id)
+        return bool(state and state["probes"])
+
+    def forget(self, truck_id):
+        """감시 중단 (힙 항목은 꺼낼 때 버림)"""
+        with self.cond:
+            return self._trucks.pop(truck_id, None) is not None
+
+    def disconnected(self, truck_id):
+        """소켓 종료 - reconnect_grace 뒤에 재접속하지 않았으면 오프라인 (감시 중이 아니면 무시)"""
+        now = self.clock()
+        with self.cond:
+            state = self._trucks.get(truck_id)
+            if state is None or state["disconnected"]:
+                return False
+            token = next(self._tokens)
+            state["disconnected"] = True
+            state["token"] = token
+            heapq.heappush(self._heap, (now + self.reconnect_grace, token, truck_id, token))
+            self.cond.notify()
+            return True
+
+    def is_tracked(self, truck_id):
+        return truck_id in self._trucks
+
+    def misses(self, truck_id):
+        state = self._trucks.get(truck_id)
+        return state["misses"] if state else None
+
+    # -------------------------------- 마감 처리 --------------------------------
+
+    def poll(self, now=None):
+        """마감 시각이 지난 항목 처리 - 오프라인으로 판단한 트럭 목록 반환"""
+        now = self.clock() if now is None else now
+        probes = []
+        silent = []
+        offline = []  # (truck_id, reason)
+        with self.cond:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, truck_id, token = heapq.heappop(self._heap)
+                state = self._trucks.get(truck_id)
+                if state is None or state["token"] != token:
+                    continue  # forget / 재등록된 트럭의 이전 항목
+
+                if state["disconnected"]:
+                    # 유예 시간 안에 재접속하지 않음
+                    del self._trucks[truck_id]
+                    offline.append((truck_id, REASON_DISCONNECTED))
+                    continue
+                if state["misses"] == 0 and state["last_seen"] + self.idle_timeout > now:
+                    deadline = state["last_seen"] + self.idle_timeout  # 그 사이 프레임 수신
+                elif not state["probes"]:
+                    # 체크에 응답하지 못하는 트럭 - idle_timeout 에 경고, silent_timeout 까지 조용하면 오프라인
+                    deadline = state["last_seen"] + self.silent_timeout
+                    if deadline <= now:
+                        del self._trucks[truck_id]
+                        offline.append((truck_id, REASON_TIMEOUT))
+                        continue
+                    if not state["silent"]:
+                        state["silent"] = True
+                        silent.append(truck_id)
+                elif state["misses"] < self.max_misses:
+                    state["misses"] += 1
+                    probes.append((truck_id, state["misses"]))
+                    deadline = now + self.probe_interval
+                else:
+                    del self._trucks[truck_id]
+                    offline.append((truck_id, REASON_TIMEOUT))
+                    continue
+                heapq.heappush(self._heap, (deadline, token, truck_id, token))
+
+        for truck_id in silent:
+            print(f"[⚠️ 트럭 무응답] {truck_id} - {self.idle_timeout:.0f}초 동안 수신 없음 "
+                  f"(하트비트 체크 미지원, {self.silent_timeout:.0f}초까지 없으면 오프라인)")
+        for truck_id, misses in probes:
+            self._probe(truck_id, misses)
+        for truck_id, reason in offline:
+            self._declare_offline(truck_id, reason)
+        return [truck_id for truck_id, _ in offline]
+
+    def next_deadline(self):
+        with self.cond:
+            return self._heap[0][0] if self._heap else None
+
+    # -------------------------------- 스레드 --------------------------------
+
+    def start(self):
+        with self.cond:
+            if self._running:
+                return
+            self._running = True
+            self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"[💓 생존 감시 시작] 무응답 {self.idle_timeout}초 후 {self.probe_interval}초 간격 체크, "
+              f"{self.max_misses}회 무응답 시 오프라인 (체크 미지원 트럭은 {self.silent_timeout}초 무수신 시), "
+              f"연결 종료 {self.reconnect_grace}초 유예")
+
+    def stop(self):
+        """감시 종료 - 이후 연결 해제는 오프라인으로 알리지 않음 (서버 종료 시)"""
+        with self.cond:
+            self._running = False
+            self._closed = True
+            self._trucks.clear()
+            self._heap.clear()
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                if not self._running:
+                    return
+                deadline = self._heap[0][0] if self._heap else None
+                timeout = None if deadline is None else max(0.0, deadline - self.clock())
+                if timeout is None or timeout > 0:
+                    self.cond.wait(timeout)
+                    continue
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[⚠️ 생존 감시 오류] {e}")
+
+    # -------------------------------------------------------------------------------
+
+    def _on_connection_event(self, event, truck_id, connection):
+        if self._closed:
+            return
+        if event == EVENT_CONNECTED:
+            self.track(truck_id)
+        elif event == EVENT_DISCONNECTED:
+            self.disconnected(truck_id)
+
+    def _probe(self, truck_id, misses):
+        connection = self.connections.get(truck_id)
+        if connection is None:
+            return
+        try:
+            with connection.send_lock:
+                connection.write(TCPProtocol.build_frame(
+                    connection.version, sender="SERVER", receiver=truck_id, cmd="HEARTBEAT_CHECK", payload={}
+                ))
+            print(f"[💓 하트비트 체크] {truck_id} ({misses}/{self.max_misses})")
+        except OSError as e:
+            print(f"[⚠️ 하트비트 체크 전송 실패] {truck_id}: {e}")
+
+    def _declare_offline(self, truck_id, reason):
+        print(f"[🚨 트럭 오프라인] {truck_id} ({reason})")
+        for callback in list(self._listeners):
+            try:
+                callback(truck_id, reason)
+            except Exception as e:
+                print(f"[⚠️ 오프라인 처리 오류] {truck_id}: {e}")
+        if reason == REASON_TIMEOUT:
+            # 수신 스레드가 recv 에서 깨어나 연결을 정리하도록 소켓 종료
+            connection = self.connections.get(truck_id)
+            if connection is not None:
+                try:
+                    connection.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
@@ -2,6 +2,8 @@
 
 import struct
 import datetime
+from backend.track.track_topology import get_track_topology
+from backend.fleet.fleet_registry import get_fleet_registry, ID_EXTENDED, MAX_SHORT_CODE
 
 class TCPProtocol:
     # 코드 정의
@@ -17,6 +19,7 @@ class TCPProtocol:
     CMD_ACK_GATE_OPENED = 0x09
     CMD_FINISH_CHARGING = 0x0A
     CMD_BATTERY = 0x0B
+    CMD_TELEMETRY = 0x0C  # 상태 레코드 묶음 (STATUS_UPDATE / BATTERY 여러 건을 한 프레임으로)
     
     # PC → 트럭 명령어
     CMD_MISSION_ASSIGNED = 0x10
@@ -32,13 +35,25 @@ class TCPProtocol:
     CMD_HELLO = 0xF0
     CMD_HEARTBEAT_ACK = 0xF1
     CMD_HEARTBEAT_CHECK = 0xF2
+    CMD_ACK = 0xF3  # v2 - seq 필드에 확인한 프레임 번호
     
-    # sender/receiver IDs
+    # 프로토콜 버전 (HELLO 로 협상 - 협상 전에는 v1)
+    PROTOCOL_V1 = 1
+    PROTOCOL_V2 = 2  # 헤더 뒤에 seq(2바이트) + flags(1바이트)
+    PROTOCOL_VERSION = PROTOCOL_V2  # 서버가 지원하는 최고 버전
+    V2_HEADER_LEN = 3
+    
+    # v2 flags
+    FLAG_ACK_REQUEST = 0x01  # 수신 측이 CMD_ACK 로 응답해야 함 (응답이 없으면 재전송)
+    FLAG_ACK = 0x02          # ACK 프레임
+    
+    # sender/receiver IDs (트럭 ID 는 FleetRegistry 가 할당)
     ID_SERVER = 0x10
     ID_TRUCK_01 = 0x01
     ID_TRUCK_02 = 0x02
     ID_TRUCK_03 = 0x03
     ID_GUI = 0x04
+    ID_EXTENDED = ID_EXTENDED  # 16비트 확장 ID 가 헤더 뒤에 이어짐
     
     # position 코드
     POS_CHECKPOINT_A = 0x01
@@ -60,12 +75,9 @@ class TCPProtocol:
     STATE_CHARGING = 0x03
     STATE_FULLY_CHARGED = 0x04
     
-    # ID 매핑 (문자열 ↔ 바이트)
+    # 고정 ID 매핑 (문자열 ↔ 바이트) - 트럭은 FleetRegistry 에서 조회
     ID_MAP = {
         "SERVER": ID_SERVER,
-        "TRUCK_01": ID_TRUCK_01,
-        "TRUCK_02": ID_TRUCK_02,
-        "TRUCK_03": ID_TRUCK_03,
         "GUI": ID_GUI
     }
     
@@ -84,6 +96,7 @@ class TCPProtocol:
         "ACK_GATE_OPENED": CMD_ACK_GATE_OPENED,
         "FINISH_CHARGING": CMD_FINISH_CHARGING,
         "BATTERY": CMD_BATTERY,
+        "TELEMETRY": CMD_TELEMETRY,
         "MISSION_ASSIGNED": CMD_MISSION_ASSIGNED,
         "NO_MISSION": CMD_NO_MISSION,
         "RUN": CMD_RUN,
@@ -94,23 +107,15 @@ class TCPProtocol:
         "GATE_CLOSED": CMD_GATE_CLOSED,
         "HELLO": CMD_HELLO,
         "HEARTBEAT_ACK": CMD_HEARTBEAT_ACK,
-        "HEARTBEAT_CHECK": CMD_HEARTBEAT_CHECK
+        "HEARTBEAT_CHECK": CMD_HEARTBEAT_CHECK,
+        "ACK": CMD_ACK
     }
     
     CMD_MAP_REVERSE = {v: k for k, v in CMD_MAP.items()}
     
-    # 위치 매핑
+    # 위치 매핑 (트랙 토폴로지의 노드 위치 코드 사용)
     POS_MAP = {
-        "CHECKPOINT_A": POS_CHECKPOINT_A,
-        "CHECKPOINT_B": POS_CHECKPOINT_B,
-        "CHECKPOINT_C": POS_CHECKPOINT_C,
-        "CHECKPOINT_D": POS_CHECKPOINT_D,
-        "LOAD_A": POS_LOAD_A,
-        "LOAD_B": POS_LOAD_B,
-        "BELT": POS_BELT,
-        "STANDBY": POS_STANDBY,
-        "GATE_A": POS_GATE_A,
-        "GATE_B": POS_GATE_B,
+        **get_track_topology().position_codes(),
         "UNKNOWN": POS_UNKNOWN
     }
     
@@ -127,13 +132,47 @@ class TCPProtocol:
     
     STATE_MAP_REVERSE = {v: k for k, v in STATE_MAP.items()}
     
+    # 주행 상태 코드 (TELEMETRY 레코드)
+    RUN_STATE_MAP = {
+        "IDLE": 0x00,
+        "RUNNING": 0x01,
+        "STOPPED": 0x02,
+        "LOADING": 0x03,
+        "UNLOADING": 0x04,
+        "CHARGING": 0x05,
+        "EMERGENCY": 0x06
+    }
+    
+    RUN_STATE_MAP_REVERSE = {v: k for k, v in RUN_STATE_MAP.items()}
+    
+    # TELEMETRY 레코드: timestamp_ms(4) + position(1) + battery(1) + run_state(1) + flags(1) + distance_cm(2)
+    TELEMETRY_RECORD = struct.Struct(">IBBBBH")
+    TELEMETRY_MAX_RECORDS = (255 - 1) // TELEMETRY_RECORD.size  # payload_len 1바이트 - count(1) 제외
+    TELEMETRY_CHARGING = 0x01   # flags - 충전 중
+    TELEMETRY_OBSTACLE = 0x02   # flags - 장애물 감지
+    TELEMETRY_NO_DISTANCE = 0xFFFF  # 거리 측정값 없음
+    
     @staticmethod
     def _get_id_code(id_str):
-        return TCPProtocol.ID_MAP.get(id_str, 0)
+        code = TCPProtocol.ID_MAP.get(id_str)
+        if code is None:
+            code = get_fleet_registry().code_of(id_str)
+        return code or 0
         
     @staticmethod
     def _get_id_str(id_code):
-        return TCPProtocol.ID_MAP_REVERSE.get(id_code, "UNKNOWN")
+        id_str = TCPProtocol.ID_MAP_REVERSE.get(id_code)
+        if id_str is None:
+            id_str = get_fleet_registry().truck_of(id_code)
+        return id_str or "UNKNOWN"
+    
+    @staticmethod
+    def extension_length(header, version=PROTOCOL_V1):
+        """헤더와 페이로드 사이 바이트 수 (확장 ID 각 2바이트 + v2 seq / flags)"""
+        length = 2 * ((header[0] == TCPProtocol.ID_EXTENDED) + (header[1] == TCPProtocol.ID_EXTENDED))
+        if version >= TCPProtocol.PROTOCOL_V2:
+            length += TCPProtocol.V2_HEADER_LEN
+        return length
         
     @staticmethod
     def _get_cmd_code(cmd_str):
@@ -244,6 +283,28 @@ class TCPProtocol:
             
             payload_bytes = bytes([battery_level, is_charging, battery_state])
         
+        # TELEMETRY - count(1) + 레코드(10바이트) * count
+        elif cmd_code == TCPProtocol.CMD_TELEMETRY:
+            records = list(payload.get("records", []))[-TCPProtocol.TELEMETRY_MAX_RECORDS:]  # 넘치면 최신 레코드만
+            payload_bytes = bytes([len(records)])
+            for record in records:
+                flags = 0
+                if record.get("is_charging"):
+                    flags |= TCPProtocol.TELEMETRY_CHARGING
+                if record.get("obstacle_detected"):
+                    flags |= TCPProtocol.TELEMETRY_OBSTACLE
+                distance_cm = record.get("distance_cm")
+                if distance_cm is None:
+                    distance_cm = TCPProtocol.TELEMETRY_NO_DISTANCE
+                payload_bytes += TCPProtocol.TELEMETRY_RECORD.pack(
+                    int(record.get("timestamp_ms", 0)) & 0xFFFFFFFF,
+                    TCPProtocol._get_pos_code(record.get("position")),
+                    max(0, min(100, int(record.get("battery_level", 100)))),
+                    TCPProtocol.RUN_STATE_MAP.get(str(record.get("run_state", "IDLE")).upper(), 0),
+                    flags,
+                    min(TCPProtocol.TELEMETRY_NO_DISTANCE, int(distance_cm))
+                )
+        
         # ACK_GATE_OPENED
         elif cmd_code == TCPProtocol.CMD_ACK_GATE_OPENED:
             gate = payload.get("gate_id", "GATE_A")
@@ -296,6 +357,11 @@ class TCPProtocol:
             battery_level = min(100, int(payload.get("battery_level", 100)))
             payload_bytes = bytes([battery_level])
         
+        # HELLO / HEARTBEAT_ACK - 프로토콜 버전 협상 (v1 트럭은 버전을 보내지 않음)
+        elif cmd_code in [TCPProtocol.CMD_HELLO, TCPProtocol.CMD_HEARTBEAT_ACK]:
+            if "version" in payload:
+                payload_bytes = bytes([int(payload["version"])])
+        
         return payload_bytes
     
     @staticmethod
@@ -379,6 +445,25 @@ class TCPProtocol:
             payload["battery_level"] = battery_level
             payload["is_charging"] = is_charging
             payload["battery_state"] = battery_state
+        
+        # TELEMETRY - 잘린 마지막 레코드는 버림
+        elif cmd_code == TCPProtocol.CMD_TELEMETRY and len(payload_bytes) >= 1:
+            size = TCPProtocol.TELEMETRY_RECORD.size
+            count = min(payload_bytes[0], (len(payload_bytes) - 1) // size)
+            records = []
+            for i in range(count):
+                timestamp_ms, position_code, battery_level, run_state, flags, distance_cm = \
+                    TCPProtocol.TELEMETRY_RECORD.unpack_from(payload_bytes, 1 + i * size)
+                records.append({
+                    "timestamp_ms": timestamp_ms,
+                    "position": TCPProtocol._get_pos_str(position_code),
+                    "battery_level": battery_level,
+                    "run_state": TCPProtocol.RUN_STATE_MAP_REVERSE.get(run_state, "IDLE"),
+                    "is_charging": bool(flags & TCPProtocol.TELEMETRY_CHARGING),
+                    "obstacle_detected": bool(flags & TCPProtocol.TELEMETRY_OBSTACLE),
+                    "distance_cm": None if distance_cm == TCPProtocol.TELEMETRY_NO_DISTANCE else distance_cm
+                })
+            payload["records"] = records
             
         # START_LOADING, FINISH_LOADING, START_UNLOADING, FINISH_UNLOADING
         elif cmd_code in [TCPProtocol.CMD_START_LOADING, 
@@ -414,16 +499,23 @@ class TCPProtocol:
             battery_level = payload_bytes[0]
             payload["battery_level"] = battery_level
         
+        # HELLO / HEARTBEAT_ACK - 프로토콜 버전
+        elif cmd_code in [TCPProtocol.CMD_HELLO, TCPProtocol.CMD_HEARTBEAT_ACK] and len(payload_bytes) >= 1:
+            payload["version"] = payload_bytes[0]
+        
         return payload
 
     @staticmethod
-    def build_message(sender, receiver, cmd, payload=None):
+    def build_message(sender, receiver, cmd, payload=None, seq=None, flags=0):
         """
         바이너리 메시지 구조 생성:
         - sender_id (1 바이트)
         - receiver_id (1 바이트)
         - cmd_id (1 바이트)
         - payload_len (1 바이트)
+        - [확장 sender_id (2 바이트)] - sender_id 가 ID_EXTENDED 인 경우
+        - [확장 receiver_id (2 바이트)] - receiver_id 가 ID_EXTENDED 인 경우
+        - [seq (2 바이트) + flags (1 바이트)] - v2 (seq 가 None 이 아닌 경우)
         - payload (가변 길이)
         """
         if payload is None:
@@ -438,13 +530,38 @@ class TCPProtocol:
         payload_bytes = TCPProtocol._encode_payload(cmd_id, payload)
         payload_len = len(payload_bytes)
         
-        # 헤더 (4바이트) + 페이로드
+        # 1바이트에 들어가지 않는 ID 는 확장 ID 로 헤더 뒤에 붙임
+        extension = b""
+        if sender_id > MAX_SHORT_CODE:
+            extension += struct.pack(">H", sender_id)
+            sender_id = TCPProtocol.ID_EXTENDED
+        if receiver_id > MAX_SHORT_CODE:
+            extension += struct.pack(">H", receiver_id)
+            receiver_id = TCPProtocol.ID_EXTENDED
+        
+        # v2 - 순번 / 플래그
+        if seq is not None:
+            extension += struct.pack(">HB", seq & 0xFFFF, flags)
+        
+        # 헤더 (4바이트) + [확장 ID] + [v2 seq / flags] + 페이로드
         header = struct.pack("BBBB", sender_id, receiver_id, cmd_id, payload_len)
-        return header + payload_bytes
+        return header + extension + payload_bytes
+    
+    @staticmethod
+    def build_frame(version, sender, receiver, cmd, payload=None, seq=0, flags=0):
+        """연결의 프로토콜 버전에 맞는 프레임 (v1 이면 seq / flags 없음, v2 의 seq 0 은 재전송 없는 프레임)"""
+        if version >= TCPProtocol.PROTOCOL_V2:
+            return TCPProtocol.build_message(sender, receiver, cmd, payload, seq=seq, flags=flags)
+        return TCPProtocol.build_message(sender, receiver, cmd, payload)
+    
+    @staticmethod
+    def build_ack(sender, receiver, seq):
+        """v2 ACK 프레임 - seq 번 프레임 수신 확인"""
+        return TCPProtocol.build_message(sender, receiver, "ACK", {}, seq=seq, flags=TCPProtocol.FLAG_ACK)
     
     @staticmethod
-    def parse_message(raw_data):
-        """바이너리 메시지 파싱"""
+    def parse_message(raw_data, version=PROTOCOL_V1):
+        """바이너리 메시지 파싱 (v2 면 결과에 seq / flags 포함)"""
         try:
             # 최소 메시지 길이 검사 (헤더 4바이트)
             if len(raw_data) < 4:
@@ -457,13 +574,32 @@ class TCPProtocol:
             # 헤더 파싱
             sender_id, receiver_id, cmd_id, payload_len = struct.unpack("BBBB", raw_data[:4])
             
+            # 확장 ID / v2 헤더
+            offset = 4
+            if len(raw_data) < offset + TCPProtocol.extension_length(raw_data, version):
+                return {
+                    "type": "INVALID",
+                    "error": "Extended ID missing",
+                    "raw": raw_data
+                }
+            if sender_id == TCPProtocol.ID_EXTENDED:
+                sender_id = struct.unpack(">H", raw_data[offset:offset + 2])[0]
+                offset += 2
+            if receiver_id == TCPProtocol.ID_EXTENDED:
+                receiver_id = struct.unpack(">H", raw_data[offset:offset + 2])[0]
+                offset += 2
+            seq = flags = None
+            if version >= TCPProtocol.PROTOCOL_V2:
+                seq, flags = struct.unpack(">HB", raw_data[offset:offset + 3])
+                offset += TCPProtocol.V2_HEADER_LEN
+            
             # ID와 명령어 문자열 변환
             sender = TCPProtocol._get_id_str(sender_id)
             receiver = TCPProtocol._get_id_str(receiver_id)
             cmd = TCPProtocol._get_cmd_str(cmd_id)
             
             # 페이로드 길이 검사
-            if len(raw_data) < 4 + payload_len:
+            if len(raw_data) < offset + payload_len:
                 return {
                     "type": "INVALID",
                     "error": "Payload length mismatch",
@@ -471,16 +607,22 @@ class TCPProtocol:
                 }
                 
             # 페이로드 디코딩
-            payload_bytes = raw_data[4:4+payload_len]
+            payload_bytes = raw_data[offset:offset+payload_len]
             payload = TCPProtocol._decode_payload(cmd_id, payload_bytes)
             
             # 최종 메시지 구조
-            return {
+            message = {
                 "sender": sender,
                 "receiver": receiver,
                 "cmd": cmd,
                 "payload": payload
             }
+            if sender == "UNKNOWN":
+                message["sender_code"] = sender_id  # 미등록 송신자 - 등록 여부는 TCP 서버가 판단
+            if seq is not None:
+                message["seq"] = seq
+                message["flags"] = flags
+            return message
             
         except Exception as e:
             return {
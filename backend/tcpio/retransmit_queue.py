@@ -0,0 +1,141 @@
+# backend/tcpio/retransmit_queue.py
+
+import heapq
+import itertools
+import threading
+import time
+
+from backend.tcpio.connection_registry import EVENT_DISCONNECTED
+
+
+class RetransmitQueue:
+    """
+    v2 명령 재전송 타이머 (타이머 힙 + 스레드 하나)
+
+    ACK 요청 프레임을 보낸 뒤 ack_timeout 안에 ACK 가 오지 않으면 같은 bytes(같은 seq)를 다시 보낸다.
+    트럭은 seq 로 중복을 걸러내므로 재전송해도 명령이 두 번 실행되지 않는다.
+    max_retries 번 재전송해도 응답이 없으면 포기하고 리스너에게 알린다 (연결 끊김은 생존 감시가 처리).
+    """
+
+    def __init__(self, connections, ack_timeout=0.5, max_retries=5, clock=time.monotonic):
+        self.connections = connections
+        self.ack_timeout = ack_timeout
+        self.max_retries = max_retries
+        self.clock = clock
+        self.cond = threading.Condition()
+        self._pending = {}    # (connection, seq) → {"truck_id", "cmd", "frame", "attempts"}
+        self._heap = []       # (재전송 시각, 순번, (connection, seq))
+        self._order = itertools.count()
+        self._listeners = []
+        self._running = False
+        self._thread = None
+        self.retransmits = 0
+        connections.add_listener(self._on_connection_event)
+
+    def add_listener(self, callback):
+        """callback(truck_id, cmd, seq) - 재전송을 포기했을 때 호출"""
+        self._listeners.append(callback)
+
+    # -------------------------------- 송신 / 확인 --------------------------------
+
+    def track(self, connection, truck_id, seq, cmd, frame):
+        """보낸 프레임을 ACK 대기 목록에 등록 (첫 등록 시 스레드 시작)"""
+        with self.cond:
+            self._pending[(connection, seq)] = {"truck_id": truck_id, "cmd": cmd, "frame": frame, "attempts": 0}
+            heapq.heappush(self._heap, (self.clock() + self.ack_timeout, next(self._order), (connection, seq)))
+            self.cond.notify_all()
+        if not self._running:
+            self.start()
+
+    def ack(self, connection, seq):
+        """ACK 수신 - 대기 중이던 프레임이면 True"""
+        with self.cond:
+            entry = self._pending.pop((connection, seq), None)
+            if entry is not None:
+                self.cond.notify_all()
+        return entry is not None
+
+    def pending_count(self, truck_id=None):
+        with self.cond:
+            return sum(1 for entry in self._pending.values() if truck_id is None or entry["truck_id"] == truck_id)
+
+    # -------------------------------- 재전송 --------------------------------
+
+    def poll(self, now=None):
+        """재전송 시각이 지난 프레임 처리 - 재전송한 프레임 수 반환"""
+        now = self.clock() if now is None else now
+        resend = []
+        expired = []
+        with self.cond:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, key = heapq.heappop(self._heap)
+                entry = self._pending.get(key)
+                if entry is None:
+                    continue  # 이미 ACK 됨
+                if entry["attempts"] >= self.max_retries:
+                    del self._pending[key]
+                    expired.append((key, entry))
+                    self.cond.notify_all()
+                    continue
+                entry["attempts"] += 1
+                resend.append((key, entry))
+                heapq.heappush(self._heap, (now + self.ack_timeout, next(self._order), key))
+
+        for (connection, seq), entry in resend:
+            try:
+                connection.sendall(entry["frame"])
+                self.retransmits += 1
+                print(f"[🔁 재전송] {entry['truck_id']} ← {entry['cmd']} (seq={seq}, {entry['attempts']}/{self.max_retries})")
+            except OSError as e:
+                print(f"[⚠️ 재전송 실패] {entry['truck_id']} ← {entry['cmd']} (seq={seq}): {e}")
+        for (connection, seq), entry in expired:
+            print(f"[❌ 전달 실패] {entry['truck_id']} ← {entry['cmd']} (seq={seq}) - ACK 없음")
+            for callback in list(self._listeners):
+                try:
+                    callback(entry["truck_id"], entry["cmd"], seq)
+                except Exception as e:
+                    print(f"[⚠️ 전달 실패 처리 오류] {e}")
+        return len(resend)
+
+    # -------------------------------- 스레드 --------------------------------
+
+    def start(self):
+        with self.cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self.cond:
+            self._running = False
+            self._pending.clear()
+            self._heap.clear()
+            self.cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                if not self._running:
+                    return
+                deadline = self._heap[0][0] if self._heap else None
+                timeout = None if deadline is None else max(0.0, deadline - self.clock())
+                if timeout is None or timeout > 0:
+                    self.cond.wait(timeout)
+                    continue
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[⚠️ 재전송 처리 오류] {e}")
+
+    # -------------------------------------------------------------------------------
+
+    def _on_connection_event(self, event, truck_id, connection):
+        """끊긴 연결로 보낸 프레임은 재전송하지 않음 (새 연결은 순번이 새로 시작)"""
+        if event != EVENT_DISCONNECTED:
+            return
+        with self.cond:
+            for key in [key for key in self._pending if key[0] is connection]:
+                del self._pending[key]
+            self.cond.notify_all()
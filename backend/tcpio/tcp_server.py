@@ -4,20 +4,44 @@ import traceback
 import socket
 import threading
 from backend.tcpio.protocol import TCPProtocol
+from backend.tcpio.connection_registry import ConnectionRegistry
+from backend.tcpio.liveness_monitor import (
+    LivenessMonitor, DEFAULT_IDLE_TIMEOUT, DEFAULT_PROBE_INTERVAL, DEFAULT_MAX_MISSES, DEFAULT_RECONNECT_GRACE
+)
+from backend.fleet.fleet_registry import get_fleet_registry
+from backend.tcpio.listener import open_listener
 from backend.main_controller.main_controller import MainController
-import time
+from backend.capture.traffic_recorder import get_traffic_recorder, tcp_stream, KIND_TCP_IN, KIND_TCP_OPEN, KIND_TCP_CLOSE
+from backend.faults.fault_injector import get_fault_injector
+
+# 첫 메시지(트럭 ID)를 보내지 않는 연결을 끊기까지 기다리는 시간 - 등록 후에는 생존 감시가 담당
+UNBOUND_TIMEOUT = 30.0
 
 
 class TCPServer:
-    def __init__(self, host="0.0.0.0", port=8000, app_controller=None):
+    def __init__(self, host="0.0.0.0", port=8000, app_controller=None,
+                 liveness_idle=DEFAULT_IDLE_TIMEOUT, liveness_interval=DEFAULT_PROBE_INTERVAL,
+                 liveness_misses=DEFAULT_MAX_MISSES, liveness_grace=DEFAULT_RECONNECT_GRACE):
         self.host = host
         self.port = port
         self.clients = {}         # addr → socket
-        self.truck_sockets = {}   # truck_id → socket
         self.running = False
 
-        # MainController 초기화 및 트럭 소켓 맵 설정
+        # MainController 초기화 및 트럭 연결 레지스트리 공유 (명령 전송자가 같은 레지스트리 참조)
         self.app = app_controller if app_controller else MainController(port_map={})
+        self.connections = getattr(self.app, 'connections', None)
+        if self.connections is None:
+            self.connections = ConnectionRegistry()
+
+        # 트럭 생존 감시 - 체크를 협상한 트럭은 하트비트 체크 후, 체크 미지원 트럭은 silent_timeout 무수신 시 오프라인 처리 (FSM 에 통보)
+        self.liveness = LivenessMonitor(self.connections, idle_timeout=liveness_idle,
+                                        probe_interval=liveness_interval, max_misses=liveness_misses,
+                                        reconnect_grace=liveness_grace)
+        if hasattr(self.app, 'handle_truck_offline'):
+            self.liveness.add_listener(self.app.handle_truck_offline)
+
+        # v2 ACK 를 재전송 대기 목록에 반영할 명령 전송자
+        self.command_sender = getattr(self.app, 'command_sender', None)
         
         # MainController에 tcp_server 참조 설정 (순환 참조 방지를 위해 명시적으로 설정)
         if hasattr(self.app, 'set_tcp_server'):
@@ -25,8 +49,11 @@ class TCPServer:
         else:
             setattr(self.app, 'tcp_server', self)
             print("[✅ TCP 서버 참조 설정] MainController에 tcp_server 참조가 설정되었습니다.")
-        
-        self.app.set_truck_commander(self.truck_sockets)
+
+    @property
+    def truck_sockets(self):
+        """truck_id → socket 스냅샷 (조회용 - 등록 / 해제는 connections 로)"""
+        return self.connections.sockets()
 
     @staticmethod
     def is_port_in_use(port, host='0.0.0.0'):
@@ -63,56 +90,21 @@ class TCPServer:
                 return port
         return None
 
-    def start(self):
+    def start(self, listener=None):
         self.running = True
         
         try:
-            # 새 소켓 생성
-            self.server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            
-            # SO_REUSEADDR 및 SO_REUSEPORT 옵션 설정 (가능한 경우)
-            self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            try:
-                # SO_REUSEPORT는 일부 플랫폼에서만 지원
-                self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
-            except (AttributeError, OSError):
-                # 지원하지 않는 플랫폼에서는 무시
-                pass
-            
-            # 소켓 타임아웃 설정
-            self.server_sock.settimeout(1.0)  # 1초 타임아웃으로 accept 대기
-            
-            # 바인딩 시도
-            try:
-                self.server_sock.bind((self.host, self.port))
-            except OSError as e:
-                if "Address already in use" in str(e):
-                    print(f"[⚠️ 포트 {self.port} 사용 중] 5초 후 다시 시도...")
-                    # 기존 소켓 닫기
-                    self.server_sock.close()
-                    # 5초 대기
-                    time.sleep(5)
-                    # 새 소켓 생성 및 재시도
-                    self.server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                    try:
-                        self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
-                    except (AttributeError, OSError):
-                        pass
-                    self.server_sock.settimeout(1.0)
-                    self.server_sock.bind((self.host, self.port))
-                else:
-                    raise
-                
-            self.server_sock.listen(5)  # 백로그 크기 명시적 설정
+            # 런처가 미리 연 리스닝 소켓이 있으면 그대로 사용
+            self.server_sock = listener or open_listener(self.host, self.port)
             print(f"[🚀 TCP 서버 시작] {self.host}:{self.port}")
+            self.liveness.start()
 
             # 클라이언트 연결을 위한 루프
             while self.running:
                 try:
                     client_sock, addr = self.server_sock.accept()
-                    # 클라이언트 연결 타임아웃 설정
-                    client_sock.settimeout(30.0)  # 클라이언트 소켓에 30초 타임아웃 설정
+                    # 트럭 ID 를 보내기 전까지만 타임아웃 적용
+                    client_sock.settimeout(UNBOUND_TIMEOUT)
                     self.clients[addr] = client_sock
                     print(f"[✅ 클라이언트 연결됨] {addr}")
 
@@ -138,20 +130,12 @@ class TCPServer:
 
     def handle_client(self, client_sock, addr):
         """클라이언트 연결 처리 메서드"""
+        # 트럭 ID 는 첫 메시지에서 등록 (그 전에는 TEMP_<포트> 로 표시)
+        connection = self.connections.open(addr, client_sock)
+        recorder = get_traffic_recorder()
+        if recorder is not None:
+            recorder.record(KIND_TCP_OPEN, tcp_stream(addr))
         try:
-            temp_truck_id = f"TEMP_{addr[1]}"
-            self.truck_sockets[temp_truck_id] = client_sock
-            
-            # 예외 처리 추가 - 안전하게 처리
-            try:
-                self.app.set_truck_commander(self.truck_sockets)
-            except Exception as e:
-                print(f"[⚠️ 명령 전송자 설정 오류] {e}")
-                print("[🔄 오류 복구] 명령 전송자 설정 오류를 무시하고 계속 진행합니다.")
-                # 스택 추적 출력
-                import traceback
-                traceback.print_exc()
-
             # 소켓 설정 개선
             try:
                 # TCP Keepalive 설정
@@ -166,27 +150,8 @@ class TCPServer:
             except (ImportError, AttributeError) as e:
                 print(f"[ℹ️ 정보] TCP Keepalive 세부 설정이 지원되지 않습니다: {e}")
             
-            # 소켓 타임아웃 설정 (클라이언트 응답 타임아웃)
-            client_sock.settimeout(120.0)  # 2분 타임아웃
-
-            last_activity_time = time.time()
-            
             while True:
                 try:
-                    current_time = time.time()
-                    # 장시간 연결 유지 확인 (5분 이상 활동 없을 때)
-                    if current_time - last_activity_time > 300:  # 5분
-                        print(f"[ℹ️ 활동 확인] {addr} - 장시간 활동이 없는 연결 확인 중")
-                        # 소켓이 살아있는지 확인
-                        try:
-                            # 0바이트 데이터로 소켓 상태 확인
-                            client_sock.send(b'')
-                            last_activity_time = current_time
-                            print(f"[✅ 연결 유지] {addr} - 연결 상태 양호")
-                        except:
-                            print(f"[⚠️ 연결 끊김] {addr} - 장시간 활동이 없는 연결 종료")
-                            break
-                    
                     # 헤더 데이터 수신 (4바이트)
                     header_data = client_sock.recv(4)
                     if not header_data:
@@ -197,11 +162,8 @@ class TCPServer:
                         print(f"[⚠️ 불완전한 헤더 수신] {addr}")
                         continue
                     
-                    # 활동 시간 갱신
-                    last_activity_time = current_time
-                    
-                    # 페이로드 길이 추출
-                    payload_len = header_data[3]
+                    # 페이로드 길이 추출 (확장 ID / v2 seq 가 있으면 페이로드 앞에 이어짐)
+                    payload_len = header_data[3] + TCPProtocol.extension_length(header_data, connection.version)
                     
                     # 페이로드 수신 (있는 경우)
                     payload_data = b''
@@ -213,59 +175,15 @@ class TCPServer:
                     
                     # 전체 메시지
                     raw_data = header_data + payload_data
-                    print(f"[📩 수신 원문] {raw_data.hex()}")
-                    
-                    # 메시지 파싱 - 예외 처리 추가
-                    try:
-                        message = TCPProtocol.parse_message(raw_data)
-                        if "type" in message and message["type"] == "INVALID":
-                            print(f"[⚠️ 메시지 파싱 실패] {message.get('error', '알 수 없는 오류')}")
+                    recorder = get_traffic_recorder()
+                    if recorder is not None:
+                        recorder.record(KIND_TCP_IN, tcp_stream(addr), raw_data)
+                    injector = get_fault_injector()
+                    if injector.active:
+                        raw_data = injector.tcp_in(connection, raw_data)
+                        if raw_data is None:
                             continue
-                    except Exception as e:
-                        print(f"[⚠️ 메시지 파싱 오류] {e}, 데이터: {raw_data.hex()}")
-                        continue  # 연결은 유지
-                    
-                    # ✅ 여기에서 무조건 truck_id 등록
-                    truck_id = message.get("sender")
-                    if truck_id:
-                        if truck_id not in self.truck_sockets:
-                            print(f"[🔗 등록] 트럭 '{truck_id}' 소켓 등록")
-                            # ✅ 임시 트럭 ID 제거
-                            if temp_truck_id in self.truck_sockets:
-                                del self.truck_sockets[temp_truck_id]
-                        self.truck_sockets[truck_id] = client_sock
-                        
-                        # ✅ AppController의 TruckCommandSender 업데이트 - 예외 처리 추가
-                        try:
-                            self.app.set_truck_commander(self.truck_sockets)
-                        except Exception as e:
-                            print(f"[⚠️ 명령 전송자 설정 오류] {e}")
-                            # 오류는 무시하고 진행
-
-                    # 하트비트 메시지 특별 처리
-                    if message.get("cmd") == "HELLO":
-                        print(f"[💓 하트비트] 트럭 {truck_id}에서 하트비트 수신")
-                        # 하트비트 응답 메시지 전송
-                        try:
-                            response = TCPProtocol.build_message(
-                                sender="SERVER",
-                                receiver=truck_id,
-                                cmd="HEARTBEAT_ACK",
-                                payload={}
-                            )
-                            client_sock.sendall(response)
-                        except Exception as e:
-                            print(f"[⚠️ 하트비트 응답 오류] {e}")
-                        continue
-
-                    # ✅ 메시지 처리 위임 - 예외 처리 추가
-                    try:
-                        self.app.handle_message(message)
-                    except Exception as e:
-                        print(f"[⚠️ 메시지 처리 오류] {e}")
-                        import traceback
-                        traceback.print_exc()
-                        # 처리 오류가 발생해도 연결은 유지
+                    self.handle_frame(connection, raw_data)
 
                 except ConnectionResetError:
                     print(f"[⚠️ 연결 재설정] {addr}")
@@ -274,34 +192,13 @@ class TCPServer:
                     print(f"[⚠️ 연결 중단] {addr}")
                     break
                 except socket.timeout:
-                    # 2분간 데이터 없으면 하트비트 체크 메시지 전송
-                    print(f"[⚠️ 소켓 타임아웃] {addr} - 하트비트 체크 시도")
-                    try:
-                        # 클라이언트가 등록된 트럭인지 확인
-                        registered_truck_id = None
-                        for tid, sock in self.truck_sockets.items():
-                            if sock == client_sock and not tid.startswith("TEMP_"):
-                                registered_truck_id = tid
-                                break
-                        
-                        if registered_truck_id:
-                            # 하트비트 요청 메시지 전송
-                            heartbeat_msg = TCPProtocol.build_message(
-                                sender="SERVER",
-                                receiver=registered_truck_id,
-                                cmd="HEARTBEAT_CHECK", 
-                                payload={}
-                            )
-                            client_sock.sendall(heartbeat_msg)
-                            print(f"[💓 하트비트 체크] {registered_truck_id}에게 생존 확인 메시지 전송")
-                            # 활동 시간 갱신
-                            last_activity_time = time.time()
-                        else:
-                            print(f"[⚠️ 미등록 연결] {addr} - 타임아웃으로 종료")
-                            break
-                    except:
-                        print(f"[❌ 연결 종료] {addr} - 하트비트 체크 실패")
-                        break
+                    # 트럭 ID 를 보내지 않은 연결만 타임아웃이 걸려 있음
+                    print(f"[⚠️ 미등록 연결] {addr} - 타임아웃으로 종료")
+                    break
+                except OSError as e:
+                    # 생존 감시가 소켓을 닫은 경우 등
+                    print(f"[❌ 연결 종료] {addr} → {e}")
+                    break
                 except Exception as e:
                     print(f"[⚠️ 에러] {addr} → {e}")
                     import traceback
@@ -315,24 +212,110 @@ class TCPServer:
                 # 클라이언트 소켓 닫기
                 client_sock.close()
                 
-                # 트럭 매핑에서 제거
-                for truck_id, sock in list(self.truck_sockets.items()):
-                    if sock == client_sock:
-                        del self.truck_sockets[truck_id]
-                        print(f"[🔌 트럭 연결 종료] {truck_id}")
+                # 연결 레지스트리에서 제거 (같은 트럭이 이미 재연결했다면 새 연결은 유지)
+                self.connections.close(connection)
+                recorder = get_traffic_recorder()
+                if recorder is not None:
+                    recorder.record(KIND_TCP_CLOSE, tcp_stream(addr))
                 
                 # 클라이언트 딕셔너리에서 제거
                 if addr in self.clients:
                     del self.clients[addr]
-                    
-                # AppController의 TruckCommandSender 업데이트 - 예외 처리 추가
-                try:
-                    self.app.set_truck_commander(self.truck_sockets)
-                except Exception as e:
-                    print(f"[⚠️ 명령 전송자 설정 오류 (정리 중)] {e}")
             except Exception as e:
                 print(f"[⚠️ 소켓 정리 오류] {addr} → {e}")
 
+    def handle_frame(self, connection, raw_data):
+        """수신 프레임 하나 처리 (파싱 → 트럭 등록 → ACK / 하트비트 → MainController) - 녹화 재생도 이 경로 사용"""
+        print(f"[📩 수신 원문] {raw_data.hex()}")
+        
+        # 메시지 파싱 - 예외 처리 추가
+        try:
+            message = TCPProtocol.parse_message(raw_data, connection.version)
+            if "type" in message and message["type"] == "INVALID":
+                print(f"[⚠️ 메시지 파싱 실패] {message.get('error', '알 수 없는 오류')}")
+                return
+        except Exception as e:
+            print(f"[⚠️ 메시지 파싱 오류] {e}, 데이터: {raw_data.hex()}")
+            return  # 연결은 유지
+        
+        # ✅ 여기에서 truck_id 등록 (이미 이 연결에 등록되어 있으면 아무 작업 없음)
+        truck_id = message.get("sender")
+        if truck_id == "UNKNOWN":
+            truck_id = self._admit_sender(connection, message)
+            if truck_id is None:
+                print(f"[⚠️ 미등록 송신자 무시] 프로토콜 ID {message.get('sender_code')} → {message.get('cmd')}")
+                return
+            message["sender"] = truck_id
+        if truck_id:
+            self.connections.bind(truck_id, connection)
+            if connection.sock.gettimeout() is not None:
+                connection.sock.settimeout(None)  # 이후 무응답 감지는 생존 감시가 담당
+            self.liveness.touch(truck_id)
+
+        # 하트비트 체크 응답은 생존 확인으로만 사용
+        if message.get("cmd") == "HEARTBEAT_ACK":
+            return
+
+        # v2 - ACK 반영, ACK 요청 프레임은 응답 후 중복(재전송)이면 처리하지 않음
+        seq = message.get("seq")
+        if message.get("cmd") == "ACK":
+            if self.command_sender:
+                self.command_sender.handle_ack(connection, seq)
+            return
+        if seq and message["flags"] & TCPProtocol.FLAG_ACK_REQUEST:
+            connection.sendall(TCPProtocol.build_ack("SERVER", truck_id, seq))
+            if connection.received.is_duplicate(seq):
+                print(f"[🔁 중복 수신 무시] {truck_id} → {message.get('cmd')} (seq={seq})")
+                return
+
+        # 하트비트 메시지 특별 처리 (버전 협상 포함)
+        if message.get("cmd") == "HELLO":
+            print(f"[💓 하트비트] 트럭 {truck_id}에서 하트비트 수신")
+            try:
+                self._reply_hello(connection, truck_id, message.get("payload", {}).get("version"))
+            except Exception as e:
+                print(f"[⚠️ 하트비트 응답 오류] {e}")
+            return
+
+        # ✅ 메시지 처리 위임 - 예외 처리 추가
+        try:
+            self.app.handle_message(message)
+        except Exception as e:
+            print(f"[⚠️ 메시지 처리 오류] {e}")
+            traceback.print_exc()
+            # 처리 오류가 발생해도 연결은 유지
+
+    def _admit_sender(self, connection, message):
+        """
+        미등록 송신자 ID 자동 등록 - 연결의 첫 프레임(아직 트럭이 묶이지 않은 연결)이나 HELLO 에서만
+        이미 다른 트럭으로 식별된 연결의 잡음 / 손상 프레임이 새 트럭을 만들지 않도록 한다.
+        """
+        if connection.truck_ids and message.get("cmd") != "HELLO":
+            return None
+        return get_fleet_registry().admit(message.get("sender_code"))
+
+    def _reply_hello(self, connection, truck_id, requested_version):
+        """HELLO 응답 - 트럭이 버전을 보냈으면 협상 결과를 실어 보내고 이후 프레임부터 그 버전 사용"""
+        payload = {}
+        version = connection.version
+        if requested_version:
+            # 버전을 보내는 트럭은 HEARTBEAT_CHECK 에 응답함 (펌웨어 트럭은 버전 없이 HELLO 만 보냄)
+            self.liveness.enable_probes(truck_id)
+        if requested_version and connection.version == TCPProtocol.PROTOCOL_V1:
+            version = max(TCPProtocol.PROTOCOL_V1, min(requested_version, TCPProtocol.PROTOCOL_VERSION))
+            payload["version"] = version
+        elif requested_version:
+            payload["version"] = connection.version  # 이미 협상된 연결의 하트비트
+
+        # 응답은 협상 전 형식으로 보내고, 같은 잠금 안에서 버전 전환 (다른 스레드 송신과 섞이지 않도록)
+        with connection.send_lock:
+            connection.write(TCPProtocol.build_frame(
+                connection.version, sender="SERVER", receiver=truck_id, cmd="HEARTBEAT_ACK", payload=payload
+            ))
+            if version != connection.version:
+                connection.version = version
+                print(f"[🤝 프로토콜 협상] {truck_id}: v{version}")
+
     def safe_stop(self):
         """서버 소켓 및 모든 클라이언트 연결만 종료 (리소스 유지)"""
         # 먼저 running 플래그를 False로 설정
@@ -345,6 +328,11 @@ class TCPServer:
         
         print("[🛑 TCP 서버 안전 종료 시작]")
         
+        # 종료 중 연결 해제는 오프라인(비상) 처리하지 않음
+        self.liveness.stop()
+        if self.command_sender:
+            self.command_sender.retransmit.stop()
+        
         # 모든 클라이언트 소켓 정리
         for addr, sock in list(self.clients.items()):
             try:
@@ -368,7 +356,7 @@ class TCPServer:
         
         # 연결 정보 초기화 (참조는 유지)
         self.clients.clear()
-        self.truck_sockets.clear()
+        self.connections.clear()
         
         print("[🔌 TCP 서버 안전 종료됨 (리소스는 유지됨)]")
 
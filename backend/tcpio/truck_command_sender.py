@@ -1,11 +1,72 @@
+import time
+
 from .protocol import TCPProtocol
+from .connection_registry import ConnectionRegistry, EVENT_CONNECTED
+from .retransmit_queue import RetransmitQueue
 
 class TruckCommandSender:
-    def __init__(self, truck_sockets: dict):
-        self.truck_sockets = truck_sockets
+    """
+    트럭 명령 전송자 - 연결 레지스트리 하나를 계속 참조 (연결이 바뀌어도 다시 만들지 않음)
+    
+    v2 로 협상한 트럭에는 순번을 붙여 보내고 ACK 가 올 때까지 재전송한다. v1 트럭은 기존처럼 한 번만 보낸다.
+    """
+    
+    def __init__(self, connections: ConnectionRegistry = None, retransmit: RetransmitQueue = None):
+        self.connections = connections if connections is not None else ConnectionRegistry()
+        self.retransmit = retransmit if retransmit is not None else RetransmitQueue(self.connections)
         self.truck_status_manager = None  # 트럭 상태 관리자 참조 추가
         self.registration_failures = {}   # 트럭 ID별 등록 실패 횟수 추적
         self.tcp_server = None            # TCP 서버 인스턴스 참조 추가
+        self.connections.add_listener(self._on_connection_event)
+    
+    @property
+    def truck_sockets(self) -> dict:
+        """truck_id → socket 스냅샷 (조회용)"""
+        return self.connections.sockets()
+    
+    def connected_trucks(self) -> list:
+        """현재 연결된 트럭 ID 목록"""
+        return self.connections.truck_ids()
+    
+    def _on_connection_event(self, event, truck_id, connection):
+        if event == EVENT_CONNECTED:
+            self.registration_failures.pop(truck_id, None)
+    
+    # -------------------------------- v2 전달 확인 --------------------------------
+    
+    def is_reliable(self, truck_id: str) -> bool:
+        """ACK / 재전송을 쓰는 v2 연결인지"""
+        connection = self.connections.get(truck_id)
+        return connection is not None and connection.version >= TCPProtocol.PROTOCOL_V2
+    
+    def handle_ack(self, connection, seq: int) -> bool:
+        """트럭이 보낸 ACK 처리 (TCP 서버 수신 스레드에서 호출)"""
+        return self.retransmit.ack(connection, seq)
+    
+    def settle(self, truck_id: str, fallback_delay: float) -> bool:
+        """
+        연속 명령 사이 대기 - v2 는 재전송 + 순서 보장으로 대기 없이 바로 반환 (True)
+        ACK 가 없는 v1 은 트럭이 앞 명령을 처리하도록 기존처럼 fallback_delay 초 대기
+        (ACK 는 이 메서드를 부른 수신 스레드가 읽으므로 여기서 ACK 를 기다리지 않음)
+        """
+        if self.is_reliable(truck_id):
+            return True
+        time.sleep(fallback_delay)
+        return False
+    
+    def _transmit(self, connection, truck_id: str, cmd: str, payload: dict):
+        """연결 버전에 맞춰 전송 - v2 는 순번을 붙이고 ACK 대기 목록에 등록"""
+        # 버전 확인과 전송을 한 잠금 안에서 (HELLO 협상으로 버전이 바뀌는 중에도 프레임 형식이 맞도록)
+        with connection.send_lock:
+            if connection.version >= TCPProtocol.PROTOCOL_V2:
+                seq = connection.next_seq()
+                frame = TCPProtocol.build_message("SERVER", truck_id, cmd, payload,
+                                                  seq=seq, flags=TCPProtocol.FLAG_ACK_REQUEST)
+                # ACK 가 sendall 보다 먼저 도착해도 놓치지 않도록 먼저 등록
+                self.retransmit.track(connection, truck_id, seq, cmd, frame)
+            else:
+                frame = TCPProtocol.build_message("SERVER", truck_id, cmd, payload)
+            connection.write(frame)
     
     # 트럭 상태 관리자 설정 메소드 추가
     def set_truck_status_manager(self, truck_status_manager):
@@ -20,10 +81,13 @@ class TruckCommandSender:
         print(f"[✅ TCP 서버 설정] tcp_server가 command_sender에 설정되었습니다.")
     
     def send(self, truck_id: str, cmd: str, payload: dict = None) -> bool:
-        # 등록 여부 확인 및 자동 등록 시도
-        if not self.is_registered(truck_id):
+        # 전송 시점의 연결 조회 (O(1)) - 재연결 중이면 새 연결로 전송
+        connection = self.connections.get(truck_id)
+        if connection is None:
+            print(f"[⚠️ 등록 확인 실패] 트럭 {truck_id}는 연결 레지스트리에 등록되어 있지 않습니다.")
             # 자동 등록 시도
-            if self._try_auto_register(truck_id):
+            connection = self._try_auto_register(truck_id)
+            if connection:
                 print(f"[✅ 트럭 소켓 자동 등록 성공] {truck_id} 소켓이 자동으로 등록되었습니다. 명령 전송을 계속합니다.")
             else:
                 # 등록 실패 횟수 증가
@@ -32,7 +96,7 @@ class TruckCommandSender:
                 
                 # 명령 전송 실패 상세 로깅
                 print(f"[❌ 트럭 소켓 미등록] 트럭 {truck_id}에 대한 {cmd} 명령 전송 실패 (미등록 오류 {failure_count}회)")
-                print(f"[📋 등록 상태] 현재 등록된 트럭: {list(self.truck_sockets.keys())}")
+                print(f"[📋 등록 상태] 현재 등록된 트럭: {self.connected_trucks()}")
                 return False
         
         if payload is None:
@@ -91,16 +155,9 @@ class TruckCommandSender:
                     # 목표 위치가 없으면 빈 페이로드 사용
                     payload = {}
             
-            # 바이너리 메시지 생성
-            message = TCPProtocol.build_message("SERVER", truck_id, cmd, payload)
-            
             # 메시지 전송 및 로깅
             print(f"[📤 송신] {truck_id} ← {cmd} | payload={payload}")
-            self.truck_sockets[truck_id].sendall(message)
-            
-            # 정상 전송 시 등록 실패 카운터 초기화
-            if truck_id in self.registration_failures:
-                del self.registration_failures[truck_id]
+            self._transmit(connection, truck_id, cmd, payload)
             
             # MISSION_ASSIGNED 명령 바로 전송 - mission_id가 있을 경우
             if cmd == "RUN" and "mission_id" in (payload or {}) and payload["mission_id"] is not None:
@@ -111,12 +168,8 @@ class TruckCommandSender:
                 }
                 
                 try:
-                    # 바이너리 메시지 생성
-                    mission_message = TCPProtocol.build_message("SERVER", truck_id, "MISSION_ASSIGNED", mission_payload)
-                    
-                    if truck_id in self.truck_sockets:
-                        self.truck_sockets[truck_id].sendall(mission_message)
-                        print(f"[🚚 미션 할당 전송] {truck_id} ← MISSION_ASSIGNED | payload={mission_payload}")
+                    self._transmit(connection, truck_id, "MISSION_ASSIGNED", mission_payload)
+                    print(f"[🚚 미션 할당 전송] {truck_id} ← MISSION_ASSIGNED | payload={mission_payload}")
                 except Exception as e:
                     print(f"[❌ MISSION_ASSIGNED 전송 실패] {truck_id}: {e}")
                 
@@ -126,57 +179,23 @@ class TruckCommandSender:
             return False
 
     def is_registered(self, truck_id: str) -> bool:
-        is_registered = truck_id in self.truck_sockets
+        is_registered = self.connections.is_connected(truck_id)
         if not is_registered:
-            print(f"[⚠️ 등록 확인 실패] 트럭 {truck_id}는 truck_sockets에 등록되어 있지 않습니다.")
+            print(f"[⚠️ 등록 확인 실패] 트럭 {truck_id}는 연결 레지스트리에 등록되어 있지 않습니다.")
         return is_registered
     
-    def _try_auto_register(self, truck_id: str) -> bool:
-        """트럭 소켓 자동 등록 시도"""
+    def _try_auto_register(self, truck_id: str):
+        """트럭 소켓 자동 등록 시도 - 트럭 ID 를 모르는 연결에만 등록"""
         try:
-            # TCP 서버 참조가 없으면 등록 불가
-            if not self.tcp_server:
-                print(f"[⚠️ 자동 등록 실패] TCP 서버 참조가 없어 {truck_id} 소켓을 자동 등록할 수 없습니다.")
-                return False
-            
-            # 임시 ID로 등록된 소켓을 확인
-            temp_sock = None
-            for tid, sock in self.tcp_server.truck_sockets.items():
-                if tid.startswith("TEMP_"):
-                    temp_sock = sock
-                    temp_id = tid
-                    print(f"[🔍 임시 소켓 발견] {temp_id}를 {truck_id}로 변환합니다.")
-                    
-                    # 임시 ID 제거 및 실제 ID로 등록
-                    del self.tcp_server.truck_sockets[temp_id]
-                    self.tcp_server.truck_sockets[truck_id] = sock
-                    self.truck_sockets[truck_id] = sock
-                    
-                    print(f"[✅ 소켓 등록 완료] 임시 ID({temp_id})가 {truck_id}로 변환되었습니다.")
-                    return True
-            
-            # 연결된 소켓이 하나만 있는 경우(가장 최근 연결) 해당 소켓 사용
-            if len(self.tcp_server.clients) == 1:
-                addr, sock = next(iter(self.tcp_server.clients.items()))
-                self.tcp_server.truck_sockets[truck_id] = sock
-                self.truck_sockets[truck_id] = sock
-                print(f"[✅ 소켓 자동 등록] 단일 연결된 클라이언트 소켓을 {truck_id}로 등록했습니다.")
-                return True
-            
-            # 모든 클라이언트 소켓 확인
-            if self.tcp_server.clients:
-                # 가장 최근에 연결된 클라이언트 소켓 사용
-                addr, sock = list(self.tcp_server.clients.items())[-1]
-                self.tcp_server.truck_sockets[truck_id] = sock
-                self.truck_sockets[truck_id] = sock
-                print(f"[✅ 소켓 자동 등록] 가장 최근 연결된 클라이언트 소켓을 {truck_id}로 등록했습니다.")
-                return True
-            
-            print(f"[⚠️ 자동 등록 실패] 사용 가능한 소켓을 찾지 못했습니다.")
-            return False
+            connection = self.connections.auto_bind(truck_id)
+            if connection is None:
+                print(f"[⚠️ 자동 등록 실패] 트럭 ID 가 정해지지 않은 소켓이 없습니다.")
+                return None
+            print(f"[✅ 소켓 자동 등록] {connection.addr} 연결을 {truck_id}로 등록했습니다.")
+            return connection
         except Exception as e:
             print(f"[❌ 자동 등록 오류] {e}")
-            return False
+            return None
 
     def _handle_command(self, truck_id, cmd, payload=None):
         """명령 처리 및 전송"""
@@ -0,0 +1,5 @@
+# track package
+
+from .track_topology import TrackTopology, TrackNode, TrackEdge, get_track_topology
+from .gate_reservation import GateReservationManager
+from .station_scheduler import StationScheduler
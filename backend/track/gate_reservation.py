@@ -0,0 +1,208 @@
+# backend/track/gate_reservation.py
+
+import heapq
+import itertools
+import threading
+
+from .track_topology import direction_key
+
+# 진입 요청 결과
+ENTRY_OPEN = "OPEN"          # 게이트를 물리적으로 열어야 함
+ENTRY_ADMITTED = "ADMITTED"  # 이미 열린 게이트로 통과 (같은 개방 주기에 합류)
+ENTRY_QUEUED = "QUEUED"      # 구간이 사용 중 - 체크포인트에서 대기
+
+POLICY_FIFO = "FIFO"
+POLICY_PRIORITY = "PRIORITY"
+
+
+class GateSegment:
+    """게이트가 지키는 단일 차선 구간 (예: CHECKPOINT_A ↔ CHECKPOINT_B)"""
+    def __init__(self, gate_id):
+        self.gate_id = gate_id
+        self.is_open = False
+        self.flow_direction = None     # 현재 구간 내 주행 방향
+        self.occupants = []            # 구간 안의 트럭 (진입 순)
+        self.batch_count = 0           # 현재 개방 주기에서 같은 방향으로 진입한 대수
+        self.open_cycles = 0           # 물리적 개방 횟수 (서보 동작 통계)
+        self.queue = []                # (우선순위, 순번, truck_id, direction) 힙
+
+    def waiting_trucks(self):
+        return [entry[2] for entry in sorted(self.queue)]
+
+    def to_dict(self):
+        return {
+            "gate_id": self.gate_id,
+            "is_open": self.is_open,
+            "flow_direction": self.flow_direction,
+            "occupants": list(self.occupants),
+            "waiting": self.waiting_trucks(),
+            "batch_count": self.batch_count,
+            "open_cycles": self.open_cycles
+        }
+
+
+class GateReservationManager:
+    """
+    게이트 구간 예약 / 통행 제어
+
+    - 구간이 비어 있거나 같은 방향 트럭만 있으면 즉시 진입 (열린 게이트는 재개방하지 않음)
+    - 반대 방향 트럭이 구간에 있으면 대기열에 넣고, 구간이 비면 다음 묶음을 진입시킨다
+    - 구간이 비고 대기 트럭도 없을 때만 게이트를 닫는다
+    - 반대 방향 대기 트럭이 있으면 같은 방향 진입은 max_batch 대까지만 허용 (기아 방지)
+    """
+
+    def __init__(self, topology, policy=POLICY_FIFO, max_batch=3):
+        self.topology = topology
+        self.policy = policy
+        self.max_batch = max_batch
+        self.lock = threading.Lock()
+        self._seq = itertools.count()
+        self.segments = {gate_id: GateSegment(gate_id) for gate_id in topology.gates()}
+
+    # -------------------------------------------------------------------------------
+
+    def request_entry(self, gate_id, truck_id, direction, priority=0):
+        """진입 체크포인트 도착 시 호출 - ENTRY_OPEN / ENTRY_ADMITTED / ENTRY_QUEUED 반환"""
+        direction = direction_key(direction)
+        with self.lock:
+            segment = self.segments.get(gate_id)
+            if segment is None:
+                return ENTRY_OPEN
+
+            if truck_id in segment.occupants:
+                return ENTRY_ADMITTED if segment.is_open else ENTRY_OPEN
+            if any(entry[2] == truck_id for entry in segment.queue):
+                return ENTRY_QUEUED
+
+            if self._can_enter(segment, direction):
+                return self._admit(segment, truck_id, direction)
+
+            order = -priority if self.policy == POLICY_PRIORITY else 0
+            heapq.heappush(segment.queue, (order, next(self._seq), truck_id, direction))
+            print(f"[🚦 게이트 대기] {truck_id}: {gate_id} 구간 사용 중 ({segment.flow_direction}, {segment.occupants}) - 대기열 {len(segment.queue)}번째")
+            return ENTRY_QUEUED
+
+    def release(self, gate_id, truck_id):
+        """
+        진출 체크포인트 도착 시 호출
+        반환: {"close": 게이트를 닫아야 하는지, "admitted": 새로 진입시킨 트럭 목록}
+        """
+        with self.lock:
+            segment = self.segments.get(gate_id)
+            if segment is None:
+                return {"close": True, "admitted": []}
+
+            if truck_id in segment.occupants:
+                segment.occupants.remove(truck_id)
+
+            return self._after_exit(segment)
+
+    def remove_truck(self, truck_id):
+        """
+        미션 취소 / 비상 해제 / 통신 두절 시 트럭을 모든 구간과 대기열에서 제거
+        반환: {gate_id: release() 와 같은 결과} - 점유가 풀린 구간만 (다음 대기 묶음 진입 포함)
+        """
+        results = {}
+        with self.lock:
+            for segment in self.segments.values():
+                queue = [entry for entry in segment.queue if entry[2] != truck_id]
+                if len(queue) != len(segment.queue):
+                    heapq.heapify(queue)
+                    segment.queue = queue
+                if truck_id in segment.occupants:
+                    segment.occupants.remove(truck_id)
+                    results[segment.gate_id] = self._after_exit(segment)
+        return results
+
+    def remove_waiting(self, truck_id):
+        """
+        통신 두절 시 트럭을 대기열에서만 제거 - 구간 점유는 유지 (트럭이 아직 구간 안에 있을 수 있음)
+        반환: 대기열에서 빠진 gate_id 목록
+        """
+        removed = []
+        with self.lock:
+            for segment in self.segments.values():
+                queue = [entry for entry in segment.queue if entry[2] != truck_id]
+                if len(queue) != len(segment.queue):
+                    heapq.heapify(queue)
+                    segment.queue = queue
+                    removed.append(segment.gate_id)
+        return removed
+
+    def occupied_segments(self, truck_id):
+        """트럭이 점유 중인 구간 {gate_id: 주행 방향}"""
+        with self.lock:
+            return {gate_id: segment.flow_direction for gate_id, segment in self.segments.items()
+                    if truck_id in segment.occupants}
+
+    def mark_opened(self, gate_id):
+        """게이트가 물리적으로 열렸음을 기록"""
+        with self.lock:
+            segment = self.segments.get(gate_id)
+            if segment and not segment.is_open:
+                segment.is_open = True
+                segment.open_cycles += 1
+
+    def is_open(self, gate_id):
+        with self.lock:
+            segment = self.segments.get(gate_id)
+            return bool(segment) and segment.is_open
+
+    def get_status(self, gate_id=None):
+        with self.lock:
+            if gate_id:
+                segment = self.segments.get(gate_id)
+                return segment.to_dict() if segment else None
+            return {gid: segment.to_dict() for gid, segment in self.segments.items()}
+
+    # -------------------------------------------------------------------------------
+
+    def _after_exit(self, segment):
+        """구간에서 트럭 하나가 빠진 뒤 - 비었으면 다음 대기 묶음 진입, 대기도 없으면 닫기"""
+        if segment.occupants:
+            # 같은 방향 트럭이 아직 구간 안에 있음 - 게이트 유지
+            return {"close": False, "admitted": []}
+
+        segment.flow_direction = None
+        segment.batch_count = 0
+        admitted = self._admit_next_batch(segment)
+        if admitted:
+            return {"close": False, "admitted": admitted}
+
+        should_close = segment.is_open
+        segment.is_open = False
+        return {"close": should_close, "admitted": []}
+
+    def _can_enter(self, segment, direction):
+        if not segment.occupants:
+            # 빈 구간이라도 먼저 기다리던 트럭이 있으면 순서를 지킨다
+            return not segment.queue
+        if segment.flow_direction != direction:
+            return False
+        opposing_waiting = any(entry[3] != direction for entry in segment.queue)
+        return not opposing_waiting or segment.batch_count < self.max_batch
+
+    def _admit(self, segment, truck_id, direction):
+        segment.occupants.append(truck_id)
+        segment.flow_direction = direction
+        segment.batch_count += 1
+        if segment.is_open:
+            print(f"[🚦 게이트 합류] {truck_id}: 열린 {segment.gate_id}로 통과 ({direction}, 구간 내 {len(segment.occupants)}대)")
+            return ENTRY_ADMITTED
+        return ENTRY_OPEN
+
+    def _admit_next_batch(self, segment):
+        """대기열 선두와 같은 방향인 트럭을 max_batch 대까지 연속으로 진입"""
+        admitted = []
+        while segment.queue and len(admitted) < self.max_batch:
+            _, _, truck_id, direction = segment.queue[0]
+            if segment.flow_direction and direction != segment.flow_direction:
+                break
+            heapq.heappop(segment.queue)
+            segment.occupants.append(truck_id)
+            segment.flow_direction = direction
+            segment.batch_count += 1
+            admitted.append(truck_id)
+        if admitted:
+            print(f"[🚦 게이트 묶음 진입] {segment.gate_id}: {admitted} ({segment.flow_direction})")
+        return admitted
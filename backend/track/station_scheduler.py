@@ -0,0 +1,209 @@
+# backend/track/station_scheduler.py
+
+import threading
+import time
+
+from .track_topology import direction_key
+
+RESOURCE_DISPENSER = "DISPENSER"
+RESOURCE_BELT = "BELT"
+
+# 적재 작업 예상 소요 시간(초) - 하역 도착 예상 시간 계산에 사용
+DEFAULT_LOADING_TIME = 10.0
+
+
+class StationReservation:
+    """설비(디스펜서/벨트) 사용 예약 1건"""
+    def __init__(self, truck_id, resource, station, expected_arrival):
+        self.truck_id = truck_id
+        self.resource = resource
+        self.station = station
+        self.expected_arrival = expected_arrival  # time.monotonic() 기준
+        self.arrived = False
+        self.started = False
+        self.reserved_at = time.monotonic()
+
+    def to_dict(self):
+        return {
+            "truck_id": self.truck_id,
+            "resource": self.resource,
+            "station": self.station,
+            "eta_seconds": max(0.0, round(self.expected_arrival - time.monotonic(), 1)),
+            "arrived": self.arrived,
+            "started": self.started
+        }
+
+
+class StationScheduler:
+    """
+    디스펜서 / 벨트 예약 스케줄러
+
+    - 설비별로 예약 대기열을 두고 한 번에 한 트럭만 사용하도록 보장한다
+    - 도착한 트럭을 우선 처리하고, 나머지는 예상 도착 시간 순으로 정렬한다
+    - 디스펜서를 해제하면 (앞 트럭이 떠나는 동안) 다음 트럭의 적재 위치로 미리 이동시킨다
+    """
+
+    def __init__(self, topology, dispenser_controller=None, loading_time=DEFAULT_LOADING_TIME):
+        self.topology = topology
+        self.dispenser_controller = dispenser_controller
+        self.loading_time = loading_time
+        self.lock = threading.RLock()
+        self.reservations = {RESOURCE_DISPENSER: [], RESOURCE_BELT: []}
+        self.active = {RESOURCE_DISPENSER: None, RESOURCE_BELT: None}
+        self._preposition_thread = None
+
+    def set_dispenser_controller(self, dispenser_controller):
+        self.dispenser_controller = dispenser_controller
+
+    # -------------------------------- 예약 --------------------------------
+
+    def reserve_mission(self, truck_id, loading_target, position, direction):
+        """미션 할당 시 적재(디스펜서) / 하역(벨트) 예약을 함께 등록"""
+        loading_eta = self._eta(position, loading_target, direction)
+        self.reserve(RESOURCE_DISPENSER, truck_id, loading_target, loading_eta)
+
+        unloading_area = self.topology.unloading_area
+        unloading_eta = loading_eta + self.loading_time + self._eta(loading_target, unloading_area, direction)
+        self.reserve(RESOURCE_BELT, truck_id, unloading_area, unloading_eta)
+
+    def reserve(self, resource, truck_id, station, eta_seconds=0.0):
+        with self.lock:
+            queue = self.reservations[resource]
+            queue[:] = [r for r in queue if r.truck_id != truck_id]
+            queue.append(StationReservation(truck_id, resource, station, time.monotonic() + eta_seconds))
+            self._sort(resource)
+            print(f"[📅 설비 예약] {resource}: {truck_id} → {station} (ETA {eta_seconds:.1f}초, 대기열 {len(queue)}건)")
+            should_preposition = resource == RESOURCE_DISPENSER and self.active[resource] is None and queue[0].truck_id == truck_id
+
+        if should_preposition:
+            self._preposition(station)
+
+    def update_position(self, truck_id, position, direction):
+        """트럭 위치 변경 시 예상 도착 시간 갱신"""
+        with self.lock:
+            for resource, queue in self.reservations.items():
+                for reservation in queue:
+                    if reservation.truck_id != truck_id:
+                        continue
+                    if position == reservation.station:
+                        reservation.arrived = True
+                    eta = self.topology.eta(position, reservation.station, direction)
+                    if eta is not None:
+                        reservation.expected_arrival = time.monotonic() + eta
+                self._sort(resource)
+
+    def cancel(self, truck_id):
+        """미션 취소 등으로 트럭의 모든 예약 제거"""
+        with self.lock:
+            for resource, queue in self.reservations.items():
+                queue[:] = [r for r in queue if r.truck_id != truck_id]
+                if self.active[resource] == truck_id:
+                    self.active[resource] = None
+
+    # -------------------------------- 점유 / 해제 --------------------------------
+
+    def acquire(self, resource, truck_id, station=None):
+        """설비 점유 시도 - 다른 트럭이 사용 중이면 False"""
+        with self.lock:
+            holder = self.active[resource]
+            if holder and holder != truck_id:
+                print(f"[📅 설비 사용 중] {resource}: {holder} 사용 중 - {truck_id} 대기")
+                return False
+
+            reservation = self._find(resource, truck_id)
+            if reservation is None:
+                # 예약 없이 도착한 트럭 (수동 제어 등)
+                reservation = StationReservation(truck_id, resource, station, time.monotonic())
+                self.reservations[resource].insert(0, reservation)
+            reservation.arrived = True
+            self.active[resource] = truck_id
+            return True
+
+    def mark_started(self, resource, truck_id):
+        """설비 작업 시작 기록 - 이미 시작했으면 False (중복 명령 방지)"""
+        with self.lock:
+            reservation = self._find(resource, truck_id)
+            if reservation is None or reservation.started:
+                return False
+            reservation.started = True
+            return True
+
+    def release(self, resource, truck_id):
+        """설비 사용 종료 - 다음 예약을 반환 (디스펜서는 다음 적재 위치로 미리 이동)"""
+        with self.lock:
+            queue = self.reservations[resource]
+            queue[:] = [r for r in queue if r.truck_id != truck_id]
+            if self.active[resource] == truck_id:
+                self.active[resource] = None
+            next_reservation = queue[0] if queue else None
+
+        if next_reservation:
+            print(f"[📅 다음 예약] {resource}: {next_reservation.truck_id} → {next_reservation.station} ({'도착' if next_reservation.arrived else '이동 중'})")
+            if resource == RESOURCE_DISPENSER:
+                self._preposition(next_reservation.station)
+        return next_reservation
+
+    def holder(self, resource):
+        with self.lock:
+            return self.active[resource]
+
+    def get_status(self):
+        with self.lock:
+            return {
+                resource: {
+                    "active": self.active[resource],
+                    "queue": [r.to_dict() for r in queue]
+                }
+                for resource, queue in self.reservations.items()
+            }
+
+    # -------------------------------- 디스펜서 사전 이동 --------------------------------
+
+    @staticmethod
+    def route_for_station(station):
+        """적재 위치 → 디스펜서 경로 (LOAD_A → ROUTE_A)"""
+        if not station or not station.startswith("LOAD_"):
+            return None
+        return f"ROUTE_{station[len('LOAD_'):]}"
+
+    def wait_for_preposition(self, timeout=10.0):
+        """사전 이동이 진행 중이면 완료될 때까지 대기"""
+        thread = self._preposition_thread
+        if thread and thread.is_alive():
+            thread.join(timeout=timeout)
+
+    def _preposition(self, station):
+        route = self.route_for_station(station)
+        if not route or not self.dispenser_controller:
+            return
+        current = self.dispenser_controller.dispenser_position.get("DISPENSER")
+        if current == route:
+            return
+
+        self.wait_for_preposition()
+        print(f"[📅 디스펜서 사전 이동] {current} → {route} (다음 트럭 도착 전)")
+        self._preposition_thread = threading.Thread(
+            target=self.dispenser_controller.move_to_route,
+            args=("DISPENSER", route),
+            daemon=True
+        )
+        self._preposition_thread.start()
+
+    # -------------------------------------------------------------------------------
+
+    def _eta(self, src, dst, direction):
+        eta = self.topology.eta(src, dst, direction_key(direction)) if src and dst else None
+        return eta if eta is not None else 0.0
+
+    def _find(self, resource, truck_id):
+        for reservation in self.reservations[resource]:
+            if reservation.truck_id == truck_id:
+                return reservation
+        return None
+
+    def _sort(self, resource):
+        # 사용 중인 트럭 → 도착한 트럭 → 예상 도착 시간 순
+        active = self.active[resource]
+        self.reservations[resource].sort(
+            key=lambda r: (r.truck_id != active, not r.arrived, r.expected_arrival)
+        )
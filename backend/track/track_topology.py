@@ -0,0 +1,296 @@
+# backend/track/track_topology.py
+
+# 기본 주행 방향 (TruckFSM의 Direction.value 와 동일한 문자열)
+CLOCKWISE = "CLOCKWISE"
+COUNTERCLOCKWISE = "COUNTERCLOCKWISE"
+DIRECTIONS = (CLOCKWISE, COUNTERCLOCKWISE)
+
+# 노드 종류
+KIND_STANDBY = "STANDBY"
+KIND_CHECKPOINT = "CHECKPOINT"
+KIND_LOAD = "LOAD"
+KIND_BELT = "BELT"
+KIND_GATE = "GATE"
+
+# 구역 (미션 단계 결정에 사용)
+ZONE_STANDBY = "STANDBY"
+ZONE_TO_LOADING = "TO_LOADING"
+ZONE_LOADING = "LOADING"
+ZONE_TO_UNLOADING = "TO_UNLOADING"
+ZONE_UNLOADING = "UNLOADING"
+
+
+def direction_key(direction):
+    """Direction enum 또는 문자열을 방향 문자열로 변환"""
+    return getattr(direction, "value", direction)
+
+
+class TrackNode:
+    """트랙 위의 위치 (체크포인트, 적재장, 벨트, 게이트 등)"""
+    def __init__(self, name, kind, pos_code, zone=None, gui_key=None):
+        self.name = name
+        self.kind = kind
+        self.pos_code = pos_code          # TCP 프로토콜 위치 코드
+        self.zone = zone                  # 미션 구역 (게이트는 None)
+        self.gui_key = gui_key or name    # GUI 맵 노드 키
+
+    @property
+    def routable(self):
+        """경로 탐색 대상 여부 (게이트는 간선에 붙는 설비이므로 제외)"""
+        return self.kind != KIND_GATE
+
+
+class TrackEdge:
+    """시계방향 기준 유향 간선"""
+    def __init__(self, src, dst, travel_time, gate=None):
+        self.src = src
+        self.dst = dst
+        self.travel_time = float(travel_time)  # 예상 주행 시간 (초)
+        self.gate = gate                        # 간선을 막고 있는 게이트 ID
+
+
+class TrackTopology:
+    """
+    사이트 트랙 그래프 모델
+
+    간선은 시계방향 기준으로 정의하고 반시계방향은 역방향 간선으로 자동 생성한다.
+    생성 시점에 방향별 전체 쌍(next-hop, ETA) 테이블을 미리 계산해 두므로
+    FSM / GUI / 스케줄러의 조회는 모두 dict 조회(O(1))로 끝난다.
+    """
+
+    def __init__(self, nodes, edges):
+        self.nodes = {node.name: node for node in nodes}
+        self.edges = list(edges)
+
+        for edge in self.edges:
+            for name in (edge.src, edge.dst):
+                if name not in self.nodes or not self.nodes[name].routable:
+                    raise ValueError(f"간선에 사용할 수 없는 노드: {name}")
+            if edge.gate and edge.gate not in self.nodes:
+                raise ValueError(f"정의되지 않은 게이트: {edge.gate}")
+
+        # 방향별 인접 리스트 / 간선 조회 테이블
+        self._adjacency = {d: {} for d in DIRECTIONS}
+        self._edge_lookup = {d: {} for d in DIRECTIONS}
+        for name, node in self.nodes.items():
+            if node.routable:
+                for d in DIRECTIONS:
+                    self._adjacency[d][name] = []
+
+        for edge in self.edges:
+            self._add_edge(CLOCKWISE, edge.src, edge.dst, edge)
+            self._add_edge(COUNTERCLOCKWISE, edge.dst, edge.src, edge)
+
+        # 전체 쌍 테이블 사전 계산
+        self._next_hop = {}
+        self._eta = {}
+        for d in DIRECTIONS:
+            self._next_hop[d], self._eta[d] = self._build_tables(d)
+
+        # 체크포인트별 게이트 동작 테이블 사전 계산
+        self._gate_actions = {d: self._build_gate_actions(d) for d in DIRECTIONS}
+
+        # 위치 코드 / GUI 키 역매핑
+        self._by_pos_code = {node.pos_code: node.name for node in self.nodes.values()}
+        self._by_gui_key = {node.gui_key: node.name for node in self.nodes.values()}
+
+    # -------------------------------- 테이블 구성 --------------------------------
+
+    def _add_edge(self, direction, src, dst, edge):
+        self._adjacency[direction][src].append(dst)
+        self._edge_lookup[direction][(src, dst)] = edge
+
+    def _build_tables(self, direction):
+        """Floyd-Warshall 로 (출발, 도착) → 다음 노드 / 예상 시간 테이블 생성"""
+        names = list(self._adjacency[direction].keys())
+        inf = float("inf")
+        dist = {(u, v): (0.0 if u == v else inf) for u in names for v in names}
+        nxt = {}
+
+        for (u, v), edge in self._edge_lookup[direction].items():
+            if edge.travel_time < dist[(u, v)]:
+                dist[(u, v)] = edge.travel_time
+                nxt[(u, v)] = v
+
+        for k in names:
+            for u in names:
+                d_uk = dist[(u, k)]
+                if d_uk == inf:
+                    continue
+                for v in names:
+                    candidate = d_uk + dist[(k, v)]
+                    if candidate < dist[(u, v)]:
+                        dist[(u, v)] = candidate
+                        nxt[(u, v)] = nxt[(u, k)]
+
+        eta = {key: value for key, value in dist.items() if value != inf}
+        return nxt, eta
+
+    def _build_gate_actions(self, direction):
+        """게이트가 있는 간선의 진입 체크포인트에서 열고, 진출 체크포인트에서 닫는다"""
+        actions = {
+            name: {"open": None, "close": None}
+            for name, node in self.nodes.items()
+            if node.kind == KIND_CHECKPOINT
+        }
+        for (src, dst), edge in self._edge_lookup[direction].items():
+            if not edge.gate:
+                continue
+            if src in actions:
+                actions[src]["open"] = edge.gate
+            if dst in actions:
+                actions[dst]["close"] = edge.gate
+        return actions
+
+    # -------------------------------- 경로 조회 --------------------------------
+
+    def next_hop(self, src, dst, direction=CLOCKWISE):
+        """src 에서 dst 로 가기 위한 다음 노드 (도달 불가/동일 위치면 None)"""
+        return self._next_hop[direction_key(direction)].get((src, dst))
+
+    def eta(self, src, dst, direction=CLOCKWISE):
+        """src → dst 예상 주행 시간(초), 도달 불가면 None"""
+        return self._eta[direction_key(direction)].get((src, dst))
+
+    def route(self, src, dst, direction=CLOCKWISE):
+        """src → dst 전체 경로 (src, dst 포함), 도달 불가면 빈 리스트"""
+        direction = direction_key(direction)
+        if (src, dst) not in self._eta[direction]:
+            return []
+        path = [src]
+        while path[-1] != dst:
+            path.append(self._next_hop[direction][(path[-1], dst)])
+        return path
+
+    def successors(self, position, direction=CLOCKWISE):
+        """해당 방향으로 바로 이어지는 노드 목록"""
+        return list(self._adjacency[direction_key(direction)].get(position, []))
+
+    def next_position(self, position, direction=CLOCKWISE, loading_target=None):
+        """
+        현재 위치에서 주행 방향의 다음 위치
+        분기(적재장 선택)가 있으면 loading_target 쪽 경로를 따른다.
+        """
+        outs = self.successors(position, direction)
+        if len(outs) == 1:
+            return outs[0]
+        if loading_target:
+            return self.next_hop(position, loading_target, direction)
+        return None
+
+    def gate_on_edge(self, src, dst, direction=CLOCKWISE):
+        """src → dst 간선을 막고 있는 게이트 ID"""
+        edge = self._edge_lookup[direction_key(direction)].get((src, dst))
+        return edge.gate if edge else None
+
+    def gate_action(self, checkpoint, direction=CLOCKWISE):
+        """체크포인트 도착 시 게이트 동작 {"open": gate_id, "close": gate_id}"""
+        return dict(self._gate_actions[direction_key(direction)].get(checkpoint, {}))
+
+    def checkpoint_gate_actions(self, direction=CLOCKWISE):
+        """방향별 전체 체크포인트 게이트 동작 테이블"""
+        return {cp: dict(action) for cp, action in self._gate_actions[direction_key(direction)].items()}
+
+    # -------------------------------- 노드 조회 --------------------------------
+
+    def has_node(self, name):
+        return name in self.nodes
+
+    def zone(self, position):
+        node = self.nodes.get(position)
+        return node.zone if node else None
+
+    def is_checkpoint(self, position):
+        node = self.nodes.get(position)
+        return bool(node) and node.kind == KIND_CHECKPOINT
+
+    def is_loading_bay(self, position):
+        node = self.nodes.get(position)
+        return bool(node) and node.kind == KIND_LOAD
+
+    def is_unloading_area(self, position):
+        node = self.nodes.get(position)
+        return bool(node) and node.kind == KIND_BELT
+
+    def loading_bays(self):
+        return [name for name, node in self.nodes.items() if node.kind == KIND_LOAD]
+
+    def checkpoints(self):
+        return [name for name, node in self.nodes.items() if node.kind == KIND_CHECKPOINT]
+
+    def gates(self):
+        return [name for name, node in self.nodes.items() if node.kind == KIND_GATE]
+
+    @property
+    def standby(self):
+        """대기 장소 노드 이름"""
+        for name, node in self.nodes.items():
+            if node.kind == KIND_STANDBY:
+                return name
+        return None
+
+    @property
+    def unloading_area(self):
+        """하역(벨트) 노드 이름"""
+        for name, node in self.nodes.items():
+            if node.kind == KIND_BELT:
+                return name
+        return None
+
+    def position_codes(self):
+        """위치 이름 → TCP 프로토콜 위치 코드"""
+        return {name: node.pos_code for name, node in self.nodes.items()}
+
+    def position_from_code(self, pos_code):
+        return self._by_pos_code.get(pos_code)
+
+    def gui_key(self, position):
+        """백엔드 위치 이름 → GUI 맵 노드 키"""
+        node = self.nodes.get(position)
+        return node.gui_key if node else None
+
+    def position_from_gui_key(self, gui_key):
+        """GUI 맵 노드 키 → 백엔드 위치 이름"""
+        return self._by_gui_key.get(gui_key, gui_key)
+
+    # -------------------------------- 기본 사이트 --------------------------------
+
+    @classmethod
+    def default(cls):
+        """현재 사이트 트랙 (STANDBY → A → GATE_A → B → LOAD_A/B → C → GATE_B → D → BELT)"""
+        nodes = [
+            TrackNode("STANDBY", KIND_STANDBY, 0x08, ZONE_STANDBY),
+            TrackNode("CHECKPOINT_A", KIND_CHECKPOINT, 0x01, ZONE_TO_LOADING),
+            TrackNode("CHECKPOINT_B", KIND_CHECKPOINT, 0x02, ZONE_TO_LOADING),
+            TrackNode("LOAD_A", KIND_LOAD, 0x05, ZONE_LOADING, gui_key="A_LOAD"),
+            TrackNode("LOAD_B", KIND_LOAD, 0x06, ZONE_LOADING, gui_key="B_LOAD"),
+            TrackNode("CHECKPOINT_C", KIND_CHECKPOINT, 0x03, ZONE_TO_UNLOADING),
+            TrackNode("CHECKPOINT_D", KIND_CHECKPOINT, 0x04, ZONE_TO_UNLOADING),
+            TrackNode("BELT", KIND_BELT, 0x07, ZONE_UNLOADING),
+            TrackNode("GATE_A", KIND_GATE, 0xA1),
+            TrackNode("GATE_B", KIND_GATE, 0xA2),
+        ]
+        # 구간별 예상 주행 시간(초) - 실측 전 기본 추정치
+        edges = [
+            TrackEdge("STANDBY", "CHECKPOINT_A", 5.0),
+            TrackEdge("CHECKPOINT_A", "CHECKPOINT_B", 8.0, gate="GATE_A"),
+            TrackEdge("CHECKPOINT_B", "LOAD_A", 4.0),
+            TrackEdge("CHECKPOINT_B", "LOAD_B", 4.0),
+            TrackEdge("LOAD_A", "CHECKPOINT_C", 4.0),
+            TrackEdge("LOAD_B", "CHECKPOINT_C", 4.0),
+            TrackEdge("CHECKPOINT_C", "CHECKPOINT_D", 8.0, gate="GATE_B"),
+            TrackEdge("CHECKPOINT_D", "BELT", 5.0),
+            TrackEdge("BELT", "STANDBY", 6.0),
+        ]
+        return cls(nodes, edges)
+
+
+_track_topology = None
+
+
+def get_track_topology():
+    """프로세스 공용 트랙 토폴로지 (최초 호출 시 생성)"""
+    global _track_topology
+    if _track_topology is None:
+        _track_topology = TrackTopology.default()
+    return _track_topology
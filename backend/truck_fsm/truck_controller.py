@@ -35,6 +35,11 @@ class TruckController:
                 self._handle_status_update(sender, payload)
                 return
             
+            # 상태 레코드 묶음 (TELEMETRY) - 한 번에 반영
+            if cmd == "TELEMETRY":
+                self._handle_telemetry(sender, payload)
+                return
+            
             # HELLO 명령은 트럭 등록을 위한 초기 명령이므로 무시
             if cmd == "HELLO":
                 print(f"[TruckController] 트럭 등록 확인: {sender}")
@@ -60,17 +65,9 @@ class TruckController:
                     command_sender = self.truck_fsm_manager.command_sender
                     # STATUS_UPDATE를 수신했으나 트럭이 등록되어 있지 않은 경우 등록 시도
                     if not command_sender.is_registered(truck_id):
-                        # tcp_server 인스턴스를 가져와 소켓 등록 시도
-                        if hasattr(self.truck_fsm_manager, 'app') and hasattr(self.truck_fsm_manager.app, 'tcp_server'):
-                            tcp_server = self.truck_fsm_manager.app.tcp_server
-                            # 현재 연결된 모든 소켓을 확인하여 해당 트럭 ID의 소켓을 찾아 등록
-                            for client_addr, client_sock in tcp_server.clients.items():
-                                # 트럭 ID와 소켓을 연결하여 등록
-                                tcp_server.truck_sockets[truck_id] = client_sock
-                                # command_sender에 업데이트된 truck_sockets 설정
-                                tcp_server.app.set_truck_commander(tcp_server.truck_sockets)
-                                print(f"[🔄 트럭 소켓 자동 등록] STATUS_UPDATE 수신 시 {truck_id} 소켓이 자동으로 등록되었습니다.")
-                                break
+                        # 트럭 ID 를 모르는 연결에 등록 (레지스트리는 명령 전송자와 TCP 서버가 공유)
+                        if command_sender._try_auto_register(truck_id):
+                            print(f"[🔄 트럭 소켓 자동 등록] STATUS_UPDATE 수신 시 {truck_id} 소켓이 자동으로 등록되었습니다.")
             except Exception as e:
                 print(f"[⚠️ 트럭 소켓 등록 시도 실패] {e}")
                 
@@ -100,14 +97,17 @@ class TruckController:
                 self.truck_status_manager.update_battery(truck_id, battery_level, is_charging)
                 
                 # FSM 매니저의 컨텍스트에도 배터리 정보 업데이트
+                charge_done = battery_level >= 95
                 if hasattr(self.truck_fsm_manager, 'fsm'):
-                    context = self.truck_fsm_manager.fsm._get_or_create_context(truck_id)
-                    context.battery_level = battery_level
-                    context.is_charging = is_charging
+                    fsm = self.truck_fsm_manager.fsm
+                    fsm.observe_battery(truck_id, battery_level, is_charging)
+                    context = fsm._get_or_create_context(truck_id)
+                    # 대기 미션이 쌓여 있으면 다음 미션들을 마칠 만큼만 충전하고 복귀
+                    charge_done = charge_done or (is_charging and fsm._is_fully_charged(context, {}))
                 
-                # 배터리가 95% 이상이고 충전 중이면 자동으로 충전 완료 처리
-                if battery_level >= 95 and is_charging:
-                    print(f"[🔋 자동 충전 완료] {truck_id}의 배터리가 95% 이상에 도달했습니다. 충전 상태를 해제합니다.")
+                # 배터리가 95% 이상이거나 충전 계획상 충분하면 자동으로 충전 완료 처리
+                if charge_done and is_charging:
+                    print(f"[🔋 자동 충전 완료] {truck_id}의 배터리({battery_level}%)가 충전 목표에 도달했습니다. 충전 상태를 해제합니다.")
                     self.truck_status_manager.update_battery(truck_id, battery_level, False)
                     if hasattr(self.truck_fsm_manager, 'fsm'):
                         context.is_charging = False
@@ -198,4 +198,65 @@ class TruckController:
             
         except Exception as e:
             print(f"[❌ 상태 업데이트 오류] {e}")
-            traceback.print_exc() 
\ No newline at end of file
+            traceback.print_exc()
+
+    def _handle_telemetry(self, truck_id: str, payload: dict):
+        """
+        TELEMETRY 묶음 처리 - 상태 저장은 apply_telemetry 한 번, FSM 에는 위치가 바뀐 레코드를 순서대로 모두 반영
+        (묶음 사이에 지나간 체크포인트 / 게이트 도착도 놓치지 않도록).
+        STATUS_UPDATE 와 같은 규칙(UNKNOWN 위치 유지, 충전 목표 도달 시 FINISH_CHARGING)을 따른다.
+        """
+        try:
+            records = payload.get("records") or []
+            if not records or not self.truck_status_manager:
+                return
+            
+            command_sender = getattr(self.truck_fsm_manager, 'command_sender', None)
+            if command_sender and not command_sender.is_registered(truck_id):
+                if command_sender._try_auto_register(truck_id):
+                    print(f"[🔄 트럭 소켓 자동 등록] TELEMETRY 수신 시 {truck_id} 소켓이 자동으로 등록되었습니다.")
+            
+            fsm = getattr(self.truck_fsm_manager, 'fsm', None)
+            context = fsm._get_or_create_context(truck_id) if fsm else None
+            
+            # UNKNOWN 위치는 직전 레코드(없으면 FSM 위치, 그것도 없으면 STANDBY)로 채움
+            location = context.position if context and context.position and context.position != "UNKNOWN" else "STANDBY"
+            resolved = []
+            for record in records:
+                record = dict(record)
+                if record.get("position", "UNKNOWN") == "UNKNOWN":
+                    record["position"] = location
+                location = record["position"]
+                resolved.append(record)
+            
+            latest = resolved[-1]
+            if context and context.state == TruckState.CHARGING:
+                latest["is_charging"] = True
+            battery_level = latest.get("battery_level", 0)
+            is_charging = bool(latest.get("is_charging"))
+            
+            self.truck_status_manager.apply_telemetry(truck_id, resolved)
+            print(f"[📦 텔레메트리] {truck_id}: {len(resolved)}건, 배터리={battery_level}%, 위치={location}")
+            
+            if not fsm:
+                return
+            
+            fsm.observe_battery(truck_id, battery_level, is_charging)
+            if is_charging and (battery_level >= 95 or fsm._is_fully_charged(context, {})):
+                print(f"[🔋 자동 충전 완료] {truck_id}의 배터리({battery_level}%)가 충전 목표에 도달했습니다. 충전 상태를 해제합니다.")
+                self.truck_status_manager.update_battery(truck_id, battery_level, False)
+                context.is_charging = False
+                context.state = TruckState.IDLE
+                self.truck_fsm_manager.handle_trigger(truck_id, "FINISH_CHARGING", {})
+            
+            # 위치 변경은 레코드 순서대로 재생
+            for record in resolved:
+                position = record["position"]
+                if context.position != position:
+                    print(f"[위치 변경 감지] {truck_id}: {context.position} → {position}")
+                    context.position = position
+                    fsm.handle_position_update(truck_id, position, {"run_state": record.get("run_state", "IDLE")})
+            
+        except Exception as e:
+            print(f"[❌ 텔레메트리 처리 오류] {e}")
+            traceback.print_exc()
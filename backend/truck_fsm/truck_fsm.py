@@ -1,34 +1,41 @@
 from .truck_state import TruckState, MissionPhase, TruckContext, Direction
-from datetime import datetime
+from backend.track.track_topology import get_track_topology, ZONE_STANDBY, ZONE_TO_LOADING, ZONE_LOADING, ZONE_TO_UNLOADING, ZONE_UNLOADING
+from backend.track.gate_reservation import GateReservationManager, ENTRY_OPEN, ENTRY_ADMITTED
+from backend.track.station_scheduler import StationScheduler, RESOURCE_DISPENSER, RESOURCE_BELT
+from backend.analytics.mission_kpi import get_mission_kpi_tracker
+from backend.analytics.battery_model import get_battery_model, ChargePlanner
+from backend.cache.state_versions import get_state_versions, DOMAIN_MISSIONS
 import time
 
+# 대기 미션 수 캐시 유효 시간 (초) - 미션 버전이 바뀌면 바로 다시 조회
+WAITING_COUNT_TTL = 5.0
+
 
 class TruckFSM:
-    def __init__(self, command_sender=None, gate_controller=None, belt_controller=None, dispenser_controller=None, mission_manager=None):
+    def __init__(self, command_sender=None, gate_controller=None, belt_controller=None, dispenser_controller=None, mission_manager=None, topology=None, gate_reservation=None, station_scheduler=None, kpi_tracker=None, battery_model=None):
         self.command_sender = command_sender
         self.gate_controller = gate_controller
         self.belt_controller = belt_controller
         self.dispenser_controller = dispenser_controller
         self.mission_manager = mission_manager
+        self.journal = None
+        self.kpi_tracker = kpi_tracker or get_mission_kpi_tracker()
         self.contexts = {}
         self.transitions = self._init_transitions()
         self._add_assigned_state_transitions()
         self._extend_finish_unloading_action()
         self.BATTERY_THRESHOLD = 30
         self.BATTERY_FULL = 100
+        self.battery_model = battery_model or get_battery_model()
+        self.charge_planner = ChargePlanner(self.battery_model, self.kpi_tracker, full_level=self.BATTERY_FULL)
+        self.versions = get_state_versions()
+        self._waiting_count_cache = None  # (미션 버전, 조회 시각, 대기 미션 수)
+        self.topology = topology or get_track_topology()
+        self.gate_reservation = gate_reservation or GateReservationManager(self.topology)
+        self.station_scheduler = station_scheduler or StationScheduler(self.topology, dispenser_controller)
         self.checkpoint_gate_mapping = {
-            Direction.CLOCKWISE: {
-                "CHECKPOINT_A": {"open": "GATE_A", "close": None},
-                "CHECKPOINT_B": {"open": None, "close": "GATE_A"},
-                "CHECKPOINT_C": {"open": "GATE_B", "close": None},
-                "CHECKPOINT_D": {"open": None, "close": "GATE_B"},
-            },
-            Direction.COUNTERCLOCKWISE: {
-                "CHECKPOINT_D": {"open": "GATE_B", "close": None},
-                "CHECKPOINT_C": {"open": None, "close": "GATE_B"},
-                "CHECKPOINT_B": {"open": "GATE_A", "close": None},
-                "CHECKPOINT_A": {"open": None, "close": "GATE_A"},
-            }
+            direction: self.topology.checkpoint_gate_actions(direction.value)
+            for direction in Direction
         }
         self.direction_transition_points = {
             "STANDBY": Direction.CLOCKWISE,       # 대기 장소에 도착 후 시계방향(정상 흐름)으로 전환
@@ -141,13 +148,95 @@ class TruckFSM:
 
     # -------------------------------------------------------------------------------   
 
-    # 이벤트 처리
+    # 상태 저널 설정
+    def set_journal(self, journal):
+        self.journal = journal
+
+    # 연속 명령 사이 대기 - v2 트럭은 재전송 / 순서 보장으로 대기 없음, v1 은 delay 초 대기
+    def settle_truck(self, truck_id, delay):
+        settle = getattr(self.command_sender, "settle", None)
+        if settle is None:
+            time.sleep(delay)
+            return
+        settle(truck_id, delay)
+
+    # ACK / 재전송을 쓰는 v2 연결인지
+    def _is_reliable(self, truck_id):
+        is_reliable = getattr(self.command_sender, "is_reliable", None)
+        return bool(is_reliable and is_reliable(truck_id) is True)
+
+    # 트럭 컨텍스트를 저널 / KPI 집계기에 기록
+    def record_context(self, truck_id):
+        context = self.contexts.get(truck_id)
+        if context is None:
+            return
+        if self.journal:
+            self.journal.record_truck(context)
+        if self.kpi_tracker:
+            self.kpi_tracker.observe_truck(truck_id, context.state, context.mission_id, context.mission_phase)
+
+    # 배터리 보고 반영 - 컨텍스트 갱신 및 소모 모델 학습
+    def observe_battery(self, truck_id, battery_level, is_charging=False):
+        context = self._get_or_create_context(truck_id)
+        context.battery_level = battery_level
+        context.is_charging = is_charging
+        self.battery_model.observe(truck_id, battery_level, context.mission_phase, is_charging)
+
+    # 대기 미션 수 (충전 계획의 수요 지표)
+    # 배터리 보고(TELEMETRY 프레임)마다 불리므로 미션 버전이 같고 WAITING_COUNT_TTL 안이면 DB 를 다시 조회하지 않음
+    def _waiting_mission_count(self):
+        if not self.mission_manager:
+            return 0
+        version = self.versions.get(DOMAIN_MISSIONS)
+        now = time.monotonic()
+        cached = self._waiting_count_cache
+        if cached and cached[0] == version and now - cached[1] < WAITING_COUNT_TTL:
+            return cached[2]
+        try:
+            count = len(self.mission_manager.get_waiting_missions())
+        except Exception as e:
+            print(f"[⚠️ 대기 미션 조회 실패] {e}")
+            return 0
+        self._waiting_count_cache = (version, now, count)
+        return count
+
+    # 예측 잔량으로 다음 미션 수행 가능 여부 확인
+    def has_battery_for_mission(self, context):
+        return self.charge_planner.can_accept_mission(context.truck_id, context.battery_level)
+
+    # 설비 점유 상태를 KPI 집계기에 기록
+    def _mark_facility(self, facility_id, busy):
+        if self.kpi_tracker:
+            self.kpi_tracker.set_facility_busy(facility_id, busy)
+
+    # 저널에서 복구한 트럭 컨텍스트 적용
+    def restore_contexts(self, contexts):
+        for truck_id, context in contexts.items():
+            self.contexts[truck_id] = context
+            # 진행 중이던 미션의 설비 예약 재등록
+            loading_target = context.loading_target
+            if context.mission_phase in (MissionPhase.TO_LOADING, MissionPhase.AT_LOADING) and loading_target:
+                self.station_scheduler.reserve_mission(truck_id, loading_target, context.position, context.direction)
+            elif context.mission_phase in (MissionPhase.TO_UNLOADING, MissionPhase.AT_UNLOADING):
+                unloading_area = self.topology.unloading_area
+                eta = self.topology.eta(context.position, unloading_area, context.direction.value) or 0.0
+                self.station_scheduler.reserve(RESOURCE_BELT, truck_id, unloading_area, eta)
+            print(f"[📒 트럭 상태 복구] {truck_id}: {context.state.value}, 위치: {context.position}, 미션: {context.mission_id}")
+
+    # -------------------------------------------------------------------------------   
+
+    # 이벤트 처리 - 처리 후 컨텍스트를 저널 / KPI 집계기에 기록
     def handle_event(self, truck_id, event, payload=None):
+        result = self._dispatch_event(truck_id, event, payload)
+        self.record_context(truck_id)
+        return result
+
+    def _dispatch_event(self, truck_id, event, payload=None):
         if payload is None: payload = {}
             
         context = self._get_or_create_context(truck_id)
         current_state = context.state
-        context.last_update_time = datetime.now()
+        context.touch()
         print(f"[이벤트 수신] 트럭: {truck_id}, 이벤트: {event}, 상태: {current_state}")
         
         # FINISH_LOADING 특별 처리 - 상태와 상관없이 RUN 명령 보내기
@@ -200,6 +289,8 @@ class TruckFSM:
                 if self.command_sender:
                     print(f"[🚚 강제 이동 명령] {truck_id}: 디스펜서 닫기 완료 후 이동 시작")
                     self.command_sender.send(truck_id, "RUN", {})
+                
+                self.release_dispenser(truck_id)
             
             return True
         
@@ -290,21 +381,19 @@ class TruckFSM:
     def _update_mission_phase_by_position(self, context):
         position = context.position
         
-        # 위치별 미션 단계 매핑
-        position_to_phase = {
-            "CHECKPOINT_A": MissionPhase.TO_LOADING if context.is_clockwise() else MissionPhase.RETURNING,
-            "CHECKPOINT_B": MissionPhase.TO_LOADING if context.is_clockwise() else MissionPhase.RETURNING,
-            "LOAD_A": MissionPhase.AT_LOADING,
-            "LOAD_B": MissionPhase.AT_LOADING,
-            "CHECKPOINT_C": MissionPhase.TO_UNLOADING if context.is_clockwise() else MissionPhase.RETURNING,
-            "CHECKPOINT_D": MissionPhase.TO_UNLOADING if context.is_clockwise() else MissionPhase.RETURNING,
-            "BELT": MissionPhase.AT_UNLOADING,
-            "STANDBY": MissionPhase.RETURNING if context.mission_id else MissionPhase.NONE
+        # 트랙 구역별 미션 단계 매핑
+        zone_to_phase = {
+            ZONE_TO_LOADING: MissionPhase.TO_LOADING if context.is_clockwise() else MissionPhase.RETURNING,
+            ZONE_LOADING: MissionPhase.AT_LOADING,
+            ZONE_TO_UNLOADING: MissionPhase.TO_UNLOADING if context.is_clockwise() else MissionPhase.RETURNING,
+            ZONE_UNLOADING: MissionPhase.AT_UNLOADING,
+            ZONE_STANDBY: MissionPhase.RETURNING if context.mission_id else MissionPhase.NONE
         }
-        
-        if position in position_to_phase:
+        zone = self.topology.zone(position)
+
+        if zone in zone_to_phase:
             old_phase = context.mission_phase
-            new_phase = position_to_phase[position]
+            new_phase = zone_to_phase[zone]
             
             if old_phase != new_phase:
                 context.mission_phase = new_phase
@@ -321,84 +410,33 @@ class TruckFSM:
         direction = context.direction
         current_position = context.position
         
-        # 방향별 이동 경로 정의
-        path_by_direction = {
-            Direction.CLOCKWISE: {
-                "STANDBY": "CHECKPOINT_A",
-                "CHECKPOINT_A": "CHECKPOINT_B",
-                "CHECKPOINT_B": None,  # LOAD_A나 LOAD_B로 가야 하므로 미션별로 결정되어야 함
-                "LOAD_A": "CHECKPOINT_C",
-                "LOAD_B": "CHECKPOINT_C",
-                "CHECKPOINT_C": "CHECKPOINT_D",
-                "CHECKPOINT_D": "BELT",
-                "BELT": "STANDBY"              # 벨트에서 바로 STANDBY로 이동
-            },
-            Direction.COUNTERCLOCKWISE: {
-                "STANDBY": "BELT",
-                "BELT": "CHECKPOINT_D",
-                "CHECKPOINT_D": "CHECKPOINT_C",
-                "CHECKPOINT_C": None,  # LOAD_A나 LOAD_B로 가야 하므로 미션별로 결정되어야 함
-                "LOAD_A": "CHECKPOINT_B",
-                "LOAD_B": "CHECKPOINT_B",
-                "CHECKPOINT_B": "CHECKPOINT_A",
-                "CHECKPOINT_A": "STANDBY"
-            }
-        }
+        loading_target = context.loading_target or self.topology.loading_bays()[0]
         
-        # 현재 방향과 위치에 따른 다음 목표 위치 결정
-        if direction in path_by_direction and current_position in path_by_direction[direction]:
-            next_position = path_by_direction[direction][current_position]
+        # 트랙 토폴로지 기준 다음 목표 위치 결정 (적재장 분기는 미션별 적재 위치 쪽으로)
+        if self.topology.has_node(current_position):
+            next_position = self.topology.next_position(current_position, direction, loading_target)
             
-            # CHECKPOINT_B나 CHECKPOINT_C에서는 특별히 처리 (미션별 적재 위치 결정)
-            if next_position is None:
-                if current_position == "CHECKPOINT_B" and direction == Direction.CLOCKWISE:
-                    # 미션 정보에 따라 적재 위치 결정
-                    loading_target = getattr(context, 'loading_target', "LOAD_A")
-                    next_position = loading_target
-                    print(f"[중요] {context.truck_id}: CHECKPOINT_B에서 미션별 적재 위치 → {loading_target} 설정")
-                elif current_position == "CHECKPOINT_C" and direction == Direction.COUNTERCLOCKWISE:
-                    # 반시계 방향일 때의 적재 위치 결정
-                    loading_target = getattr(context, 'loading_target', "LOAD_A")
-                    next_position = loading_target
-                    print(f"[중요] {context.truck_id}: CHECKPOINT_C에서 미션별 적재 위치 → {loading_target} 설정")
+            if next_position in self.topology.loading_bays():
+                print(f"[중요] {context.truck_id}: {current_position}에서 미션별 적재 위치 → {loading_target} 설정")
             
             if next_position:  # None이 아닌 경우만 설정
                 context.target_position = next_position
                 print(f"[목표 위치 업데이트] {context.truck_id}: 현재 {current_position}, 다음 목표 → {next_position}")
                 
         elif phase == MissionPhase.TO_LOADING:
-            # 기본 목표 설정
-            if context.position == "CHECKPOINT_A":
-                context.target_position = "CHECKPOINT_B"  # GATE_A를 건너뛰고 직접 CHECKPOINT_B로
-            elif context.position == "CHECKPOINT_B":
-                # 미션 정보에 따라 적재 위치 결정 - 명시적으로 로딩 타겟 사용
-                loading_target = getattr(context, 'loading_target', "LOAD_A")
-                context.target_position = loading_target
-                print(f"[적재 위치 설정] {context.truck_id}: 미션별 적재 위치 → {loading_target} (loading_target: {loading_target})")
-                
-                # 로딩 타겟과 현재 위치가 일치하지 않으면 경고
-                if context.position in ["LOAD_A", "LOAD_B"] and context.position != loading_target:
-                    print(f"[⚠️ 경고] {context.truck_id}: 현재 위치({context.position})와 설정된 적재 위치({loading_target})가 일치하지 않음")
-                
+            context.target_position = loading_target
         elif phase == MissionPhase.AT_LOADING:
-            context.target_position = "CHECKPOINT_C"
-        elif phase == MissionPhase.TO_UNLOADING:
-            if context.position == "CHECKPOINT_C":
-                context.target_position = "CHECKPOINT_D"  # GATE_B를 건너뛰고 직접 CHECKPOINT_D로
-            elif context.position == "CHECKPOINT_D":
-                context.target_position = "BELT"
-        elif phase == MissionPhase.AT_UNLOADING:
-            context.target_position = "STANDBY"  # 바로 대기장소로 이동
-        elif phase == MissionPhase.RETURNING:
-            context.target_position = "STANDBY"  # 어느 위치에서든 대기장소로
-        else:
+            context.target_position = self.topology.next_position(loading_target, direction)
+        elif phase in (MissionPhase.AT_UNLOADING, MissionPhase.RETURNING):
+            context.target_position = self.topology.standby  # 어느 위치에서든 대기장소로
+        elif phase != MissionPhase.TO_UNLOADING:
             context.target_position = None
         
         if context.target_position:
             print(f"[이동 경로] {context.truck_id}: {current_position} → {context.target_position} (방향: {direction.value}, 미션 단계: {phase})")
         
         # 디버그 정보: 현재 트럭의 컨텍스트 요약 출력
-        if hasattr(context, 'loading_target'):
+        if context.loading_target:
             print(f"[컨텍스트 요약] {context.truck_id}: 미션={context.mission_id}, 적재위치={context.loading_target}, 현재위치={context.position}, 목표={context.target_position}, 단계={context.mission_phase}")
         else:
             print(f"[컨텍스트 요약] {context.truck_id}: 미션={context.mission_id}, 적재위치=미설정, 현재위치={context.position}, 목표={context.target_position}, 단계={context.mission_phase}")
@@ -426,9 +464,12 @@ class TruckFSM:
         context.target_position = "CHECKPOINT_A"  # 첫 목표는 CHECKPOINT_A
         
         # 소스에 따라 적재 위치 설정
-        loading_target = source if source in ["LOAD_A", "LOAD_B"] else "LOAD_A"
+        loading_target = source if self.topology.is_loading_bay(source) else self.topology.loading_bays()[0]
         context.loading_target = loading_target  # 적재 위치 저장
         
+        # 적재(디스펜서) / 하역(벨트) 설비 예약
+        self.station_scheduler.reserve_mission(context.truck_id, loading_target, context.position, context.direction)
+        
         print(f"[미션 할당] {context.truck_id}: 미션 {mission_id}, 출발지 {source}, 적재 위치 {loading_target}, 방향 {context.direction.value}")
         if old_mission_id or old_target:
             print(f"[상태 변경] {context.truck_id}: 이전 미션 {old_mission_id} → 새 미션 {mission_id}, 타겟 {old_target} → {context.target_position}")
@@ -440,8 +481,8 @@ class TruckFSM:
                 "source": source
             })
             
-            # 1초 대기 (트럭이 미션 정보를 처리할 시간 제공)
-            time.sleep(1.0)
+            # 트럭이 미션 정보를 처리할 시간 제공 (v2 트럭은 순서 / 전달이 보장되어 대기 없음)
+            self.settle_truck(context.truck_id, 1.0)
             
             # 2. RUN 명령 전송 - 타겟 정보 없이 단순 RUN만 전송
             # 트럭 시뮬레이터가 자체적으로 다음 위치를 결정
@@ -469,6 +510,9 @@ class TruckFSM:
         print(f"[⚙️ 디버그] 트럭 ARRIVED 현재 상태 - 현재 상태: {context.state}, 미션 단계: {context.mission_phase}")
         print(f"[⚙️ payload 확인] {payload}")
         
+        # 설비 예약 도착 예상 시간 갱신
+        self.station_scheduler.update_position(context.truck_id, position, direction)
+        
         # 방향 전환점에 도착한 경우 방향 업데이트
         if position in self.direction_transition_points:
             new_direction = self.direction_transition_points[position]
@@ -483,11 +527,11 @@ class TruckFSM:
             # 게이트 제어 로직 실행
             self._process_checkpoint_gate_control(context, position, direction)
         # 작업 위치에 도착한 경우 처리
-        elif position in ["LOAD_A", "LOAD_B"]:
+        elif self.topology.is_loading_bay(position):
             print(f"[⚙️ 적재 위치 {position} 도착 처리 시작 - 명확한 분기]")
             
             # 미션에 설정된 loading_target과 현재 위치 비교
-            loading_target = getattr(context, 'loading_target', None)
+            loading_target = context.loading_target
             print(f"[디버그] 트럭 {context.truck_id}, 설정된 로딩 타겟: {loading_target}, 현재 위치: {position}")
             
             if loading_target and position != loading_target:
@@ -510,7 +554,7 @@ class TruckFSM:
             if self.command_sender:
                 print(f"[🛑 STOP 명령 전송] {context.truck_id}에게 정지 명령 전송")
                 self.command_sender.send(context.truck_id, "STOP")
-                time.sleep(0.5)  # 잠시 대기하여 트럭이 정지할 시간 제공
+                self.settle_truck(context.truck_id, 0.5)  # 트럭이 정지 명령을 처리할 시간 제공
             
             # 트럭이 적재 위치에 도착했을 때 자동으로 START_LOADING 명령 먼저 전송하고 상태 전환
             print(f"[🔄 자동 적재 시작] {context.truck_id}: 적재 위치 {position} 도착 - 적재 작업 자동 시작")
@@ -525,7 +569,7 @@ class TruckFSM:
                     print(f"[⚠️ START_LOADING 명령 전송 오류] {e}")
                 
                 # 짧은 대기 시간을 통해 트럭이 명령을 처리할 시간 제공
-                time.sleep(1.0)
+                self.settle_truck(context.truck_id, 1.0)
             
             # FSM 상태 변경을 위해 START_LOADING 이벤트 처리
             try:
@@ -596,123 +640,96 @@ class TruckFSM:
         """체크포인트에서의 게이트 제어 처리"""
         print(f"[체크포인트 도착] {context.truck_id}: 체크포인트 {checkpoint}, 방향 {direction.value}")
         
-        # 각 방향별 체크포인트 도착 시 게이트 처리 정의
-        checkpoint_gate_actions = {
-            "CHECKPOINT_A": {
-                Direction.CLOCKWISE: {"open": "GATE_A", "close": None},        # 시계방향: GATE_A 열기
-                Direction.COUNTERCLOCKWISE: {"open": None, "close": "GATE_A"}  # 반시계방향: GATE_A 닫기
-            },
-            "CHECKPOINT_B": {
-                Direction.CLOCKWISE: {"open": None, "close": "GATE_A"},        # 시계방향: GATE_A 닫기
-                Direction.COUNTERCLOCKWISE: {"open": "GATE_A", "close": None}  # 반시계방향: GATE_A 열기
-            },
-            "CHECKPOINT_C": {
-                Direction.CLOCKWISE: {"open": "GATE_B", "close": None},        # 시계방향: GATE_B 열기
-                Direction.COUNTERCLOCKWISE: {"open": None, "close": "GATE_B"}  # 반시계방향: GATE_B 닫기
-            },
-            "CHECKPOINT_D": {
-                Direction.CLOCKWISE: {"open": None, "close": "GATE_B"},        # 시계방향: GATE_B 닫기
-                Direction.COUNTERCLOCKWISE: {"open": "GATE_B", "close": None}  # 반시계방향: GATE_B 열기
-            }
-        }
-        
         # 게이트 액션이 필요한지 확인
         has_gate_action = False
         
-        # 특수 처리: CHECKPOINT_B에서 직접 GATE_A 닫기
-        if checkpoint == "CHECKPOINT_B" and direction == Direction.CLOCKWISE:
-            print(f"[🔒 중요 게이트 제어] CHECKPOINT_B에서 GATE_A 닫기 명령 강제 실행")
-            close_result = self._close_gate_and_log("GATE_A", context.truck_id)
-            print(f"[게이트 닫기 결과] GATE_A: {'성공' if close_result else '실패'}")
-            has_gate_action = True
-            
-            # 2초 대기하여 게이트 닫힘 동작 완료 확인
-            time.sleep(2)
-            
-            # 게이트 닫힌 후에는 이동 명령을 보내지 않음 (트럭이 이미 이동 중일 것이므로)
-            print(f"[ℹ️ 자동 이동 유지] {context.truck_id}: GATE_A 닫은 후 별도 RUN 명령 없이 자동 이동 진행")
-            
-            return
-            
-        # 특수 처리: CHECKPOINT_C에서 직접 GATE_B 열기
-        elif checkpoint == "CHECKPOINT_C" and direction == Direction.CLOCKWISE:
-            print(f"[🔓 중요 게이트 제어] CHECKPOINT_C에서 GATE_B 열기 명령 강제 실행")
-            open_result = self._open_gate_and_log("GATE_B", context.truck_id)
-            print(f"[게이트 열기 결과] GATE_B: {'성공' if open_result else '실패'}")
-            has_gate_action = True
-            
-            # 2초 대기하여 게이트 열림 동작 완료 확인
-            time.sleep(2)
-            
-            # 게이트 열림 후에는 반드시 RUN 명령을 전송 (멈춤→이동 필요)
-            print(f"[�� 게이트 열림 후 RUN 명령] {context.truck_id}: 게이트가 열렸으므로 이동 명령 전송")
-            self.command_sender.send(context.truck_id, "RUN", {})
-                
-            return
-        
         # 해당 체크포인트에 대한 액션 가져오기
-        if checkpoint in checkpoint_gate_actions:
-            # 디버그 로그 추가
-            print(f"[체크포인트 액션 결정] {checkpoint}, 방향: {direction.value}, 액션 정의: {checkpoint_gate_actions[checkpoint].get(direction, {})}")
+        if self.topology.is_checkpoint(checkpoint):
+            # 트랙 토폴로지의 게이트 간선 정의에서 게이트 동작 결정
+            actions = self.topology.gate_action(checkpoint, direction)
+            print(f"[체크포인트 액션 결정] {checkpoint}, 방향: {direction.value}, 액션 정의: {actions}")
             
-            actions = checkpoint_gate_actions[checkpoint].get(direction, {})
-            
-            # 게이트 열기 액션
-            if "open" in actions and actions["open"]:
-                gate_id = actions["open"]
-                print(f"[게이트 제어] 열기: {gate_id}, 체크포인트: {checkpoint}, 방향: {direction.value}")
-                
-                # CHECKPOINT_C에서 GATE_B 열기 특별 처리 추가
-                if checkpoint == "CHECKPOINT_C" and gate_id == "GATE_B" and direction == Direction.CLOCKWISE:
-                    print(f"[중요 게이트 제어] CHECKPOINT_C에서 GATE_B 열기 명령 실행")
-                
-                open_result = self._open_gate_and_log(gate_id, context.truck_id)
-                print(f"[게이트 열기 결과] {gate_id}: {'성공' if open_result else '실패'}")
+            # 게이트 구간 진출 - 구간이 비고 대기 트럭이 없을 때만 게이트 닫기
+            if actions.get("close"):
+                gate_id = actions["close"]
+                print(f"[게이트 제어] 구간 진출: {gate_id}, 체크포인트: {checkpoint}, 방향: {direction.value}")
+                self._exit_gate_segment(gate_id, context.truck_id)
                 has_gate_action = True
             
-            # 게이트 닫기 액션
-            if "close" in actions and actions["close"]:
-                gate_id = actions["close"]
-                print(f"[게이트 제어] 닫기: {gate_id}, 체크포인트: {checkpoint}, 방향: {direction.value}")
-                
-                # CHECKPOINT_B에서 GATE_A 닫기 특별 처리
-                if checkpoint == "CHECKPOINT_B" and gate_id == "GATE_A" and direction == Direction.CLOCKWISE:
-                    print(f"[중요 게이트 제어] CHECKPOINT_B에서 GATE_A 닫기 명령 실행")
-                
-                # CHECKPOINT_D에서 GATE_B 닫기 특별 처리 추가
-                if checkpoint == "CHECKPOINT_D" and gate_id == "GATE_B" and direction == Direction.CLOCKWISE:
-                    print(f"[중요 게이트 제어] CHECKPOINT_D에서 GATE_B 닫기 명령 실행")
-                
-                close_result = self._close_gate_and_log(gate_id, context.truck_id)
-                print(f"[게이트 닫기 결과] {gate_id}: {'성공' if close_result else '실패'}")
+            # 게이트 구간 진입 - 예약 후 열기 / 열린 게이트 합류 / 대기
+            if actions.get("open"):
+                gate_id = actions["open"]
+                print(f"[게이트 제어] 구간 진입: {gate_id}, 체크포인트: {checkpoint}, 방향: {direction.value}")
+                self._enter_gate_segment(gate_id, context.truck_id, direction)
                 has_gate_action = True
             
             # 게이트 액션이 없는 경우 바로 다음 위치로 이동 명령
             if not has_gate_action:
                 print(f"[게이트 제어 없음] {context.truck_id}: 체크포인트 {checkpoint}에서 게이트 제어가 필요 없습니다.")
-                # 바로 RUN 명령 전송
                 if self.command_sender:
-                    # CHECKPOINT_D에서 게이트 닫기 후에는 별도로 RUN 명령 보내지 않음 (이미 이동 중)
-                    if checkpoint == "CHECKPOINT_D" and direction == Direction.CLOCKWISE:
-                        print(f"[ℹ️ RUN 명령 생략] {context.truck_id}: CHECKPOINT_D에서는 게이트 닫힘 이후 별도 RUN 명령 없이 이동 계속")
-                    else:
-                        print(f"[자동 이동] {context.truck_id}: {context.position}에서 다음 위치로 이동")
-                        # 단순 RUN 명령 - 트럭이 자체적으로 다음 위치 결정
-                        self.command_sender.send(context.truck_id, "RUN", {})
-        else:
-            print(f"[알 수 없는 체크포인트] {checkpoint}에 대한 게이트 제어 정의가 없습니다.")
-        
-        # 위치에 따른 자동 명령 (체크포인트지만 자동 RUN 명령을 보내지 않는 특수 경우)
-        if not has_gate_action and checkpoint not in ["CHECKPOINT_A", "CHECKPOINT_C"]:  # CHECKPOINT_A, CHECKPOINT_C는 게이트 열기 후 이동
-            # 다음 목표로 자동 이동 (체크포인트에서 경로 계속)
-            if self.command_sender:
-                # CHECKPOINT_D에서 게이트 닫기 후에는 별도로 RUN 명령 보내지 않음 (이미 이동 중)
-                if checkpoint == "CHECKPOINT_D" and direction == Direction.CLOCKWISE:
-                    print(f"[ℹ️ RUN 명령 생략] {context.truck_id}: CHECKPOINT_D에서는 게이트 닫힘 이후 별도 RUN 명령 없이 이동 계속")
-                else:
                     print(f"[자동 이동] {context.truck_id}: {context.position}에서 다음 위치로 이동")
                     # 단순 RUN 명령 - 트럭이 자체적으로 다음 위치 결정
                     self.command_sender.send(context.truck_id, "RUN", {})
+        else:
+            print(f"[알 수 없는 체크포인트] {checkpoint}에 대한 게이트 제어 정의가 없습니다.")
+    
+    # 게이트 구간 진입 요청 처리
+    def _enter_gate_segment(self, gate_id, truck_id, direction):
+        entry = self.gate_reservation.request_entry(gate_id, truck_id, direction)
+        
+        if entry == ENTRY_OPEN:
+            open_result = self._open_gate_and_log(gate_id, truck_id)
+            if open_result:
+                self.gate_reservation.mark_opened(gate_id)
+                self._mark_facility(gate_id, True)
+            print(f"[게이트 열기 결과] {gate_id}: {'성공' if open_result else '실패'}")
+        elif entry == ENTRY_ADMITTED:
+            # 같은 방향 트럭이 통과 중인 열린 게이트 - 서보 재동작 없이 통과
+            self._notify_gate_opened(gate_id, truck_id)
+        else:
+            # 반대 방향 트럭이 구간 사용 중 - 체크포인트에서 정지 대기
+            print(f"[🚦 통과 대기] {truck_id}: {gate_id} 구간 예약 대기 - 체크포인트에서 정지")
+            if self.command_sender:
+                self.command_sender.send(truck_id, "STOP")
+    
+    # 게이트 구간 진출 처리
+    def _exit_gate_segment(self, gate_id, truck_id):
+        self._apply_gate_release(gate_id, truck_id, self.gate_reservation.release(gate_id, truck_id))
+    
+    # 비상 / 통신 두절 후 진출 체크포인트 보고 - 점유한 구간을 빠져나왔으면 해제
+    def _release_passed_segments(self, truck_id, position):
+        for gate_id, direction in self.gate_reservation.occupied_segments(truck_id).items():
+            if direction and self.topology.gate_action(position, direction).get("close") == gate_id:
+                print(f"[🚦 구간 진출 확인] {truck_id}: {position} 도착 - {gate_id} 점유 해제")
+                self._exit_gate_segment(gate_id, truck_id)
+    
+    # 구간 이탈 (미션 취소 / 비상 해제) - 점유를 풀고 대기 묶음을 진입시킴
+    def _leave_gate_segments(self, truck_id):
+        released = self.gate_reservation.remove_truck(truck_id)
+        for gate_id, release in released.items():
+            print(f"[🚦 구간 점유 해제] {truck_id}: {gate_id}")
+            self._apply_gate_release(gate_id, truck_id, release)
+        return list(released)
+    
+    # 구간 해제 결과 반영 (게이트 닫기 또는 대기 트럭 통과)
+    def _apply_gate_release(self, gate_id, truck_id, release):
+        if release["close"]:
+            close_result = self._close_gate_and_log(gate_id, truck_id)
+            if close_result:
+                self._mark_facility(gate_id, False)
+            print(f"[게이트 닫기 결과] {gate_id}: {'성공' if close_result else '실패'}")
+        elif release["admitted"]:
+            # 대기 트럭을 같은 개방 주기로 통과시킴 (게이트가 닫혀 있으면 한 번만 열기)
+            waiting_trucks = list(release["admitted"])
+            if not self.gate_reservation.is_open(gate_id):
+                first_truck = waiting_trucks.pop(0)
+                if self._open_gate_and_log(gate_id, first_truck):
+                    self.gate_reservation.mark_opened(gate_id)
+                    self._mark_facility(gate_id, True)
+            for waiting_truck in waiting_trucks:
+                self._notify_gate_opened(gate_id, waiting_truck)
+        else:
+            print(f"[🚦 게이트 유지] {gate_id}: 구간에 같은 방향 트럭이 남아 있어 열린 상태 유지")
     
     # -------------------------------------------------------------------------------   
 
@@ -733,45 +750,63 @@ class TruckFSM:
         print(f"[적재 시작] {context.truck_id}: 적재 작업 시작")
         print(f"[적재 디버그] 트럭 상태: {context.state}, 위치: {context.position}, 디스펜서 존재: {self.dispenser_controller is not None}")
         
-        # 디스펜서 컨트롤러가 있는 경우, 디스펜서 제어 명령 전송
-        if self.dispenser_controller:
-            position = context.position
-            print(f"[디스펜서 제어] {context.truck_id}가 {position}에 있어 디스펜서 제어 시작")
-            
-            if position == "LOAD_A":
-                # LOAD_A 위치인 경우 디스펜서 A 경로로 설정 (ROUTE_A)
-                print(f"[디스펜서 제어] {context.truck_id}가 LOAD_A에 도착 - 디스펜서 A 경로로 설정")
-                try:
-                    success = self.dispenser_controller.send_command("DISPENSER", "LOC_ROUTE_A")
-                    print(f"[디스펜서 경로 설정 결과] ROUTE_A: {'성공' if success else '실패'}")
-                except Exception as e:
-                    print(f"[⚠️ 디스펜서 경로 설정 오류] {e}")
-            elif position == "LOAD_B":
-                # LOAD_B 위치인 경우 디스펜서 B 경로로 설정 (ROUTE_B)
-                print(f"[디스펜서 제어] {context.truck_id}가 LOAD_B에 도착 - 디스펜서 B 경로로 설정")
-                try:
-                    success = self.dispenser_controller.send_command("DISPENSER", "LOC_ROUTE_B")
-                    print(f"[디스펜서 경로 설정 결과] ROUTE_B: {'성공' if success else '실패'}")
-                except Exception as e:
-                    print(f"[⚠️ 디스펜서 경로 설정 오류] {e}")
+        self.begin_loading(context.truck_id, context.position)
+    
+    # 디스펜서 점유 후 경로 설정 및 열기
+    def begin_loading(self, truck_id, position):
+        """디스펜서 점유 후 적재 시작 - 다른 트럭이 사용 중이면 대기 (한 번에 한 트럭만)"""
+        if not self.station_scheduler.acquire(RESOURCE_DISPENSER, truck_id, position):
+            print(f"[📅 적재 대기] {truck_id}: 디스펜서 사용 중 - {position}에서 대기 (앞 트럭 적재 완료 후 자동 시작)")
+            return False
+        
+        # 이미 시작된 적재 작업이면 중복 명령을 보내지 않음
+        if not self.station_scheduler.mark_started(RESOURCE_DISPENSER, truck_id):
+            print(f"[ℹ️ 적재 진행 중] {truck_id}: 디스펜서 작업이 이미 시작됨")
+            return True
+        
+        self._mark_facility("DISPENSER", True)
+        
+        if not self.dispenser_controller:
+            print(f"[⚠️ 디스펜서 없음] {truck_id}: 디스펜서 컨트롤러가 없어 제어할 수 없습니다.")
+            return True
+        
+        self.dispenser_controller.current_truck_id = truck_id
+        print(f"[디스펜서 제어] {truck_id}가 {position}에 있어 디스펜서 제어 시작")
+        
+        # 사전 이동이 진행 중이면 완료 대기 후, 위치가 다를 때만 경로 변경
+        self.station_scheduler.wait_for_preposition()
+        route = self.station_scheduler.route_for_station(position)
+        if route and self.dispenser_controller.dispenser_position.get("DISPENSER") != route:
+            try:
+                success = self.dispenser_controller.send_command("DISPENSER", f"LOC_{route}")
+                print(f"[디스펜서 경로 설정 결과] {route}: {'성공' if success else '실패'}")
+            except Exception as e:
+                print(f"[⚠️ 디스펜서 경로 설정 오류] {e}")
             
             # 1초 대기 후 디스펜서 열기
             print(f"[디스펜서 준비] 1초 대기 후 디스펜서 열기 시작")
             time.sleep(1)
-            
-            # 디스펜서 열기
-            try:
-                print(f"[디스펜서 열기 시작] DISPENSER OPEN 명령 전송")
-                success = self.dispenser_controller.send_command("DISPENSER", "OPEN")
-                print(f"[디스펜서 열기 결과] {'성공' if success else '실패'}")
-            except Exception as e:
-                print(f"[⚠️ 디스펜서 열기 오류] {e}")
-            
-            # 로그 메시지 추가
-            print(f"[디스펜서 LOADED 이벤트 대기] 디스펜서에서 LOADED 상태가 되면 트럭에 DISPENSER_LOADED 메시지가 전송됩니다.")
-            print(f"[디스펜서 적재 완료 흐름] dispenser_controller → facility_status_manager → truck_command_sender → 트럭으로 전달")
         else:
-            print(f"[⚠️ 디스펜서 없음] {context.truck_id}: 디스펜서 컨트롤러가 없어 제어할 수 없습니다.")
+            print(f"[📅 사전 이동 완료] 디스펜서가 이미 {route}에 있어 바로 열기")
+        
+        # 디스펜서 열기
+        try:
+            print(f"[디스펜서 열기 시작] DISPENSER OPEN 명령 전송")
+            success = self.dispenser_controller.send_command("DISPENSER", "OPEN")
+            print(f"[디스펜서 열기 결과] {'성공' if success else '실패'}")
+        except Exception as e:
+            print(f"[⚠️ 디스펜서 열기 오류] {e}")
+        
+        print(f"[디스펜서 LOADED 이벤트 대기] 디스펜서에서 LOADED 상태가 되면 트럭에 DISPENSER_LOADED 메시지가 전송됩니다.")
+        return True
+    
+    # 디스펜서 해제 처리
+    def release_dispenser(self, truck_id):
+        """디스펜서 해제 - 다음 예약 트럭 위치로 사전 이동, 이미 도착해 있으면 바로 적재 시작"""
+        self._mark_facility("DISPENSER", False)
+        next_reservation = self.station_scheduler.release(RESOURCE_DISPENSER, truck_id)
+        if next_reservation and next_reservation.arrived:
+            self.begin_loading(next_reservation.truck_id, next_reservation.station)
     
     # -------------------------------------------------------------------------------   
 
@@ -780,7 +815,7 @@ class TruckFSM:
         print(f"[적재 완료] {context.truck_id}: 적재 완료, 이동 시작")
         
         # 시작 시 잠시 지연 - 트럭이 명령을 처리할 시간 제공
-        time.sleep(1.0)
+        self.settle_truck(context.truck_id, 1.0)
         
         # 디스펜서 닫기
         if self.dispenser_controller:
@@ -807,6 +842,8 @@ class TruckFSM:
         if self.command_sender:
             print(f"[🚚 이동 명령 전송] {context.truck_id}: 적재 완료 후 이동 시작")
             self.command_sender.send(context.truck_id, "RUN", {})
+        
+        self.release_dispenser(context.truck_id)
     
     # -------------------------------------------------------------------------------   
 
@@ -815,6 +852,8 @@ class TruckFSM:
         """하차 작업 시작 처리"""
         print(f"[하차 시작] {context.truck_id}: 위치 {context.position}에서 하차 작업 시작")
         
+        self._mark_facility("BELT", True)
+        
         # 벨트 작동 명령 전송
         if self.belt_controller:
             print(f"[벨트 작동] {context.truck_id} → 벨트에 RUN 명령 전송")
@@ -841,6 +880,12 @@ class TruckFSM:
         if self.belt_controller:
             print(f"[벨트 중지] {context.truck_id} → 벨트에 STOP 명령 전송")
             self.belt_controller.send_command("BELT", "STOP")
+        
+        # 벨트 해제 - 다음 예약 트럭이 이미 도착해 있으면 바로 하차 시작
+        self._mark_facility("BELT", False)
+        next_reservation = self.station_scheduler.release(RESOURCE_BELT, context.truck_id)
+        if next_reservation and next_reservation.arrived:
+            self.handle_event(next_reservation.truck_id, "START_UNLOADING", {"position": next_reservation.station})
     
     # -------------------------------------------------------------------------------   
 
@@ -890,12 +935,13 @@ class TruckFSM:
         if is_assigned and context.mission_id and self.command_sender:
             print(f"[미션 할당 확인] {context.truck_id}: 미션 {context.mission_id} 할당 완료. 명령 전송")
             # 미션이 할당되었지만 이전 상태 때문에 명령이 전송되지 않았을 수 있으므로 명시적 전송
-            if hasattr(context, 'loading_target'):
+            # (v2 트럭은 할당 시 보낸 명령의 전달이 보장되므로 다시 보내지 않음)
+            if context.loading_target and not self._is_reliable(context.truck_id):
                 self.command_sender.send(context.truck_id, "MISSION_ASSIGNED", {
                     "source": context.loading_target
                 })
                 # 이동 명령 추가 전송
-                time.sleep(1.0)  # 트럭이 미션 정보를 처리할 시간 제공
+                self.settle_truck(context.truck_id, 1.0)  # 트럭이 미션 정보를 처리할 시간 제공
                 self.command_sender.send(context.truck_id, "RUN", {})
         
         return True
@@ -916,10 +962,34 @@ class TruckFSM:
     
     # -------------------------------------------------------------------------------   
 
+    # 통신 두절 처리 (생존 감시가 오프라인으로 판단)
+    def handle_truck_offline(self, truck_id, reason=None):
+        """
+        게이트 대기와 설비 예약만 풀고, 작업 중이던 트럭은 비상 상태로 전환 (RESET 필요)
+        구간 점유는 트럭이 아직 구간 안에 있을 수 있으므로 RESET 또는 진출 체크포인트 보고 때까지 유지
+        """
+        context = self.contexts.get(truck_id)
+        dropped = self.gate_reservation.remove_waiting(truck_id)
+        self.station_scheduler.cancel(truck_id)
+        occupied = list(self.gate_reservation.occupied_segments(truck_id))
+        print(f"[🚨 통신 두절] {truck_id} ({reason}) - 게이트 대기 취소: {dropped or '없음'}, 구간 점유 유지: {occupied or '없음'}")
+
+        if context is None:
+            return False
+        busy = context.mission_id or context.state not in (TruckState.IDLE, TruckState.CHARGING, TruckState.EMERGENCY)
+        if not busy:
+            return False
+        return self.handle_event(truck_id, "EMERGENCY_TRIGGERED", {"reason": "OFFLINE"})
+
+    # -------------------------------------------------------------------------------   
+
     # 비상 상황 해제 처리
     def _reset_from_emergency(self, context, payload):
         print(f"[🔄 비상 해제] {context.truck_id}: 기본 상태로 복귀")
         
+        # 게이트 구간 점유 / 대기 해제
+        self._leave_gate_segments(context.truck_id)
+        
         # 미션 취소 처리
         if context.mission_id and self.mission_manager:
             self.mission_manager.cancel_mission(context.mission_id)
@@ -941,6 +1011,11 @@ class TruckFSM:
             if context.state == TruckState.EMERGENCY:
                 print(f"[미션 거부] {context.truck_id}: 비상 상태")
                 return False
+            
+            # 다음 미션을 마칠 배터리가 없으면 수락 불가
+            if not self.has_battery_for_mission(context):
+                print(f"[미션 거부] {context.truck_id}: 예상 배터리 부족 ({context.battery_level}%)")
+                return False
                 
             # 기존 미션이 있으면 로그 남기고 초기화
             if context.mission_id is not None:
@@ -962,9 +1037,9 @@ class TruckFSM:
             print(f"[미션 거부] {context.truck_id}: 충전 중")
             return False
         
-        # 배터리가 부족하면 수락 불가
-        if context.battery_level <= self.BATTERY_THRESHOLD:
-            print(f"[미션 거부] {context.truck_id}: 배터리 부족 ({context.battery_level}%)")
+        # 다음 미션을 마칠 배터리가 없으면 수락 불가 (소모 모델 예측)
+        if not self.has_battery_for_mission(context):
+            print(f"[미션 거부] {context.truck_id}: 예상 배터리 부족 ({context.battery_level}%)")
             return False
         
         # 비상 상태면 수락 불가
@@ -975,16 +1050,21 @@ class TruckFSM:
         return True
     
     def _is_at_loading_area(self, context, payload):
-        return context.position in ["LOAD_A", "LOAD_B"]
+        return self.topology.is_loading_bay(context.position)
     
     def _is_at_unloading_area(self, context, payload):
-        return context.position == "BELT"
+        if not self.topology.is_unloading_area(context.position):
+            return False
+        # 벨트는 한 번에 한 트럭만 사용
+        return self.station_scheduler.acquire(RESOURCE_BELT, context.truck_id, context.position)
     
     def _needs_charging(self, context, payload):
-        return context.battery_level <= self.BATTERY_THRESHOLD
+        """다음 미션을 마칠 수 없거나 수요가 적을 때 충전"""
+        return self.charge_planner.should_charge(context.truck_id, context.battery_level, self._waiting_mission_count())
     
     def _is_fully_charged(self, context, payload):
-        return context.battery_level >= self.BATTERY_FULL
+        """완충 또는 대기 미션이 쌓여 있고 다음 몇 건을 마칠 만큼 충전됨"""
+        return self.charge_planner.charge_done(context.truck_id, context.battery_level, self._waiting_mission_count())
     
     # -------------------------------- 게이트 제어 메서드 --------------------------------
     
@@ -1003,20 +1083,23 @@ class TruckFSM:
             success = True
                 
         # 트럭에 게이트 열림 알림 전송 (성공 여부와 상관없이 알림)
+        self._notify_gate_opened(gate_id, truck_id)
+            
+        return success
+    
+    def _notify_gate_opened(self, gate_id, truck_id):
         if self.command_sender:
             print(f"[📤 게이트 열림 알림] {truck_id}에게 GATE_OPENED 메시지 전송 (gate_id: {gate_id})")
             self.command_sender.send(truck_id, "GATE_OPENED", {"gate_id": gate_id})
             
             # 게이트 열림 후 잠시 대기 (트럭이 열림 메시지를 처리할 시간 제공)
-            time.sleep(0.5)
+            self.settle_truck(truck_id, 0.5)
             
             # 게이트 열림 후에는 반드시 RUN 명령을 전송 (멈춤→이동 필요)
             print(f"[📤 게이트 열림 후 RUN 명령] {truck_id}: 게이트가 열렸으므로 이동 명령 전송")
             self.command_sender.send(truck_id, "RUN", {})
         else:
             print(f"[⚠️ 경고] command_sender가 없어 GATE_OPENED 메시지를 전송할 수 없습니다.")
-            
-        return success
     
     def _close_gate_and_log(self, gate_id, truck_id):
         success = False
@@ -1059,6 +1142,10 @@ class TruckFSM:
         context.position = new_position
         print(f"[위치 변경] {truck_id}: {old_position} → {new_position}")
         
+        # 비상 상태에서는 체크포인트 이벤트가 처리되지 않으므로 구간 진출만 직접 반영
+        if context.state == TruckState.EMERGENCY:
+            self._release_passed_segments(truck_id, new_position)
+        
         # BELT 위치에 도착한 경우 항상 STOP 명령 전송
         if new_position == "BELT":
             print(f"[특별 처리] {truck_id}: BELT 위치 도착 감지, 항상 STOP 명령 전송")
@@ -1080,9 +1167,9 @@ class TruckFSM:
         
         # 특정 상태에서 예상되는 위치 정의
         state_to_expected_positions = {
-            TruckState.LOADING: ["LOAD_A", "LOAD_B"],
-            TruckState.UNLOADING: ["BELT"],
-            TruckState.WAITING: ["CHECKPOINT_A", "CHECKPOINT_C", "BELT", "LOAD_A", "LOAD_B", "CHECKPOINT_B", "CHECKPOINT_D"]
+            TruckState.LOADING: self.topology.loading_bays(),
+            TruckState.UNLOADING: [self.topology.unloading_area],
+            TruckState.WAITING: self.topology.checkpoints() + self.topology.loading_bays() + [self.topology.unloading_area]
         }
         
         # 위치와 상태가 일치하지 않는 경우 감지
@@ -1091,7 +1178,7 @@ class TruckFSM:
             print(f"[⚠️ 불일치 감지] {context.truck_id}: 상태 {state}와 위치 {position}이 일치하지 않음")
             
             # 자동 복구 로직
-            if position in ["LOAD_A", "LOAD_B"] and state != TruckState.LOADING:
+            if self.topology.is_loading_bay(position) and state != TruckState.LOADING:
                 # 적재 위치에 있는데 LOADING 상태가 아니면, WAITING 상태로 변경
                 suggested_state = TruckState.WAITING
                 print(f"[🔄 자동 조정] {context.truck_id}: 상태를 {suggested_state}로 변경")
@@ -1205,6 +1292,10 @@ class TruckFSM:
         if self.mission_manager:
             self.mission_manager.cancel_mission(mission_id)
         
+        # 설비 예약 / 게이트 구간 점유 취소
+        self.station_scheduler.cancel(context.truck_id)
+        self._leave_gate_segments(context.truck_id)
+        
         # 상태 초기화
         context.mission_id = None
         context.mission_phase = MissionPhase.NONE
@@ -1214,7 +1305,7 @@ class TruckFSM:
             self.command_sender.send(context.truck_id, "STOP")
         
         # 대기 장소로 복귀 명령
-        context.direction = Direction.RETURN
+        context.direction = Direction.CLOCKWISE  # 순환 트랙 - 진행 방향 그대로 대기 장소까지
         context.target_position = "STANDBY"
         
         if self.command_sender:
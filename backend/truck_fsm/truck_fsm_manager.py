@@ -47,8 +47,17 @@ class TruckFSMManager:
     def handle_event(self, truck_id, event, payload=None):
         return self.fsm.handle_event(truck_id, event, payload)
 
-    # 트리거 처리
+    # 통신 두절 처리
+    def handle_truck_offline(self, truck_id, reason=None):
+        return self.fsm.handle_truck_offline(truck_id, reason)
+
+    # 트리거 처리 - 처리 후 컨텍스트를 저널 / KPI 집계기에 기록
     def handle_trigger(self, truck_id, cmd, payload=None):
+        result = self._dispatch_trigger(truck_id, cmd, payload)
+        self.fsm.record_context(truck_id)
+        return result
+
+    def _dispatch_trigger(self, truck_id, cmd, payload=None):
         if payload is None:
             payload = {}
             
@@ -56,9 +65,6 @@ class TruckFSMManager:
             # 트리거 로그 출력
             print(f"[FSM] 트리거: {truck_id}, 명령: {cmd}")
             
-            # time 모듈 문제 해결을 위해 명시적 import 추가
-            import time as timer
-            
             # 기존 로직과 호환되는 이벤트 매핑
             event_mapping = {
                 "ASSIGN_MISSION": "ASSIGN_MISSION",
@@ -91,57 +97,35 @@ class TruckFSMManager:
                 print(f"[위치 업데이트] {truck_id}: {old_position} → {position}")
                 
                 # 위치가 LOAD_A 또는 LOAD_B인 경우 적재 시작 명령 자동 전송
-                if position in ["LOAD_A", "LOAD_B"]:
+                if self.fsm.topology.is_loading_bay(position):
                     print(f"[🚨 적재 위치 자동 감지] {truck_id}가 {position}에 도착")
                     
                     # 현재 트럭의 미션 정보 확인
-                    loading_target = getattr(context, 'loading_target', None)
-                    mission_id = getattr(context, 'mission_id', None)
+                    loading_target = context.loading_target
+                    mission_id = context.mission_id
                     
                     # 미션이 있고, 현재 위치가 미션의 목적지인 경우에만 정지 및 적재 시작
                     if mission_id and (loading_target == position or loading_target is None):
                         print(f"[✅ 미션 목적지 확인] {truck_id}의 미션 목적지({loading_target})와 현재 위치({position})가 일치")
                         
-                        # 트럭 ID를 디스펜서 컨트롤러에 전역 변수로 저장
-                        if self.dispenser_controller:
-                            self.dispenser_controller.current_truck_id = truck_id
-                            print(f"[🔄 트럭 ID 설정] 디스펜서 컨트롤러에 트럭 ID '{truck_id}' 설정")
-                        
                         # 먼저 트럭 정지 명령 전송
                         if self.command_sender:
                             print(f"[🛑 STOP 명령 전송] {truck_id}에게 정지 명령 전송")
                             self.command_sender.send(truck_id, "STOP")
-                            timer.sleep(0.5)  # 잠시 대기
+                            self.fsm.settle_truck(truck_id, 0.5)  # 잠시 대기 (v2 트럭은 대기 없음)
                         
                         # 적재 시작 명령 전송
                         if self.command_sender:
                             print(f"[📤 START_LOADING 명령 전송] {truck_id}에게 적재 시작 명령 전송")
                             self.command_sender.send(truck_id, "START_LOADING", {"position": position})
-                            timer.sleep(0.5)
+                            self.fsm.settle_truck(truck_id, 0.5)
                         
                         # 명시적으로 FSM 상태 변경
                         print(f"[🔄 FSM 상태 변경] {truck_id}: START_LOADING 이벤트 처리")
                         self.fsm.handle_event(truck_id, "START_LOADING", {"position": position})
                         
-                        # 디스펜서 직접 제어
-                        if self.dispenser_controller:
-                            print(f"[🔄 디스펜서 제어 시작] {position}에서 디스펜서 제어")
-                            try:
-                                if position == "LOAD_A":
-                                    success = self.dispenser_controller.send_command("DISPENSER", "LOC_ROUTE_A")
-                                    print(f"[디스펜서 경로 설정 결과] ROUTE_A: {'성공' if success else '실패'}")
-                                elif position == "LOAD_B":
-                                    success = self.dispenser_controller.send_command("DISPENSER", "LOC_ROUTE_B")
-                                    print(f"[디스펜서 경로 설정 결과] ROUTE_B: {'성공' if success else '실패'}")
-                                    
-                                # 잠시 대기 후 디스펜서 열기
-                                timer.sleep(1.0)
-                                success = self.dispenser_controller.send_command("DISPENSER", "OPEN")
-                                print(f"[디스펜서 열기 결과] {'성공' if success else '실패'}")
-                            except Exception as e:
-                                print(f"[⚠️ 디스펜서 제어 오류] {e}")
-                        else:
-                            print(f"[⚠️ 디스펜서 컨트롤러 없음] 디스펜서 제어 불가")
+                        # 디스펜서 제어 - 스케줄러가 점유를 확인하므로 FSM 액션에서 이미 시작했으면 중복 전송 없음
+                        self.fsm.begin_loading(truck_id, position)
                         
                         # 중요: 적재 위치에 도착했을 때는 다음 RUN 명령을 자동으로 보내지 않음
                         # DISPENSER_LOADED 이벤트를 받아야만 다음 이동 명령이 전송됨
@@ -154,6 +138,14 @@ class TruckFSMManager:
                 
             # ASSIGN_MISSION 명령이고 미션 ID가 지정되지 않은 경우 미션 매니저에서 대기 중인 미션 찾기
             if cmd == "ASSIGN_MISSION" and "mission_id" not in payload and self.mission_manager:
+                # 다음 미션을 마칠 배터리가 없으면 미션을 잡지 않고 충전부터 (소모 모델 예측)
+                context = self.fsm._get_or_create_context(truck_id)
+                if not context.is_charging and not self.fsm.has_battery_for_mission(context):
+                    print(f"[🔋 미션 보류] 트럭 {truck_id}: 예상 배터리 부족 ({context.battery_level}%) - 충전 후 할당")
+                    if context.position == "STANDBY" and context.state == TruckState.IDLE:
+                        self.fsm.handle_event(truck_id, "START_CHARGING")
+                    return False
+                
                 waiting_missions = self.mission_manager.get_waiting_missions()
                 
                 # 대기 중인 미션이 있다면 가장 오래된 미션 할당
@@ -257,7 +249,7 @@ class TruckFSMManager:
                     elif current_position == "ROUTE_B":
                         current_position = "LOAD_B"
                     print(f"[🔄 위치 매핑] 디스펜서 위치 {old_position}를 트럭 위치 {current_position}로 변환")
-                elif not current_position or current_position not in ["LOAD_A", "LOAD_B"]:
+                elif not current_position or not self.fsm.topology.is_loading_bay(current_position):
                     # 현재 디스펜서 위치를 확인하여 적절한 위치 설정
                     if self.dispenser_controller and hasattr(self.dispenser_controller, 'current_position'):
                         dispenser_position = self.dispenser_controller.current_position
@@ -304,9 +296,9 @@ class TruckFSMManager:
                         
                         # RUN 명령은 FINISH_LOADING이 성공했을 때만 전송
                         if success:
-                            # 0.5초 후 RUN 명령도 강제 전송
+                            # 0.5초 후 RUN 명령도 강제 전송 (v2 트럭은 대기 없음)
                             import time
-                            time.sleep(0.5)
+                            self.fsm.settle_truck(truck_id, 0.5)
                             run_success = self.command_sender.send(truck_id, "RUN", {
                                 "target": "CHECKPOINT_C"
                             })
@@ -344,6 +336,9 @@ class TruckFSMManager:
                         time.sleep(1.0)
                 else:
                     print(f"[⚠️ 디스펜서 컨트롤러 없음] 디스펜서 제어 불가")
+                
+                # 디스펜서 해제 - 다음 예약 트럭에게 넘김
+                self.fsm.release_dispenser(truck_id)
                     
                 # 상태 LOADED로 직접 변경 - loading → loaded
                 context.state = TruckState.LOADED
@@ -398,9 +393,9 @@ class TruckFSMManager:
                 # 대기 장소(STANDBY)로 돌아가는 RUN 명령 전송
                 if self.command_sender:
                     try:
-                        # 잠시 대기 후 RUN 명령 전송
+                        # 잠시 대기 후 RUN 명령 전송 (v2 트럭은 대기 없음)
                         import time
-                        time.sleep(0.5)
+                        self.fsm.settle_truck(truck_id, 0.5)
                         
                         # 대기 위치(STANDBY)로 이동 명령
                         print(f"[🚀 자동 RUN 명령 전송] {truck_id}: 하역 완료 후 STANDBY로 이동 명령 전송")
@@ -506,8 +501,8 @@ class TruckFSMManager:
             
         # 배터리 상태 업데이트
         if battery_level is not None:
-            context.battery_level = battery_level
-            context.is_charging = is_charging
+            self.fsm.observe_battery(truck_id, battery_level, is_charging)
+            self.fsm.record_context(truck_id)
 
     # -------------------------------------------------------------------------------
 
@@ -515,16 +510,19 @@ class TruckFSMManager:
     def get_all_truck_statuses(self):
         result = {}
         for truck_id, context in self.fsm.contexts.items():
+            data = context.to_dict()
             result[truck_id] = {
-                "state": context.state.value,
-                "position": context.position,
-                "mission_id": context.mission_id,
-                "mission_phase": context.mission_phase.value if context.mission_phase else None,
+                "state": data["state"],
+                "position": data["position"],
+                "position_code": data["position_code"],
+                "mission_id": data["mission_id"],
+                "mission_phase": data["mission_phase"],
+                "phase_code": data["phase_code"],
                 "battery": {
-                    "level": context.battery_level,
-                    "is_charging": context.is_charging
+                    "level": data["battery_level"],
+                    "is_charging": data["is_charging"]
                 },
-                "direction": context.direction.value if hasattr(context, 'direction') else 'UNKNOWN'
+                "direction": data["direction"] or 'UNKNOWN'
             }
         return result
     
@@ -607,13 +605,13 @@ class TruckFSMManager:
             }
         
         # 추가 디버깅: 적재 위치 도착 시 무조건 적재 시작 명령 전송
-        if cmd == "ARRIVED" and position in ["LOAD_A", "LOAD_B"]:
+        if cmd == "ARRIVED" and self.fsm.topology.is_loading_bay(position):
             print(f"[🚨 강제 적재 시작 테스트] {sender}가 {position}에 도착함")
             
             # 현재 트럭의 미션 정보 확인
             context = self.fsm._get_or_create_context(sender)
-            loading_target = getattr(context, 'loading_target', None)
-            mission_id = getattr(context, 'mission_id', None)
+            loading_target = context.loading_target
+            mission_id = context.mission_id
             
             # 미션이 있고, 현재 위치가 미션의 목적지인 경우에만 정지 및 적재 시작
             if mission_id and (loading_target == position or loading_target is None):
@@ -623,29 +621,15 @@ class TruckFSMManager:
                 if self.command_sender:
                     print(f"[🚨 강제 STOP 명령 전송] {sender}에게 정지 명령 전송")
                     self.command_sender.send(sender, "STOP")
-                    timer.sleep(0.5)  # 잠시 대기
+                    self.fsm.settle_truck(sender, 0.5)  # 잠시 대기 (v2 트럭은 대기 없음)
                     
                     # 적재 시작 명령 전송
                     print(f"[🚨 강제 START_LOADING 명령 전송] {sender}에게 적재 시작 명령 전송")
                     self.command_sender.send(sender, "START_LOADING", {"position": position})
-                    timer.sleep(1.0)  # 프로세스를 위한 대기
+                    self.fsm.settle_truck(sender, 1.0)  # 프로세스를 위한 대기
                     
-                    # 디스펜서 직접 제어
-                    if self.dispenser_controller:
-                        print(f"[🚨 강제 디스펜서 제어 시작] {position}에서 디스펜서 제어")
-                        if position == "LOAD_A":
-                            success = self.dispenser_controller.send_command("DISPENSER", "LOC_ROUTE_A")
-                            print(f"[🚨 디스펜서 경로 설정 결과] ROUTE_A: {'성공' if success else '실패'}")
-                        elif position == "LOAD_B":
-                            success = self.dispenser_controller.send_command("DISPENSER", "LOC_ROUTE_B")
-                            print(f"[🚨 디스펜서 경로 설정 결과] ROUTE_B: {'성공' if success else '실패'}")
-                            
-                        # 잠시 대기 후 디스펜서 열기
-                        timer.sleep(1.0)
-                        success = self.dispenser_controller.send_command("DISPENSER", "OPEN")
-                        print(f"[🚨 디스펜서 열기 결과] {'성공' if success else '실패'}")
-                    else:
-                        print(f"[🚨 디스펜서 컨트롤러 없음] 디스펜서 제어 불가")
+                    # 디스펜서 제어 (디스펜서 점유 중인 트럭이 있으면 대기)
+                    self.fsm.begin_loading(sender, position)
                     
                     # 중요: 적재 위치에서는 다음 RUN 명령을 자동으로 보내지 않음
                     # DISPENSER_LOADED 이벤트를 받아야만 다음 이동 명령이 전송됨
@@ -680,7 +664,7 @@ class TruckFSMManager:
             
             # 게이트 열림 후 잠시 대기 (트럭이 열림 메시지를 처리할 시간 제공)
             import time
-            time.sleep(0.5)
+            self.fsm.settle_truck(truck_id, 0.5)
             
             # 게이트 열림 후 자동으로 RUN 명령도 전송 - 최대 3회 재시도
             print(f"[📤 자동 RUN 명령 전송] {truck_id}에게 게이트 열림 후 RUN 명령 전송")
@@ -1,5 +1,9 @@
 from enum import Enum
-from datetime import datetime
+from operator import attrgetter
+import sys
+import time
+
+from backend.track.track_topology import get_track_topology
 
 
 class TruckState(Enum):
@@ -31,46 +35,130 @@ class Direction(Enum):
     COUNTERCLOCKWISE = "COUNTERCLOCKWISE"  # 반시계방향 (비정상 흐름)
 
 
+# 위치 정수 코드 - TCPProtocol.POS_MAP 과 같은 트랙 토폴로지 위치 코드 사용
+POS_UNKNOWN = 0x00
+POS_CODES = {**get_track_topology().position_codes(), "UNKNOWN": POS_UNKNOWN}
+
+# 미션 단계 정수 코드 (MissionPhase 선언 순서)
+PHASE_CODES = {phase: code for code, phase in enumerate(MissionPhase)}
+
+# snapshot() 튜플의 필드 순서 (마지막은 항상 last_update_time - 상태 비교 시 [:-1] 로 제외)
+SNAPSHOT_FIELDS = (
+    "truck_id", "state", "position", "position_code", "mission_id", "mission_phase", "phase_code",
+    "direction", "target_position", "loading_target", "battery_level", "is_charging", "last_update_time"
+)
+
+
 class TruckContext:
     """트럭 정보 문맥 클래스"""
+    __slots__ = (
+        "truck_id", "state", "_position", "position_code", "mission_id", "_mission_phase", "phase_code",
+        "direction", "target_position", "loading_target", "battery_level", "is_charging", "last_update_time"
+    )
+
+    _snapshot_getter = attrgetter(*SNAPSHOT_FIELDS)
+
     def __init__(self, truck_id):
         self.truck_id = truck_id
         self.state = TruckState.IDLE
-        self.position = "STANDBY"      # 현재 물리적 위치
+        self.position = "STANDBY"      # 현재 물리적 위치 (position_code 함께 갱신)
         self.mission_id = None         # 현재 미션 ID
-        self.mission_phase = MissionPhase.NONE  # 미션 진행 단계
+        self.mission_phase = MissionPhase.NONE  # 미션 진행 단계 (phase_code 함께 갱신)
         self.direction = Direction.CLOCKWISE  # 현재 이동 방향 (기본값: 시계방향)
         self.target_position = None    # 이동 목표 위치
+        self.loading_target = None     # 미션 적재 위치 (LOAD_A / LOAD_B)
         self.battery_level = 100       # 배터리 잔량
         self.is_charging = False       # 충전 중 여부
-        self.last_update_time = datetime.now()  # 마지막 업데이트 시간
-        self.gate_status = {}          # 게이트 상태 정보
-        
+        self.last_update_time = time.monotonic()  # 마지막 업데이트 시간 (monotonic 초)
+
+    # -------------------------------------------------------------------------------
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        # 위치 문자열은 intern 하여 트럭 간 같은 객체를 공유
+        if isinstance(value, str):
+            value = sys.intern(value)
+            self.position_code = POS_CODES.get(value) or POS_CODES.get(value.upper(), POS_UNKNOWN)
+        else:
+            self.position_code = POS_UNKNOWN
+        self._position = value
+
+    @property
+    def mission_phase(self):
+        return self._mission_phase
+
+    @mission_phase.setter
+    def mission_phase(self, value):
+        self._mission_phase = value
+        self.phase_code = PHASE_CODES.get(value, 0)
+
+    # -------------------------------------------------------------------------------
+
+    def touch(self):
+        """마지막 업데이트 시간 갱신"""
+        self.last_update_time = time.monotonic()
+
+    def seconds_since_update(self):
+        return time.monotonic() - self.last_update_time
+
+    def snapshot(self):
+        """현재 상태를 SNAPSHOT_FIELDS 순서의 튜플로 반환 (딕셔너리 복사 없음)"""
+        return self._snapshot_getter(self)
+
+    def to_dict(self):
+        """API / 저널용 딕셔너리 (Enum 은 값 문자열로)"""
+        data = dict(zip(SNAPSHOT_FIELDS, self.snapshot()))
+        data["state"] = self.state.value
+        data["mission_phase"] = self.mission_phase.value if self.mission_phase else None
+        data["direction"] = self.direction.value if self.direction else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict() 결과로 컨텍스트 복원"""
+        context = cls(data["truck_id"])
+        context.state = TruckState(data.get("state") or TruckState.IDLE.value)
+        context.position = data.get("position") or "STANDBY"
+        context.mission_id = data.get("mission_id")
+        context.mission_phase = MissionPhase(data.get("mission_phase") or MissionPhase.NONE.value)
+        context.direction = Direction(data.get("direction") or Direction.CLOCKWISE.value)
+        context.target_position = data.get("target_position")
+        context.loading_target = data.get("loading_target")
+        context.battery_level = data.get("battery_level", 100)
+        context.is_charging = data.get("is_charging", False)
+        return context
+
+    # -------------------------------------------------------------------------------
+
     def update_position(self, new_position):
         """위치 정보 업데이트"""
         old_position = self.position
         self.position = new_position
-        self.last_update_time = datetime.now()
+        self.touch()
         return old_position
         
     def update_state(self, new_state):
         """상태 정보 업데이트"""
         old_state = self.state
         self.state = new_state
-        self.last_update_time = datetime.now()
+        self.touch()
         return old_state
         
     def update_battery(self, level, is_charging):
         """배터리 정보 업데이트"""
         self.battery_level = level
         self.is_charging = is_charging
-        self.last_update_time = datetime.now()
+        self.touch()
         
     def update_direction(self, new_direction):
         """방향 정보 업데이트"""
         old_direction = self.direction
         self.direction = new_direction
-        self.last_update_time = datetime.now()
+        self.touch()
         return old_direction
         
     def is_clockwise(self):
@@ -2,14 +2,97 @@ import mysql.connector
 from datetime import datetime
 from typing import Optional, List, Dict
 
+from backend.db.migrations import apply_migrations
+from backend.db.retention import drop_day_partitions, retention_cutoff
+from backend.db.history_query import bucket_expr, merge_level_buckets, time_in_state
+
+# 히스토리 보관 기간 (일)
+RAW_RETENTION_DAYS = 7          # 원본 해상도 보관 기간
+AGGREGATE_RETENTION_DAYS = 180  # 배터리 분 단위 집계 보관 기간
+
+# since 를 지정하지 않은 범위 조회의 시작 시각
+HISTORY_EPOCH = datetime(2000, 1, 1)
+
+# 스키마 마이그레이션 (버전, 설명, SQL 목록)
+MIGRATIONS = [
+    (1, "battery_status / position_status (truck_id, timestamp) 복합 인덱스", [
+        "CREATE INDEX idx_battery_truck_time ON battery_status (truck_id, timestamp)",
+        "CREATE INDEX idx_position_truck_time ON position_status (truck_id, timestamp)"
+    ]),
+    (2, "트럭별 최신 상태 테이블 (battery_status_latest / position_status_latest)", [
+        """
+        CREATE TABLE IF NOT EXISTS battery_status_latest (
+            truck_id VARCHAR(50) PRIMARY KEY,
+            battery_level FLOAT,
+            truck_status VARCHAR(50),
+            event_type VARCHAR(50),
+            timestamp DATETIME
+        ) ENGINE=InnoDB
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS position_status_latest (
+            truck_id VARCHAR(50) PRIMARY KEY,
+            location VARCHAR(50),
+            status VARCHAR(50),
+            timestamp DATETIME
+        ) ENGINE=InnoDB
+        """,
+        # 기존 히스토리에서 트럭별 마지막 행으로 채우기
+        """
+        REPLACE INTO battery_status_latest (truck_id, battery_level, truck_status, event_type, timestamp)
+        SELECT b.truck_id, b.battery_level, b.truck_status, b.event_type, b.timestamp
+        FROM battery_status b
+        JOIN (SELECT truck_id, MAX(id) AS last_id FROM battery_status GROUP BY truck_id) latest_row
+          ON b.id = latest_row.last_id
+        """,
+        """
+        REPLACE INTO position_status_latest (truck_id, location, status, timestamp)
+        SELECT p.truck_id, p.location, p.status, p.timestamp
+        FROM position_status p
+        JOIN (SELECT truck_id, MAX(id) AS last_id FROM position_status GROUP BY truck_id) latest_row
+          ON p.id = latest_row.last_id
+        """
+    ]),
+    (3, "보관 정책용 timestamp 인덱스 + 배터리 분 단위 집계 테이블", [
+        "CREATE INDEX idx_battery_time ON battery_status (timestamp)",
+        "CREATE INDEX idx_position_time ON position_status (timestamp)",
+        """
+        CREATE TABLE IF NOT EXISTS battery_status_minute (
+            truck_id VARCHAR(50),
+            bucket DATETIME,
+            min_level FLOAT,
+            avg_level FLOAT,
+            max_level FLOAT,
+            samples INT,
+            PRIMARY KEY (truck_id, bucket),
+            INDEX idx_battery_minute_bucket (bucket)
+        ) ENGINE=InnoDB
+        """
+    ]),
+    (4, "트럭 목록 / 프로토콜 ID 할당 테이블 (fleet_trucks)", [
+        """
+        CREATE TABLE IF NOT EXISTS fleet_trucks (
+            truck_id VARCHAR(50) PRIMARY KEY,
+            protocol_id INT NOT NULL UNIQUE,
+            name VARCHAR(100),
+            active TINYINT(1) DEFAULT 1,
+            registered_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB
+        """
+    ]),
+]
+
 class TruckStatusDB:
-    def __init__(self, host="localhost", user="root", password="jinhyuk2dacibul", database="dust"):
+    def __init__(self, host="localhost", user="root", password="jinhyuk2dacibul", database="dust",
+                 raw_retention_days=RAW_RETENTION_DAYS, aggregate_retention_days=AGGREGATE_RETENTION_DAYS):
         self.connection_params = {
             'host': host,
             'user': user,
             'password': password,
             'database': database
         }
+        self.raw_retention_days = raw_retention_days
+        self.aggregate_retention_days = aggregate_retention_days
         self.init_db()
 
     def get_connection(self):
@@ -42,6 +125,10 @@ class TruckStatusDB:
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
                 ) ENGINE=InnoDB;
             """)
+            conn.commit()
+            
+            # 인덱스 / 최신 상태 테이블 마이그레이션
+            apply_migrations(conn, "truck_status", MIGRATIONS)
             
             # TRUCK_01의 초기 상태 데이터 생성
             cursor.execute("""
@@ -54,6 +141,17 @@ class TruckStatusDB:
                 VALUES ('TRUCK_01', 'STANDBY', 'IDLE')
             """)
             
+            # 최신 상태 테이블에 아직 행이 없을 때만 초기값 추가
+            cursor.execute("""
+                INSERT IGNORE INTO battery_status_latest (truck_id, battery_level, truck_status, event_type, timestamp)
+                VALUES ('TRUCK_01', 100.0, 'NORMAL', 'CHARGING_END', NOW())
+            """)
+            
+            cursor.execute("""
+                INSERT IGNORE INTO position_status_latest (truck_id, location, status, timestamp)
+                VALUES ('TRUCK_01', 'STANDBY', 'IDLE', NOW())
+            """)
+            
             conn.commit()
             cursor.close()
             conn.close()
@@ -69,6 +167,9 @@ class TruckStatusDB:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM position_status")
             cursor.execute("DELETE FROM battery_status")
+            cursor.execute("DELETE FROM position_status_latest")
+            cursor.execute("DELETE FROM battery_status_latest")
+            cursor.execute("DELETE FROM battery_status_minute")
             conn.commit()
             cursor.close()
             conn.close()
@@ -81,8 +182,17 @@ class TruckStatusDB:
             conn = self.get_connection()
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO battery_status (truck_id, battery_level, truck_status, event_type)
-                VALUES (%s, %s, %s, %s)
+                INSERT INTO battery_status (truck_id, battery_level, truck_status, event_type, timestamp)
+                VALUES (%s, %s, %s, %s, NOW())
+            """, (truck_id, battery_level, truck_status, event_type))
+            cursor.execute("""
+                INSERT INTO battery_status_latest (truck_id, battery_level, truck_status, event_type, timestamp)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE
+                    battery_level = VALUES(battery_level),
+                    truck_status = VALUES(truck_status),
+                    event_type = VALUES(event_type),
+                    timestamp = VALUES(timestamp)
             """, (truck_id, battery_level, truck_status, event_type))
             conn.commit()
             cursor.close()
@@ -102,10 +212,19 @@ class TruckStatusDB:
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
+            status = run_state if run_state else "IDLE"
+            cursor.execute("""
+                INSERT INTO position_status (truck_id, location, status, timestamp)
+                VALUES (%s, %s, %s, NOW())
+            """, (truck_id, position, status))
             cursor.execute("""
-                INSERT INTO position_status (truck_id, location, status)
-                VALUES (%s, %s, %s)
-            """, (truck_id, position, run_state if run_state else "IDLE"))
+                INSERT INTO position_status_latest (truck_id, location, status, timestamp)
+                VALUES (%s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE
+                    location = VALUES(location),
+                    status = VALUES(status),
+                    timestamp = VALUES(timestamp)
+            """, (truck_id, position, status))
             conn.commit()
             cursor.close()
             conn.close()
@@ -113,16 +232,62 @@ class TruckStatusDB:
         except Exception as e:
             print(f"[ERROR] 위치 상태 로깅 실패: {str(e)}")
 
+    def log_telemetry_batch(self, truck_id: str, rows: List[tuple]):
+        """
+        TELEMETRY 레코드 묶음을 한 번에 기록합니다 (연결 / 커밋 1회).
+
+        Args:
+            truck_id (str): 트럭 ID
+            rows (list): (timestamp, battery_level, truck_status, event_type, location, status) 목록 - 시간 순
+        """
+        if not rows:
+            return
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO battery_status (truck_id, battery_level, truck_status, event_type, timestamp)
+                VALUES (%s, %s, %s, %s, %s)
+            """, [(truck_id, level, truck_status, event_type, ts)
+                  for ts, level, truck_status, event_type, _, _ in rows])
+            cursor.executemany("""
+                INSERT INTO position_status (truck_id, location, status, timestamp)
+                VALUES (%s, %s, %s, %s)
+            """, [(truck_id, location, status, ts) for ts, _, _, _, location, status in rows])
+
+            # 최신 상태 테이블은 마지막 레코드만
+            ts, level, truck_status, event_type, location, status = rows[-1]
+            cursor.execute("""
+                INSERT INTO battery_status_latest (truck_id, battery_level, truck_status, event_type, timestamp)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    battery_level = VALUES(battery_level),
+                    truck_status = VALUES(truck_status),
+                    event_type = VALUES(event_type),
+                    timestamp = VALUES(timestamp)
+            """, (truck_id, level, truck_status, event_type, ts))
+            cursor.execute("""
+                INSERT INTO position_status_latest (truck_id, location, status, timestamp)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    location = VALUES(location),
+                    status = VALUES(status),
+                    timestamp = VALUES(timestamp)
+            """, (truck_id, location, status, ts))
+            conn.commit()
+            cursor.close()
+            conn.close()
+        except mysql.connector.Error as err:
+            print(f"[ERROR] 텔레메트리 로깅 실패: {err}")
+
     def get_latest_battery_status(self, truck_id: str) -> Optional[Dict]:
         try:
             conn = self.get_connection()
             cursor = conn.cursor(dictionary=True)
             cursor.execute("""
                 SELECT battery_level, truck_status, event_type, timestamp
-                FROM battery_status
+                FROM battery_status_latest
                 WHERE truck_id = %s
-                ORDER BY timestamp DESC
-                LIMIT 1
             """, (truck_id,))
             row = cursor.fetchone()
             cursor.close()
@@ -138,10 +303,8 @@ class TruckStatusDB:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("""
                 SELECT location, status, timestamp
-                FROM position_status
+                FROM position_status_latest
                 WHERE truck_id = %s
-                ORDER BY timestamp DESC
-                LIMIT 1
             """, (truck_id,))
             row = cursor.fetchone()
             cursor.close()
@@ -151,43 +314,224 @@ class TruckStatusDB:
             print(f"[ERROR] 위치 상태 조회 실패: {err}")
             return None
 
-    def get_battery_history(self, truck_id: str, limit: int = 100) -> List[Dict]:
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
+    def get_battery_history(self, truck_id: str, limit: int = 100,
+                            since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
+        """
+        배터리 히스토리 조회 (최신순)
+        since 가 원본 보관 기간보다 오래되면 그 이전 구간은 분 단위 집계(min/avg/max)로 채운다.
+        """
+        if since is None and until is None:
+            query = """
                 SELECT battery_level, truck_status, event_type, timestamp
                 FROM battery_status
                 WHERE truck_id = %s
                 ORDER BY timestamp DESC
                 LIMIT %s
-            """, (truck_id, limit))
-            result = cursor.fetchall()
+            """
+            return self._fetch_all(query, (truck_id, limit), "배터리 히스토리 조회")
+
+        until = until or datetime.now()
+        raw_cutoff = retention_cutoff(self.raw_retention_days)
+        rows = []
+        if until > raw_cutoff:
+            rows = self._fetch_all("""
+                SELECT battery_level, truck_status, event_type, timestamp, 'raw' AS resolution
+                FROM battery_status
+                WHERE truck_id = %s AND timestamp >= %s AND timestamp < %s
+                ORDER BY timestamp DESC
+                LIMIT %s
+            """, (truck_id, max(since or raw_cutoff, raw_cutoff), until, limit), "배터리 히스토리 조회")
+
+        if (since is None or since < raw_cutoff) and len(rows) < limit:
+            rows += self._fetch_all("""
+                SELECT avg_level AS battery_level, min_level, max_level, samples,
+                       NULL AS truck_status, 'AGGREGATED' AS event_type, bucket AS timestamp, '1m' AS resolution
+                FROM battery_status_minute
+                WHERE truck_id = %s AND bucket >= %s AND bucket < %s
+                ORDER BY bucket DESC
+                LIMIT %s
+            """, (truck_id, since or HISTORY_EPOCH, min(until, raw_cutoff), limit - len(rows)), "배터리 집계 히스토리 조회")
+        return rows
+
+    def get_position_history(self, truck_id: str, limit: int = 100,
+                             since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
+        """위치 히스토리 조회 (최신순) - 위치는 원본 보관 기간까지만 남는다"""
+        if since is None and until is None:
+            query = """
+                SELECT location, status, timestamp
+                FROM position_status
+                WHERE truck_id = %s
+                ORDER BY timestamp DESC
+                LIMIT %s
+            """
+            return self._fetch_all(query, (truck_id, limit), "위치 히스토리 조회")
+
+        return self._fetch_all("""
+            SELECT location, status, timestamp
+            FROM position_status
+            WHERE truck_id = %s AND timestamp >= %s AND timestamp < %s
+            ORDER BY timestamp DESC
+            LIMIT %s
+        """, (truck_id, since or HISTORY_EPOCH, until or datetime.now(), limit), "위치 히스토리 조회")
+
+    # -------------------------------- 구간 집계 조회 --------------------------------
+
+    def get_battery_buckets(self, truck_id: str, since: datetime, until: datetime, bucket_seconds: int) -> List[Dict]:
+        """배터리 구간별 min / avg / max (원본 + 분 단위 집계 병합) - [{"t", "min", "avg", "max", "samples"}]"""
+        raw_rows = self._fetch_all(f"""
+            SELECT {bucket_expr("timestamp")} AS bucket_start,
+                   MIN(battery_level) AS min_level, AVG(battery_level) AS avg_level,
+                   MAX(battery_level) AS max_level, COUNT(*) AS samples
+            FROM battery_status
+            WHERE truck_id = %s AND timestamp >= %s AND timestamp < %s
+            GROUP BY bucket_start
+        """, (bucket_seconds, bucket_seconds, truck_id, since, until), "배터리 구간 집계")
+
+        minute_rows = []
+        raw_cutoff = retention_cutoff(self.raw_retention_days)
+        if since < raw_cutoff:
+            minute_rows = self._fetch_all(f"""
+                SELECT {bucket_expr("bucket")} AS bucket_start,
+                       MIN(min_level) AS min_level, SUM(avg_level * samples) / SUM(samples) AS avg_level,
+                       MAX(max_level) AS max_level, SUM(samples) AS samples
+                FROM battery_status_minute
+                WHERE truck_id = %s AND bucket >= %s AND bucket < %s
+                GROUP BY bucket_start
+            """, (bucket_seconds, bucket_seconds, truck_id, since, min(until, raw_cutoff)), "배터리 집계 구간 조회")
+
+        return merge_level_buckets(raw_rows, minute_rows)
+
+    def get_time_in_state(self, truck_id: str, since: datetime, until: datetime) -> Dict[str, float]:
+        """구간 내 주행 상태별 체류 시간(초)"""
+        # 구간 시작 시점의 상태를 알기 위해 since 직전 행부터 조회
+        rows = self._fetch_all("""
+            (SELECT status, timestamp FROM position_status
+             WHERE truck_id = %s AND timestamp < %s
+             ORDER BY timestamp DESC LIMIT 1)
+            UNION ALL
+            (SELECT status, timestamp FROM position_status
+             WHERE truck_id = %s AND timestamp >= %s AND timestamp < %s)
+            ORDER BY timestamp
+        """, (truck_id, since, truck_id, since, until), "상태 체류 시간 조회")
+        return time_in_state(rows, since, until)
+
+    def get_battery_drain_by_mission(self, truck_id: str, since: datetime, until: datetime) -> List[Dict]:
+        """구간 내 완료된 미션별 배터리 소모량 / 분당 소모율"""
+        rows = self._fetch_all("""
+            SELECT m.mission_id, m.timestamp_assigned, m.timestamp_completed,
+                   (SELECT b.battery_level FROM battery_status b
+                    WHERE b.truck_id = m.assigned_truck_id AND b.timestamp >= m.timestamp_assigned
+                    ORDER BY b.timestamp ASC LIMIT 1) AS start_level,
+                   (SELECT b.battery_level FROM battery_status b
+                    WHERE b.truck_id = m.assigned_truck_id AND b.timestamp <= m.timestamp_completed
+                    ORDER BY b.timestamp DESC LIMIT 1) AS end_level
+            FROM missions m
+            WHERE m.assigned_truck_id = %s AND m.status_code = 'COMPLETED'
+              AND m.timestamp_completed >= %s AND m.timestamp_completed < %s
+            ORDER BY m.timestamp_completed
+        """, (truck_id, since, until), "미션별 배터리 소모 조회")
+
+        result = []
+        for row in rows:
+            if row["start_level"] is None or row["end_level"] is None or not row["timestamp_assigned"]:
+                continue
+            minutes = (row["timestamp_completed"] - row["timestamp_assigned"]).total_seconds() / 60
+            drained = float(row["start_level"]) - float(row["end_level"])
+            result.append({
+                "mission_id": row["mission_id"],
+                "duration_min": round(minutes, 2),
+                "drained": round(drained, 2),
+                "drain_per_min": round(drained / minutes, 3) if minutes > 0 else None
+            })
+        return result
+
+    # -------------------------------- 트럭 목록 --------------------------------
+
+    def load_fleet(self) -> List[Dict]:
+        """FleetRegistry 저장소 - 등록된 트럭 목록"""
+        return self._fetch_all("""
+            SELECT truck_id, protocol_id, name, active, registered_at
+            FROM fleet_trucks
+            ORDER BY protocol_id
+        """, (), "트럭 목록 조회")
+
+    def save_fleet_truck(self, record: Dict):
+        """FleetRegistry 저장소 - 트럭 등록 / 활성 상태 저장 (프로토콜 ID 는 바꾸지 않음)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO fleet_trucks (truck_id, protocol_id, name, active, registered_at)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    name = VALUES(name),
+                    active = VALUES(active)
+            """, (record["truck_id"], record["protocol_id"], record["name"],
+                  1 if record["active"] else 0, record["registered_at"]))
+            conn.commit()
             cursor.close()
             conn.close()
-            return result
         except mysql.connector.Error as err:
-            print(f"[ERROR] 배터리 히스토리 조회 실패: {err}")
-            return []
+            print(f"[ERROR] 트럭 목록 저장 실패: {err}")
 
-    def get_position_history(self, truck_id: str, limit: int = 100) -> List[Dict]:
+    def _fetch_all(self, query: str, params: tuple, label: str) -> List[Dict]:
         try:
             conn = self.get_connection()
             cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT location, status, timestamp
-                FROM position_status
-                WHERE truck_id = %s
-                ORDER BY timestamp DESC
-                LIMIT %s
-            """, (truck_id, limit))
+            cursor.execute(query, params)
             result = cursor.fetchall()
             cursor.close()
             conn.close()
             return result
         except mysql.connector.Error as err:
-            print(f"[ERROR] 위치 히스토리 조회 실패: {err}")
+            print(f"[ERROR] {label} 실패: {err}")
             return []
 
+    # -------------------------------- 보관 정책 --------------------------------
+
+    def apply_retention(self, now: Optional[datetime] = None, archiver=None) -> Dict[str, int]:
+        """
+        오래된 히스토리 정리 - 테이블별 삭제 행 수 반환
+        - battery_status: 원본 보관 기간이 지난 날은 분 단위 집계로 옮긴 뒤 삭제
+        - position_status: 원본 보관 기간이 지난 날 삭제
+        - battery_status_minute: 집계 보관 기간이 지난 행 삭제
+        """
+        raw_cutoff = retention_cutoff(self.raw_retention_days, now)
+        aggregate_cutoff = retention_cutoff(self.aggregate_retention_days, now)
+        summary = {}
+        try:
+            conn = self.get_connection()
+            summary["battery_status"] = drop_day_partitions(
+                conn, "battery_status", raw_cutoff, archiver, before_drop=self._rollup_battery_minutes
+            )
+            summary["position_status"] = drop_day_partitions(conn, "position_status", raw_cutoff, archiver)
+
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM battery_status_minute WHERE bucket < %s", (aggregate_cutoff,))
+            summary["battery_status_minute"] = cursor.rowcount
+            conn.commit()
+            cursor.close()
+            conn.close()
+        except mysql.connector.Error as err:
+            print(f"[ERROR] 트럭 상태 히스토리 정리 실패: {err}")
+        return summary
+
+    @staticmethod
+    def _rollup_battery_minutes(cursor, start: datetime, end: datetime):
+        """[start, end) 구간 배터리 원본을 트럭/분 단위 min/avg/max 로 집계"""
+        cursor.execute("""
+            INSERT INTO battery_status_minute (truck_id, bucket, min_level, avg_level, max_level, samples)
+            SELECT truck_id, DATE_FORMAT(timestamp, '%%Y-%%m-%%d %%H:%%i:00') AS minute_bucket,
+                   MIN(battery_level), AVG(battery_level), MAX(battery_level), COUNT(*)
+            FROM battery_status
+            WHERE timestamp >= %s AND timestamp < %s
+            GROUP BY truck_id, minute_bucket
+            ON DUPLICATE KEY UPDATE
+                min_level = VALUES(min_level),
+                avg_level = VALUES(avg_level),
+                max_level = VALUES(max_level),
+                samples = VALUES(samples)
+        """, (start, end))
+
     def close(self):
         print("[DEBUG] TruckStatusDB 리소스 정리 완료")
@@ -1,12 +1,34 @@
+import threading
 from typing import Dict, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from .truck_status_db import TruckStatusDB
+from backend.cache.state_versions import get_state_versions, DOMAIN_TRUCKS
+from backend.fleet.fleet_registry import get_fleet_registry
+
+
+def default_truck_status(location: str = "STANDBY") -> dict:
+    """상태 보고 전 트럭의 기본 상태"""
+    return {
+        "battery": {"level": 100.0, "is_charging": False},
+        "position": {"location": location, "status": "IDLE"},
+        "fsm_state": "IDLE"
+    }
+
+
+def copy_truck_status(status: dict) -> dict:
+    """트럭 상태 복사 - battery / position 등 하위 dict 까지 (REST 스레드가 메모리 상태를 바꾸지 않도록)"""
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in status.items()}
+
 
 class TruckStatusManager:
-    def __init__(self, db: TruckStatusDB):
+    def __init__(self, db: TruckStatusDB, serve_from_memory: bool = False, fleet=None):
         self.truck_status_db = db
+        self.fleet = fleet or get_fleet_registry()  # 조회 / 초기화 대상 트럭 목록
+        self.serve_from_memory = serve_from_memory  # 트럭 메시지로 직접 갱신되는 실행 중인 인스턴스면 조회 시 DB 생략
         self.truck_status = {}
         self.fsm_states = {}  # 트럭의 FSM 상태를 별도로 저장하는 딕셔너리
+        self.lock = threading.Lock()  # TCP 스레드 갱신 ↔ REST 스레드 스냅샷
+        self.versions = get_state_versions()  # 상태 버전 (응답 캐시 무효화)
     
     # -------------------------------- 트럭 상태 초기화 --------------------------------
     def reset_all_trucks(self):
@@ -19,30 +41,24 @@ class TruckStatusManager:
         self.truck_status_db.reset_all_statuses()
         print("[✅ 트럭 상태 초기화 완료] 모든 트럭 상태 기록이 삭제되었습니다")
         
-        # 메모리 상태 초기화
-        self.truck_status = {
-            "TRUCK_01": {
-                "battery": {"level": 100.0, "is_charging": False},
-                "position": {"location": "STANDBY", "status": "IDLE"},
-                "fsm_state": "IDLE"
-            },
-            "TRUCK_02": {
-                "battery": {"level": 100.0, "is_charging": False},
-                "position": {"location": "UNKNOWN", "status": "IDLE"},
-                "fsm_state": "IDLE"
-            },
-            "TRUCK_03": {
-                "battery": {"level": 100.0, "is_charging": False},
-                "position": {"location": "UNKNOWN", "status": "IDLE"},
-                "fsm_state": "IDLE"
-            }
-        }
+        # 메모리 상태 초기화 (등록된 모든 트럭은 대기 장소에서 시작)
+        with self.lock:
+            self.truck_status = {truck_id: default_truck_status() for truck_id in self.fleet.truck_ids()}
+        self.versions.bump(DOMAIN_TRUCKS)
         print("[✅ 메모리 상태 초기화 완료] 모든 트럭 상태가 초기화되었습니다")
         return True
     
     # -------------------------------- 트럭 상태 조회 --------------------------------
     def get_truck_status(self, truck_id: str) -> dict:
         """트럭 상태 조회 - DB에서 최신 상태를 가져와 메모리 업데이트"""
+        if self.serve_from_memory:
+            with self.lock:
+                status = self.truck_status.get(truck_id)
+                result = copy_truck_status(status) if status is not None else None
+            if result is not None:
+                result["fsm_state"] = self.get_fsm_state(truck_id)
+                return result
+        
         # DB에서 최신 상태 조회
         battery_data = self.truck_status_db.get_latest_battery_status(truck_id)
         position_data = self.truck_status_db.get_latest_position_status(truck_id)
@@ -70,16 +86,18 @@ class TruckStatusManager:
             }
 
         # 메모리 상태 업데이트
-        self.truck_status[truck_id] = {
+        status = {
             "battery": battery_status,
             "position": position_status
         }
+        with self.lock:
+            self.truck_status[truck_id] = status
         
         # FSM 상태 조회
         fsm_state = self.get_fsm_state(truck_id)
         
         # 응답에 FSM 상태 포함
-        result = self.truck_status[truck_id].copy()
+        result = copy_truck_status(status)
         result["fsm_state"] = fsm_state
 
         return result
@@ -89,9 +107,9 @@ class TruckStatusManager:
     def update_battery(self, truck_id: str, level: float, is_charging: bool):
         """배터리 상태 업데이트"""
         # 이전 배터리 상태 확인
-        prev_level = 100.0  # 기본값
-        if truck_id in self.truck_status:
-            prev_level = self.truck_status[truck_id]["battery"]["level"]
+        with self.lock:
+            status = self.truck_status.get(truck_id)
+            prev_level = status["battery"]["level"] if status else 100.0  # 기본값
         
         # DB에 로깅
         self.truck_status_db.log_battery_status(
@@ -102,14 +120,16 @@ class TruckStatusManager:
         )
         
         # 메모리 상태 업데이트
-        if truck_id not in self.truck_status:
-            self.truck_status[truck_id] = {
-                "battery": {"level": level, "is_charging": is_charging},
-                "position": {"location": "UNKNOWN", "status": "IDLE"}
-            }
-        else:
-            self.truck_status[truck_id]["battery"]["level"] = level
-            self.truck_status[truck_id]["battery"]["is_charging"] = is_charging
+        with self.lock:
+            if truck_id not in self.truck_status:
+                self.truck_status[truck_id] = {
+                    "battery": {"level": level, "is_charging": is_charging},
+                    "position": {"location": "UNKNOWN", "status": "IDLE"}
+                }
+            else:
+                self.truck_status[truck_id]["battery"]["level"] = level
+                self.truck_status[truck_id]["battery"]["is_charging"] = is_charging
+        self.versions.bump(DOMAIN_TRUCKS)
         
         # 상태 변화 로깅
         print(f"[🔋 배터리 상태] {truck_id}: {level}% (충전상태: {is_charging}, 이전: {prev_level}%)")
@@ -139,89 +159,144 @@ class TruckStatusManager:
             self.truck_status_db.log_position_status(truck_id, position, run_state_str)
             
             # 메모리 상태 업데이트 (위치 및 상태 정보만)
-            if truck_id not in self.truck_status:
-                self.truck_status[truck_id] = {
-                    "battery": {"level": 100, "is_charging": False},
-                    "position": {"location": "UNKNOWN", "status": "IDLE"}
+            with self.lock:
+                if truck_id not in self.truck_status:
+                    self.truck_status[truck_id] = {
+                        "battery": {"level": 100, "is_charging": False},
+                        "position": {"location": "UNKNOWN", "status": "IDLE"}
+                    }
+                
+                # 위치 정보만 업데이트 (FSM 상태는 건드리지 않음)
+                self.truck_status[truck_id]["position"] = {
+                    "location": position,
+                    "status": run_state_str
                 }
-            
-            # 위치 정보만 업데이트 (FSM 상태는 건드리지 않음)
-            self.truck_status[truck_id]["position"] = {
-                "location": position,
-                "status": run_state_str
-            }
+            self.versions.bump(DOMAIN_TRUCKS)
             
             print(f"[DEBUG] 위치 업데이트 완료: {truck_id} - position={position}, run_state={run_state_str}")
             
         except Exception as e:
             print(f"[ERROR] 위치 업데이트 실패: {str(e)}")
 
+    # -------------------------------- 텔레메트리 묶음 반영 --------------------------------
+
+    def apply_telemetry(self, truck_id: str, records: list, now: Optional[datetime] = None):
+        """
+        TELEMETRY 레코드 묶음 반영 - DB 기록 1회, 메모리 갱신 / 버전 증가는 마지막 레코드로 1회.
+        
+        트럭 시계는 서버와 맞지 않으므로 마지막 레코드를 수신 시각에 맞추고
+        나머지는 트럭 timestamp_ms 차이만큼 앞선 시각으로 기록합니다.
+        
+        Args:
+            truck_id (str): 트럭 ID
+            records (list): 시간 순 레코드 (position, battery_level, run_state, is_charging, distance_cm, timestamp_ms)
+        """
+        if not records:
+            return
+        now = now or datetime.now()
+        last_ms = records[-1].get("timestamp_ms", 0)
+        rows = []
+        for record in records:
+            age_ms = (last_ms - record.get("timestamp_ms", 0)) & 0xFFFFFFFF  # uint32 랩어라운드
+            is_charging = bool(record.get("is_charging"))
+            rows.append((
+                now - timedelta(milliseconds=age_ms),
+                record.get("battery_level", 100),
+                "CHARGING" if is_charging else "NORMAL",
+                "CHARGING_START" if is_charging else "CHARGING_END",
+                record.get("position", "UNKNOWN"),
+                record.get("run_state") or "IDLE"
+            ))
+        self.truck_status_db.log_telemetry_batch(truck_id, rows)
+        
+        latest = records[-1]
+        with self.lock:
+            status = self.truck_status.setdefault(truck_id, default_truck_status("UNKNOWN"))
+            status["battery"] = {"level": latest.get("battery_level", 100), "is_charging": bool(latest.get("is_charging"))}
+            status["position"] = {"location": latest.get("position", "UNKNOWN"), "status": latest.get("run_state") or "IDLE"}
+            status["obstacle"] = {"detected": bool(latest.get("obstacle_detected")), "distance_cm": latest.get("distance_cm")}
+        self.versions.bump(DOMAIN_TRUCKS)
+
     # -------------------------------- 조회 --------------------------------
     
     def get_all_trucks(self) -> Dict[str, dict]:
         """모든 트럭의 상태 조회 - DB에서 최신 상태를 가져와 메모리 업데이트"""
         try:
-            # 현재는 TRUCK_01만 사용
-            truck_id = "TRUCK_01"
-            
-            # DB에서 최신 상태 조회
-            battery_data = self.truck_status_db.get_latest_battery_status(truck_id)
-            position_data = self.truck_status_db.get_latest_position_status(truck_id)
+            for truck_id in self.fleet.truck_ids():
+                if self.serve_from_memory:
+                    # 실행 중 인스턴스는 시작 시 reset_all_trucks 로 채워짐 - 이후 등록된 트럭만 기본 상태 추가
+                    with self.lock:
+                        self.truck_status.setdefault(truck_id, default_truck_status())
+                    continue
+                
+                # DB에서 최신 상태 조회
+                battery_data = self.truck_status_db.get_latest_battery_status(truck_id)
+                position_data = self.truck_status_db.get_latest_position_status(truck_id)
 
-            # 배터리 초기화
-            battery_status = {
-                "level": 100.0,
-                "is_charging": False
-            }
-            if battery_data:
+                # 배터리 초기화
                 battery_status = {
-                    "level": battery_data["battery_level"],
-                    "is_charging": battery_data["event_type"] == "CHARGING_START"
+                    "level": 100.0,
+                    "is_charging": False
                 }
+                if battery_data:
+                    battery_status = {
+                        "level": battery_data["battery_level"],
+                        "is_charging": battery_data["event_type"] == "CHARGING_START"
+                    }
 
-            # 위치 초기화
-            position_status = {
-                "location": "STANDBY",  # 기본값을 STANDBY로 변경
-                "status": "IDLE"
-            }
-            if position_data:
+                # 위치 초기화
                 position_status = {
-                    "location": position_data["location"],
-                    "status": position_data["status"]
+                    "location": "STANDBY",  # 기본값을 STANDBY로 변경
+                    "status": "IDLE"
                 }
+                if position_data:
+                    position_status = {
+                        "location": position_data["location"],
+                        "status": position_data["status"]
+                    }
 
-            # 메모리 상태 업데이트
-            self.truck_status[truck_id] = {
-                "battery": battery_status,
-                "position": position_status
-            }
+                # 메모리 상태 업데이트
+                with self.lock:
+                    self.truck_status[truck_id] = {
+                        "battery": battery_status,
+                        "position": position_status
+                    }
             
-            # FSM 상태도 포함하여 결과 생성
-            result = {}
-            for t_id, status in self.truck_status.items():
-                result[t_id] = status.copy()
-                result[t_id]["fsm_state"] = self.get_fsm_state(t_id)
-
-            # 항상 최소한 하나의 트럭 상태를 반환
-            return result
+            return self._memory_snapshot()
         except Exception as e:
             print(f"[ERROR] 트럭 상태 조회 중 오류 발생: {e}")
             # 오류 발생 시 기본 상태 반환
-            return {
-                "TRUCK_01": {
-                    "battery": {"level": 100.0, "is_charging": False},
-                    "position": {"location": "STANDBY", "status": "IDLE"},
-                    "fsm_state": "IDLE"
-                }
-            }
+            return {truck_id: default_truck_status() for truck_id in self.fleet.truck_ids()}
     
-    def get_battery_history(self, truck_id: str, limit: int = 100):
-        """배터리 히스토리 조회"""
-        return self.truck_status_db.get_battery_history(truck_id, limit)
+    def _memory_snapshot(self) -> Dict[str, dict]:
+        """메모리 상태 + FSM 상태 - TCP 스레드 갱신 중에도 일관된 복사본"""
+        with self.lock:
+            result = {t_id: copy_truck_status(status) for t_id, status in self.truck_status.items()}
+        for t_id, status in result.items():
+            status["fsm_state"] = self.get_fsm_state(t_id)
+        return result
+    
+    def get_battery_history(self, truck_id: str, limit: int = 100,
+                            since: Optional[datetime] = None, until: Optional[datetime] = None):
+        """배터리 히스토리 조회 - 오래된 구간은 분 단위 집계로 반환"""
+        return self.truck_status_db.get_battery_history(truck_id, limit, since, until)
     
-    def get_position_history(self, truck_id: str, limit: int = 100):
+    def get_position_history(self, truck_id: str, limit: int = 100,
+                             since: Optional[datetime] = None, until: Optional[datetime] = None):
         """위치 히스토리 조회"""
-        return self.truck_status_db.get_position_history(truck_id, limit)
+        return self.truck_status_db.get_position_history(truck_id, limit, since, until)
+    
+    def get_battery_buckets(self, truck_id: str, since: datetime, until: datetime, bucket_seconds: int):
+        """배터리 구간별 min / avg / max"""
+        return self.truck_status_db.get_battery_buckets(truck_id, since, until, bucket_seconds)
+    
+    def get_time_in_state(self, truck_id: str, since: datetime, until: datetime):
+        """주행 상태별 체류 시간(초)"""
+        return self.truck_status_db.get_time_in_state(truck_id, since, until)
+    
+    def get_battery_drain_by_mission(self, truck_id: str, since: datetime, until: datetime):
+        """미션별 배터리 소모율"""
+        return self.truck_status_db.get_battery_drain_by_mission(truck_id, since, until)
     
     # -------------------------------- FSM 상태 관리 --------------------------------
 
@@ -232,6 +307,7 @@ class TruckStatusManager:
     def set_fsm_state(self, truck_id: str, fsm_state: str):
         """트럭의 FSM 상태 설정"""
         self.fsm_states[truck_id] = fsm_state
+        self.versions.bump(DOMAIN_TRUCKS)
         print(f"[FSM 상태 설정] {truck_id}: {fsm_state}")
     
     def close(self):
@@ -1,5 +1,9 @@
 import requests
+import copy
 import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List, Union
 
 class APIClient:
@@ -27,6 +31,15 @@ class APIClient:
         self.api_port = 5001
         self.base_url = f"http://{self.server_address}:{self.api_port}/api"
         self.timeout = 5.0  # 요청 타임아웃 (초)
+        
+        # 비동기 요청용 작업 스레드 풀 (UI 스레드는 네트워크 대기 없이 Future 만 받음)
+        self.max_workers = 4
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="api-client")
+        self._local = threading.local()       # 스레드별 keep-alive 세션
+        self._inflight_lock = threading.Lock()
+        self._inflight = {}                   # (endpoint, params) → 진행 중인 GET Future
+        self._etag_lock = threading.Lock()
+        self._etag_cache = {}                 # url+params → (ETag, 응답 데이터 원본 - 호출자에게는 복사본)
         self._initialized = True
         
     def update_config(self, server_address=None, api_port=None):
@@ -38,6 +51,19 @@ class APIClient:
             
         # 베이스 URL 업데이트
         self.base_url = f"http://{self.server_address}:{self.api_port}/api"
+        with self._etag_lock:
+            self._etag_cache.clear()
+        
+    def _session(self):
+        """현재 스레드의 requests.Session (연결 재사용)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
         
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """GET 요청 수행
@@ -47,7 +73,7 @@ class APIClient:
             params: URL 파라미터 (옵션)
             
         Returns:
-            응답 데이터 (JSON)
+            응답 데이터 (JSON) - 304 응답이어도 호출마다 새 객체이므로 수정해도 캐시에 영향 없음
             
         Raises:
             ConnectionError: 연결 실패
@@ -55,11 +81,22 @@ class APIClient:
             ValueError: 잘못된 응답
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        cache_key = (url, _params_key(params))
+        with self._etag_lock:
+            cached = self._etag_cache.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else None
         
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self._session().get(url, params=params, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached:
+                return copy.deepcopy(cached[1])  # 서버 상태가 바뀌지 않음 - 이전 응답 재사용
             response.raise_for_status()  # HTTP 에러 체크
-            return response.json()
+            data = response.json()
+            etag = response.headers.get("ETag")
+            if etag:
+                with self._etag_lock:
+                    self._etag_cache[cache_key] = (etag, copy.deepcopy(data))
+            return data
         except requests.exceptions.Timeout:
             print(f"[ERROR] API 요청 시간 초과: {url}")
             raise TimeoutError(f"API 요청 시간 초과: {url}")
@@ -95,7 +132,7 @@ class APIClient:
         print(f"[DEBUG] API 요청 데이터: {data}")
         
         try:
-            response = requests.post(url, json=data, timeout=self.timeout)
+            response = self._session().post(url, json=data, timeout=self.timeout)
             # 디버그 출력 추가
             print(f"[DEBUG] API 응답 상태 코드: {response.status_code}")
             
@@ -134,7 +171,53 @@ class APIClient:
             print(f"[ERROR] API 응답 JSON 파싱 실패: {url}")
             raise ValueError("API 응답 JSON 파싱 실패")
     
+    # 비동기 요청 메서드
+    def get_async(self, endpoint: str, params: Optional[Dict] = None):
+        """GET 요청을 작업 스레드에서 수행하고 Future 반환
+        
+        같은 엔드포인트 / 파라미터의 GET 이 이미 진행 중이면 새 요청을 보내지 않고
+        진행 중인 Future 를 함께 사용합니다. 결과는 future.result() (get() 과 같은 예외).
+        병합된 호출자들은 같은 결과 객체를 받으므로 읽기 전용으로 사용합니다.
+        """
+        key = (endpoint.lstrip('/'), _params_key(params))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self.get, endpoint, params)
+            self._inflight[key] = future
+        future.add_done_callback(lambda done: self._forget_inflight(key, done))
+        return future
+    
+    def post_async(self, endpoint: str, data: Dict):
+        """POST 요청을 작업 스레드에서 수행하고 Future 반환 (병합하지 않음)"""
+        return self._executor.submit(self.post, endpoint, data)
+    
+    def call_async(self, method, *args, **kwargs):
+        """블로킹 API 메서드(create_mission 등)를 작업 스레드에서 실행하고 Future 반환 (병합하지 않음)"""
+        return self._executor.submit(method, *args, **kwargs)
+    
+    def _forget_inflight(self, key, future):
+        with self._inflight_lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+    
+    def shutdown(self):
+        """작업 스레드 정리 (프로그램 종료 시)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
     # 트럭 관련 API 메서드
+    def get_fleet(self) -> Dict:
+        """등록된 트럭 목록 조회"""
+        return self.get("trucks/fleet")
+    
+    def register_truck(self, truck_id: str, protocol_id: int = None) -> Dict:
+        """트럭 등록 (protocol_id 를 생략하면 서버가 할당)"""
+        data = {"truck_id": truck_id}
+        if protocol_id is not None:
+            data["protocol_id"] = protocol_id
+        return self.post("trucks/fleet", data)
+    
     def get_all_trucks(self) -> Dict:
         """모든 트럭 정보 조회"""
         return self.get("trucks")
@@ -182,17 +265,20 @@ class APIClient:
             if truck_id:
                 params["truck_id"] = truck_id
             
-            response = self.get("missions", params)
-            
-            # 응답이 리스트인 경우 딕셔너리로 변환
-            if isinstance(response, list):
-                return {"success": True, "missions": response}
-            
-            return response
+            return normalize_missions(self.get("missions", params))
         except Exception as e:
             print(f"[ERROR] 미션 목록 조회 실패: {e}")
             return {"success": False, "message": str(e), "missions": []}
     
+    def get_missions_async(self, status=None, truck_id=None):
+        """미션 목록 비동기 조회 - 결과는 get() 원본 응답 (normalize_missions 로 변환)"""
+        params = {}
+        if status:
+            params["status"] = status
+        if truck_id:
+            params["truck_id"] = truck_id
+        return self.get_async("missions", params)
+    
     def get_mission(self, mission_id: str) -> Dict:
         """특정 미션 조회"""
         return self.get(f"missions/{mission_id}")
@@ -296,5 +382,41 @@ class APIClient:
         """
         return self.get("system/tcp/status")
 
+
+def gather_futures(*futures):
+    """여러 Future 가 모두 끝나면 결과 목록(인자 순서)으로 완료되는 Future - 하나라도 실패하면 그 예외"""
+    combined = Future()
+    lock = threading.Lock()
+    remaining = [len(futures)]
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            combined.set_result([future.result() for future in futures])
+        except Exception as e:
+            combined.set_exception(e)
+
+    if not futures:
+        combined.set_result([])
+    for future in futures:
+        future.add_done_callback(on_done)
+    return combined
+
+
+def _params_key(params):
+    """요청 파라미터 → 병합 / ETag 캐시 키"""
+    return tuple(sorted((params or {}).items()))
+
+
+def normalize_missions(response):
+    """미션 목록 응답 정규화 (리스트 응답은 딕셔너리로 변환)"""
+    if isinstance(response, list):
+        return {"success": True, "missions": response}
+    return response
+
+
 # 싱글톤 인스턴스 사용을 위한 전역 변수
 api_client = APIClient() 
\ No newline at end of file
@@ -0,0 +1,75 @@
+# gui/async_api.py
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from gui.api_client import api_client
+
+
+class _ResultDispatcher(QObject):
+    """작업 스레드에서 끝난 Future 결과를 Qt 시그널로 UI 스레드에 전달"""
+
+    finished = pyqtSignal(object, object, object, object)  # future, on_result, on_error, key
+
+    def __init__(self):
+        super().__init__()
+        self._pending = set()  # (future, on_result) - 같은 슬롯이 같은 요청에 중복 등록되지 않도록
+        self.finished.connect(self._deliver)
+
+    def watch(self, future, on_result, on_error=None):
+        key = (future, on_result)
+        if key in self._pending:
+            return  # 타이머가 이전 요청 완료 전에 다시 호출된 경우
+        self._pending.add(key)
+        # add_done_callback 은 작업 스레드에서 실행 → 시그널은 큐 연결로 UI 스레드에서 처리
+        future.add_done_callback(lambda done: self.finished.emit(done, on_result, on_error, key))
+
+    def _deliver(self, future, on_result, on_error, key):
+        self._pending.discard(key)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"[ERROR] 비동기 API 요청 실패: {error}")
+            return
+        on_result(future.result())
+
+
+_dispatcher = None
+
+
+def _get_dispatcher():
+    """UI 스레드에서 처음 호출될 때 생성 (시그널 수신 스레드 = UI 스레드)"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = _ResultDispatcher()
+    return _dispatcher
+
+
+def deliver(future, on_result, on_error=None):
+    """Future 결과를 UI 스레드의 on_result(result) / on_error(exception) 로 전달"""
+    _get_dispatcher().watch(future, on_result, on_error)
+    return future
+
+
+def fetch(endpoint, on_result, on_error=None, params=None):
+    """비동기 GET - 같은 요청이 진행 중이면 함께 결과를 받음"""
+    return deliver(api_client.get_async(endpoint, params), on_result, on_error)
+
+
+def call(method, *args, on_result, on_error=None, **kwargs):
+    """api_client.<method>(...) 를 작업 스레드에서 실행 - 버튼 / 다이얼로그 동작용
+    
+    api_client 에 없는 메서드면 AttributeError 를 바로 on_error 로 전달합니다.
+    """
+    try:
+        future = api_client.call_async(getattr(api_client, method), *args, **kwargs)
+    except Exception as e:
+        if on_error:
+            on_error(e)
+        else:
+            print(f"[ERROR] 비동기 API 요청 실패: {e}")
+        return None
+    return deliver(future, on_result, on_error)
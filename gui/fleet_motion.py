@@ -0,0 +1,211 @@
+# gui/fleet_motion.py
+
+import bisect
+import math
+
+from backend.track.track_topology import CLOCKWISE, COUNTERCLOCKWISE
+
+PREDICT_LIMIT = 0.9   # ETA 예측 이동은 다음 노드 90% 지점까지만 (도착 보고 전에 노드를 지나치지 않도록)
+CATCH_UP_TIME = 0.4   # 새 위치 보고 시 표시 위치에서 보고 노드까지 따라가는 시간 (초)
+MIN_MOVE = 0.25       # 이보다 작게 움직이면 다시 그리지 않음 (px)
+
+
+def rounded_rect_points(left, top, right, bottom, radius, arc_steps=8):
+    """
+    맵에 그리는 모서리가 둥근 사각형 트랙과 같은 순서의 점 목록
+    (좌측 하단 → 하단 → 우측 → 상단 → 좌측, 트럭 시계방향 주행 순서)
+    """
+    def arc(cx, cy, start):
+        # QPainterPath.arcTo 와 같은 각도 기준 (0도 = 3시, 화면 반시계방향으로 증가)
+        return [(cx + radius * math.cos(math.radians(start + 90 * i / arc_steps)),
+                 cy - radius * math.sin(math.radians(start + 90 * i / arc_steps)))
+                for i in range(arc_steps + 1)]
+
+    return ([(left + radius, bottom)]
+            + arc(right - radius, bottom - radius, 270)
+            + arc(right - radius, top + radius, 0)
+            + arc(left + radius, top + radius, 90)
+            + arc(left + radius, bottom - radius, 180))
+
+
+class TrackPolyline:
+    """닫힌 트랙 경로 - 트랙 위 거리 ↔ 맵 좌표"""
+
+    def __init__(self, points):
+        self.points = list(points)
+        self.cumulative = [0.0]
+        for (x1, y1), (x2, y2) in zip(self.points, self.points[1:] + self.points[:1]):
+            self.cumulative.append(self.cumulative[-1] + math.hypot(x2 - x1, y2 - y1))
+        self.length = self.cumulative[-1]
+
+    def project(self, x, y):
+        """좌표에서 가장 가까운 트랙 지점의 거리"""
+        best, best_gap = 0.0, None
+        for index, (x1, y1) in enumerate(self.points):
+            x2, y2 = self.points[(index + 1) % len(self.points)]
+            seg_x, seg_y = x2 - x1, y2 - y1
+            seg_len2 = seg_x * seg_x + seg_y * seg_y
+            t = 0.0 if not seg_len2 else max(0.0, min(1.0, ((x - x1) * seg_x + (y - y1) * seg_y) / seg_len2))
+            gap = math.hypot(x1 + seg_x * t - x, y1 + seg_y * t - y)
+            if best_gap is None or gap < best_gap:
+                best_gap = gap
+                best = self.cumulative[index] + (self.cumulative[index + 1] - self.cumulative[index]) * t
+        return best % self.length
+
+    def point_at(self, distance):
+        """트랙 거리 → 좌표 (한 바퀴 넘는 거리는 감아서 계산)"""
+        distance %= self.length
+        index = min(bisect.bisect_right(self.cumulative, distance) - 1, len(self.points) - 1)
+        seg_len = self.cumulative[index + 1] - self.cumulative[index]
+        t = (distance - self.cumulative[index]) / seg_len if seg_len else 0.0
+        x1, y1 = self.points[index]
+        x2, y2 = self.points[(index + 1) % len(self.points)]
+        return x1 + (x2 - x1) * t, y1 + (y2 - y1) * t
+
+    def forward_gap(self, src, dst):
+        """src → dst 주행 방향(시계방향) 거리"""
+        return (dst - src) % self.length
+
+
+class TruckMotion:
+    """
+    트럭 한 대의 표시 위치
+
+    위치 보고가 오면 현재 표시 위치에서 보고 노드까지 CATCH_UP_TIME 동안 트랙을 따라 이동하고,
+    RUNNING 이면 이어서 다음 노드 쪽으로 토폴로지 ETA 속도로 PREDICT_LIMIT 까지 미리 이동한다.
+    """
+
+    def __init__(self, truck_id):
+        self.truck_id = truck_id
+        self.report = None           # 마지막 (location, status)
+        self.node = None             # 보고 위치의 GUI 노드 키 (None 이면 맵에 표시하지 않음)
+        self.direction = CLOCKWISE
+        self.distance = None         # 표시 중인 트랙 거리 (감지 않은 값)
+        self.catch_from = None
+        self.target = None
+        self.started = 0.0
+        self.catch_time = 0.0
+        self.predict_gap = 0.0
+        self.eta = None
+        self.drawn = None            # 마지막으로 그린 좌표
+
+    def position(self, now):
+        """now 시점의 트랙 거리 (표시하지 않는 트럭은 None)"""
+        if self.target is None:
+            return None
+        elapsed = now - self.started
+        if elapsed < self.catch_time:
+            return self.catch_from + (self.target - self.catch_from) * elapsed / self.catch_time
+        if self.eta:
+            return self.target + self.predict_gap * min((elapsed - self.catch_time) / self.eta, PREDICT_LIMIT)
+        return self.target
+
+    def settled(self, now):
+        """더 이상 움직이지 않는지 (다음 보고 전까지)"""
+        remaining = self.catch_time + (self.eta * PREDICT_LIMIT if self.eta else 0.0)
+        return now - self.started >= remaining
+
+
+class FleetMotion:
+    """
+    전체 트럭 표시 위치 계산 (Qt 없음 - 렌더러는 step() 결과만 그림)
+
+    apply_snapshot() 은 /trucks/positions 응답을 받아 (위치, 상태) 가 바뀐 트럭만 새 이동을 시작하고,
+    step() 은 움직이는 중인 트럭만 계산해 MIN_MOVE 이상 바뀐 좌표만 돌려준다.
+    """
+
+    def __init__(self, track, node_coords, topology):
+        self.track = track
+        self.topology = topology
+        self.node_distances = {key: track.project(x, y) for key, (x, y) in node_coords.items()}
+        self.trucks = {}
+        self.active = set()          # 움직이는 중이거나 아직 그리지 않은 트럭
+
+    @property
+    def animating(self):
+        return bool(self.active)
+
+    def apply_snapshot(self, positions, now):
+        """
+        {truck_id: {"location": ..., "status": ...}} 반영
+        반환: (새로 생긴 트럭 ID 목록, 사라진 트럭 ID 목록)
+        """
+        added = [truck_id for truck_id in positions if truck_id not in self.trucks]
+        removed = [truck_id for truck_id in self.trucks if truck_id not in positions]
+        for truck_id in removed:
+            del self.trucks[truck_id]
+            self.active.discard(truck_id)
+        for truck_id in added:
+            self.trucks[truck_id] = TruckMotion(truck_id)
+
+        for truck_id, position in positions.items():
+            position = position or {}
+            report = (str(position.get("location") or "").upper(), position.get("status", "IDLE"))
+            motion = self.trucks[truck_id]
+            if report != motion.report:
+                motion.report = report
+                self._start(motion, report[0], report[1], now)
+                self.active.add(truck_id)
+        return added, removed
+
+    def step(self, now):
+        """움직인 트럭만 {truck_id: (x, y) 또는 None(숨김)}"""
+        moved = {}
+        for truck_id in list(self.active):
+            motion = self.trucks[truck_id]
+            distance = motion.position(now)
+            settled = motion.settled(now)
+            if distance is None:
+                point = None
+            else:
+                motion.distance = distance
+                point = self.track.point_at(distance)
+            drawn = motion.drawn
+            if (point is None) != (drawn is None) or (
+                    point is not None and (settled or abs(point[0] - drawn[0]) >= MIN_MOVE
+                                           or abs(point[1] - drawn[1]) >= MIN_MOVE)):
+                if point != drawn:
+                    moved[truck_id] = point
+                motion.drawn = point
+            if settled:
+                self.active.discard(truck_id)
+        return moved
+
+    # -------------------------------------------------------------------------------
+
+    def _start(self, motion, location, status, now):
+        node = self.topology.gui_key(location)
+        node_distance = self.node_distances.get(node)
+        if node_distance is None:
+            # 위치 미확인 / 맵에 없는 위치
+            motion.node = motion.target = motion.distance = None
+            motion.catch_time, motion.eta = 0.0, None
+            return
+
+        current = motion.position(now)
+        if current is None:
+            # 처음 표시 - 노드에 바로 배치
+            current = node_distance
+        else:
+            current %= self.track.length
+        gap = self.track.forward_gap(current, node_distance)
+        if gap > self.track.length / 2:
+            gap -= self.track.length     # 반대 방향이 더 가까우면 뒤로 (반시계방향 주행)
+        if motion.node != node and abs(gap) >= MIN_MOVE:
+            motion.direction = CLOCKWISE if gap > 0 else COUNTERCLOCKWISE
+
+        motion.node = node
+        motion.started = now
+        motion.catch_from = current
+        motion.target = current + gap
+        motion.catch_time = CATCH_UP_TIME if abs(gap) >= MIN_MOVE else 0.0
+        motion.predict_gap, motion.eta = 0.0, None
+
+        if status == "RUNNING":
+            next_position = self.topology.next_position(location, motion.direction)
+            next_distance = self.node_distances.get(self.topology.gui_key(next_position))
+            eta = self.topology.eta(location, next_position, motion.direction) if next_position else None
+            if next_distance is not None and eta:
+                forward = self.track.forward_gap(node_distance, next_distance)
+                motion.predict_gap = forward if motion.direction == CLOCKWISE else forward - self.track.length
+                motion.eta = eta
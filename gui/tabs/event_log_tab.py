@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 
 # API 클라이언트 가져오기
 from gui.api_client import api_client
+from gui.async_api import fetch
 
 class EventLogTab(QWidget):
     """이벤트 로그 탭 클래스"""
@@ -144,9 +145,20 @@ class EventLogTab(QWidget):
             if keyword:
                 filters["keyword"] = keyword
             
-            # API 호출
-            response = api_client.get_logs(filters)
+            # API 호출 (응답은 apply_log_table 에서 처리)
+            fetch("logs", self.apply_log_table, self.show_log_error, params=filters)
             
+        except Exception as e:
+            print(f"[ERROR] 로그 테이블 업데이트 실패: {e}")
+            QMessageBox.critical(self, "오류", f"로그 데이터 불러오기 실패: {e}")
+    
+    def show_log_error(self, error):
+        print(f"[ERROR] 로그 테이블 업데이트 실패: {error}")
+        QMessageBox.critical(self, "오류", f"로그 데이터 불러오기 실패: {error}")
+    
+    def apply_log_table(self, response):
+        """로그 조회 응답으로 테이블 갱신"""
+        try:
             if not response.get("success", False):
                 print(f"[ERROR] 로그 데이터 가져오기 실패: {response.get('message', '알 수 없는 오류')}")
                 return
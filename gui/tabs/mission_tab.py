@@ -5,7 +5,8 @@ import os
 from datetime import datetime
 
 # API 클라이언트 가져오기
-from gui.api_client import api_client
+from gui.api_client import api_client, gather_futures, normalize_missions
+from gui.async_api import fetch, deliver, call
 
 class MissionTab(QWidget):
     """미션 관리 탭 클래스"""
@@ -232,10 +233,14 @@ class MissionTab(QWidget):
         self.update_timer.start(10000)  # 10초마다 업데이트
     
     def refresh_mission_table(self):
-        """미션 테이블 데이터 새로고침"""
+        """미션 테이블 데이터 새로고침 (API 호출 - 응답은 apply_mission_table 에서 처리)"""
+        fetch("missions", self.apply_mission_table,
+              lambda e: print(f"[ERROR] 미션 테이블 업데이트 실패: {e}"))
+    
+    def apply_mission_table(self, response):
+        """미션 목록 응답으로 테이블 갱신"""
         try:
-            # API 호출하여 미션 데이터 가져오기
-            response = api_client.get_missions()
+            response = normalize_missions(response)
             
             # API 응답 디버깅
             print("[DEBUG] API 응답 타입:", type(response))
@@ -522,19 +527,26 @@ class MissionTab(QWidget):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                # API 호출
-                response = api_client.cancel_mission(mission_id)
-                
-                if response.get("success", False):
-                    QMessageBox.information(self, "미션 취소 성공", f"미션 ID: {mission_id}가 취소되었습니다.")
-                    # 테이블 새로고침
-                    self.refresh_mission_table()
-                else:
-                    error_msg = response.get("message", "알 수 없는 오류")
-                    QMessageBox.warning(self, "미션 취소 실패", error_msg)
+                # API 호출 (작업 스레드)
+                call("cancel_mission", mission_id,
+                     on_result=lambda response: self.apply_cancel_mission(mission_id, response),
+                     on_error=self.show_cancel_mission_error)
         except Exception as e:
-            print(f"[ERROR] 미션 취소 실패: {e}")
-            QMessageBox.critical(self, "오류", f"미션 취소 실패: {e}")
+            self.show_cancel_mission_error(e)
+    
+    def apply_cancel_mission(self, mission_id, response):
+        """미션 취소 응답 반영 (UI 스레드)"""
+        if response.get("success", False):
+            QMessageBox.information(self, "미션 취소 성공", f"미션 ID: {mission_id}가 취소되었습니다.")
+            # 테이블 새로고침
+            self.refresh_mission_table()
+        else:
+            error_msg = response.get("message", "알 수 없는 오류")
+            QMessageBox.warning(self, "미션 취소 실패", error_msg)
+    
+    def show_cancel_mission_error(self, e):
+        print(f"[ERROR] 미션 취소 실패: {e}")
+        QMessageBox.critical(self, "오류", f"미션 취소 실패: {e}")
     
     def add_new_mission(self):
         """새 미션 추가 (UI에서 직접)"""
@@ -573,37 +585,12 @@ class MissionTab(QWidget):
             # 화물 수량은 기본값 1로 설정
             cargo_amount = 1
             
-            try:
-                # API 호출
-                print(f"[INFO] 미션 생성 요청: source={source}, destination={destination}, cargo_type={cargo_type}, cargo_amount={cargo_amount}")
-                response = api_client.create_mission(
-                    truck_id=truck_id,
-                    source=source,
-                    destination=destination,
-                    cargo_type=cargo_type,
-                    cargo_amount=cargo_amount
-                )
-                
-                print(f"[INFO] API 응답: {response}")
-                
-                if isinstance(response, dict) and response.get("success", False):
-                    mission_id = response.get("mission_id", "알 수 없음")
-                    QMessageBox.information(self, "미션 추가 성공", 
-                                            f"미션이 성공적으로 등록되었습니다.\n"
-                                            f"ID: {mission_id}\n"
-                                            f"출발지: {display_text}\n"
-                                            f"화물 유형: 기본 화물")
-                    # 테이블 새로고침
-                    self.refresh_mission_table()
-                else:
-                    error_msg = "알 수 없는 오류"
-                    if isinstance(response, dict):
-                        error_msg = response.get("message", error_msg)
-                    QMessageBox.warning(self, "미션 추가 실패", error_msg)
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                QMessageBox.critical(self, "오류", f"미션 등록 중 오류 발생: {e}")
+            # API 호출 (작업 스레드)
+            print(f"[INFO] 미션 생성 요청: source={source}, destination={destination}, cargo_type={cargo_type}, cargo_amount={cargo_amount}")
+            call("create_mission", truck_id=truck_id, source=source, destination=destination,
+                 cargo_type=cargo_type, cargo_amount=cargo_amount,
+                 on_result=lambda response: self.apply_new_mission(display_text, response),
+                 on_error=lambda e: QMessageBox.critical(self, "오류", f"미션 등록 중 오류 발생: {e}"))
                 
         except Exception as e:
             import traceback
@@ -611,6 +598,25 @@ class MissionTab(QWidget):
             print(f"[ERROR] 미션 추가 실패: {e}")
             QMessageBox.critical(self, "오류", f"미션 추가 실패: {e}")
             
+    def apply_new_mission(self, display_text, response):
+        """미션 생성 응답 반영 (UI 스레드)"""
+        print(f"[INFO] API 응답: {response}")
+        
+        if isinstance(response, dict) and response.get("success", False):
+            mission_id = response.get("mission_id", "알 수 없음")
+            QMessageBox.information(self, "미션 추가 성공", 
+                                    f"미션이 성공적으로 등록되었습니다.\n"
+                                    f"ID: {mission_id}\n"
+                                    f"출발지: {display_text}\n"
+                                    f"화물 유형: 기본 화물")
+            # 테이블 새로고침
+            self.refresh_mission_table()
+        else:
+            error_msg = "알 수 없는 오류"
+            if isinstance(response, dict):
+                error_msg = response.get("message", error_msg)
+            QMessageBox.warning(self, "미션 추가 실패", error_msg)
+            
     def cancel_all_missions(self):
         """모든 미션 취소"""
         try:
@@ -639,26 +645,32 @@ class MissionTab(QWidget):
                     QMessageBox.information(self, "알림", "취소할 미션이 없습니다.")
                     return
                     
-                # 모든 미션 취소 요청
-                success_count = 0
-                error_count = 0
-                for mission_id in mission_ids:
-                    try:
-                        response = api_client.cancel_mission(mission_id)
-                        if response.get("success", False):
-                            success_count += 1
-                        else:
-                            error_count += 1
-                    except Exception:
-                        error_count += 1
-                
-                # 결과 메시지
-                result_msg = f"총 {len(mission_ids)}개의 미션 중 {success_count}개 취소 성공, {error_count}개 실패"
-                QMessageBox.information(self, "미션 취소 결과", result_msg)
-                
-                # 테이블 새로고침
-                self.refresh_mission_table()
+                # 모든 미션 취소 요청 (작업 스레드) - 개별 실패는 결과로 받아 집계
+                futures = [api_client.call_async(self._cancel_mission_result, mission_id)
+                           for mission_id in mission_ids]
+                deliver(gather_futures(*futures), self.apply_cancel_all_results,
+                        lambda e: QMessageBox.critical(self, "오류", f"모든 미션 취소 실패: {e}"))
                 
         except Exception as e:
             print(f"[ERROR] 모든 미션 취소 실패: {e}")
-            QMessageBox.critical(self, "오류", f"모든 미션 취소 실패: {e}") 
\ No newline at end of file
+            QMessageBox.critical(self, "오류", f"모든 미션 취소 실패: {e}")
+    
+    @staticmethod
+    def _cancel_mission_result(mission_id):
+        """작업 스레드에서 실행 - 미션 하나 취소 성공 여부"""
+        try:
+            return api_client.cancel_mission(mission_id).get("success", False)
+        except Exception:
+            return False
+    
+    def apply_cancel_all_results(self, results):
+        """모든 미션 취소 결과 집계 (UI 스레드)"""
+        success_count = sum(1 for success in results if success)
+        error_count = len(results) - success_count
+        
+        # 결과 메시지
+        result_msg = f"총 {len(results)}개의 미션 중 {success_count}개 취소 성공, {error_count}개 실패"
+        QMessageBox.information(self, "미션 취소 결과", result_msg)
+        
+        # 테이블 새로고침
+        self.refresh_mission_table() 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGraphicsScene, QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsTextItem, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView, QDialog, QGridLayout, QPushButton, QLabel, QComboBox
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGraphicsScene, QGraphicsItem, QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsTextItem, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView, QDialog, QGridLayout, QPushButton, QLabel, QComboBox
 from PyQt6.QtGui import QPen, QBrush, QColor, QPainterPath
 from PyQt6.QtCore import Qt, QTimer, QSize
 from PyQt6 import uic
@@ -6,11 +6,14 @@ import os
 import math
 
 # 공통 API 클라이언트 가져오기
-from gui.api_client import api_client
+from gui.api_client import api_client, gather_futures, normalize_missions
+from gui.async_api import fetch, deliver, call
+from backend.track.track_topology import get_track_topology
+from gui.fleet_motion import rounded_rect_points
+from gui.ui.fleet_map import FleetMapRenderer
 
-# 트럭 아이콘 클래스 직접 포함
-from PyQt6.QtWidgets import QGraphicsPixmapItem
-from PyQt6.QtGui import QPixmap
+# 정적인 맵 아이템 캐시 (트럭이 지나갈 때마다 시설물 / 라벨 / 트랙을 다시 그리지 않음)
+STATIC_CACHE = QGraphicsItem.CacheMode.DeviceCoordinateCache
 
 # 클릭 가능한 시설물 클래스 정의
 class ClickableFacilityItem:
@@ -29,6 +32,7 @@ class ClickableFacilityItem:
         # 스타일 설정
         self.shape_item.setBrush(QBrush(color))
         self.shape_item.setPen(QPen(QColor("black"), 2))
+        self.shape_item.setCacheMode(STATIC_CACHE)
         
         # 클릭 이벤트를 위한 플래그 설정
         self.shape_item.setAcceptHoverEvents(True)
@@ -78,19 +82,6 @@ class ClickableFacilityItem:
         self.shape_item.hoverEnterEvent = hoverEnterEvent
         self.shape_item.hoverLeaveEvent = hoverLeaveEvent
 
-class TruckIcon(QGraphicsPixmapItem):
-    def __init__(self, truck_id, parent=None):
-        super().__init__(parent)
-        self.truck_id = truck_id
-        # 트럭 아이콘 이미지 로드 (나중에 실제 이미지로 교체 필요)
-        self.setPixmap(QPixmap("gui/assets/truck.png").scaled(30, 30, Qt.AspectRatioMode.KeepAspectRatio))
-        self.setOffset(-15, -15)  # 아이콘의 중심점을 기준으로 위치 조정
-        
-    def update_position(self, x, y):
-        """트럭의 위치를 업데이트합니다."""
-        self.setPos(x, y)
-
-
 class MonitoringTab(QWidget):
     """메인 모니터링 탭 클래스 - MainMonitoringTab과 통합"""
     
@@ -110,6 +101,15 @@ class MonitoringTab(QWidget):
         
         # 시설물 맵 객체 저장용 딕셔너리
         self.facility_items = {}
+        
+        # 트랙 토폴로지 (위치 이름 ↔ 맵 노드 키)
+        self.topology = get_track_topology()
+        
+        # 마지막으로 받은 선택 트럭 FSM 상태 (미션 진행률 계산용)
+        self.current_fsm_state = "IDLE"
+        
+        # 등록된 트럭 목록 (서버 /trucks/fleet 응답으로 갱신, 탭 순서 = 목록 순서)
+        self.fleet_ids = ["TRUCK_01", "TRUCK_02", "TRUCK_03"]
             
         # 초기화
         self.setup_map()
@@ -127,6 +127,8 @@ class MonitoringTab(QWidget):
         self.scene = QGraphicsScene(self)
         self.graphicsView_map.setScene(self.scene)
         self.scene.setSceneRect(0, 0, 800, 400)  # 맵 크기 조정
+        # 트럭 아이콘이 매 프레임 움직이므로 BSP 인덱스 갱신 비용이 없는 NoIndex 사용
+        self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
         
         # 모서리가 둥근 사각형 맵 좌표 계산용 변수
         left, top = 0, 80        # 좌상단 좌표 (이전 -100에서 150 오른쪽으로 이동)
@@ -186,7 +188,11 @@ class MonitoringTab(QWidget):
         path.arcTo(left, bottom - 2*corner_radius, 2*corner_radius, 2*corner_radius, 180, 90)
         
         # 경로 그리기
-        self.scene.addPath(path, QPen(QColor("black"), 2))
+        track_item = self.scene.addPath(path, QPen(QColor("black"), 2))
+        track_item.setCacheMode(STATIC_CACHE)
+        
+        # 트럭 이동 보간용 트랙 점 목록 (위 경로와 같은 순서)
+        self.track_points = rounded_rect_points(left, top, right, bottom, corner_radius)
 
         # 색상 정의
         color_map = {
@@ -230,11 +236,7 @@ class MonitoringTab(QWidget):
             shape_type = node_shape[key]
             
             # 맵 API에서 사용하는 ID로 변환
-            facility_id = key
-            if key == "A_LOAD":
-                facility_id = "LOAD_A"
-            elif key == "B_LOAD":
-                facility_id = "LOAD_B"
+            facility_id = self.topology.position_from_gui_key(key)
                 
             # 라벨 텍스트
             label_text = self.get_label(key)
@@ -256,10 +258,12 @@ class MonitoringTab(QWidget):
                     item = QGraphicsRectItem(x - w / 2, y - h / 2, w, h)
                 item.setBrush(QBrush(color))
                 item.setPen(QPen(QColor("black"), 2))
+                item.setCacheMode(STATIC_CACHE)
                 self.scene.addItem(item)
 
             # 라벨 위치 조정
             label = QGraphicsTextItem(label_text)
+            label.setCacheMode(STATIC_CACHE)
             
             # 노드 위치에 따라 라벨 위치 조정
             if y == top:  # 상단 노드
@@ -302,7 +306,20 @@ class MonitoringTab(QWidget):
             layout = QGridLayout()
             dialog.setLayout(layout)
             
-            # 시설물 종류에 따라 다른 제어 UI 표시
+            # 시설물 종류에 따라 다른 제어 UI 표시 (API 호출은 작업 스레드, 결과는 UI 스레드 콜백)
+            def show_update_result(success_title, success_message, failure_title):
+                def on_result(response):
+                    if response.get("success", False):
+                        QMessageBox.information(dialog, success_title, success_message)
+                        dialog.accept()
+                    else:
+                        error_msg = response.get("message", "알 수 없는 오류")
+                        QMessageBox.warning(dialog, failure_title, error_msg)
+                return on_result
+            
+            def show_update_error(action):
+                return lambda e: QMessageBox.critical(dialog, "오류", f"{action} 중 오류 발생: {e}")
+            
             if facility_id in ["LOAD_A", "LOAD_B"]:
                 # 적재지 제어
                 layout.addWidget(QLabel(f"{facility_name} 상태:"), 0, 0)
@@ -312,15 +329,12 @@ class MonitoringTab(QWidget):
                 layout.addWidget(status_combo, 0, 1)
                 
                 # 현재 상태 가져오기
-                try:
-                    facility_data = api_client.get_facility(facility_id)
+                def apply_load_status(facility_data):
                     current_status = facility_data.get("status", "AVAILABLE")
-                    if current_status == "OCCUPIED":
-                        status_combo.setCurrentIndex(1)
-                    else:
-                        status_combo.setCurrentIndex(0)
-                except Exception as e:
-                    print(f"[ERROR] 시설물 상태 조회 실패: {e}")
+                    status_combo.setCurrentIndex(1 if current_status == "OCCUPIED" else 0)
+                
+                call("get_facility", facility_id, on_result=apply_load_status,
+                     on_error=lambda e: print(f"[ERROR] 시설물 상태 조회 실패: {e}"))
                 
                 # 저장 버튼
                 save_button = QPushButton("상태 변경")
@@ -329,17 +343,11 @@ class MonitoringTab(QWidget):
                 # 저장 버튼 클릭 이벤트
                 def on_save_click():
                     new_status = "OCCUPIED" if status_combo.currentIndex() == 1 else "AVAILABLE"
-                    try:
-                        response = api_client.update_facility(facility_id, {"status": new_status})
-                        if response.get("success", False):
-                            QMessageBox.information(dialog, "상태 변경 성공", 
-                                f"{facility_name}의 상태가 성공적으로 변경되었습니다.")
-                            dialog.accept()
-                        else:
-                            error_msg = response.get("message", "알 수 없는 오류")
-                            QMessageBox.warning(dialog, "상태 변경 실패", error_msg)
-                    except Exception as e:
-                        QMessageBox.critical(dialog, "오류", f"상태 변경 중 오류 발생: {e}")
+                    call("update_facility", facility_id, {"status": new_status},
+                         on_result=show_update_result("상태 변경 성공",
+                                                      f"{facility_name}의 상태가 성공적으로 변경되었습니다.",
+                                                      "상태 변경 실패"),
+                         on_error=show_update_error("상태 변경"))
                         
                 save_button.clicked.connect(on_save_click)
                 
@@ -352,15 +360,12 @@ class MonitoringTab(QWidget):
                 layout.addWidget(status_combo, 0, 1)
                 
                 # 현재 상태 가져오기
-                try:
-                    facility_data = api_client.get_facility(facility_id)
+                def apply_gate_status(facility_data):
                     current_status = facility_data.get("status", "CLOSED")
-                    if current_status == "OPEN":
-                        status_combo.setCurrentIndex(1)
-                    else:
-                        status_combo.setCurrentIndex(0)
-                except Exception as e:
-                    print(f"[ERROR] 게이트 상태 조회 실패: {e}")
+                    status_combo.setCurrentIndex(1 if current_status == "OPEN" else 0)
+                
+                call("get_facility", facility_id, on_result=apply_gate_status,
+                     on_error=lambda e: print(f"[ERROR] 게이트 상태 조회 실패: {e}"))
                 
                 # 닫기 버튼
                 close_button = QPushButton("닫기")
@@ -372,30 +377,18 @@ class MonitoringTab(QWidget):
                 
                 # 버튼 클릭 이벤트
                 def on_close_click():
-                    try:
-                        response = api_client.update_facility(facility_id, {"status": "CLOSED"})
-                        if response.get("success", False):
-                            QMessageBox.information(dialog, "게이트 닫기 성공", 
-                                f"{facility_name}가 성공적으로 닫혔습니다.")
-                            dialog.accept()
-                        else:
-                            error_msg = response.get("message", "알 수 없는 오류")
-                            QMessageBox.warning(dialog, "게이트 닫기 실패", error_msg)
-                    except Exception as e:
-                        QMessageBox.critical(dialog, "오류", f"게이트 닫기 중 오류 발생: {e}")
+                    call("update_facility", facility_id, {"status": "CLOSED"},
+                         on_result=show_update_result("게이트 닫기 성공",
+                                                      f"{facility_name}가 성공적으로 닫혔습니다.",
+                                                      "게이트 닫기 실패"),
+                         on_error=show_update_error("게이트 닫기"))
                         
                 def on_open_click():
-                    try:
-                        response = api_client.update_facility(facility_id, {"status": "OPEN"})
-                        if response.get("success", False):
-                            QMessageBox.information(dialog, "게이트 열기 성공", 
-                                f"{facility_name}가 성공적으로 열렸습니다.")
-                            dialog.accept()
-                        else:
-                            error_msg = response.get("message", "알 수 없는 오류")
-                            QMessageBox.warning(dialog, "게이트 열기 실패", error_msg)
-                    except Exception as e:
-                        QMessageBox.critical(dialog, "오류", f"게이트 열기 중 오류 발생: {e}")
+                    call("update_facility", facility_id, {"status": "OPEN"},
+                         on_result=show_update_result("게이트 열기 성공",
+                                                      f"{facility_name}가 성공적으로 열렸습니다.",
+                                                      "게이트 열기 실패"),
+                         on_error=show_update_error("게이트 열기"))
                 
                 close_button.clicked.connect(on_close_click)
                 open_button.clicked.connect(on_open_click)
@@ -416,8 +409,7 @@ class MonitoringTab(QWidget):
                 layout.addWidget(speed_combo, 1, 1)
                 
                 # 현재 상태 가져오기
-                try:
-                    facility_data = api_client.get_facility(facility_id)
+                def apply_belt_status(facility_data):
                     current_status = facility_data.get("status", "STOPPED")
                     current_speed = facility_data.get("speed", 50)
                     
@@ -435,8 +427,9 @@ class MonitoringTab(QWidget):
                         speed_combo.setCurrentIndex(2)
                     else:
                         speed_combo.setCurrentIndex(3)
-                except Exception as e:
-                    print(f"[ERROR] 벨트 상태 조회 실패: {e}")
+                
+                call("get_facility", facility_id, on_result=apply_belt_status,
+                     on_error=lambda e: print(f"[ERROR] 벨트 상태 조회 실패: {e}"))
                 
                 # 적용 버튼
                 apply_button = QPushButton("적용")
@@ -446,22 +439,11 @@ class MonitoringTab(QWidget):
                 def on_apply_click():
                     new_status = "RUNNING" if status_combo.currentIndex() == 1 else "STOPPED"
                     new_speed = int(speed_combo.currentText().replace("%", ""))
-                    
-                    try:
-                        response = api_client.update_facility(facility_id, {
-                            "status": new_status, 
-                            "speed": new_speed
-                        })
-                        
-                        if response.get("success", False):
-                            QMessageBox.information(dialog, "벨트 제어 성공", 
-                                f"컨베이어 벨트 상태가 성공적으로 변경되었습니다.")
-                            dialog.accept()
-                        else:
-                            error_msg = response.get("message", "알 수 없는 오류")
-                            QMessageBox.warning(dialog, "벨트 제어 실패", error_msg)
-                    except Exception as e:
-                        QMessageBox.critical(dialog, "오류", f"벨트 제어 중 오류 발생: {e}")
+                    call("update_facility", facility_id, {"status": new_status, "speed": new_speed},
+                         on_result=show_update_result("벨트 제어 성공",
+                                                      "컨베이어 벨트 상태가 성공적으로 변경되었습니다.",
+                                                      "벨트 제어 실패"),
+                         on_error=show_update_error("벨트 제어"))
                         
                 apply_button.clicked.connect(on_apply_click)
             
@@ -483,11 +465,8 @@ class MonitoringTab(QWidget):
             QMessageBox.critical(self, "오류", f"시설물 제어 다이얼로그 실패: {e}")
         
     def setup_truck(self):
-        """트럭 초기화"""
-        # TRUCK_01만 생성하여 STANDBY에 위치
-        self.truck = TruckIcon("TRUCK_01")
-        self.truck.update_position(*self.node_coords["STANDBY"])
-        self.scene.addItem(self.truck)
+        """트럭 초기화 - 아이콘은 첫 위치 스냅샷을 받을 때 트럭별로 생성"""
+        self.fleet_map = FleetMapRenderer(self.scene, self.node_coords, self.topology, self.track_points, self)
         
     def setup_controls(self):
         """컨트롤 버튼 초기화"""
@@ -602,63 +581,63 @@ class MonitoringTab(QWidget):
         self.mission_list_timer = QTimer(self)
         self.mission_list_timer.timeout.connect(self.update_mission_list)
         self.mission_list_timer.start(5000)  # 5초마다 업데이트
+        
+        # 트럭 목록 갱신 타이머
+        self.refresh_fleet()
+        self.fleet_timer = QTimer(self)
+        self.fleet_timer.timeout.connect(self.refresh_fleet)
+        self.fleet_timer.start(10000)  # 10초마다 업데이트
+    
+    def refresh_fleet(self):
+        """등록된 트럭 목록 조회 (API 호출 - 응답은 apply_fleet 에서 처리)"""
+        fetch("trucks/fleet", self.apply_fleet,
+              lambda e: print(f"[ERROR] 트럭 목록 조회 실패: {e}"))
+        
+    def apply_fleet(self, data):
+        """트럭 목록 응답 반영 - 탭 제목을 트럭 ID 로 표시"""
+        fleet_ids = [truck["truck_id"] for truck in data.get("trucks", [])]
+        if not fleet_ids or fleet_ids == self.fleet_ids:
+            return
+        self.fleet_ids = fleet_ids
+        tab_widget = self.findChild(QWidget, "tabWidget")
+        if tab_widget:
+            for index in range(tab_widget.count()):
+                title = fleet_ids[index] if index < len(fleet_ids) else "-"
+                tab_widget.setTabText(index, title)
+        
+    def truck_id_at(self, index):
+        """탭 인덱스 → 트럭 ID (목록보다 뒤의 탭은 TRUCK_<번호>)"""
+        if 0 <= index < len(self.fleet_ids):
+            return self.fleet_ids[index]
+        return f"TRUCK_{index + 1:02d}"
     
     def update_truck_position_from_api(self):
-        """트럭 위치 업데이트 (API 호출)"""
+        """전체 트럭 위치 업데이트 (API 호출 - 응답은 apply_truck_positions 에서 처리)"""
+        fetch("trucks/positions", self.apply_truck_positions,
+              lambda e: print(f"[ERROR] 트럭 위치 업데이트 실패: {e}"))
+        
+    def apply_truck_positions(self, data):
+        """전체 트럭 위치 응답 반영 ({truck_id: {"location", "status"}})"""
         try:
-            # api_client를 사용하여 트럭 정보 조회
-            data = api_client.get_truck("TRUCK_01")
+            # 맵 - 바뀐 트럭만 노드 사이를 보간 이동
+            self.fleet_map.apply_positions(data)
             
-            # location 키를 사용하여 위치 데이터 가져오기
-            pos = data.get("position", {}).get("location")
-            status = data.get("position", {}).get("status", "IDLE")
-            
-            # 위치 표시 라벨 업데이트
+            # 위치 표시 라벨 - 선택 탭의 트럭 기준
+            pos = (data.get(self.selected_truck_id() or "TRUCK_01") or {}).get("location")
             position_label = self.findChild(QWidget, "label_truck_position_name")
             if position_label and pos:
                 position_label.setText(self.get_location_display_name(pos))
-            
-            # 위치 정보가 있을 때만 디버그 메시지 출력
-            if pos:
-                # print(f"[DEBUG] 트럭 위치 데이터: {data.get('position', {})}")
-                pass
-            
-            # 위치 매핑 테이블 - 백엔드에서 보내는 위치를 맵 좌표 키로 변환
-            location_mapping = {
-                "STANDBY": "STANDBY",
-                "CHECKPOINT_A": "CHECKPOINT_A", 
-                "GATE_A": "GATE_A",
-                "CHECKPOINT_B": "CHECKPOINT_B",
-                "LOAD_A": "A_LOAD",     # 백엔드: LOAD_A -> GUI: A_LOAD
-                "LOAD_B": "B_LOAD",     # 백엔드: LOAD_B -> GUI: B_LOAD
-                "CHECKPOINT_C": "CHECKPOINT_C",
-                "GATE_B": "GATE_B",
-                "CHECKPOINT_D": "CHECKPOINT_D",
-                "BELT": "BELT"
-            }
-            
-            # pos가 None이 아닐 때만 처리
-            if pos:
-                # 대문자로 통일
-                pos_upper = pos.upper()
-                # 맵 좌표 키로 변환
-                node = location_mapping.get(pos_upper)
-                
-                if node in self.node_coords:
-                    self.truck.update_position(*self.node_coords[node])
-                    # STANDBY가 아니거나 상태가 변경되었을 때만 로그 출력
-                    if (pos_upper != "STANDBY") or (status != "IDLE"):
-                        # print(f"[DEBUG] 트럭 위치 업데이트: {node} (상태: {status})")
-                        pass
-                else:
-                    # print(f"[DEBUG] 매핑되지 않은 위치: {pos_upper} -> {node}")
-                    pass
                     
         except Exception as e:
             print(f"[ERROR] 트럭 위치 업데이트 실패: {e}")
         
     def refresh_battery_status(self):
-        """배터리 상태 업데이트"""
+        """배터리 상태 업데이트 (API 호출 - 응답은 apply_battery_status 에서 처리)"""
+        fetch("trucks/batteries", self.apply_battery_status,
+              lambda e: print(f"[ERROR] 배터리 상태 업데이트 실패: {e}"))
+        
+    def apply_battery_status(self, data):
+        """배터리 응답 반영 (응답 도착 시점의 선택 탭 기준)"""
         # 탭 위젯 참조
         tab_widget = self.findChild(QWidget, "tabWidget")
         if not tab_widget:
@@ -675,12 +654,9 @@ class MonitoringTab(QWidget):
             return
         
         try:
-            # api_client를 사용하여 모든 트럭 배터리 정보 조회
-            data = api_client.get_all_truck_batteries()
-            
             # 현재 탭 인덱스에 따라 트럭 ID 결정
             current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+            truck_id = self.truck_id_at(current_index)
             
             # 트럭 데이터 가져오기
             truck_data = data.get(truck_id, {})
@@ -753,7 +729,7 @@ class MonitoringTab(QWidget):
             # 트럭 선택
             layout.addWidget(QLabel("트럭:"), 2, 0)
             truck_combo = QComboBox()
-            truck_combo.addItems(["TRUCK_01", "TRUCK_02", "TRUCK_03"])
+            truck_combo.addItems(self.fleet_ids)
             layout.addWidget(truck_combo, 2, 1)
             
             # 화물 유형 선택
@@ -775,26 +751,27 @@ class MonitoringTab(QWidget):
                 truck = truck_combo.currentText()
                 cargo_type = cargo_combo.currentText()
                 
-                try:
-                    # API 호출
-                    response = api_client.create_mission(
-                        truck_id=truck,
-                        source=source,
-                        destination=destination,
-                        cargo_type=cargo_type
-                    )
-                    
-                    if response.get("success", False):
-                        mission_id = response.get("mission_id", "알 수 없음")
-                        self.show_alert(f"미션이 성공적으로 등록되었습니다. ID: {mission_id}")
-                        dialog.accept()
-                    else:
-                        error_msg = response.get("message", "알 수 없는 오류")
-                        self.show_alert(f"미션 등록 실패: {error_msg}")
-                        QMessageBox.warning(self, "미션 등록 실패", error_msg)
-                except Exception as e:
-                    self.show_alert(f"오류: 미션 등록 중 오류 발생 - {e}")
-                    QMessageBox.critical(self, "오류", f"미션 등록 중 오류 발생: {e}")
+                # API 호출 (작업 스레드) - 응답이 올 때까지 중복 등록 방지
+                save_button.setEnabled(False)
+                call("create_mission", truck_id=truck, source=source,
+                     destination=destination, cargo_type=cargo_type,
+                     on_result=on_mission_created, on_error=on_mission_error)
+            
+            def on_mission_created(response):
+                save_button.setEnabled(True)
+                if response.get("success", False):
+                    mission_id = response.get("mission_id", "알 수 없음")
+                    self.show_alert(f"미션이 성공적으로 등록되었습니다. ID: {mission_id}")
+                    dialog.accept()
+                else:
+                    error_msg = response.get("message", "알 수 없는 오류")
+                    self.show_alert(f"미션 등록 실패: {error_msg}")
+                    QMessageBox.warning(self, "미션 등록 실패", error_msg)
+            
+            def on_mission_error(e):
+                save_button.setEnabled(True)
+                self.show_alert(f"오류: 미션 등록 중 오류 발생 - {e}")
+                QMessageBox.critical(self, "오류", f"미션 등록 중 오류 발생: {e}")
             
             save_button.clicked.connect(register_mission)
             layout.addWidget(save_button, 4, 1)
@@ -815,7 +792,7 @@ class MonitoringTab(QWidget):
                 raise ValueError("탭 위젯을 찾을 수 없습니다.")
                 
             current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+            truck_id = self.truck_id_at(current_index)
             
             # 확인 대화상자
             reply = QMessageBox.question(
@@ -827,19 +804,26 @@ class MonitoringTab(QWidget):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                # API 호출
-                response = api_client.cancel_current_mission(truck_id)
-                
-                if response.get("success", False):
-                    self.show_alert(f"{truck_id}의 미션이 취소되었습니다.")
-                    QMessageBox.information(self, "미션 취소", f"{truck_id}의 미션이 취소되었습니다.")
-                else:
-                    error_msg = response.get("message", "알 수 없는 오류")
-                    self.show_alert(f"미션 취소 실패: {error_msg}")
-                    QMessageBox.warning(self, "미션 취소 실패", error_msg)
+                # API 호출 (작업 스레드)
+                call("cancel_current_mission", truck_id,
+                     on_result=lambda response: self.apply_cancel_current_mission(truck_id, response),
+                     on_error=self.show_cancel_mission_error)
         except Exception as e:
-            self.show_alert(f"오류: 미션 취소 실패 - {e}")
-            print(f"[ERROR] 미션 취소 실패: {e}")
+            self.show_cancel_mission_error(e)
+    
+    def apply_cancel_current_mission(self, truck_id, response):
+        """미션 취소 응답 반영 (UI 스레드)"""
+        if response.get("success", False):
+            self.show_alert(f"{truck_id}의 미션이 취소되었습니다.")
+            QMessageBox.information(self, "미션 취소", f"{truck_id}의 미션이 취소되었습니다.")
+        else:
+            error_msg = response.get("message", "알 수 없는 오류")
+            self.show_alert(f"미션 취소 실패: {error_msg}")
+            QMessageBox.warning(self, "미션 취소 실패", error_msg)
+    
+    def show_cancel_mission_error(self, e):
+        self.show_alert(f"오류: 미션 취소 실패 - {e}")
+        print(f"[ERROR] 미션 취소 실패: {e}")
             
     def toggle_control_mode(self):
         """수동 제어 모드 토글"""
@@ -851,22 +835,31 @@ class MonitoringTab(QWidget):
             # 버튼 상태 확인
             manual_mode_on = button.isChecked()
             
-            # API 호출
-            response = api_client.set_manual_control_mode(enabled=manual_mode_on)
-            
-            if response.get("success", False):
-                mode_text = "수동 제어 모드 ON" if manual_mode_on else "수동 제어 모드 OFF"
-                button.setText(mode_text)
-                self.show_alert(f"제어 모드 변경: {mode_text}")
-            else:
-                error_msg = response.get("message", "알 수 없는 오류")
-                self.show_alert(f"제어 모드 변경 실패: {error_msg}")
-                
-                # 실패 시 버튼 상태 되돌리기
-                button.setChecked(not manual_mode_on)
+            # API 호출 (작업 스레드)
+            call("set_manual_control_mode", enabled=manual_mode_on,
+                 on_result=lambda response: self.apply_control_mode(button, manual_mode_on, response),
+                 on_error=lambda e: self.show_control_mode_error(button, manual_mode_on, e))
         except Exception as e:
             self.show_alert(f"오류: 제어 모드 변경 실패 - {e}")
             print(f"[ERROR] 제어 모드 변경 실패: {e}")
+    
+    def apply_control_mode(self, button, manual_mode_on, response):
+        """제어 모드 변경 응답 반영 (UI 스레드)"""
+        if response.get("success", False):
+            mode_text = "수동 제어 모드 ON" if manual_mode_on else "수동 제어 모드 OFF"
+            button.setText(mode_text)
+            self.show_alert(f"제어 모드 변경: {mode_text}")
+        else:
+            error_msg = response.get("message", "알 수 없는 오류")
+            self.show_alert(f"제어 모드 변경 실패: {error_msg}")
+            
+            # 실패 시 버튼 상태 되돌리기
+            button.setChecked(not manual_mode_on)
+    
+    def show_control_mode_error(self, button, manual_mode_on, e):
+        self.show_alert(f"오류: 제어 모드 변경 실패 - {e}")
+        print(f"[ERROR] 제어 모드 변경 실패: {e}")
+        button.setChecked(not manual_mode_on)
             
     def show_facility_tab(self):
         """시설 관리 탭으로 이동 (탭 제거됨)"""
@@ -921,20 +914,23 @@ class MonitoringTab(QWidget):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                # 현재 미션을 가진 모든 트럭에 대해 미션 취소 요청
-                for truck_id in ["TRUCK_01", "TRUCK_02", "TRUCK_03"]:
-                    try:
-                        response = api_client.cancel_current_mission(truck_id)
-                        if response.get("success", False):
-                            self.show_alert(f"{truck_id}의 미션이 취소되었습니다.")
-                    except Exception as e:
-                        self.show_alert(f"{truck_id} 미션 취소 실패: {e}")
-                
-                self.show_alert("모든 미션 취소 요청이 완료되었습니다.")
+                # 현재 미션을 가진 모든 트럭에 대해 미션 취소 요청 (작업 스레드에서 동시에)
+                futures = [api_client.call_async(api_client.cancel_current_mission, truck_id)
+                           for truck_id in self.fleet_ids]
+                for truck_id, future in zip(self.fleet_ids, futures):
+                    deliver(future, lambda response, t_id=truck_id: self.apply_cancel_all_result(t_id, response),
+                            lambda e, t_id=truck_id: self.show_alert(f"{t_id} 미션 취소 실패: {e}"))
+                deliver(gather_futures(*futures),
+                        lambda _: self.show_alert("모든 미션 취소 요청이 완료되었습니다."),
+                        lambda _: self.show_alert("모든 미션 취소 요청이 완료되었습니다."))
         except Exception as e:
             self.show_alert(f"오류: 모든 미션 취소 실패 - {e}")
             print(f"[ERROR] 모든 미션 취소 실패: {e}")
             
+    def apply_cancel_all_result(self, truck_id, response):
+        if response.get("success", False):
+            self.show_alert(f"{truck_id}의 미션이 취소되었습니다.")
+            
     def pause_truck(self):
         """현재 선택된 트럭 작업 일시정지"""
         try:
@@ -944,20 +940,13 @@ class MonitoringTab(QWidget):
                 raise ValueError("탭 위젯을 찾을 수 없습니다.")
                 
             current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+            truck_id = self.truck_id_at(current_index)
             
-            # 이 부분은 API 구현에 따라 달라질 수 있음
-            try:
-                # 만약 API에 pause 기능이 있다면 사용
-                response = api_client.pause_truck(truck_id)
-                if response.get("success", False):
-                    self.show_alert(f"{truck_id}가 일시정지되었습니다.")
-                else:
-                    error_msg = response.get("message", "알 수 없는 오류")
-                    self.show_alert(f"트럭 일시정지 실패: {error_msg}")
-            except AttributeError:
-                # API에 해당 기능이 없는 경우
-                self.show_alert("트럭 일시정지 기능은 현재 구현되지 않았습니다.")
+            # API 호출 (작업 스레드) - 기능이 없으면 미구현 알림
+            self.run_truck_command("pause_truck", truck_id,
+                                   success_msg=f"{truck_id}가 일시정지되었습니다.",
+                                   failure_msg="트럭 일시정지 실패",
+                                   unsupported_msg="트럭 일시정지 기능은 현재 구현되지 않았습니다.")
                 
         except Exception as e:
             self.show_alert(f"오류: 트럭 일시정지 실패 - {e}")
@@ -972,20 +961,13 @@ class MonitoringTab(QWidget):
                 raise ValueError("탭 위젯을 찾을 수 없습니다.")
                 
             current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+            truck_id = self.truck_id_at(current_index)
             
-            # 이 부분은 API 구현에 따라 달라질 수 있음
-            try:
-                # 만약 API에 resume 기능이 있다면 사용
-                response = api_client.resume_truck(truck_id)
-                if response.get("success", False):
-                    self.show_alert(f"{truck_id}의 작업이 재시작되었습니다.")
-                else:
-                    error_msg = response.get("message", "알 수 없는 오류")
-                    self.show_alert(f"트럭 재시작 실패: {error_msg}")
-            except AttributeError:
-                # API에 해당 기능이 없는 경우
-                self.show_alert("트럭 재시작 기능은 현재 구현되지 않았습니다.")
+            # API 호출 (작업 스레드) - 기능이 없으면 미구현 알림
+            self.run_truck_command("resume_truck", truck_id,
+                                   success_msg=f"{truck_id}의 작업이 재시작되었습니다.",
+                                   failure_msg="트럭 재시작 실패",
+                                   unsupported_msg="트럭 재시작 기능은 현재 구현되지 않았습니다.")
                 
         except Exception as e:
             self.show_alert(f"오류: 트럭 재시작 실패 - {e}")
@@ -1000,20 +982,13 @@ class MonitoringTab(QWidget):
                 raise ValueError("탭 위젯을 찾을 수 없습니다.")
                 
             current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+            truck_id = self.truck_id_at(current_index)
             
-            # 이 부분은 API 구현에 따라 달라질 수 있음
-            try:
-                # API에 dispense 기능이 있다면 사용
-                response = api_client.dispense_cargo(truck_id)
-                if response.get("success", False):
-                    self.show_alert(f"{truck_id}에서 화물이 투하되었습니다.")
-                else:
-                    error_msg = response.get("message", "알 수 없는 오류")
-                    self.show_alert(f"화물 투하 실패: {error_msg}")
-            except AttributeError:
-                # API에 해당 기능이 없는 경우
-                self.show_alert("화물 투하 기능은 현재 구현되지 않았습니다.")
+            # API 호출 (작업 스레드) - 기능이 없으면 미구현 알림
+            self.run_truck_command("dispense_cargo", truck_id,
+                                   success_msg=f"{truck_id}에서 화물이 투하되었습니다.",
+                                   failure_msg="화물 투하 실패",
+                                   unsupported_msg="화물 투하 기능은 현재 구현되지 않았습니다.")
                 
         except Exception as e:
             self.show_alert(f"오류: 화물 투하 실패 - {e}")
@@ -1028,20 +1003,13 @@ class MonitoringTab(QWidget):
                 raise ValueError("탭 위젯을 찾을 수 없습니다.")
                 
             current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+            truck_id = self.truck_id_at(current_index)
             
-            # 이 부분은 API 구현에 따라 달라질 수 있음
-            try:
-                # API에 move_dispenser 기능이 있다면 사용
-                response = api_client.move_dispenser(truck_id, direction="left")
-                if response.get("success", False):
-                    self.show_alert(f"{truck_id}의 디스펜서가 왼쪽으로 이동되었습니다.")
-                else:
-                    error_msg = response.get("message", "알 수 없는 오류")
-                    self.show_alert(f"디스펜서 이동 실패: {error_msg}")
-            except AttributeError:
-                # API에 해당 기능이 없는 경우
-                self.show_alert("디스펜서 이동 기능은 현재 구현되지 않았습니다.")
+            # API 호출 (작업 스레드) - 기능이 없으면 미구현 알림
+            self.run_truck_command("move_dispenser", truck_id, direction="left",
+                                   success_msg=f"{truck_id}의 디스펜서가 왼쪽으로 이동되었습니다.",
+                                   failure_msg="디스펜서 이동 실패",
+                                   unsupported_msg="디스펜서 이동 기능은 현재 구현되지 않았습니다.")
                 
         except Exception as e:
             self.show_alert(f"오류: 디스펜서 이동 실패 - {e}")
@@ -1056,25 +1024,37 @@ class MonitoringTab(QWidget):
                 raise ValueError("탭 위젯을 찾을 수 없습니다.")
                 
             current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+            truck_id = self.truck_id_at(current_index)
             
-            # 이 부분은 API 구현에 따라 달라질 수 있음
-            try:
-                # API에 move_dispenser 기능이 있다면 사용
-                response = api_client.move_dispenser(truck_id, direction="right")
-                if response.get("success", False):
-                    self.show_alert(f"{truck_id}의 디스펜서가 오른쪽으로 이동되었습니다.")
-                else:
-                    error_msg = response.get("message", "알 수 없는 오류")
-                    self.show_alert(f"디스펜서 이동 실패: {error_msg}")
-            except AttributeError:
-                # API에 해당 기능이 없는 경우
-                self.show_alert("디스펜서 이동 기능은 현재 구현되지 않았습니다.")
+            # API 호출 (작업 스레드) - 기능이 없으면 미구현 알림
+            self.run_truck_command("move_dispenser", truck_id, direction="right",
+                                   success_msg=f"{truck_id}의 디스펜서가 오른쪽으로 이동되었습니다.",
+                                   failure_msg="디스펜서 이동 실패",
+                                   unsupported_msg="디스펜서 이동 기능은 현재 구현되지 않았습니다.")
                 
         except Exception as e:
             self.show_alert(f"오류: 디스펜서 이동 실패 - {e}")
             print(f"[ERROR] 디스펜서 이동 실패: {e}")
 
+    def run_truck_command(self, method, *args, success_msg, failure_msg, unsupported_msg, **kwargs):
+        """트럭 제어 API 를 작업 스레드에서 호출하고 결과를 알림 영역에 표시"""
+        def on_result(response):
+            if response.get("success", False):
+                self.show_alert(success_msg)
+            else:
+                error_msg = response.get("message", "알 수 없는 오류")
+                self.show_alert(f"{failure_msg}: {error_msg}")
+        
+        def on_error(e):
+            if isinstance(e, AttributeError):
+                # API에 해당 기능이 없는 경우
+                self.show_alert(unsupported_msg)
+                return
+            self.show_alert(f"오류: {failure_msg} - {e}")
+            print(f"[ERROR] {failure_msg}: {e}")
+        
+        call(method, *args, on_result=on_result, on_error=on_error, **kwargs)
+            
     def get_location_display_name(self, location_code):
         """위치 코드를 표시용 이름으로 변환"""
         location_names = {
@@ -1091,49 +1071,50 @@ class MonitoringTab(QWidget):
         }
         return location_names.get(location_code.upper(), location_code)
         
+    def selected_truck_id(self):
+        """현재 선택된 탭의 트럭 ID (탭 위젯이 없으면 None)"""
+        tab_widget = self.findChild(QWidget, "tabWidget")
+        if not tab_widget:
+            return None
+        return self.truck_id_at(tab_widget.currentIndex())
+        
     def update_truck_status(self):
-        """트럭 상태 및 미션 정보 업데이트"""
-        try:
-            # 현재 선택된 탭 인덱스를 가져와서 트럭 ID 결정
-            tab_widget = self.findChild(QWidget, "tabWidget")
-            if not tab_widget:
-                return
-                
-            current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+        """트럭 상태 및 미션 정보 업데이트 (트럭 / 미션 조회를 동시에 요청)"""
+        truck_id = self.selected_truck_id()
+        if not truck_id:
+            return
             
-            # 트럭 상태 조회
-            data = api_client.get_truck(truck_id)
+        fetch(f"trucks/{truck_id}", self.apply_truck_status,
+              lambda e: print(f"[ERROR] 트럭 상태 업데이트 실패: {e}"))
+        deliver(api_client.get_missions_async(truck_id=truck_id), self.apply_current_mission,
+                lambda e: print(f"[ERROR] 미션 정보 업데이트 실패: {e}"))
+        
+    def apply_truck_status(self, data):
+        """FSM 상태 응답 반영"""
+        self.current_fsm_state = data.get("fsm_state", "IDLE")
+        fsm_label = self.findChild(QWidget, "label_loc_name_2")
+        if fsm_label:
+            fsm_label.setText(self.get_fsm_state_display_name(self.current_fsm_state))
+            
+    def apply_current_mission(self, mission_data):
+        """현재 미션 응답 반영"""
+        try:
+            missions = normalize_missions(mission_data).get("missions", {})
             
-            # FSM 상태 업데이트
-            fsm_state = data.get("fsm_state", "IDLE")
-            fsm_label = self.findChild(QWidget, "label_loc_name_2")
-            if fsm_label:
-                fsm_label.setText(self.get_fsm_state_display_name(fsm_state))
-                
-            # 현재 미션 정보 업데이트
-            try:
-                # 트럭에 할당된 미션 조회
-                mission_data = api_client.get_missions(truck_id=truck_id)
-                missions = mission_data.get("missions", {})
-                
-                # 미션 라벨 업데이트
-                mission_label = self.findChild(QWidget, "label_mission_target")
-                if not mission_label:
-                    return
-                    
-                if missions and len(missions) > 0:
-                    # 첫 번째 미션 정보 (가장 최근 할당된 미션)
-                    mission = list(missions.values())[0]
-                    source = mission.get("source", "")
-                    mission_label.setText(f"적재지: {self.get_location_display_name(source)}")
-                else:
-                    mission_label.setText("할당된 미션 없음")
-            except Exception as e:
-                print(f"[ERROR] 미션 정보 업데이트 실패: {e}")
+            # 미션 라벨 업데이트
+            mission_label = self.findChild(QWidget, "label_mission_target")
+            if not mission_label:
+                return
                 
+            if missions and len(missions) > 0:
+                # 첫 번째 미션 정보 (가장 최근 할당된 미션)
+                mission = list(missions.values())[0]
+                source = mission.get("source", "")
+                mission_label.setText(f"적재지: {self.get_location_display_name(source)}")
+            else:
+                mission_label.setText("할당된 미션 없음")
         except Exception as e:
-            print(f"[ERROR] 트럭 상태 업데이트 실패: {e}")
+            print(f"[ERROR] 미션 정보 업데이트 실패: {e}")
             
     def get_fsm_state_display_name(self, state_code):
         """FSM 상태 코드를 표시용 이름으로 변환"""
@@ -1166,29 +1147,35 @@ class MonitoringTab(QWidget):
             print(f"[ERROR] 컨테이너 상태 업데이트 실패: {e}")
     
     def update_mission_progress(self):
-        """미션 진행률 업데이트"""
-        try:
-            # 현재 선택된 탭 인덱스를 가져와서 트럭 ID 결정
-            tab_widget = self.findChild(QWidget, "tabWidget")
-            if not tab_widget:
-                return
-                
-            current_index = tab_widget.currentIndex()
-            truck_id = f"TRUCK_0{current_index + 1}"  # 0 -> TRUCK_01, 1 -> TRUCK_02, etc.
+        """미션 진행률 업데이트 (트럭 상태 / 미션 조회를 함께 받아 같은 시점 값으로 계산)"""
+        truck_id = self.selected_truck_id()
+        if not truck_id:
+            return
             
+        deliver(gather_futures(api_client.get_async(f"trucks/{truck_id}"),
+                               api_client.get_missions_async(truck_id=truck_id)),
+                self.apply_mission_progress, self.show_mission_progress_error)
+        
+    def show_mission_progress_error(self, error):
+        print(f"[ERROR] 미션 진행률 업데이트 API 호출 실패: {error}")
+        progress_bar = self.findChild(QWidget, "progressBar_mission")
+        if progress_bar:
+            # 오류 시 기본값 표시
+            progress_bar.setValue(0)
+            progress_bar.setFormat("미션 정보 없음")
+        
+    def apply_mission_progress(self, results):
+        """미션 진행률 응답 반영 (results = [트럭 상태 응답, 미션 목록 응답])"""
+        try:
             # 미션 진행률 프로그레스 바 참조
             progress_bar = self.findChild(QWidget, "progressBar_mission")
             if not progress_bar:
                 return
                 
             try:
-                # 트럭 상태 조회
-                data = api_client.get_truck(truck_id)
-                fsm_state = data.get("fsm_state", "IDLE")
-                
-                # 트럭에 할당된 미션 조회
-                mission_data = api_client.get_missions(truck_id=truck_id)
-                missions = mission_data.get("missions", {})
+                truck_data, mission_data = results
+                fsm_state = (truck_data or {}).get("fsm_state", "IDLE")
+                missions = normalize_missions(mission_data).get("missions", {})
                 
                 if missions and len(missions) > 0:
                     # 미션이 있는 경우, 진행 상황 계산 (예시: 이동 단계에 따라 진행률 계산)
@@ -1260,7 +1247,12 @@ class MonitoringTab(QWidget):
             facility_text_edit.append(f"시설 상태 정보 로딩 실패: {e}")
             
     def update_mission_list(self):
-        """미션 목록 업데이트"""
+        """미션 목록 업데이트 (API 호출 - 응답은 apply_mission_list 에서 처리)"""
+        fetch("missions", self.apply_mission_list,
+              lambda e: print(f"[ERROR] 미션 목록 업데이트 실패: {e}"))
+        
+    def apply_mission_list(self, mission_data):
+        """미션 목록 응답 반영"""
         mission_table = self.findChild(QWidget, "tableWidget_mission_list")
         if not mission_table:
             return
@@ -1268,8 +1260,7 @@ class MonitoringTab(QWidget):
         try:
             # 미션 정보 가져오기
             try:
-                mission_data = api_client.get_missions()
-                missions = mission_data.get("missions", {})
+                missions = normalize_missions(mission_data).get("missions", {})
                 
                 # 테이블 초기화
                 mission_table.setRowCount(0)
@@ -0,0 +1,60 @@
+import time
+
+from PyQt6.QtCore import Qt, QTimer
+
+from gui.fleet_motion import FleetMotion, TrackPolyline
+from gui.ui.truck_icon import TruckIcon
+
+FRAME_INTERVAL_MS = 16  # 약 60fps
+
+
+class FleetMapRenderer:
+    """
+    맵 위 전체 트럭 표시
+
+    apply_positions() 로 /trucks/positions 스냅샷 하나를 받아 트럭 아이콘을 만들거나 지우고,
+    움직이는 트럭이 있는 동안만 프레임 타이머를 돌려 위치가 바뀐 아이콘만 setPos 한다.
+    위치 계산은 Qt 없는 FleetMotion 이 담당한다.
+    """
+
+    def __init__(self, scene, node_coords, topology, track_points, parent=None, clock=time.monotonic):
+        self.scene = scene
+        self.clock = clock
+        self.motion = FleetMotion(TrackPolyline(track_points), node_coords, topology)
+        self.icons = {}
+
+        self.frame_timer = QTimer(parent)
+        self.frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.frame_timer.timeout.connect(self.render_frame)
+
+    def apply_positions(self, positions):
+        """전체 트럭 위치 스냅샷 반영 ({truck_id: {"location": ..., "status": ...}})"""
+        added, removed = self.motion.apply_snapshot(positions, self.clock())
+        for truck_id in removed:
+            self.scene.removeItem(self.icons.pop(truck_id))
+        for truck_id in added:
+            icon = TruckIcon(truck_id)
+            icon.setVisible(False)  # 위치가 정해지면 render_frame 에서 표시
+            self.scene.addItem(icon)
+            self.icons[truck_id] = icon
+
+        if self.motion.animating:
+            self.render_frame()
+            if self.motion.animating and not self.frame_timer.isActive():
+                self.frame_timer.start(FRAME_INTERVAL_MS)
+
+    def render_frame(self):
+        """위치가 바뀐 트럭 아이콘만 갱신 - 모두 멈추면 타이머 정지"""
+        for truck_id, point in self.motion.step(self.clock()).items():
+            icon = self.icons[truck_id]
+            if point is None:
+                icon.setVisible(False)
+                continue
+            icon.setPos(*point)
+            if not icon.isVisible():
+                icon.setVisible(True)
+        if not self.motion.animating:
+            self.frame_timer.stop()
+
+    def icon(self, truck_id):
+        return self.icons.get(truck_id)
@@ -1,15 +1,40 @@
-from PyQt6.QtWidgets import QGraphicsPixmapItem
+import os
+
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsPixmapItem, QGraphicsSimpleTextItem
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt
 
+ICON_SIZE = 30
+TRUCK_IMAGE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "truck.png")
+
+# 크기별 스케일된 트럭 이미지 (모든 TruckIcon 이 같은 QPixmap 을 공유)
+_pixmap_cache = {}
+
+
+def truck_pixmap(size=ICON_SIZE):
+    """트럭 아이콘 이미지 - 파일 로드 / 스케일은 크기별로 한 번만"""
+    pixmap = _pixmap_cache.get(size)
+    if pixmap is None:
+        pixmap = QPixmap(TRUCK_IMAGE).scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                             Qt.TransformationMode.SmoothTransformation)
+        _pixmap_cache[size] = pixmap
+    return pixmap
+
+
 class TruckIcon(QGraphicsPixmapItem):
     def __init__(self, truck_id, parent=None):
-        super().__init__(parent)
+        super().__init__(truck_pixmap(), parent)
         self.truck_id = truck_id
-        # 트럭 아이콘 이미지 로드 (나중에 실제 이미지로 교체 필요)
-        self.setPixmap(QPixmap("gui/assets/truck.png").scaled(30, 30, Qt.AspectRatioMode.KeepAspectRatio))
-        self.setOffset(-15, -15)  # 아이콘의 중심점을 기준으로 위치 조정
-        
+        self.setOffset(-ICON_SIZE / 2, -ICON_SIZE / 2)  # 아이콘의 중심점을 기준으로 위치 조정
+        self.setZValue(10)  # 시설물 / 라벨 위에 표시
+        # 이동만 하고 모양은 바뀌지 않으므로 그린 결과를 캐시해 프레임마다 다시 그리지 않음
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+        # 여러 대가 겹쳐도 구분되도록 트럭 번호 표시 (TRUCK_01 → 01)
+        self.label = QGraphicsSimpleTextItem(truck_id.rsplit("_", 1)[-1], self)
+        self.label.setPos(ICON_SIZE / 2 - 4, -ICON_SIZE / 2 - 6)
+        self.label.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
     def update_position(self, x, y):
         """트럭의 위치를 업데이트합니다."""
-        self.setPos(x, y) 
\ No newline at end of file
+        self.setPos(x, y)
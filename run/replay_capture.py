@@ -0,0 +1,31 @@
+import sys
+import os
+import argparse
+
+# 프로젝트 루트 경로를 sys.path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.main_controller.main_controller import MainController
+from backend.capture.traffic_replayer import TrafficReplayer
+
+# 재생 시 장치는 모두 가상 (녹화한 서버와 같은 포트 이름 사용 - 시리얼 응답 주입 시 포트로 찾음)
+port_map = {
+    "GATE_A": "/dev/ttyACM0",
+    "GATE_B": "/dev/ttyACM0",
+    "BELT": "/dev/ttyACM1",
+    "DISPENSER": "/dev/ttyACM3",
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="통신 녹화 재생 (사고 재현 / 벤치마크)")
+    parser.add_argument("capture", help="녹화 디렉토리 또는 세그먼트 파일 (.dcap)")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (0 이면 대기 없이 최대 속도)")
+    parser.add_argument("--inject-serial", action="store_true", help="녹화된 장치 응답을 가상 시리얼에 주입")
+    args = parser.parse_args()
+
+    main_controller = MainController(port_map=port_map, use_fake=True)
+
+    replayer = TrafficReplayer(main_controller, speed=args.speed or None, inject_serial=args.inject_serial)
+    stats = replayer.replay(args.capture)
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
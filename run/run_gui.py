@@ -6,10 +6,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from PyQt6.QtWidgets import QApplication
 from gui.login_window import LoginWindow
+from gui.api_client import api_client
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     login = LoginWindow()
     login.show()
     exit_code = app.exec()
+    api_client.shutdown()  # 진행 중인 API 요청 작업 스레드 정리
     sys.exit(exit_code) 
\ No newline at end of file
@@ -5,16 +5,8 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 sys.path.append(project_root)
 
-from backend.main_controller.main_controller import MainController
-from backend.tcpio.tcp_server import TCPServer
-from backend.mission.mission import Mission
-from backend.mission.mission_db import MissionDB
-from backend.mission.mission_status import MissionStatus
-from backend.truck_status.truck_status_db import TruckStatusDB
-from backend.facility_status.facility_status_manager import FacilityStatusManager
-from backend.facility_status.facility_status_db import FacilityStatusDB
-import threading
-from backend.rest_api.app import flask_server, init_tcp_server_reference  # app.py에서 Flask 서버와 초기화 함수 가져오기
+# TCP 포트를 먼저 열 수 있도록 무거운 모듈(MySQL / Flask / 시리얼)은 런처가 병렬 초기화 중에 import
+from backend.launcher.server_launcher import ServerLauncher
 
 # 설정
 HOST = '0.0.0.0'
@@ -37,100 +29,81 @@ USE_FAKE_HARDWARE = False  # 가상 하드웨어 모드로 설정
 # 특정 장치만 가상 모드로 설정
 FAKE_DEVICES = []  # 모든 장치를 가상으로 사용
 
+# 가상 장치 모델 설정 (None 이면 기본 가상 장치) - 장치별 동작 시간 분포와 장애 확률
+# 예: {"gate": {"open_time": {"dist": "normal", "mean": 3.0, "stddev": 0.5}, "failure_rate": 0.02},
+#      "belt": {"run_time": 20}, "dispenser": {"open_time": {"dist": "uniform", "low": 1.0, "high": 2.0}}, "seed": 1}
+FAKE_DEVICE_MODELS = None
+
+# 장애 주입 설정 (None 이면 주입하지 않음 - 실행 중에는 PUT /api/system/faults 로 변경)
+# 예: {"tcp_out": {"latency": {"dist": "uniform", "low": 0.05, "high": 0.3}, "drop_rate": 0.05},
+#      "serial": {"missing_ack_rate": 0.1, "garble_rate": 0.02}, "seed": 1}
+FAULT_INJECTION = None
+
 # 디버그 모드 설정
 DEBUG_MODE = False  # 디버그 로그 비활성화
 
-print(f"[초기화] 하드웨어 설정: 기본 모드={'가상' if USE_FAKE_HARDWARE else '실제'}, 가상 장치={FAKE_DEVICES}")
-print(f"[초기화] 디버그 모드: {'활성화' if DEBUG_MODE else '비활성화'}")
-
-# DB 연결 설정
-mission_db = MissionDB(
-    host="localhost",
-    user="root",
-    password="jinhyuk2dacibul",
-    database="dust"
-)
+# 상태 저널 설정 - 재시작 시 마지막 FSM / 시설 상태 복구
+JOURNAL_DIR = os.path.join(project_root, "data", "journal")
+JOURNAL_SNAPSHOT_INTERVAL = 500  # 저널 레코드 N건마다 스냅샷
 
-# 트럭 상태 데이터베이스 설정 및 초기화
-truck_status_db = TruckStatusDB(
-    host="localhost",
-    user="root",
-    password="jinhyuk2dacibul",
-    database="dust"
-)
+# 히스토리 보관 정책 - 보관 기간은 TruckStatusDB / FacilityStatusDB 기본값 사용
+RETENTION_INTERVAL_SECONDS = 3600  # 정리 주기
+HISTORY_ARCHIVE_DIR = None  # 삭제 전 CSV 보관 위치 (None 이면 보관 없이 삭제)
 
-# 시설 상태 데이터베이스 설정 및 초기화
-facility_status_db = FacilityStatusDB(
-    host="localhost",
-    user="root",
-    password="jinhyuk2dacibul",
-    database="dust"
-)
+# 통신 녹화 - 트럭 TCP 프레임 / 시리얼 줄을 기록 (사고 재현: run/replay_capture.py 로 재생)
+CAPTURE_DIR = None  # 예: os.path.join(project_root, "data", "capture") - None 이면 녹화하지 않음
+CAPTURE_SEGMENT_MB = 16
+CAPTURE_MAX_SEGMENTS = 8
 
-# 트럭 상태 초기화 - 시뮬레이터 시작 시마다 상태 리셋
-truck_status_db.reset_all_statuses()
+# REST API 서버 설정 - waitress(운영) / pooled(내장 스레드 풀) / dev(Flask 개발 서버)
+REST_HOST = "0.0.0.0"
+REST_PORT = 5001
+REST_SERVER = "waitress"  # waitress 가 없으면 pooled 로 자동 전환
+REST_THREADS = 8          # 동시에 처리할 API 요청 수 (트럭 메시지 처리와 GIL 경쟁 상한)
+REST_BACKLOG = 64         # 작업 스레드가 모두 바쁠 때 대기시킬 연결 수
 
-# 시설 상태 매니저 생성
-facility_status_manager = FacilityStatusManager(facility_status_db)
+print(f"[초기화] 하드웨어 설정: 기본 모드={'가상' if USE_FAKE_HARDWARE else '실제'}, 가상 장치={FAKE_DEVICES}")
+print(f"[초기화] 디버그 모드: {'활성화' if DEBUG_MODE else '비활성화'}")
 
-# MainController 인스턴스 생성 (시설 상태 매니저 전달)
-main_controller = MainController(
-    port_map=port_map, 
-    use_fake=USE_FAKE_HARDWARE, 
+launcher = ServerLauncher(
+    host=HOST,
+    port=PORT,
+    port_map=port_map,
+    use_fake=USE_FAKE_HARDWARE,
     fake_devices=FAKE_DEVICES,
+    device_models=FAKE_DEVICE_MODELS,
+    fault_injection=FAULT_INJECTION,
     debug=DEBUG_MODE,
-    facility_status_manager=facility_status_manager
+    journal_dir=JOURNAL_DIR,
+    journal_snapshot_interval=JOURNAL_SNAPSHOT_INTERVAL,
+    retention_interval=RETENTION_INTERVAL_SECONDS,
+    history_archive_dir=HISTORY_ARCHIVE_DIR,
+    capture_dir=CAPTURE_DIR,
+    capture_segment_mb=CAPTURE_SEGMENT_MB,
+    capture_max_segments=CAPTURE_MAX_SEGMENTS,
+    rest_host=REST_HOST,
+    rest_port=REST_PORT,
+    rest_server=REST_SERVER,
+    rest_threads=REST_THREADS,
+    rest_backlog=REST_BACKLOG
 )
 
-# 앱의 트럭 상태 초기화 (메모리에 있는 상태도 초기화)
-main_controller.truck_status_manager.reset_all_trucks()
-
-# 시설 상태 초기화
-facility_status_manager.reset_all_facilities()
-
-# 기존 미션 확인
-print("[🔍 기존 미션 확인 중...]")
-waiting_missions = mission_db.get_waiting_missions()
-print(f"[ℹ️ 기존 미션 발견] 총 {len(waiting_missions)}개의 대기 중인 미션이 있습니다.")
-
-# TCP 서버 실행
-server = TCPServer(HOST, PORT, main_controller)
-
-# TCP 서버 인스턴스를 시스템 API에 전달
-init_tcp_server_reference(server)
-
-# Flask 서버 실행 함수
-def run_flask():
-    flask_server.run(host="0.0.0.0", port=5001, debug=False, use_reloader=False)
-
 # 종료 신호 핸들링
 def signal_handler(sig, frame):
     print("[🛑 서버 종료 요청됨]")
-    
-    # 실행 중인 모든 미션을 취소 상태로 변경
-    print("[⚠️ 실행 중인 미션 취소 중...]")
-    waiting_missions = mission_db.get_waiting_missions()
-    for mission_data in waiting_missions:
-        mission = Mission.from_row(mission_data)
-        main_controller.mission_manager.cancel_mission(mission.mission_id)
-    print(f"[✅ {len(waiting_missions)}개의 미션이 취소되었습니다.]")
-    
-    server.stop()
-    mission_db.close()  # DB 연결 종료
-    truck_status_db.close()  # 트럭 상태 DB 연결 종료
-    facility_status_db.close()  # 시설 상태 DB 연결 종료
+    launcher.shutdown()
     sys.exit(0)
 
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
 
-print(f"[메인 서버 시작됨] TCP 서버: {HOST}:{PORT}, Flask 서버: 0.0.0.0:5001")
+if __name__ == "__main__":
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    # TCP 포트 → (DB / 시리얼 / 저널 병렬 초기화) → 트럭 accept 시작 순서로 기동
+    server = launcher.start()
 
+    # 가상 장치가 sys.modules 에서 찾는 MainController 참조 (FakeSerial 직접 LOADED 알림)
+    main_controller = launcher.main_controller
 
-if __name__ == "__main__":
-    # TCP 서버를 별도 데몬 스레드로 시작 (중요: 데몬 스레드로 실행하여 메인 스레드와 독립적으로 동작)
-    tcp_thread = threading.Thread(target=server.start, daemon=True)
-    tcp_thread.start()
-    
     # Flask 서버를 메인 스레드에서 시작 (중요: 메인 프로세스로 실행하여 TCP 서버가 종료되어도 Flask 서버는 유지)
-    run_flask() 
\ No newline at end of file
+    launcher.serve_rest()
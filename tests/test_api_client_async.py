@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# tests/test_api_client_async.py
+
+import sys
+import os
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gui.api_client import APIClient, gather_futures, normalize_missions
+
+
+def make_response(status=200, data=None, etag=None):
+    response = MagicMock()
+    response.status_code = status
+    response.json.return_value = data
+    response.headers = {"ETag": etag} if etag else {}
+    return response
+
+
+class TestAPIClientAsync(unittest.TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client._etag_cache.clear()
+        self.session = MagicMock()
+        patcher = patch.object(self.client, "_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_duplicate_gets_share_one_request(self):
+        """진행 중인 같은 GET 은 하나의 요청 / Future 를 공유"""
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(2)
+            return make_response(data={"TRUCK_01": {"level": 80}})
+
+        self.session.get.side_effect = slow_get
+        first = self.client.get_async("trucks/batteries")
+        second = self.client.get_async("/trucks/batteries")
+        other = self.client.get_async("trucks/batteries", {"truck_id": "TRUCK_02"})
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        release.set()
+        self.assertEqual(first.result(2), {"TRUCK_01": {"level": 80}})
+        other.result(2)
+        self.assertEqual(self.session.get.call_count, 2)
+
+        # 완료 후에는 새 요청
+        third = self.client.get_async("trucks/batteries")
+        self.assertIsNot(first, third)
+        third.result(2)
+
+    def test_async_errors_are_raised_from_future(self):
+        import requests
+        self.session.get.side_effect = requests.exceptions.ConnectionError()
+        future = self.client.get_async("missions")
+        with self.assertRaises(ConnectionError):
+            future.result(2)
+
+    def test_not_modified_reuses_previous_body(self):
+        self.session.get.return_value = make_response(data={"missions": {}}, etag='"abc"')
+        self.assertEqual(self.client.get("missions"), {"missions": {}})
+
+        self.session.get.return_value = make_response(status=304)
+        self.assertEqual(self.client.get("missions"), {"missions": {}})
+        headers = self.session.get.call_args.kwargs["headers"]
+        self.assertEqual(headers, {"If-None-Match": '"abc"'})
+
+    def test_cached_body_is_copied(self):
+        """304 응답으로 받은 데이터를 수정해도 다음 호출 결과는 원본 그대로"""
+        self.session.get.return_value = make_response(data={"missions": {"M1": {"status": "WAITING"}}}, etag='"abc"')
+        self.client.get("missions")["missions"]["M1"]["status"] = "CHANGED"
+
+        self.session.get.return_value = make_response(status=304)
+        first = self.client.get("missions")
+        first["missions"].clear()
+        self.assertEqual(self.client.get("missions"), {"missions": {"M1": {"status": "WAITING"}}})
+
+    def test_gather_futures(self):
+        truck, missions = Future(), Future()
+        combined = gather_futures(truck, missions)
+        missions.set_result({"missions": {}})
+        self.assertFalse(combined.done())
+        truck.set_result({"fsm_state": "LOADING"})
+        self.assertEqual(combined.result(1), [{"fsm_state": "LOADING"}, {"missions": {}}])
+
+        failed, other = Future(), Future()
+        combined = gather_futures(failed, other)
+        failed.set_exception(ConnectionError("down"))
+        self.assertFalse(combined.done())  # 모든 요청이 끝날 때까지 기다림
+        other.set_result({})
+        self.assertIsInstance(combined.exception(1), ConnectionError)
+
+    def test_normalize_missions(self):
+        self.assertEqual(normalize_missions([{"mission_id": "M1"}]),
+                         {"success": True, "missions": [{"mission_id": "M1"}]})
+        self.assertEqual(normalize_missions({"missions": {}}), {"missions": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
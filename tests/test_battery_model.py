@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# tests/test_battery_model.py
+
+import sys
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.analytics.battery_model import BatteryModel, ChargePlanner, DEFAULT_PHASE_SECONDS, PHASE_SECONDS_TTL
+from backend.cache.state_versions import get_state_versions, DOMAIN_MISSIONS
+from backend.analytics.mission_kpi import MissionKPITracker
+from backend.truck_fsm.truck_fsm import TruckFSM
+from backend.truck_fsm.truck_state import MissionPhase
+
+TOTAL_PHASE_SECONDS = sum(DEFAULT_PHASE_SECONDS.values())  # 140초
+
+
+class TestBatteryModel(unittest.TestCase):
+    def test_online_phase_rates(self):
+        """연속 보고로 단계별 소모율 학습"""
+        model = BatteryModel()
+        model.observe("TRUCK_01", 90, MissionPhase.TO_LOADING, now=1000)
+        model.observe("TRUCK_01", 88, MissionPhase.AT_LOADING, now=1010)
+        self.assertAlmostEqual(model.drain_rate("TRUCK_01", "to_loading"), 0.2)
+        # 학습되지 않은 단계는 전체 소모율 사용
+        self.assertAlmostEqual(model.drain_rate("TRUCK_01", "unloading"), 0.2)
+
+    def test_charging_samples_not_counted_as_drain(self):
+        model = BatteryModel()
+        model.observe("TRUCK_01", 50, is_charging=True, now=1000)
+        model.observe("TRUCK_01", 60, is_charging=True, now=1020)
+        self.assertEqual(model.rates, {})
+        self.assertAlmostEqual(model.charge_rate("TRUCK_01"), 0.5)
+
+    def test_fit_history(self):
+        """battery_status 히스토리(최신순)로 초기 추정"""
+        start = datetime(2025, 1, 1, 9, 0, 0)
+        rows = [
+            {"battery_level": 100 - i, "truck_status": "NORMAL", "timestamp": start + timedelta(seconds=10 * i)}
+            for i in range(5)
+        ][::-1]
+        model = BatteryModel(history_source=lambda truck_id: rows)
+        model.observe("TRUCK_02", 95, now=1000)
+        self.assertAlmostEqual(model.drain_rate("TRUCK_02"), 0.1)
+
+    def test_can_complete_missions(self):
+        model = BatteryModel(reserve_level=30)
+        model.rates["TRUCK_01"] = {"overall": 0.1}
+        drain = 0.1 * TOTAL_PHASE_SECONDS
+        self.assertTrue(model.can_complete_missions("TRUCK_01", 30 + drain))
+        self.assertFalse(model.can_complete_missions("TRUCK_01", 30 + drain - 1))
+
+
+class TestChargePlanner(unittest.TestCase):
+    def setUp(self):
+        self.model = BatteryModel(reserve_level=30)
+        self.model.rates["TRUCK_01"] = {"overall": 0.1}  # 미션당 14%
+        self.planner = ChargePlanner(self.model, MissionKPITracker())
+
+    def test_charge_when_demand_low(self):
+        self.assertTrue(self.planner.should_charge("TRUCK_01", 80, waiting_missions=0))
+        self.assertFalse(self.planner.should_charge("TRUCK_01", 80, waiting_missions=3))
+
+    def test_charge_when_next_mission_not_possible(self):
+        self.assertTrue(self.planner.should_charge("TRUCK_01", 40, waiting_missions=3))
+
+    def test_charge_done_early_under_demand(self):
+        """대기 미션이 있으면 2건 분량만 충전하고 복귀"""
+        self.assertTrue(self.planner.charge_done("TRUCK_01", 60, waiting_missions=2))
+        self.assertFalse(self.planner.charge_done("TRUCK_01", 50, waiting_missions=2))
+        self.assertFalse(self.planner.charge_done("TRUCK_01", 90, waiting_missions=0))
+
+    def test_phase_seconds_from_kpi(self):
+        tracker = MissionKPITracker(clock=lambda: 2000)
+        tracker.on_mission_assigned("MISSION_001", "TRUCK_01", 1000)
+        tracker.observe_truck("TRUCK_01", "ASSIGNED", "MISSION_001", "TO_LOADING", now=1000)
+        tracker.observe_truck("TRUCK_01", "WAITING", None, "COMPLETED", now=1100)
+        planner = ChargePlanner(self.model, tracker)
+        self.assertEqual(planner.phase_seconds()["to_loading"], 100.0)
+
+    def test_phase_seconds_cached_until_completion(self):
+        """배터리 보고마다 KPI 요약을 다시 계산하지 않음 - 새 완료나 TTL 경과 시에만"""
+        now = [0.0]
+        tracker = MagicMock(completed_count=0)
+        tracker.get_summary.return_value = {"missions": {"phases": {}}}
+        planner = ChargePlanner(self.model, tracker, clock=lambda: now[0])
+        for _ in range(10):
+            planner.phase_seconds()
+        self.assertEqual(tracker.get_summary.call_count, 1)
+        tracker.completed_count = 1
+        planner.phase_seconds()
+        now[0] = PHASE_SECONDS_TTL + 1
+        planner.phase_seconds()
+        self.assertEqual(tracker.get_summary.call_count, 3)
+
+
+class TestFSMBatteryPrediction(unittest.TestCase):
+    def test_mission_rejected_on_predicted_shortfall(self):
+        model = BatteryModel(reserve_level=30)
+        model.rates["TRUCK_01"] = {"overall": 0.1}
+        fsm = TruckFSM(command_sender=MagicMock(), kpi_tracker=MissionKPITracker(), battery_model=model)
+        context = fsm._get_or_create_context("TRUCK_01")
+        context.position = "CHECKPOINT_A"
+        fsm.observe_battery("TRUCK_01", 40)
+        self.assertFalse(fsm._can_accept_mission(context, {}))
+        fsm.observe_battery("TRUCK_01", 50)
+        self.assertTrue(fsm._can_accept_mission(context, {}))
+
+    def test_waiting_count_cached_by_mission_version(self):
+        """대기 미션 수는 미션 상태 버전이 바뀔 때만 DB 재조회"""
+        mission_manager = MagicMock()
+        mission_manager.get_waiting_missions.return_value = ["M1", "M2"]
+        fsm = TruckFSM(command_sender=MagicMock(), mission_manager=mission_manager, kpi_tracker=MissionKPITracker())
+        for _ in range(10):
+            self.assertEqual(fsm._waiting_mission_count(), 2)
+        self.assertEqual(mission_manager.get_waiting_missions.call_count, 1)
+        get_state_versions().bump(DOMAIN_MISSIONS)
+        fsm._waiting_mission_count()
+        self.assertEqual(mission_manager.get_waiting_missions.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
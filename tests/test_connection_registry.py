@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# tests/test_connection_registry.py
+
+import sys
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.tcpio.connection_registry import ConnectionRegistry, EVENT_CONNECTED, EVENT_DISCONNECTED
+from backend.tcpio.truck_command_sender import TruckCommandSender
+from backend.tcpio.protocol import TCPProtocol
+
+
+class TestConnectionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ConnectionRegistry()
+        self.events = []
+        self.registry.add_listener(lambda event, truck_id, conn: self.events.append((event, truck_id)))
+
+    def test_bind_and_lookup(self):
+        conn = self.registry.open(("127.0.0.1", 5000), MagicMock())
+        self.assertEqual(self.registry.sockets(), {"TEMP_5000": conn.sock})
+
+        self.assertTrue(self.registry.bind("TRUCK_01", conn))
+        self.assertFalse(self.registry.bind("TRUCK_01", conn))  # 메시지마다 호출돼도 이벤트 없음
+        self.assertIs(self.registry.get("TRUCK_01"), conn)
+        self.assertEqual(self.registry.sockets(), {"TRUCK_01": conn.sock})
+        self.assertEqual(self.events, [(EVENT_CONNECTED, "TRUCK_01")])
+
+    def test_reconnect_keeps_new_connection(self):
+        """재연결 후 이전 연결이 늦게 닫혀도 새 연결은 유지"""
+        old = self.registry.open(("127.0.0.1", 5000), MagicMock())
+        self.registry.bind("TRUCK_01", old)
+        first_generation = self.registry.generation("TRUCK_01")
+
+        new = self.registry.open(("127.0.0.1", 5001), MagicMock())
+        self.registry.bind("TRUCK_01", new)
+        self.assertGreater(self.registry.generation("TRUCK_01"), first_generation)
+
+        self.assertEqual(self.registry.close(old), [])
+        self.assertIs(self.registry.get("TRUCK_01"), new)
+
+        self.assertEqual(self.registry.close(new), ["TRUCK_01"])
+        self.assertIsNone(self.registry.get("TRUCK_01"))
+        self.assertEqual(self.events[-1], (EVENT_DISCONNECTED, "TRUCK_01"))
+
+    def test_auto_bind_prefers_unbound_connection(self):
+        bound = self.registry.open(("127.0.0.1", 5000), MagicMock())
+        self.registry.bind("TRUCK_01", bound)
+        unbound = self.registry.open(("127.0.0.1", 5001), MagicMock())
+        self.assertIs(self.registry.auto_bind("TRUCK_02"), unbound)
+
+    def test_auto_bind_never_steals_bound_connection(self):
+        """모든 연결에 트럭이 묶여 있으면 자동 등록하지 않음"""
+        bound = self.registry.open(("127.0.0.1", 5000), MagicMock())
+        self.registry.bind("TRUCK_01", bound)
+        self.assertIsNone(self.registry.auto_bind("TRUCK_02"))
+        self.assertEqual(bound.truck_ids, {"TRUCK_01"})
+        self.assertFalse(self.registry.is_connected("TRUCK_02"))
+
+
+class TestTruckCommandSender(unittest.TestCase):
+    def setUp(self):
+        self.registry = ConnectionRegistry()
+        self.sender = TruckCommandSender(self.registry)
+
+    def test_send_uses_current_connection(self):
+        old_sock, new_sock = MagicMock(), MagicMock()
+        self.registry.bind("TRUCK_01", self.registry.open(("127.0.0.1", 5000), old_sock))
+        self.assertTrue(self.sender.send("TRUCK_01", "STOP"))
+
+        # 재연결 - 같은 전송자 객체가 새 소켓으로 전송
+        self.registry.bind("TRUCK_01", self.registry.open(("127.0.0.1", 5001), new_sock))
+        self.assertTrue(self.sender.send("TRUCK_01", "STOP"))
+        self.assertEqual(old_sock.sendall.call_count, 1)
+        new_sock.sendall.assert_called_once_with(TCPProtocol.build_message("SERVER", "TRUCK_01", "STOP", {}))
+        self.assertEqual(self.sender.connected_trucks(), ["TRUCK_01"])
+
+    def test_unregistered_truck_fails_without_connections(self):
+        self.assertFalse(self.sender.send("TRUCK_09", "STOP"))
+        self.assertEqual(self.sender.registration_failures["TRUCK_09"], 1)
+
+        self.registry.bind("TRUCK_09", self.registry.open(("127.0.0.1", 5000), MagicMock()))
+        self.assertNotIn("TRUCK_09", self.sender.registration_failures)
+
+    def test_concurrent_sends_do_not_interleave(self):
+        written = []
+        sock = MagicMock()
+        sock.sendall.side_effect = lambda data: written.append(data)
+        self.registry.bind("TRUCK_01", self.registry.open(("127.0.0.1", 5000), sock))
+
+        threads = [threading.Thread(target=self.sender.send, args=("TRUCK_01", "STOP")) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(written), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# tests/test_db_migrations.py
+
+import sys
+import os
+import unittest
+
+import mysql.connector
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.db.migrations import apply_migrations
+from backend.truck_status.truck_status_db import MIGRATIONS as TRUCK_MIGRATIONS
+from backend.facility_status.facility_status_db import MIGRATIONS as FACILITY_MIGRATIONS, LATEST_TABLES
+
+
+class RecordingCursor:
+    """실행한 SQL 을 기록하는 커서 (schema_migrations 버전만 흉내)"""
+    def __init__(self, current_version=0, failing=None):
+        self.executed = []
+        self.current_version = current_version
+        self.failing = failing or {}
+
+    def execute(self, sql, params=None):
+        self.executed.append(" ".join(sql.split()))
+        for fragment, errno in self.failing.items():
+            if fragment in sql:
+                raise mysql.connector.Error(msg="duplicate", errno=errno)
+
+    def fetchone(self):
+        return (self.current_version,)
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestMigrations(unittest.TestCase):
+    def test_applies_only_newer_versions(self):
+        """이미 적용된 버전은 건너뛰고 이후 버전만 적용"""
+        cursor = RecordingCursor(current_version=1)
+        applied = apply_migrations(RecordingConnection(cursor), "truck_status", TRUCK_MIGRATIONS)
+        self.assertEqual(applied, [version for version, _, _ in TRUCK_MIGRATIONS if version > 1])
+        self.assertFalse(any("idx_battery_truck_time" in sql for sql in cursor.executed))
+        self.assertTrue(any("battery_status_latest" in sql for sql in cursor.executed))
+
+    def test_existing_index_is_ignored(self):
+        """수동으로 만든 인덱스(1061)는 적용된 것으로 간주"""
+        cursor = RecordingCursor(failing={"idx_battery_truck_time": 1061})
+        applied = apply_migrations(RecordingConnection(cursor), "truck_status", TRUCK_MIGRATIONS)
+        self.assertEqual(applied, [version for version, _, _ in TRUCK_MIGRATIONS])
+
+    def test_other_errors_propagate(self):
+        cursor = RecordingCursor(failing={"idx_gate_time": 1146})
+        with self.assertRaises(mysql.connector.Error):
+            apply_migrations(RecordingConnection(cursor), "facility_status", FACILITY_MIGRATIONS)
+
+    def test_latest_table_per_facility(self):
+        """시설 테이블마다 최신 상태 테이블 생성"""
+        cursor = RecordingCursor()
+        apply_migrations(RecordingConnection(cursor), "facility_status", FACILITY_MIGRATIONS)
+        for table in LATEST_TABLES:
+            self.assertTrue(any(f"CREATE TABLE IF NOT EXISTS {table}_latest" in sql for sql in cursor.executed))
+
+
+if __name__ == "__main__":
+    unittest.main()
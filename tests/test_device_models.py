@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# tests/test_device_models.py
+
+import sys
+import os
+import random
+import time
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.serialio.device_clock import VirtualClock
+from backend.serialio.device_models import (
+    GateModel, BeltModel, DispenserModel, FixedLatency, UniformLatency, NormalLatency,
+    make_latency, build_device_models
+)
+from backend.serialio.fake_serial import FakeSerial
+from backend.serialio.serial_interface import SerialInterface
+from backend.serialio.gate_controller import GateController
+
+
+def _drain(ser):
+    lines = []
+    while ser.in_waiting:
+        lines.append(ser.readline().decode().strip())
+    return lines
+
+
+class TestVirtualClock(unittest.TestCase):
+    def test_callbacks_run_in_time_order(self):
+        clock = VirtualClock()
+        fired = []
+        clock.call_later(2.0, fired.append, "b")
+        clock.call_later(0.5, fired.append, "a")
+        clock.call_later(5.0, fired.append, "c")
+
+        self.assertEqual(clock.advance(2.0), 2)
+        self.assertEqual(fired, ["a", "b"])
+        self.assertEqual(clock.now(), 2.0)
+        self.assertEqual(clock.run_until_idle(), 1)
+        self.assertEqual(fired, ["a", "b", "c"])
+        self.assertEqual(clock.now(), 5.0)
+        self.assertEqual(clock.pending(), 0)
+
+
+class TestLatency(unittest.TestCase):
+    def test_make_latency(self):
+        self.assertIsInstance(make_latency(0.5), FixedLatency)
+        self.assertIsInstance(make_latency({"dist": "uniform", "low": 1, "high": 2}), UniformLatency)
+        self.assertIsInstance(make_latency({"dist": "normal", "mean": 3, "stddev": 1}), NormalLatency)
+        with self.assertRaises(ValueError):
+            make_latency({"dist": "weibull"})
+
+    def test_invalid_latency_rejected(self):
+        for spec in (-0.1, float("inf"), float("nan"), "fast",
+                     {"dist": "uniform", "low": -1, "high": 2},
+                     {"dist": "uniform", "low": 2, "high": 1},
+                     {"dist": "uniform", "low": 0, "high": float("inf")},
+                     {"dist": "uniform", "low": 1},
+                     {"dist": "normal", "mean": 1, "stddev": -1}):
+            with self.assertRaises(ValueError, msg=spec):
+                make_latency(spec)
+        self.assertEqual(make_latency({"dist": "uniform", "low": 1, "high": 1}).sample(random.Random()), 1.0)
+
+    def test_distributions_are_bounded_and_seeded(self):
+        rng = random.Random(7)
+        uniform = UniformLatency(1.0, 2.0)
+        self.assertTrue(all(1.0 <= uniform.sample(rng) <= 2.0 for _ in range(200)))
+        normal = NormalLatency(0.1, 5.0)
+        self.assertTrue(all(normal.sample(rng) >= 0.0 for _ in range(200)))
+
+        first = [uniform.sample(random.Random(3)) for _ in range(3)]
+        second = [uniform.sample(random.Random(3)) for _ in range(3)]
+        self.assertEqual(first, second)
+
+
+class TestFakeSerialModels(unittest.TestCase):
+    def test_default_models_keep_responses(self):
+        clock = VirtualClock()
+        ser = FakeSerial(name="TEST_PORT", clock=clock)
+        self.assertFalse(hasattr(ser, "polling_thread"))  # 가상 시간에는 폴링 스레드 없음
+
+        ser.write(b"GATE_A_OPEN\n")
+        self.assertEqual(_drain(ser), [])
+        clock.advance(0.5)
+        self.assertEqual(_drain(ser), ["ACK:GATE_A_OPENED"])
+        clock.advance(0.1)
+        self.assertEqual(_drain(ser), ["STATUS:GATE_A:OPENED"])
+
+        ser.write(b"BELT_RUN\n")
+        self.assertEqual(_drain(ser), ["ACK:BELT_RUN:SUCCESS"])
+        ser.write(b"DISPENSER_DI_CLOSE\n")
+        self.assertEqual(_drain(ser), ["ACK:DI_CLOSED:OK"])
+        ser.close()
+
+    def test_belt_run_time_in_virtual_time(self):
+        clock = VirtualClock()
+        ser = FakeSerial(name="BELT", clock=clock, models=[BeltModel(run_time=20.0)])
+        ser.write(b"BELT_RUN\n")
+        clock.run_until_idle()
+        self.assertEqual(_drain(ser), ["ACK:BELT_RUN:SUCCESS", "STATUS:BELT:RUNNING", "STATUS:BELT:STOPPED"])
+        self.assertAlmostEqual(clock.now(), 20.1)
+
+    def test_dispenser_loaded_follows_open_time(self):
+        clock = VirtualClock()
+        ser = FakeSerial(name="DISPENSER", clock=clock,
+                         models=[DispenserModel(open_time=1.5, loaded_times=(0.5,))])
+        ser.write(b"DISPENSER_DI_OPEN\n")
+        clock.advance(1.5)
+        self.assertEqual(_drain(ser), ["ACK:DI_OPENED:OK"])
+        clock.advance(0.5)
+        self.assertEqual(_drain(ser), ["STATUS:DISPENSER:LOADED"])
+
+    def test_build_device_models_from_config(self):
+        config = {"gate": {"open_time": {"dist": "uniform", "low": 1.0, "high": 3.0}, "failure_rate": 0.5},
+                  "belt": {}, "seed": 11}
+        models = build_device_models(config)
+        self.assertEqual([m.name for m in models], ["GATE", "BELT"])
+
+        def failures():
+            clock = VirtualClock()
+            gate = build_device_models(config)[0]
+            ser = FakeSerial(name="TEST_PORT", clock=clock, models=[gate])
+            for _ in range(40):
+                ser.write(b"GATE_A_OPEN\n")
+            return gate.failures
+
+        first = failures()
+        self.assertEqual(first, failures())  # 같은 seed → 같은 장애 순서
+        self.assertTrue(0 < first < 40)
+
+
+class TestGateControllerVirtualTime(unittest.TestCase):
+    def _controller(self, model):
+        clock = VirtualClock()
+        interface = SerialInterface(port="TEST_PORT", use_fake=True, clock=clock, models=[model])
+        self.addCleanup(interface.close)
+        return clock, GateController(interface)
+
+    def test_open_waits_for_actuation(self):
+        clock, controller = self._controller(GateModel(open_time=3.0))
+        started = time.monotonic()
+        self.assertTrue(controller.open_gate("GATE_A"))
+        self.assertLess(time.monotonic() - started, 1.0)  # 3초 동작이 실제로는 즉시 끝남
+        self.assertGreaterEqual(clock.now(), 3.0)
+        self.assertLess(clock.now(), 3.2)
+        self.assertEqual(controller.gate_states["GATE_A"], "OPENED")
+
+    def test_missing_ack_forces_open_after_timeout(self):
+        clock, controller = self._controller(GateModel(failure_rate=1.0))
+        self.assertTrue(controller.open_gate("GATE_A"))  # 응답 없음 → 강제 열림
+        self.assertGreaterEqual(clock.now(), 15.0)
+
+    def test_close_retries_use_device_clock(self):
+        clock, controller = self._controller(GateModel(failure_rate=1.0))
+        controller.gate_states["GATE_A"] = "OPENED"
+        controller.close_gate("GATE_A")
+        # 15초 대기 x 3 + 재시도 간격 1초 + 2초 - 모두 가상 시간
+        self.assertGreaterEqual(clock.now(), 48.0)
+        self.assertLess(clock.now(), 49.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
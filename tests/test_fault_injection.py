@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# tests/test_fault_injection.py
+
+import sys
+import os
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+from backend.faults.fault_injector import FaultInjector, get_fault_injector
+from backend.rest_api import managers
+from backend.rest_api.routes.system_api import system_api
+from backend.serialio.device_clock import VirtualClock
+from backend.serialio.device_models import GateModel
+from backend.serialio.gate_controller import GateController
+from backend.serialio.serial_interface import SerialInterface
+from backend.tcpio.connection_registry import Connection
+
+
+class _Sock:
+    def __init__(self):
+        self.sent = []
+        self.shut = False
+
+    def sendall(self, data):
+        self.sent.append(data)
+
+    def shutdown(self, how):
+        self.shut = True
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFaultInjector(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.sleeps = []
+        self.injector = FaultInjector(clock=self.clock, sleep=self.sleeps.append)
+        self.connection = Connection(("10.0.0.5", 5000), _Sock())
+
+    def test_inactive_passes_through(self):
+        self.assertFalse(self.injector.active)
+        self.assertEqual(self.injector.report()["paths"], {})
+
+    def test_invalid_config_rejected(self):
+        with self.assertRaises(ValueError):
+            self.injector.configure({"tcp_in": {"partial_rate": 0.5}})
+        with self.assertRaises(ValueError):
+            self.injector.configure({"udp": {}})
+        with self.assertRaises(ValueError):
+            self.injector.configure({"tcp_out": {"drop_rate": 2}})
+
+    def test_tcp_out_faults(self):
+        frame = b"\x10\x01\x05\x03abc"
+        self.injector.configure({"tcp_out": {"drop_rate": 1.0, "latency": 0.2}})
+        self.assertIsNone(self.injector.tcp_out(self.connection, frame))
+        self.assertEqual(self.sleeps, [0.2])
+
+        self.injector.configure({"tcp_out": {"partial_rate": 1.0}})
+        partial = self.injector.tcp_out(self.connection, frame)
+        self.assertTrue(frame.startswith(partial))
+        self.assertLess(len(partial), len(frame))
+
+        self.injector.configure({"tcp_out": {"disconnect_rate": 1.0}})
+        with self.assertRaises(ConnectionResetError):
+            self.injector.tcp_out(self.connection, frame)
+        self.assertTrue(self.connection.sock.shut)
+
+    def test_loss_and_recovery_report(self):
+        self.injector.configure({"tcp_in": {"drop_rate": 0.5}, "seed": 3})
+        results = []
+        for i in range(200):
+            self.clock.now = i * 0.1
+            results.append(self.injector.tcp_in(self.connection, b"frame"))
+
+        paths = self.injector.report()["paths"]["tcp_in"]
+        dropped = results.count(None)
+        self.assertEqual(paths["attempts"], 200)
+        self.assertEqual(paths["faults"]["drop"], dropped)
+        self.assertEqual(paths["delivered"], 200 - dropped)
+        self.assertAlmostEqual(paths["loss_rate"], dropped / 200)
+        self.assertGreater(paths["recovery"]["count"], 0)
+        self.assertGreaterEqual(paths["recovery"]["mean"], 0.1)
+
+    def test_connection_write_applies_faults(self):
+        injector = get_fault_injector()
+        injector.configure({"tcp_out": {"drop_rate": 1.0}})
+        try:
+            self.connection.sendall(b"frame")
+        finally:
+            injector.clear()
+        self.connection.sendall(b"frame")
+        self.assertEqual(self.connection.sock.sent, [b"frame"])
+
+
+class TestSerialFaults(unittest.TestCase):
+    def setUp(self):
+        self.injector = get_fault_injector()
+        self.clock = VirtualClock()
+        self.interface = SerialInterface(port="TEST_PORT", use_fake=True, clock=self.clock, models=[GateModel()])
+        self.controller = GateController(self.interface)
+
+    def tearDown(self):
+        self.injector.clear()
+        self.interface.close()
+
+    def test_missing_ack_counts_forced_open(self):
+        self.injector.configure({"serial": {"missing_ack_rate": 1.0}})
+        self.assertTrue(self.controller.open_gate("GATE_A"))
+        # ACK 는 버려지고 뒤따르는 STATUS 줄을 받아 열림 확인
+        self.assertEqual(self.controller.open_stats["forced_opens"], 0)
+        self.assertEqual(self.injector.report()["paths"]["serial"]["faults"], {"missing_ack": 1})
+
+    def test_dropped_responses_force_open(self):
+        self.injector.configure({"serial": {"drop_rate": 1.0}})
+        self.assertTrue(self.controller.open_gate("GATE_A"))
+        self.assertEqual(self.controller.open_stats["opens"], 1)
+        self.assertEqual(self.controller.open_stats["forced_opens"], 1)
+        self.assertGreaterEqual(self.controller.open_stats["forced_wait"], 15.0)
+
+    def test_garbled_and_delayed_lines(self):
+        self.injector.configure({"serial": {"garble_rate": 1.0, "latency": 2.0}})
+        self.interface.send_command("GATE_A", "OPEN")
+        line = self.interface.read_response(timeout=5)
+        self.assertIsNotNone(line)
+        self.assertNotEqual(line, "ACK:GATE_A_OPENED")
+        self.assertEqual(len(line), len("ACK:GATE_A_OPENED"))
+        self.assertGreaterEqual(self.clock.now(), 2.5)  # 0.5초 동작 + 2초 주입 지연
+
+
+class TestFaultApi(unittest.TestCase):
+    def setUp(self):
+        app = Flask("fault_test")
+        app.register_blueprint(system_api, url_prefix='/api/system')
+        self.client = app.test_client()
+        self.gate = GateController(SerialInterface(port="TEST_PORT", use_fake=True, clock=VirtualClock()))
+        self.gate.open_stats.update(opens=4, forced_opens=1, forced_wait=15.0)
+
+        class _DeviceManager:
+            controllers = {"GATE_A": self.gate}
+        managers.register_services(device_manager=_DeviceManager())
+
+    def tearDown(self):
+        get_fault_injector().clear()
+        managers.clear_services()
+        self.gate.interface.close()
+
+    def test_configure_report_and_clear(self):
+        response = self.client.put("/api/system/faults", json={"tcp_out": {"drop_rate": 0.2}, "seed": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(get_fault_injector().active)
+
+        report = self.client.get("/api/system/faults").get_json()["report"]
+        self.assertEqual(report["config"], {"tcp_out": {"drop_rate": 0.2}, "seed": 1})
+        self.assertIn("tcp_out", report["paths"])
+        self.assertEqual(report["gates"]["GATE_A"]["forced_opens"], 1)
+
+        self.assertEqual(self.client.put("/api/system/faults", json={"tcp_out": {"bogus": 1}}).status_code, 400)
+
+        # 잘못된 지연 / seed 는 400 이고 기존 설정은 그대로
+        for config in ({"tcp_out": {"latency": -1}},
+                       {"tcp_out": {"latency": {"dist": "uniform", "low": 0.5, "high": 0.1}}},
+                       {"serial": {"drop_rate": 0.5}, "seed": [1, 2]}):
+            self.assertEqual(self.client.put("/api/system/faults", json=config).status_code, 400)
+        self.assertEqual(get_fault_injector().report()["config"], {"tcp_out": {"drop_rate": 0.2}, "seed": 1})
+        self.assertEqual(list(get_fault_injector().paths), ["tcp_out"])
+        self.assertEqual(self.client.delete("/api/system/faults").status_code, 200)
+        self.assertFalse(get_fault_injector().active)
+
+
+if __name__ == "__main__":
+    unittest.main()
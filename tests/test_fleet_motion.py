@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# tests/test_fleet_motion.py
+
+import sys
+import os
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.track.track_topology import get_track_topology
+from gui.fleet_motion import CATCH_UP_TIME, MIN_MOVE, PREDICT_LIMIT, FleetMotion, TrackPolyline, rounded_rect_points
+
+# MonitoringTab.setup_map 과 같은 맵 (left=0, top=80, right=600, bottom=320)
+NODE_COORDS = {
+    "STANDBY": (60, 320), "CHECKPOINT_A": (180, 320), "GATE_A": (300, 320), "CHECKPOINT_B": (420, 320),
+    "B_LOAD": (600, 248), "A_LOAD": (600, 152),
+    "CHECKPOINT_C": (420, 80), "GATE_B": (300, 80), "CHECKPOINT_D": (180, 80),
+    "BELT": (0, 152),
+}
+
+
+class TestTrackPolyline(unittest.TestCase):
+    def setUp(self):
+        self.track = TrackPolyline(rounded_rect_points(0, 80, 600, 320, 40))
+
+    def test_nodes_round_trip(self):
+        for x, y in NODE_COORDS.values():
+            px, py = self.track.point_at(self.track.project(x, y))
+            self.assertAlmostEqual(px, x, places=6)
+            self.assertAlmostEqual(py, y, places=6)
+
+    def test_drive_order_and_wrap(self):
+        distances = [self.track.project(*NODE_COORDS[key])
+                     for key in ("STANDBY", "CHECKPOINT_B", "B_LOAD", "A_LOAD", "CHECKPOINT_D", "BELT")]
+        self.assertEqual(distances, sorted(distances))
+        self.assertEqual(self.track.point_at(self.track.length + 20), self.track.point_at(20))
+        # 모서리는 둥근 경로를 따라 감 (직선으로 가로지르지 않음)
+        corner = self.track.point_at(self.track.project(600, 320))
+        self.assertGreater(((corner[0] - 600) ** 2 + (corner[1] - 320) ** 2) ** 0.5, 10)
+
+
+class TestFleetMotion(unittest.TestCase):
+    def setUp(self):
+        self.track = TrackPolyline(rounded_rect_points(0, 80, 600, 320, 40))
+        self.topology = get_track_topology()
+        self.motion = FleetMotion(self.track, NODE_COORDS, self.topology)
+
+    def assertPoint(self, point, expected):
+        self.assertAlmostEqual(point[0], expected[0], places=6)
+        self.assertAlmostEqual(point[1], expected[1], places=6)
+
+    def test_snapshot_adds_removes_and_hides_unknown(self):
+        added, removed = self.motion.apply_snapshot({
+            "TRUCK_01": {"location": "STANDBY", "status": "IDLE"},
+            "TRUCK_02": {"location": "UNKNOWN", "status": "IDLE"},
+        }, now=0.0)
+        self.assertEqual((added, removed), (["TRUCK_01", "TRUCK_02"], []))
+        self.assertEqual(self.motion.step(0.0), {"TRUCK_01": NODE_COORDS["STANDBY"]})
+        self.assertFalse(self.motion.animating)
+
+        added, removed = self.motion.apply_snapshot({"TRUCK_02": {"location": "LOAD_A"}}, now=1.0)
+        self.assertEqual((added, removed), ([], ["TRUCK_01"]))
+        self.assertEqual(self.motion.step(1.0), {"TRUCK_02": NODE_COORDS["A_LOAD"]})
+
+    def test_unchanged_snapshot_does_no_work(self):
+        snapshot = {f"TRUCK_{i:02d}": {"location": "STANDBY", "status": "IDLE"} for i in range(50)}
+        self.motion.apply_snapshot(snapshot, now=0.0)
+        self.assertEqual(len(self.motion.step(0.0)), 50)
+        self.motion.apply_snapshot(dict(snapshot), now=0.2)
+        self.assertFalse(self.motion.animating)
+        self.assertEqual(self.motion.step(0.2), {})
+
+    def test_catch_up_along_track(self):
+        self.motion.apply_snapshot({"TRUCK_01": {"location": "CHECKPOINT_B", "status": "IDLE"}}, now=0.0)
+        self.motion.step(0.0)
+        self.motion.apply_snapshot({"TRUCK_01": {"location": "LOAD_A", "status": "IDLE"}}, now=1.0)
+
+        # 따라가는 도중에는 하단 → 둥근 모서리 → 우측 트랙 위
+        x, y = self.motion.step(1.0 + CATCH_UP_TIME / 2)["TRUCK_01"]
+        self.assertAlmostEqual(self.track.point_at(self.track.project(x, y))[0], x, places=6)
+        self.assertPoint(self.motion.step(1.0 + CATCH_UP_TIME + 0.01)["TRUCK_01"], NODE_COORDS["A_LOAD"])
+        self.assertFalse(self.motion.animating)
+
+    def test_running_predicts_with_eta(self):
+        eta = self.topology.eta("STANDBY", "CHECKPOINT_A")
+        self.motion.apply_snapshot({"TRUCK_01": {"location": "STANDBY", "status": "RUNNING"}}, now=0.0)
+        self.motion.step(0.0)
+
+        x, y = self.motion.step(eta / 2)["TRUCK_01"]
+        self.assertAlmostEqual(x, 60 + 120 * 0.5)
+        self.assertEqual(y, 320)
+        # 도착 보고 전에는 다음 노드를 넘지 않음
+        x, _ = self.motion.step(eta * 3)["TRUCK_01"]
+        self.assertAlmostEqual(x, 60 + 120 * PREDICT_LIMIT)
+        self.assertFalse(self.motion.animating)
+
+        # 도착 보고 - 예측 위치에서 짧게 따라잡음 (뒤로 돌아가지 않음)
+        self.motion.apply_snapshot({"TRUCK_01": {"location": "CHECKPOINT_A", "status": "IDLE"}}, now=eta * 3)
+        x, _ = self.motion.step(eta * 3 + CATCH_UP_TIME / 2)["TRUCK_01"]
+        self.assertGreater(x, 60 + 120 * PREDICT_LIMIT)
+        self.assertPoint(self.motion.step(eta * 3 + CATCH_UP_TIME)["TRUCK_01"], NODE_COORDS["CHECKPOINT_A"])
+
+    def test_fifty_trucks_frame_work(self):
+        """프레임마다 움직인 트럭만 돌려주고, 모두 멈추면 계산하지 않음 (실행 시간 대신 한 일의 양 확인)"""
+        locations = ["STANDBY", "CHECKPOINT_A", "LOAD_B", "CHECKPOINT_C", "CHECKPOINT_D", "BELT"]
+        self.motion.apply_snapshot({f"TRUCK_{i:02d}": {"location": locations[i % 6], "status": "RUNNING"}
+                                    for i in range(50)}, now=0.0)
+        drawn = {}
+        for frame in range(60):
+            for truck_id, point in self.motion.step(frame / 60).items():
+                previous = drawn.get(truck_id)
+                if previous is not None:
+                    self.assertGreaterEqual(max(abs(point[0] - previous[0]), abs(point[1] - previous[1])), MIN_MOVE)
+                drawn[truck_id] = point
+        self.assertEqual(len(drawn), 50)
+
+        # 예측 한계까지 간 뒤에는 다음 보고 전까지 할 일이 없음
+        self.motion.step(1000.0)
+        self.assertFalse(self.motion.animating)
+        self.assertEqual(self.motion.step(1001.0), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
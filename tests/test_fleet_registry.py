@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# tests/test_fleet_registry.py
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import backend.fleet.fleet_registry as fleet_module
+from backend.fleet.fleet_registry import FleetRegistry, RESERVED_CODES, ID_EXTENDED
+from backend.tcpio.protocol import TCPProtocol
+from backend.tcpio.connection_registry import ConnectionRegistry
+from backend.tcpio.tcp_server import TCPServer
+from backend.truck_status.truck_status_manager import TruckStatusManager
+
+
+class TestFleetRegistry(unittest.TestCase):
+    def setUp(self):
+        self.fleet = FleetRegistry()
+
+    def test_default_fleet_keeps_legacy_codes(self):
+        self.assertEqual(self.fleet.truck_ids(), ["TRUCK_01", "TRUCK_02", "TRUCK_03"])
+        self.assertEqual([self.fleet.code_of(t) for t in self.fleet.truck_ids()], [1, 2, 3])
+
+    def test_allocation_skips_reserved_codes(self):
+        codes = [self.fleet.register(f"AGV_{i}")["protocol_id"] for i in range(20)]
+        self.assertFalse(set(codes) & RESERVED_CODES)
+        self.assertEqual(len(set(codes)), 20)
+        # TRUCK_04 의 번호 0x04 는 GUI 라 다른 ID 를 받음
+        self.assertNotIn(self.fleet.register("TRUCK_04")["protocol_id"], RESERVED_CODES)
+
+    def test_extended_ids_after_short_space(self):
+        for i in range(300):
+            self.fleet.register(f"AGV_{i:03d}")
+        codes = [self.fleet.code_of(t) for t in self.fleet.truck_ids()]
+        self.assertEqual(len(codes), 303)
+        self.assertGreater(max(codes), 0xFF)
+
+        short_only = FleetRegistry(allow_extended=False, default_trucks=())
+        for i in range(0xFF + 1 - len(RESERVED_CODES)):
+            short_only.register(f"AGV_{i:03d}")
+        with self.assertRaises(ValueError):
+            short_only.register("AGV_OVERFLOW")
+
+    def test_register_conflicts(self):
+        with self.assertRaises(ValueError):
+            self.fleet.register("AGV_X", protocol_id=0x01)  # TRUCK_01 이 사용 중
+        with self.assertRaises(ValueError):
+            self.fleet.register("AGV_X", protocol_id=0x10)  # SERVER
+        with self.assertRaises(ValueError):
+            self.fleet.register("TRUCK_01", protocol_id=0x07)
+
+    def test_truck_of_is_lookup_only(self):
+        self.assertEqual(self.fleet.truck_of(0x01), "TRUCK_01")
+        self.assertIsNone(self.fleet.truck_of(0x07))
+        self.assertNotIn("TRUCK_07", self.fleet)
+
+    def test_admit_auto_registers(self):
+        self.assertEqual(self.fleet.admit(0x07), "TRUCK_07")
+        self.assertIn("TRUCK_07", self.fleet)
+        self.assertEqual(self.fleet.admit(0x01), "TRUCK_01")
+        for code in (0x00, 0x04, 0x10, 0xFF, 0x10000):
+            self.assertIsNone(self.fleet.admit(code))
+        self.assertEqual(len(self.fleet), 4)
+
+        strict = FleetRegistry(auto_register=False)
+        self.assertIsNone(strict.admit(0x07))
+
+    def test_deactivate_hides_but_keeps_code(self):
+        self.assertTrue(self.fleet.deactivate("TRUCK_02"))
+        self.assertNotIn("TRUCK_02", self.fleet.truck_ids())
+        self.assertIn("TRUCK_02", self.fleet.truck_ids(active_only=False))
+        with self.assertRaises(ValueError):
+            self.fleet.register("AGV_X", protocol_id=0x02)
+
+    def test_attach_store(self):
+        store = MagicMock()
+        store.load_fleet.return_value = []
+        self.fleet.attach_store(store)
+        self.assertEqual(store.save_fleet_truck.call_count, 3)  # 비어 있으면 기본 목록 저장
+
+        store = MagicMock()
+        store.load_fleet.return_value = [
+            {"truck_id": "AGV_A", "protocol_id": 0x20, "name": "A", "active": 1},
+            {"truck_id": "AGV_B", "protocol_id": 0x120, "name": "B", "active": 0},
+        ]
+        fleet = FleetRegistry(store=store)
+        self.assertEqual(fleet.truck_ids(), ["AGV_A"])
+        self.assertEqual(fleet.code_of("AGV_B"), 0x120)
+        store.save_fleet_truck.assert_not_called()
+
+
+class TestExtendedIdProtocol(unittest.TestCase):
+    def setUp(self):
+        fleet_module._fleet_registry = FleetRegistry()
+        self.fleet = fleet_module.get_fleet_registry()
+
+    def tearDown(self):
+        fleet_module._fleet_registry = None
+
+    def test_short_id_frame_unchanged(self):
+        raw = TCPProtocol.build_message("SERVER", "TRUCK_01", "RUN", {})
+        self.assertEqual(raw[:2], bytes([0x10, 0x01]))
+        self.assertEqual(TCPProtocol.extension_length(raw[:4]), 0)
+
+    def test_extended_id_round_trip(self):
+        self.fleet.register("AGV_BIG", protocol_id=0x1234)
+        raw = TCPProtocol.build_message("AGV_BIG", "SERVER", "ARRIVED", {"position": "CHECKPOINT_A"})
+        self.assertEqual(raw[0], ID_EXTENDED)
+        self.assertEqual(TCPProtocol.extension_length(raw[:4]), 2)
+        self.assertEqual(raw[4:6], b"\x12\x34")
+
+        message = TCPProtocol.parse_message(raw)
+        self.assertEqual(message["sender"], "AGV_BIG")
+        self.assertEqual(message["receiver"], "SERVER")
+        self.assertEqual(message["cmd"], "ARRIVED")
+
+    def test_truncated_extension_is_invalid(self):
+        self.fleet.register("AGV_BIG", protocol_id=0x1234)
+        raw = TCPProtocol.build_message("SERVER", "AGV_BIG", "RUN", {})
+        self.assertEqual(TCPProtocol.parse_message(raw[:5])["type"], "INVALID")
+
+
+class _App:
+    def __init__(self):
+        self.connections = ConnectionRegistry()
+        self.messages = []
+
+    def handle_message(self, message):
+        self.messages.append(message)
+
+    def set_tcp_server(self, server):
+        pass
+
+
+class TestSenderRegistration(unittest.TestCase):
+    """미등록 송신자는 연결의 첫 프레임 / HELLO 에서만 등록 (수신자 바이트로는 등록하지 않음)"""
+
+    def setUp(self):
+        fleet_module._fleet_registry = FleetRegistry()
+        self.fleet = fleet_module.get_fleet_registry()
+        self.app = _App()
+        self.server = TCPServer(app_controller=self.app)
+        self.sock = MagicMock()
+        self.sock.gettimeout.return_value = None
+        self.connection = self.app.connections.open(("127.0.0.1", 5000), self.sock)
+
+    def tearDown(self):
+        fleet_module._fleet_registry = None
+
+    def frame(self, sender, receiver, cmd):
+        return bytes([sender, receiver, cmd, 0])
+
+    def test_parse_does_not_register(self):
+        message = TCPProtocol.parse_message(self.frame(0x07, 0x08, TCPProtocol.CMD_HELLO))
+        self.assertEqual((message["sender"], message["receiver"], message["sender_code"]), ("UNKNOWN", "UNKNOWN", 0x07))
+        self.assertEqual(self.fleet.truck_ids(), ["TRUCK_01", "TRUCK_02", "TRUCK_03"])
+
+    def test_first_frame_registers_sender_only(self):
+        self.server.handle_frame(self.connection, self.frame(0x07, 0x08, TCPProtocol.CMD_ARRIVED))
+        self.assertIn("TRUCK_07", self.fleet)
+        self.assertNotIn("TRUCK_08", self.fleet)
+        self.assertIs(self.app.connections.get("TRUCK_07"), self.connection)
+        self.assertEqual(self.app.messages[0]["sender"], "TRUCK_07")
+
+    def test_bound_connection_does_not_register_new_sender(self):
+        self.app.connections.bind("TRUCK_01", self.connection)
+        self.server.handle_frame(self.connection, self.frame(0x09, 0x10, TCPProtocol.CMD_ARRIVED))
+        self.assertNotIn("TRUCK_09", self.fleet)
+        self.assertEqual(self.app.messages, [])
+
+        # HELLO 는 같은 연결에서도 등록 (한 연결로 여러 트럭을 중계하는 경우)
+        self.server.handle_frame(self.connection, self.frame(0x09, 0x10, TCPProtocol.CMD_HELLO))
+        self.assertIn("TRUCK_09", self.fleet)
+
+    def test_reserved_sender_rejected(self):
+        for code in (0x00, 0xFF):
+            self.server.handle_frame(self.connection, self.frame(code, 0x10, TCPProtocol.CMD_HELLO))
+        self.assertEqual(len(self.fleet), 3)
+        self.assertEqual(self.app.connections.truck_ids(), [])
+
+
+class TestStatusManagerUsesFleet(unittest.TestCase):
+    def test_reset_and_memory_snapshot_follow_fleet(self):
+        fleet = FleetRegistry(default_trucks=("TRUCK_01",))
+        fleet.register("AGV_NEW")
+        manager = TruckStatusManager(MagicMock(), serve_from_memory=True, fleet=fleet)
+
+        self.assertTrue(manager.reset_all_trucks())
+        self.assertEqual(set(manager.truck_status), {"TRUCK_01", "AGV_NEW"})
+        self.assertEqual(set(manager.get_all_trucks()), {"TRUCK_01", "AGV_NEW"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# tests/test_gate_reservation.py
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.track.track_topology import TrackTopology, CLOCKWISE, COUNTERCLOCKWISE
+from backend.track.gate_reservation import (
+    GateReservationManager, ENTRY_OPEN, ENTRY_ADMITTED, ENTRY_QUEUED, POLICY_PRIORITY
+)
+from backend.truck_fsm.truck_fsm import TruckFSM
+from backend.truck_fsm.truck_state import Direction, MissionPhase, TruckState
+
+
+class TestGateReservation(unittest.TestCase):
+    def setUp(self):
+        self.reservation = GateReservationManager(TrackTopology.default())
+
+    def test_same_direction_batch(self):
+        """같은 방향 트럭은 한 번의 개방 주기로 통과"""
+        self.assertEqual(self.reservation.request_entry("GATE_A", "TRUCK_01", CLOCKWISE), ENTRY_OPEN)
+        self.reservation.mark_opened("GATE_A")
+        self.assertEqual(self.reservation.request_entry("GATE_A", "TRUCK_02", CLOCKWISE), ENTRY_ADMITTED)
+
+        # 앞 트럭이 빠져도 뒤 트럭이 구간 안에 있으면 닫지 않음
+        self.assertEqual(self.reservation.release("GATE_A", "TRUCK_01"), {"close": False, "admitted": []})
+        self.assertEqual(self.reservation.release("GATE_A", "TRUCK_02"), {"close": True, "admitted": []})
+        self.assertEqual(self.reservation.get_status("GATE_A")["open_cycles"], 1)
+
+    def test_opposing_direction_queued(self):
+        """반대 방향 트럭은 구간이 빌 때까지 대기 후 게이트를 닫지 않고 진입"""
+        self.reservation.request_entry("GATE_A", "TRUCK_01", CLOCKWISE)
+        self.reservation.mark_opened("GATE_A")
+        self.assertEqual(self.reservation.request_entry("GATE_A", "TRUCK_02", COUNTERCLOCKWISE), ENTRY_QUEUED)
+
+        release = self.reservation.release("GATE_A", "TRUCK_01")
+        self.assertEqual(release, {"close": False, "admitted": ["TRUCK_02"]})
+        self.assertEqual(self.reservation.get_status("GATE_A")["flow_direction"], COUNTERCLOCKWISE)
+
+    def test_max_batch_prevents_starvation(self):
+        """반대 방향 대기 중에는 같은 방향 진입을 max_batch 대로 제한"""
+        reservation = GateReservationManager(TrackTopology.default(), max_batch=2)
+        reservation.request_entry("GATE_B", "TRUCK_01", CLOCKWISE)
+        reservation.mark_opened("GATE_B")
+        reservation.request_entry("GATE_B", "TRUCK_02", COUNTERCLOCKWISE)
+        self.assertEqual(reservation.request_entry("GATE_B", "TRUCK_03", CLOCKWISE), ENTRY_ADMITTED)
+        self.assertEqual(reservation.request_entry("GATE_B", "TRUCK_04", CLOCKWISE), ENTRY_QUEUED)
+
+    def test_priority_policy(self):
+        """우선순위 정책에서는 우선순위가 높은 트럭이 먼저 진입"""
+        reservation = GateReservationManager(TrackTopology.default(), policy=POLICY_PRIORITY)
+        reservation.request_entry("GATE_A", "TRUCK_01", CLOCKWISE)
+        reservation.request_entry("GATE_A", "TRUCK_02", COUNTERCLOCKWISE, priority=0)
+        reservation.request_entry("GATE_A", "TRUCK_03", COUNTERCLOCKWISE, priority=5)
+        self.assertEqual(reservation.get_status("GATE_A")["waiting"], ["TRUCK_03", "TRUCK_02"])
+
+
+class TestFSMGateTraffic(unittest.TestCase):
+    def setUp(self):
+        self.gate_controller = MagicMock()
+        self.gate_controller.open_gate.return_value = True
+        self.gate_controller.close_gate.return_value = True
+        self.fsm = TruckFSM(command_sender=MagicMock(), gate_controller=self.gate_controller)
+
+    def _arrive(self, truck_id, checkpoint):
+        context = self.fsm._get_or_create_context(truck_id)
+        context.position = checkpoint
+        context.direction = Direction.CLOCKWISE
+        self.fsm._process_checkpoint_gate_control(context, checkpoint, Direction.CLOCKWISE)
+
+    def test_following_truck_not_shut_out(self):
+        """앞 트럭의 CHECKPOINT_B 도착이 뒤 트럭 앞에서 GATE_A를 닫지 않음"""
+        self._arrive("TRUCK_01", "CHECKPOINT_A")
+        self._arrive("TRUCK_02", "CHECKPOINT_A")
+        self._arrive("TRUCK_01", "CHECKPOINT_B")
+        self.gate_controller.close_gate.assert_not_called()
+
+        self._arrive("TRUCK_02", "CHECKPOINT_B")
+        self.assertEqual(self.gate_controller.open_gate.call_count, 1)
+        self.gate_controller.close_gate.assert_called_once_with("GATE_A")
+
+
+    def test_cancelled_truck_releases_segment(self):
+        """구간 안에서 미션이 취소된 트럭은 점유를 풀고 대기 트럭을 진입시킴"""
+        self._arrive("TRUCK_01", "CHECKPOINT_A")
+        context = self.fsm.contexts["TRUCK_01"]
+        context.state = TruckState.MOVING
+        context.mission_id = "M1"
+        context.mission_phase = MissionPhase.TO_LOADING
+        self.assertEqual(self.fsm.gate_reservation.request_entry("GATE_A", "TRUCK_02", COUNTERCLOCKWISE), ENTRY_QUEUED)
+
+        self.assertTrue(self.fsm.handle_event("TRUCK_01", "CANCEL_MISSION", {}))
+        status = self.fsm.gate_reservation.get_status("GATE_A")
+        self.assertEqual(status["occupants"], ["TRUCK_02"])
+        self.assertEqual(status["waiting"], [])
+        self.assertEqual(self.gate_controller.close_gate.call_count, 0)
+
+        # 이후 진입 요청도 막히지 않음
+        self.fsm.gate_reservation.release("GATE_A", "TRUCK_02")
+        self.assertEqual(self.fsm.gate_reservation.request_entry("GATE_A", "TRUCK_03", CLOCKWISE), ENTRY_OPEN)
+
+    def test_reset_releases_segment(self):
+        """비상 해제는 구간 점유를 풀고 빈 구간의 게이트를 닫음"""
+        self._arrive("TRUCK_01", "CHECKPOINT_A")
+        self.fsm.contexts["TRUCK_01"].state = TruckState.EMERGENCY
+        self.fsm.handle_event("TRUCK_01", "RESET", {})
+        self.assertEqual(self.fsm.gate_reservation.get_status("GATE_A")["occupants"], [])
+        self.gate_controller.close_gate.assert_called_once_with("GATE_A")
+
+    def test_offline_keeps_segment_until_exit(self):
+        """통신 두절 트럭은 대기만 취소 - 구간 점유는 진출 체크포인트 보고(또는 RESET) 때까지 유지"""
+        self._arrive("TRUCK_02", "CHECKPOINT_C")
+        context = self.fsm.contexts["TRUCK_02"]
+        context.state = TruckState.MOVING
+        context.mission_id = "M1"
+        self.fsm.gate_reservation.request_entry("GATE_B", "TRUCK_03", COUNTERCLOCKWISE)
+        self.fsm.gate_reservation.request_entry("GATE_B", "TRUCK_04", COUNTERCLOCKWISE)
+
+        self.assertFalse(self.fsm.handle_truck_offline("TRUCK_04", "TIMEOUT"))
+        self.assertTrue(self.fsm.handle_truck_offline("TRUCK_02", "TIMEOUT"))
+        self.assertEqual(context.state, TruckState.EMERGENCY)
+        status = self.fsm.gate_reservation.get_status("GATE_B")
+        self.assertEqual(status["occupants"], ["TRUCK_02"])
+        self.assertEqual(status["waiting"], ["TRUCK_03"])
+
+        # 재접속 후 진출 체크포인트 보고 - 점유 해제, 반대 방향 대기 트럭 진입
+        self.fsm.handle_position_update("TRUCK_02", "CHECKPOINT_D")
+        status = self.fsm.gate_reservation.get_status("GATE_B")
+        self.assertEqual(status["occupants"], ["TRUCK_03"])
+        self.assertEqual(status["waiting"], [])
+        self.gate_controller.close_gate.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
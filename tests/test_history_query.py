@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# tests/test_history_query.py
+
+import sys
+import os
+import unittest
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.db.history_query import merge_level_buckets, time_in_state
+from backend.rest_api.history_args import parse_history_args, parse_bucket_arg, parse_time_arg, require_range, MAX_BUCKETS
+
+
+class TestHistoryQuery(unittest.TestCase):
+    def test_merge_raw_and_minute_buckets(self):
+        """원본 / 분 단위 집계 구간을 표본 수 가중 평균으로 병합"""
+        raw = [{"bucket_start": 3600, "min_level": 50, "avg_level": 60, "max_level": 70, "samples": 10}]
+        minute = [
+            {"bucket_start": 3600, "min_level": 40, "avg_level": 90, "max_level": 95, "samples": 30},
+            {"bucket_start": 0, "min_level": 95, "avg_level": 97, "max_level": 99, "samples": 5},
+        ]
+        buckets = merge_level_buckets(raw, minute)
+        self.assertEqual([b["t"] for b in buckets], [0, 3600])
+        self.assertEqual(buckets[1], {"t": 3600, "min": 40.0, "avg": 82.5, "max": 95.0, "samples": 40})
+
+    def test_time_in_state(self):
+        """구간 이전 상태부터 이어서 상태별 체류 시간 계산"""
+        since = datetime(2024, 1, 1, 12, 0)
+        rows = [
+            {"status": "IDLE", "timestamp": since - timedelta(minutes=5)},
+            {"status": "RUNNING", "timestamp": since + timedelta(minutes=10)},
+            {"status": "IDLE", "timestamp": since + timedelta(minutes=40)},
+        ]
+        result = time_in_state(rows, since, since + timedelta(hours=1))
+        self.assertEqual(result, {"IDLE": 1800.0, "RUNNING": 1800.0})
+
+
+class TestHistoryArgs(unittest.TestCase):
+    def test_bucket_units(self):
+        self.assertEqual(parse_bucket_arg("15m"), 900)
+        self.assertEqual(parse_bucket_arg("1h"), 3600)
+        self.assertEqual(parse_bucket_arg("30"), 30)
+        with self.assertRaises(ValueError):
+            parse_bucket_arg("0s")
+
+    def test_bucket_defaults_to_recent_window(self):
+        query = parse_history_args({"bucket": "1h", "to": "2024-01-02T00:00:00"})
+        self.assertEqual(query["since"], datetime(2024, 1, 1))
+        self.assertEqual(query["bucket_seconds"], 3600)
+
+    def test_rejects_invalid_ranges(self):
+        with self.assertRaises(ValueError):
+            parse_history_args({"from": "2024-01-02", "to": "2024-01-01"})
+        with self.assertRaises(ValueError):
+            parse_history_args({"from": "2024-01-01", "to": "2024-02-01", "bucket": "1s"})
+        self.assertGreater(MAX_BUCKETS, 24 * 31)
+
+    def test_rejects_out_of_range_times(self):
+        """inf / nan / 범위 밖 epoch 는 OverflowError 가 아닌 ValueError (400)"""
+        for value in ("1e20", "inf", "-inf", "nan", "-1e20"):
+            with self.assertRaises(ValueError):
+                parse_time_arg(value)
+        with self.assertRaises(ValueError):
+            parse_bucket_arg("1e400s")
+        with self.assertRaises(ValueError):
+            require_range(parse_history_args({"to": "0001-01-01T00:00:00"}))
+
+    def test_blank_bucket_and_bad_limit(self):
+        """공백뿐인 bucket 은 지정하지 않은 것으로, limit 은 1 이상만"""
+        for value in ("", "   ", "\t"):
+            self.assertIsNone(parse_bucket_arg(value))
+        self.assertIsNone(parse_history_args({"bucket": " "})["bucket_seconds"])
+        for limit in ("0", "-5"):
+            with self.assertRaises(ValueError):
+                parse_history_args({"limit": limit})
+
+    def test_plain_limit_query(self):
+        """from/to/bucket 이 없으면 기존 limit 조회"""
+        query = parse_history_args({"limit": "20"})
+        self.assertEqual(query, {"since": None, "until": None, "bucket_seconds": None, "limit": 20})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# tests/test_history_retention.py
+
+import sys
+import os
+import csv
+import gzip
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.db.retention import drop_day_partitions, retention_cutoff, HistoryArchiver
+
+
+class DayCursor:
+    """MIN(timestamp) 조회와 구간 삭제/조회를 흉내 내는 커서"""
+    def __init__(self, timestamps):
+        self.timestamps = sorted(timestamps)
+        self.deleted_ranges = []
+        self.description = [("id",), ("timestamp",)]
+        self.rowcount = 0
+        self._result = []
+
+    def execute(self, sql, params=None):
+        if sql.startswith("SELECT MIN"):
+            self._result = [(self.timestamps[0] if self.timestamps else None,)]
+            return
+        start, end = params
+        selected = [ts for ts in self.timestamps if start <= ts < end]
+        if sql.startswith("DELETE"):
+            self.timestamps = [ts for ts in self.timestamps if not (start <= ts < end)]
+            self.deleted_ranges.append((start, end))
+            self.rowcount = len(selected)
+        else:
+            self._result = [(index, ts) for index, ts in enumerate(selected)]
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class DayConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestHistoryRetention(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2024, 3, 20, 15, 30)
+        self.cutoff = retention_cutoff(7, self.now)
+
+    def test_cutoff_is_day_aligned(self):
+        self.assertEqual(self.cutoff, datetime(2024, 3, 13))
+
+    def test_drops_whole_days_before_cutoff(self):
+        """보관 기간 이전 데이터만 하루 단위로 집계 후 삭제"""
+        timestamps = [self.now - timedelta(days=d, hours=1) for d in range(12)]
+        cursor = DayCursor(timestamps)
+        conn = DayConnection(cursor)
+        rolled_up = []
+
+        deleted = drop_day_partitions(conn, "battery_status", self.cutoff,
+                                      before_drop=lambda c, start, end: rolled_up.append(start))
+
+        self.assertEqual(deleted, 4)
+        self.assertTrue(all(ts >= self.cutoff for ts in cursor.timestamps))
+        self.assertEqual(rolled_up, [start for start, _ in cursor.deleted_ranges])
+        self.assertEqual(conn.commits, len(cursor.deleted_ranges))
+
+    def test_archive_before_delete(self):
+        """보관 디렉터리를 지정하면 삭제 전에 CSV 로 남김"""
+        directory = tempfile.mkdtemp()
+        try:
+            old = self.cutoff - timedelta(hours=3)
+            cursor = DayCursor([old, self.now])
+            drop_day_partitions(DayConnection(cursor), "position_status", self.cutoff, HistoryArchiver(directory))
+
+            path = os.path.join(directory, "position_status", f"{old:%Y-%m-%d}.csv.gz")
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ["id", "timestamp"])
+            self.assertEqual(len(rows), 2)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
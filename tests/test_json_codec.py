@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# tests/test_json_codec.py
+
+import sys
+import os
+import unittest
+from datetime import datetime
+from decimal import Decimal
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from unittest.mock import MagicMock
+
+from flask import Flask, jsonify
+
+from backend.cache.state_versions import get_state_versions, DOMAIN_TRUCKS
+from backend.mission.mission import Mission
+from backend.mission.mission_status import MissionStatus
+from backend.rest_api import managers, response_cache
+from backend.rest_api.json_codec import FastJSONProvider, dumps, loads, mission_record, json_bytes_response
+from backend.rest_api.routes.truck_api import truck_api
+
+
+class TestJSONCodec(unittest.TestCase):
+    def test_dumps_extended_types(self):
+        data = loads(dumps({
+            "at": datetime(2025, 1, 2, 3, 4, 5),
+            "avg": Decimal("12.50"),
+            "status": MissionStatus.WAITING,
+            "name": "게이트"
+        }))
+        self.assertEqual(data, {"at": "2025-01-02T03:04:05", "avg": 12.5,
+                                "status": MissionStatus.WAITING.value, "name": "게이트"})
+
+    def test_mission_record_matches_to_dict(self):
+        """스키마 인코더 결과가 Mission.to_dict 와 같은 JSON"""
+        mission = Mission("MISSION_001", "SAND", 1.0, "LOAD_A", "BELT",
+                          timestamp_created=datetime(2025, 1, 1, 9, 0, 0, 123456))
+        mission.assign_to_truck("TRUCK_01")
+        self.assertEqual(loads(dumps(mission_record(mission))), loads(dumps(mission.to_dict())))
+
+    def test_trucks_encoded_once_per_version(self):
+        """/trucks 는 상태 버전이 바뀔 때만 다시 조회 / 인코딩"""
+        truck_manager = MagicMock()
+        truck_manager.get_all_trucks.side_effect = lambda: {
+            "TRUCK_01": {"battery": {"level": 90}, "position": {"current": "STANDBY", "run_state": "IDLE"}}
+        }
+        managers.register_services(main_controller=MagicMock(), truck_status_manager=truck_manager)
+        response_cache._response_cache = None
+        self.addCleanup(managers.clear_services)
+        self.addCleanup(setattr, response_cache, "_response_cache", None)
+        app = Flask("codec_trucks")
+        app.json = FastJSONProvider(app)
+        app.register_blueprint(truck_api, url_prefix="/api")
+        client = app.test_client()
+
+        first = client.get("/api/trucks")
+        self.assertEqual(first.get_json()["TRUCK_01"]["position"], {"location": "STANDBY", "status": "IDLE"})
+        self.assertEqual(client.get("/api/trucks").data, first.data)
+        self.assertEqual(truck_manager.get_all_trucks.call_count, 1)
+        get_state_versions().bump(DOMAIN_TRUCKS)
+        client.get("/api/trucks")
+        self.assertEqual(truck_manager.get_all_trucks.call_count, 2)
+
+    def test_flask_provider(self):
+        app = Flask("codec_test")
+        app.json = FastJSONProvider(app)
+
+        @app.route("/jsonify")
+        def with_jsonify():
+            return jsonify({"at": datetime(2025, 1, 1)})
+
+        @app.route("/bytes")
+        def with_bytes():
+            return json_bytes_response(dumps([1, 2]), status=201)
+
+        client = app.test_client()
+        self.assertEqual(client.get("/jsonify").get_json(), {"at": "2025-01-01T00:00:00"})
+        response = client.get("/bytes")
+        self.assertEqual((response.status_code, response.mimetype), (201, "application/json"))
+        self.assertEqual(response.get_json(), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# tests/test_liveness_monitor.py
+
+import sys
+import os
+import socket
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.tcpio.connection_registry import ConnectionRegistry
+from backend.tcpio.liveness_monitor import (
+    LivenessMonitor, REASON_TIMEOUT, REASON_DISCONNECTED, DEFAULT_IDLE_TIMEOUT, STATUS_REPORT_INTERVAL, LOAD_DWELL
+)
+from backend.tcpio.protocol import TCPProtocol
+from backend.tcpio.tcp_server import TCPServer
+from backend.truck_fsm.truck_fsm import TruckFSM
+from backend.truck_fsm.truck_state import TruckState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLivenessMonitor(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.connections = ConnectionRegistry()
+        self.monitor = LivenessMonitor(self.connections, idle_timeout=5.0, probe_interval=2.0,
+                                       max_misses=3, reconnect_grace=3.0, clock=self.clock)
+        self.offline = []
+        self.monitor.add_listener(lambda truck_id, reason: self.offline.append((truck_id, reason)))
+        self.sock = MagicMock()
+        self.connection = self.connections.open(("127.0.0.1", 5000), self.sock)
+        self.connections.bind("TRUCK_01", self.connection)  # 연결 이벤트로 감시 시작
+        self.monitor.enable_probes("TRUCK_01")
+
+    def advance(self, seconds):
+        self.clock.now += seconds
+        return self.monitor.poll()
+
+    def test_silent_truck_goes_offline_after_misses(self):
+        self.assertTrue(self.monitor.is_tracked("TRUCK_01"))
+        self.advance(5.0)
+        self.assertEqual(self.monitor.misses("TRUCK_01"), 1)
+        sent = TCPProtocol.parse_message(self.sock.sendall.call_args[0][0])
+        self.assertEqual(sent["cmd"], "HEARTBEAT_CHECK")
+
+        self.advance(2.0)
+        self.advance(2.0)
+        self.assertEqual(self.sock.sendall.call_count, 3)
+        self.assertEqual(self.advance(2.0), ["TRUCK_01"])
+        self.assertEqual(self.offline, [("TRUCK_01", REASON_TIMEOUT)])
+        self.sock.shutdown.assert_called_once()
+        self.assertFalse(self.monitor.is_tracked("TRUCK_01"))
+
+    def test_frames_keep_truck_alive(self):
+        for _ in range(10):
+            self.clock.now += 3.0
+            self.monitor.touch("TRUCK_01")
+            self.monitor.poll()
+        self.sock.sendall.assert_not_called()
+        self.assertEqual(self.offline, [])
+
+    def test_reply_to_probe_resets_misses(self):
+        self.advance(5.0)
+        self.advance(2.0)
+        self.assertEqual(self.monitor.misses("TRUCK_01"), 2)
+        self.monitor.touch("TRUCK_01")
+        self.advance(2.0)
+        self.assertEqual(self.monitor.misses("TRUCK_01"), 0)
+        self.assertEqual(self.sock.sendall.call_count, 2)
+
+    def test_truck_without_probes_goes_offline_after_silence(self):
+        """하트비트 체크를 협상하지 않은 (펌웨어) 트럭은 체크 없이 경고 후 silent_timeout 에 오프라인"""
+        firmware = self.connections.open(("127.0.0.1", 5001), MagicMock())
+        self.connections.bind("TRUCK_02", firmware)
+        self.assertFalse(self.monitor.probes_enabled("TRUCK_02"))
+        self.assertEqual(self.monitor.silent_timeout, 10.0)
+
+        # 보고가 이어지면 오프라인 아님
+        for _ in range(5):
+            self.monitor.touch("TRUCK_01")
+            self.clock.now += 4.0
+            self.monitor.touch("TRUCK_02")
+            self.monitor.poll()
+        self.assertEqual(self.offline, [])
+
+        # idle_timeout 에는 경고만, silent_timeout 에 오프라인 + 소켓 종료
+        self.monitor.touch("TRUCK_01")
+        self.assertEqual(self.advance(5.0), [])
+        self.assertTrue(self.monitor.is_tracked("TRUCK_02"))
+        self.monitor.touch("TRUCK_01")
+        self.assertEqual(self.advance(5.0), ["TRUCK_02"])
+        firmware.sock.sendall.assert_not_called()
+        firmware.sock.shutdown.assert_called_once()
+        self.assertEqual(self.offline, [("TRUCK_02", REASON_TIMEOUT)])
+
+    def test_truck_without_probes_disconnect(self):
+        """체크 미지원 트럭의 소켓 종료는 재접속 유예 후 오프라인"""
+        firmware = self.connections.open(("127.0.0.1", 5001), MagicMock())
+        self.connections.bind("TRUCK_02", firmware)
+        self.connections.close(firmware)
+        self.assertEqual(self.advance(3.0), ["TRUCK_02"])
+        self.assertEqual(self.offline, [("TRUCK_02", REASON_DISCONNECTED)])
+
+    def test_reconnect_requires_new_negotiation(self):
+        self.connections.bind("TRUCK_01", self.connections.open(("127.0.0.1", 5001), MagicMock()))
+        self.assertFalse(self.monitor.probes_enabled("TRUCK_01"))
+
+    def test_defaults_cover_firmware_cadence(self):
+        """기본 무응답 시간은 상태 보고 2~3회 + 적재 대기(delay 10초) 이상"""
+        self.assertGreaterEqual(DEFAULT_IDLE_TIMEOUT, 2 * STATUS_REPORT_INTERVAL + LOAD_DWELL)
+        self.assertEqual(LivenessMonitor(ConnectionRegistry()).idle_timeout, DEFAULT_IDLE_TIMEOUT)
+
+    def test_disconnect_reports_offline_once(self):
+        self.connections.close(self.connection)
+        self.assertEqual(self.offline, [])
+        self.assertEqual(self.advance(3.0), ["TRUCK_01"])
+        self.assertEqual(self.offline, [("TRUCK_01", REASON_DISCONNECTED)])
+        self.assertEqual(self.advance(20.0), [])
+
+    def test_reconnect_within_grace_is_not_offline(self):
+        """순간 끊김 후 유예 시간 안에 재접속하면 오프라인으로 알리지 않고 감시를 이어감"""
+        self.connections.close(self.connection)
+        self.clock.now += 2.0
+        self.connections.bind("TRUCK_01", self.connections.open(("127.0.0.1", 5001), MagicMock()))
+        self.assertEqual(self.advance(2.0), [])
+        for _ in range(5):
+            self.monitor.touch("TRUCK_01")
+            self.advance(4.0)
+        self.assertEqual(self.offline, [])
+        self.assertTrue(self.monitor.is_tracked("TRUCK_01"))
+
+    def test_stop_ignores_shutdown_disconnects(self):
+        self.monitor.stop()
+        self.connections.clear()
+        self.assertEqual(self.offline, [])
+
+
+class TestOfflineFSM(unittest.TestCase):
+    def test_busy_truck_enters_emergency(self):
+        fsm = TruckFSM(command_sender=MagicMock(), mission_manager=MagicMock())
+        context = fsm._get_or_create_context("TRUCK_01")
+        context.state = TruckState.MOVING
+        context.mission_id = "M1"
+        fsm.gate_reservation.request_entry("GATE_A", "TRUCK_02", "CLOCKWISE")
+        fsm.gate_reservation.request_entry("GATE_A", "TRUCK_01", "COUNTERCLOCKWISE")
+
+        self.assertTrue(fsm.handle_truck_offline("TRUCK_01", REASON_TIMEOUT))
+        self.assertEqual(context.state, TruckState.EMERGENCY)
+        self.assertEqual(fsm.gate_reservation.get_status("GATE_A")["waiting"], [])
+        self.assertEqual(fsm.gate_reservation.get_status("GATE_A")["occupants"], ["TRUCK_02"])
+
+    def test_offline_truck_keeps_occupancy_until_reset(self):
+        """구간 안에서 끊긴 트럭의 점유는 유지 - 반대 방향 트럭은 RESET 뒤에 진입"""
+        fsm = TruckFSM(command_sender=MagicMock(), mission_manager=MagicMock())
+        context = fsm._get_or_create_context("TRUCK_01")
+        context.state = TruckState.MOVING
+        context.mission_id = "M1"
+        fsm.gate_reservation.request_entry("GATE_A", "TRUCK_01", "CLOCKWISE")
+        fsm.gate_reservation.request_entry("GATE_A", "TRUCK_02", "COUNTERCLOCKWISE")
+
+        self.assertTrue(fsm.handle_truck_offline("TRUCK_01", REASON_DISCONNECTED))
+        self.assertEqual(fsm.gate_reservation.get_status("GATE_A")["occupants"], ["TRUCK_01"])
+
+        fsm.handle_event("TRUCK_01", "RESET", {})
+        self.assertEqual(fsm.gate_reservation.get_status("GATE_A")["occupants"], ["TRUCK_02"])
+
+    def test_idle_truck_stays_idle(self):
+        fsm = TruckFSM(command_sender=MagicMock())
+        fsm._get_or_create_context("TRUCK_01")
+        self.assertFalse(fsm.handle_truck_offline("TRUCK_01", REASON_DISCONNECTED))
+        self.assertEqual(fsm.contexts["TRUCK_01"].state, TruckState.IDLE)
+
+
+class _App:
+    connections = None
+
+    def __init__(self):
+        self.offline = []
+
+    def handle_message(self, message):
+        pass
+
+    def handle_truck_offline(self, truck_id, reason=None):
+        self.offline.append((truck_id, reason))
+
+    def set_tcp_server(self, server):
+        pass
+
+
+class TestTCPServerLiveness(unittest.TestCase):
+    def test_silent_client_detected_in_seconds(self):
+        app = _App()
+        server = TCPServer(app_controller=app, liveness_idle=0.2, liveness_interval=0.1, liveness_misses=2)
+        server.liveness.start()
+
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        client = socket.create_connection(listener.getsockname())
+        conn, addr = listener.accept()
+        handler = threading.Thread(target=server.handle_client, args=(conn, addr), daemon=True)
+        handler.start()
+        try:
+            # 버전을 보낸 HELLO - 하트비트 체크 협상 (v1 유지)
+            client.sendall(TCPProtocol.build_message("TRUCK_01", "SERVER", "HELLO", {"version": 1}))
+            started = time.monotonic()
+            handler.join(timeout=5.0)
+            self.assertFalse(handler.is_alive())
+            self.assertLess(time.monotonic() - started, 3.0)
+            self.assertEqual(app.offline, [("TRUCK_01", REASON_TIMEOUT)])
+            self.assertFalse(server.connections.is_connected("TRUCK_01"))
+        finally:
+            server.liveness.stop()
+            client.close()
+            listener.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
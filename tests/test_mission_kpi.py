@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# tests/test_mission_kpi.py
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+from backend.analytics.mission_kpi import MissionKPITracker
+from backend.rest_api.routes.analytics_api import analytics_api
+from backend.truck_fsm.truck_fsm import TruckFSM
+from backend.truck_fsm.truck_state import TruckState, MissionPhase
+
+
+class FakeClock:
+    def __init__(self, now=10000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestMissionKPITracker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracker = MissionKPITracker(clock=self.clock)
+
+    def _observe(self, at, state, mission_id, phase):
+        self.clock.now = at
+        self.tracker.observe_truck("TRUCK_01", state, mission_id, phase)
+
+    def _run_mission(self, mission_id, start):
+        """대기 20초 → 적재 이동 30 → 적재 10 → 하역 이동 40 → 하역 15 → 복귀 25"""
+        self.tracker.on_mission_created(mission_id, start)
+        self.tracker.on_mission_assigned(mission_id, "TRUCK_01", start + 20)
+        self._observe(start + 20, TruckState.ASSIGNED, mission_id, MissionPhase.TO_LOADING)
+        self._observe(start + 50, TruckState.WAITING, mission_id, MissionPhase.AT_LOADING)
+        self._observe(start + 60, TruckState.MOVING, mission_id, MissionPhase.TO_UNLOADING)
+        self._observe(start + 100, TruckState.WAITING, mission_id, MissionPhase.AT_UNLOADING)
+        self._observe(start + 115, TruckState.MOVING, mission_id, MissionPhase.RETURNING)
+        self._observe(start + 140, TruckState.IDLE, None, MissionPhase.COMPLETED)
+
+    def test_phase_durations(self):
+        """미션 단계별 소요 시간과 사이클 타임 계산"""
+        self._run_mission("MISSION_001", 10000)
+        record = self.tracker.get_recent_missions()[0]
+        self.assertEqual(record["phases"], {
+            "queue_wait": 20.0, "to_loading": 30.0, "loading": 10.0,
+            "to_unloading": 40.0, "unloading": 15.0, "return": 25.0
+        })
+        self.assertEqual(record["cycle_time"], 120.0)
+
+    def test_summary_window_and_bottleneck(self):
+        """조회 구간 밖의 미션 제외 및 병목 단계 판정"""
+        self._run_mission("MISSION_001", 10000)
+        self._run_mission("MISSION_002", 20000)
+        summary = self.tracker.get_summary(window_seconds=600)
+        self.assertEqual(summary["missions"]["completed"], 1)
+        self.assertEqual(summary["bottleneck"]["phase"], "to_unloading")
+        self.assertEqual(self.tracker.get_summary(window_seconds=3 * 3600)["missions"]["completed"], 2)
+
+    def test_truck_utilization(self):
+        """작업 / 대기 시간 비율"""
+        self._observe(10000, TruckState.IDLE, None, MissionPhase.NONE)
+        self._observe(10100, TruckState.MOVING, "MISSION_001", MissionPhase.TO_LOADING)
+        self.clock.now = 10400
+        ratios = self.tracker.get_summary(window_seconds=400)["trucks"]["TRUCK_01"]
+        self.assertEqual(ratios, {"idle": 0.25, "busy": 0.75})
+
+    def test_facility_busy_ratio(self):
+        self.tracker.set_facility_busy("BELT", False, now=10000)
+        self.tracker.set_facility_busy("BELT", True, now=10060)
+        self.tracker.set_facility_busy("BELT", False, now=10090)
+        self.clock.now = 10120
+        self.assertEqual(self.tracker.get_summary(window_seconds=120)["facilities"]["BELT"], 0.25)
+
+    def test_cancelled_mission_not_counted(self):
+        self.tracker.on_mission_created("MISSION_009", 10000)
+        self.tracker.on_mission_assigned("MISSION_009", "TRUCK_01", 10005)
+        self._observe(10005, TruckState.ASSIGNED, "MISSION_009", MissionPhase.TO_LOADING)
+        self.tracker.on_mission_cancelled("MISSION_009")
+        self._observe(10050, TruckState.IDLE, None, MissionPhase.NONE)
+        self.assertEqual(self.tracker.get_recent_missions(), [])
+
+    def test_recent_missions_limit(self):
+        """limit 은 최근 N건 - 0 / 음수는 ValueError, API 는 400"""
+        for index in range(3):
+            self._run_mission(f"MISSION_10{index}", 10000 + index * 200)
+        self.assertEqual([r["mission_id"] for r in self.tracker.get_recent_missions(2)], ["MISSION_102", "MISSION_101"])
+        for limit in (0, -1):
+            with self.assertRaises(ValueError):
+                self.tracker.get_recent_missions(limit)
+
+        app = Flask("kpi_test")
+        app.register_blueprint(analytics_api, url_prefix="/api")
+        client = app.test_client()
+        self.assertEqual(client.get("/api/analytics/missions?limit=0").status_code, 400)
+        self.assertEqual(client.get("/api/analytics/missions?limit=-5").status_code, 400)
+        self.assertEqual(client.get("/api/analytics/missions?limit=1").status_code, 200)
+        # 공백뿐인 window 는 기본 구간 (500 아님)
+        self.assertEqual(client.get("/api/analytics/kpi?window=%20").status_code, 200)
+
+
+class TestFSMKPIHooks(unittest.TestCase):
+    def test_fsm_reports_context_and_belt(self):
+        """FSM 이벤트 처리 후 컨텍스트 관측 및 벨트 점유 기록"""
+        tracker = MissionKPITracker()
+        fsm = TruckFSM(command_sender=MagicMock(), kpi_tracker=tracker)
+        context = fsm._get_or_create_context("TRUCK_01")
+        context.state = TruckState.WAITING
+        context.mission_id = "MISSION_001"
+        context.mission_phase = MissionPhase.AT_UNLOADING
+        fsm.record_context("TRUCK_01")
+        fsm._start_unloading(context, {})
+
+        self.assertEqual(tracker.active["TRUCK_01"]["mission_id"], "MISSION_001")
+        self.assertEqual(tracker.facilities["BELT"].current[0], "busy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# tests/test_protocol_v2.py
+
+import sys
+import os
+import socket
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.tcpio.protocol import TCPProtocol
+from backend.tcpio.connection_registry import ConnectionRegistry, SeqWindow
+from backend.tcpio.retransmit_queue import RetransmitQueue
+from backend.tcpio.truck_command_sender import TruckCommandSender
+from backend.tcpio.tcp_server import TCPServer
+from backend.tcpio.client import TCPClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameFormat(unittest.TestCase):
+    def test_v1_frame_unchanged(self):
+        raw = TCPProtocol.build_message("SERVER", "TRUCK_01", "RUN", {})
+        self.assertEqual(raw, bytes([0x10, 0x01, TCPProtocol.CMD_RUN, 0]))
+        self.assertNotIn("seq", TCPProtocol.parse_message(raw))
+
+    def test_v2_round_trip(self):
+        raw = TCPProtocol.build_message("TRUCK_01", "SERVER", "ARRIVED", {"position": "CHECKPOINT_A"},
+                                        seq=0x1234, flags=TCPProtocol.FLAG_ACK_REQUEST)
+        self.assertEqual(len(raw), 4 + TCPProtocol.extension_length(raw, TCPProtocol.PROTOCOL_V2) + raw[3])
+        message = TCPProtocol.parse_message(raw, TCPProtocol.PROTOCOL_V2)
+        self.assertEqual(message["seq"], 0x1234)
+        self.assertEqual(message["flags"], TCPProtocol.FLAG_ACK_REQUEST)
+        self.assertEqual(message["payload"], {"position": "CHECKPOINT_A"})
+
+        ack = TCPProtocol.parse_message(TCPProtocol.build_ack("SERVER", "TRUCK_01", 0x1234), TCPProtocol.PROTOCOL_V2)
+        self.assertEqual((ack["cmd"], ack["seq"], ack["flags"]), ("ACK", 0x1234, TCPProtocol.FLAG_ACK))
+
+    def test_hello_carries_version(self):
+        raw = TCPProtocol.build_message("TRUCK_01", "SERVER", "HELLO", {"version": 2})
+        self.assertEqual(TCPProtocol.parse_message(raw)["payload"], {"version": 2})
+        self.assertEqual(TCPProtocol.parse_message(TCPProtocol.build_message("TRUCK_01", "SERVER", "HELLO", {}))["payload"], {})
+
+    def test_seq_window(self):
+        window = SeqWindow(size=2)
+        self.assertFalse(window.is_duplicate(1))
+        self.assertTrue(window.is_duplicate(1))
+        window.is_duplicate(2)
+        window.is_duplicate(3)
+        self.assertFalse(window.is_duplicate(1))  # 창 밖으로 밀려남
+
+
+class TestRetransmitQueue(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.connections = ConnectionRegistry()
+        self.queue = RetransmitQueue(self.connections, ack_timeout=0.5, max_retries=2, clock=self.clock)
+        self.queue._running = True  # 스레드 없이 poll() 로 진행
+        self.connection = self.connections.open(("127.0.0.1", 5000), MagicMock())
+        self.connections.bind("TRUCK_01", self.connection)
+        self.failed = []
+        self.queue.add_listener(lambda truck_id, cmd, seq: self.failed.append((truck_id, cmd, seq)))
+
+    def test_resend_until_ack(self):
+        self.queue.track(self.connection, "TRUCK_01", 7, "RUN", b"frame")
+        self.clock.now = 0.5
+        self.assertEqual(self.queue.poll(), 1)
+        self.connection.sock.sendall.assert_called_once_with(b"frame")
+        self.assertTrue(self.queue.ack(self.connection, 7))
+        self.clock.now = 5.0
+        self.assertEqual(self.queue.poll(), 0)
+        self.assertEqual(self.failed, [])
+
+    def test_give_up_after_max_retries(self):
+        self.queue.track(self.connection, "TRUCK_01", 7, "RUN", b"frame")
+        for step in range(1, 4):
+            self.clock.now = 0.5 * step
+            self.queue.poll()
+        self.assertEqual(self.connection.sock.sendall.call_count, 2)
+        self.assertEqual(self.failed, [("TRUCK_01", "RUN", 7)])
+        self.assertEqual(self.queue.pending_count(), 0)
+
+    def test_disconnect_drops_pending(self):
+        self.queue.track(self.connection, "TRUCK_01", 7, "RUN", b"frame")
+        self.connections.close(self.connection)
+        self.assertEqual(self.queue.pending_count(), 0)
+
+
+class TestCommandSenderV2(unittest.TestCase):
+    def setUp(self):
+        self.connections = ConnectionRegistry()
+        self.sender = TruckCommandSender(self.connections)
+        self.connection = self.connections.open(("127.0.0.1", 5000), MagicMock())
+        self.connections.bind("TRUCK_01", self.connection)
+
+    def tearDown(self):
+        self.sender.retransmit.stop()
+
+    def test_v1_truck_gets_plain_frames(self):
+        self.assertTrue(self.sender.send("TRUCK_01", "STOP"))
+        self.assertEqual(self.connection.sock.sendall.call_args[0][0], bytes([0x10, 0x01, TCPProtocol.CMD_STOP, 0]))
+        self.assertEqual(self.sender.retransmit.pending_count(), 0)
+        self.assertFalse(self.sender.settle("TRUCK_01", 0.0))
+
+    def test_v2_truck_gets_sequenced_frames(self):
+        self.connection.version = TCPProtocol.PROTOCOL_V2
+        self.sender.send("TRUCK_01", "STOP")
+        self.sender.send("TRUCK_01", "RUN", {})
+        frames = [TCPProtocol.parse_message(call[0][0], TCPProtocol.PROTOCOL_V2)
+                  for call in self.connection.sock.sendall.call_args_list]
+        self.assertEqual([f["seq"] for f in frames], [1, 2])
+        self.assertTrue(all(f["flags"] & TCPProtocol.FLAG_ACK_REQUEST for f in frames))
+        self.assertEqual(self.sender.retransmit.pending_count("TRUCK_01"), 2)
+
+        self.sender.handle_ack(self.connection, 1)
+        self.sender.handle_ack(self.connection, 2)
+        self.assertEqual(self.sender.retransmit.pending_count(), 0)
+        self.assertTrue(self.sender.settle("TRUCK_01", 10.0))  # 대기 없이 반환
+
+
+class _App:
+    def __init__(self):
+        self.connections = ConnectionRegistry()
+        self.command_sender = TruckCommandSender(self.connections)
+        self.messages = []
+
+    def handle_message(self, message):
+        self.messages.append(message)
+
+    def set_tcp_server(self, server):
+        pass
+
+
+class TestNegotiation(unittest.TestCase):
+    def setUp(self):
+        self.app = _App()
+        self.server = TCPServer(app_controller=self.app)
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(1)
+        self.client = TCPClient(*self.listener.getsockname())
+        self.client.connect()
+        conn, addr = self.listener.accept()
+        threading.Thread(target=self.server.handle_client, args=(conn, addr), daemon=True).start()
+
+    def tearDown(self):
+        self.app.command_sender.retransmit.stop()
+        self.client.close()
+        self.listener.close()
+
+    def wait_for(self, predicate, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and not predicate():
+            time.sleep(0.01)
+        return predicate()
+
+    def test_v1_truck_stays_v1(self):
+        self.client.send_command("TRUCK_01", "SERVER", "HELLO", {})
+        reply = self.client.read_response()
+        self.assertEqual(reply["cmd"], "HEARTBEAT_ACK")
+        self.assertEqual(reply["payload"], {})
+        self.assertEqual(self.app.connections.get("TRUCK_01").version, TCPProtocol.PROTOCOL_V1)
+
+    def test_v2_duplicates_and_acks(self):
+        self.assertEqual(self.client.negotiate("TRUCK_01"), TCPProtocol.PROTOCOL_V2)
+
+        # 트럭 → 서버: 같은 seq 로 재전송해도 한 번만 처리, ACK 는 매번
+        for _ in range(2):
+            self.client.send_command("TRUCK_01", "SERVER", "ARRIVED", {"position": "CHECKPOINT_A"}, seq=5)
+            ack = self.client.read_response()
+            self.assertEqual((ack["cmd"], ack["seq"]), ("ACK", 5))
+        self.assertTrue(self.wait_for(lambda: len(self.app.messages) == 1))
+
+        # 서버 → 트럭: ACK 가 오면 재전송 목록에서 빠짐
+        self.assertTrue(self.app.command_sender.send("TRUCK_01", "RUN", {}))
+        command = self.client.read_response()
+        self.assertEqual(command["cmd"], "RUN")
+        self.assertFalse(command["duplicate"])
+        self.assertTrue(self.wait_for(lambda: self.app.command_sender.retransmit.pending_count() == 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# tests/test_response_cache.py
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask, jsonify
+
+from backend.cache.state_versions import get_state_versions, DOMAIN_MISSIONS
+from backend.rest_api import managers
+from backend.rest_api import response_cache
+from backend.rest_api.response_cache import ResponseCache, cached_response
+from backend.facility_status.facility_status_manager import FacilityStatusManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.versions = get_state_versions()
+        response_cache._response_cache = ResponseCache(self.versions, clock=self.clock)
+        managers.register_services(main_controller=MagicMock())
+        self.calls = 0
+
+        app = Flask("cache_test")
+
+        @app.route("/missions")
+        @cached_response(DOMAIN_MISSIONS)
+        def missions():
+            self.calls += 1
+            return jsonify({"calls": self.calls})
+
+        @app.route("/status")
+        @cached_response(ttl=1.0)
+        def status():
+            self.calls += 1
+            return jsonify({"calls": self.calls})
+
+        self.client = app.test_client()
+
+    def tearDown(self):
+        managers.clear_services()
+        response_cache._response_cache = None
+
+    def test_computed_once_per_version(self):
+        """버전이 같으면 뷰를 다시 실행하지 않음"""
+        for _ in range(5):
+            self.assertEqual(self.client.get("/missions").get_json(), {"calls": 1})
+        self.versions.bump(DOMAIN_MISSIONS)
+        self.assertEqual(self.client.get("/missions").get_json(), {"calls": 2})
+
+    def test_etag_not_modified(self):
+        first = self.client.get("/missions")
+        etag = first.headers["ETag"]
+        second = self.client.get("/missions", headers={"If-None-Match": etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.get_data(), b"")
+
+    def test_ttl_expiry(self):
+        self.client.get("/status")
+        self.clock.now += 0.5
+        self.assertEqual(self.client.get("/status").get_json(), {"calls": 1})
+        self.clock.now += 1.0
+        self.assertEqual(self.client.get("/status").get_json(), {"calls": 2})
+
+    def test_standalone_uses_short_ttl(self):
+        """MainController 가 없으면 버전이 같아도 짧은 TTL 후 재계산"""
+        managers.clear_services()
+        self.client.get("/missions")
+        self.clock.now += response_cache.STANDALONE_TTL + 0.1
+        self.assertEqual(self.client.get("/missions").get_json(), {"calls": 2})
+
+    def test_manager_bumps_version(self):
+        before = self.versions.get("facilities")
+        FacilityStatusManager(MagicMock()).update_gate_status("GATE_A", "OPENED", "OPEN")
+        self.assertEqual(self.versions.get("facilities"), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# tests/test_server_launcher.py
+
+import sys
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.launcher.server_launcher import ServerLauncher
+from backend.launcher.startup_timer import StartupTimer
+from backend.tcpio.protocol import TCPProtocol
+
+DB_DELAY = 0.3
+
+
+class _StubDB:
+    """DB 객체 대역 - 모든 메서드가 빈 목록 반환"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: []
+
+
+class _TestLauncher(ServerLauncher):
+    def _open_mission_db(self):
+        time.sleep(DB_DELAY)
+        return _StubDB()
+
+    def _open_truck_status_db(self):
+        time.sleep(DB_DELAY)
+        return _StubDB()
+
+    def _open_facility_status_db(self):
+        time.sleep(DB_DELAY)
+        return _StubDB()
+
+
+class TestStartupTimer(unittest.TestCase):
+    def test_phases_and_marks(self):
+        now = [0.0]
+        timer = StartupTimer(clock=lambda: now[0])
+        with timer.phase("listen"):
+            now[0] = 0.01
+        timer.mark("listening")
+        now[0] = 0.5
+        self.assertEqual(timer.run("db", lambda: "ok"), "ok")
+
+        report = timer.report()
+        self.assertEqual(report["total"], 0.5)
+        self.assertEqual(report["phases"]["listen"], {"start": 0.0, "duration": 0.01})
+        self.assertEqual(report["phases"]["db"], {"start": 0.5, "duration": 0.0})
+        self.assertEqual(report["marks"], {"listening": 0.01})
+
+
+class TestServerLauncher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.launcher = _TestLauncher(
+            host="127.0.0.1", port=0, port_map={"GATE_A": "FAKE_GATE", "BELT": "FAKE_BELT"},
+            use_fake=True, journal_dir=self.tmp.name, retention_interval=None, rest_port=None
+        )
+
+    def tearDown(self):
+        self.launcher.shutdown()
+        self.tmp.cleanup()
+
+    def test_listener_first_and_parallel_init(self):
+        started = threading.Thread(target=self.launcher.start, daemon=True)
+        started.start()
+        deadline = time.monotonic() + 5.0
+        while self.launcher.listener is None and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+        # 초기화가 끝나기 전에 연결 - 커널 backlog 에서 대기하다 accept 루프가 돌면 바로 처리
+        client = socket.create_connection(("127.0.0.1", self.launcher.port), timeout=5.0)
+        self.addCleanup(client.close)
+        connected_at = self.launcher.timer.elapsed()
+        client.sendall(TCPProtocol.build_message("TRUCK_01", "SERVER", "HELLO", {}))
+        reply = TCPProtocol.parse_message(client.recv(64))
+        started.join(timeout=5.0)
+
+        self.assertEqual(reply["cmd"], "HEARTBEAT_ACK")
+        report = self.launcher.timer.report()
+        self.assertLess(connected_at, report["marks"]["tcp_accepting"])
+        # DB 3개 (각 0.3초) 가 동시에 열리므로 합계보다 훨씬 짧음
+        self.assertLess(report["marks"]["tcp_accepting"], DB_DELAY * 2)
+        self.assertLess(report["marks"]["tcp_accepting"], 1.0)
+        for phase in ("tcp_listen", "mission_db", "truck_status_db", "facility_status_db",
+                      "serial_ports", "journal_recover", "main_controller", "tcp_accept"):
+            self.assertIn(phase, report["phases"])
+        gate = self.launcher.main_controller.device_manager.get_controller("GATE_A")
+        self.assertIs(gate.facility_status_manager, self.launcher.facility_status_manager)
+
+    def test_serve_rest_requires_rest_port(self):
+        with self.assertRaises(RuntimeError):
+            self.launcher.serve_rest()
+        with self.assertRaises(RuntimeError):
+            self.launcher.start_rest()
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_launcher_import_is_light(self):
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        code = ("import sys, backend.launcher, backend.tcpio.listener; "
+                "print(any(m in sys.modules for m in ('flask', 'mysql.connector', 'serial', "
+                "'backend.main_controller.main_controller')))")
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, timeout=60)
+        self.assertEqual(output.stdout.strip(), "False", output.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
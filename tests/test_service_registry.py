@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# tests/test_service_registry.py
+
+import importlib
+import sys
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.rest_api import managers
+from backend.rest_api.app import flask_server
+from backend.truck_status.truck_status_manager import TruckStatusManager
+from backend.facility_status.facility_status_manager import FacilityStatusManager
+
+# routes 패키지가 같은 이름의 블루프린트를 export 하므로 모듈을 직접 가져옴
+facility_routes = importlib.import_module("backend.rest_api.routes.facility_api")
+
+
+class TestServiceRegistry(unittest.TestCase):
+    def setUp(self):
+        self.main_controller = MagicMock()
+        self.main_controller.truck_status_manager.get_all_trucks.return_value = {"TRUCK_01": {"fsm_state": "IDLE"}}
+        self.gate_controller = MagicMock()
+        self.gate_controller.open_gate.return_value = True
+        self.main_controller.device_manager.get_controller.side_effect = (
+            lambda device_id: self.gate_controller if device_id == "GATE_A" else None
+        )
+        managers.register_main_controller(self.main_controller)
+        self.client = flask_server.test_client()
+
+    def tearDown(self):
+        managers.clear_services()
+        facility_routes.device_manager = None
+        facility_routes.gate_controllers = {}
+
+    def test_rest_uses_registered_managers(self):
+        """REST API 가 MainController 의 매니저 인스턴스를 그대로 사용"""
+        self.assertIs(managers.get_truck_status_manager(), self.main_controller.truck_status_manager)
+        self.assertIs(managers.get_mission_manager(), self.main_controller.mission_manager)
+        self.assertIs(managers.get_facility_status_manager(), self.main_controller.facility_status_manager)
+
+        response = self.client.get("/api/trucks")
+        self.assertEqual(response.status_code, 200)
+        self.main_controller.truck_status_manager.get_all_trucks.assert_called_once()
+
+    def test_facility_control_uses_shared_device_manager(self):
+        """시설 제어 API 가 별도 DeviceManager 를 만들지 않음"""
+        response = self.client.post("/api/facilities/gates/GATE_A/control", json={"command": "open"})
+        self.assertEqual(response.status_code, 200)
+        self.gate_controller.open_gate.assert_called_once_with("GATE_A")
+        self.assertIs(facility_routes.device_manager, self.main_controller.device_manager)
+
+
+class TestServeFromMemory(unittest.TestCase):
+    def test_truck_status_from_memory(self):
+        db = MagicMock()
+        manager = TruckStatusManager(db, serve_from_memory=True)
+        manager.update_battery("TRUCK_01", 80, False)
+        status = manager.get_truck_status("TRUCK_01")
+        self.assertEqual(status["battery"]["level"], 80)
+        db.get_latest_battery_status.assert_not_called()
+        self.assertIn("TRUCK_01", manager.get_all_trucks())
+        db.get_latest_position_status.assert_not_called()
+
+    def test_facility_status_from_memory(self):
+        db = MagicMock()
+        manager = FacilityStatusManager(db, serve_from_memory=True)
+        manager.update_gate_status("GATE_A", "OPENED", "OPEN")
+        self.assertEqual(manager.get_gate_status("GATE_A")["state"], "OPENED")
+        db.get_latest_gate_status.assert_not_called()
+
+    def test_getters_return_copies(self):
+        """REST 스레드가 응답을 바꿔도 메모리 상태는 그대로"""
+        trucks = TruckStatusManager(MagicMock(), serve_from_memory=True)
+        trucks.update_battery("TRUCK_01", 80, False)
+        status = trucks.get_truck_status("TRUCK_01")
+        status["battery"]["level"] = 0
+        trucks.get_all_trucks()["TRUCK_01"]["battery"]["level"] = 0
+        self.assertEqual(trucks.get_truck_status("TRUCK_01")["battery"]["level"], 80)
+
+        facilities = FacilityStatusManager(MagicMock(), serve_from_memory=True)
+        facilities.update_gate_status("GATE_A", "OPENED", "OPEN")
+        facilities.get_gate_status("GATE_A")["state"] = "CLOSED"
+        facilities.get_all_facilities()["GATE_A"]["state"] = "CLOSED"
+        self.assertEqual(facilities.get_gate_status("GATE_A")["state"], "OPENED")
+
+    def test_snapshot_while_tcp_thread_inserts(self):
+        """TCP 스레드가 새 트럭 / obstacle 키를 추가하는 중에도 스냅샷이 기본값으로 떨어지지 않음"""
+        trucks = TruckStatusManager(MagicMock(), serve_from_memory=True, fleet=MagicMock(truck_ids=lambda: []))
+        done = threading.Event()
+
+        def writer():
+            for i in range(2000):
+                trucks.apply_telemetry(f"TRUCK_{i:04d}", [{"position": "CHECKPOINT_A", "obstacle_detected": True}])
+            done.set()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        seen = 0
+        while not done.is_set():
+            snapshot = trucks.get_all_trucks()
+            self.assertGreaterEqual(len(snapshot), seen)
+            seen = len(snapshot)
+        thread.join()
+        self.assertEqual(len(trucks.get_all_trucks()), 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# tests/test_state_journal.py
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.analytics.mission_kpi import MissionKPITracker
+from backend.journal.state_journal import StateJournal, JOURNAL_FILE, context_from_record, context_to_record
+from backend.mission.mission import Mission
+from backend.mission.mission_manager import MissionManager
+from backend.truck_fsm.truck_fsm import TruckFSM
+from backend.truck_fsm.truck_state import TruckState, MissionPhase
+
+
+class TestStateJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _fsm(self, journal):
+        fsm = TruckFSM(command_sender=MagicMock())
+        fsm.set_journal(journal)
+        return fsm
+
+    def test_recover_truck_and_facility(self):
+        """저널 재생으로 트럭 컨텍스트와 시설 상태 복원"""
+        journal = StateJournal(self.directory)
+        journal.recover()
+        fsm = self._fsm(journal)
+        context = fsm._get_or_create_context("TRUCK_01")
+        context.mission_id = "MISSION_001"
+        context.mission_phase = MissionPhase.TO_LOADING
+        context.loading_target = "LOAD_B"
+        fsm.handle_event("TRUCK_01", "START_MOVING")
+        journal.record_facility("GATE", "GATE_A", {"state": "OPENED", "operation": "OPEN"})
+        journal.close()
+
+        state = StateJournal(self.directory).recover()
+        restored = context_from_record(state["trucks"]["TRUCK_01"])
+        self.assertEqual(restored.state, context.state)
+        self.assertEqual(restored.mission_id, "MISSION_001")
+        self.assertEqual(restored.loading_target, "LOAD_B")
+        self.assertEqual(state["facilities"]["GATE_A"]["state"], "OPENED")
+
+    def test_unchanged_context_not_rebuilt(self):
+        """상태가 같으면 snapshot 튜플 비교만 하고 레코드를 다시 만들지 않음"""
+        journal = StateJournal(self.directory)
+        journal.recover()
+        context = self._fsm(journal)._get_or_create_context("TRUCK_01")
+        journal.record_truck(context)
+        records = journal.records_since_snapshot
+
+        with patch("backend.journal.state_journal.context_to_record", side_effect=context_to_record) as build:
+            context.touch()  # last_update_time 만 바뀜
+            journal.record_truck(context)
+            build.assert_not_called()
+            context.position = "CHECKPOINT_A"
+            journal.record_truck(context)
+            build.assert_called_once()
+        self.assertEqual(journal.records_since_snapshot, records + 1)
+        journal.close()
+
+    def test_snapshot_compacts_journal(self):
+        """스냅샷 후 저널은 비워지고 상태는 유지"""
+        journal = StateJournal(self.directory, snapshot_interval=3)
+        journal.recover()
+        for level in range(10):
+            journal.record_facility("BELT", "BELT", {"state": "RUNNING", "operation": str(level)})
+        journal.close()
+
+        self.assertLess(os.path.getsize(os.path.join(self.directory, JOURNAL_FILE)), 200)
+        state = StateJournal(self.directory).recover()
+        self.assertEqual(state["facilities"]["BELT"]["operation"], "9")
+
+    def test_torn_tail_truncated(self):
+        """쓰기 중 잘린 마지막 레코드는 버리고 이어서 기록"""
+        journal = StateJournal(self.directory)
+        journal.recover()
+        journal.record_facility("GATE", "GATE_A", {"state": "CLOSED", "operation": "CLOSE"})
+        journal.record_facility("GATE", "GATE_A", {"state": "OPENED", "operation": "OPEN"})
+        journal.close()
+
+        path = os.path.join(self.directory, JOURNAL_FILE)
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 5)
+
+        journal = StateJournal(self.directory)
+        state = journal.recover()
+        self.assertEqual(state["facilities"]["GATE_A"]["state"], "CLOSED")
+
+        journal.record_facility("GATE", "GATE_B", {"state": "OPENED", "operation": "OPEN"})
+        journal.close()
+        state = StateJournal(self.directory).recover()
+        self.assertEqual(sorted(state["facilities"]), ["GATE_A", "GATE_B"])
+
+    def test_restore_contexts_into_fsm(self):
+        """복구한 컨텍스트로 FSM 상태와 설비 예약 재구성"""
+        journal = StateJournal(self.directory)
+        journal.recover()
+        fsm = self._fsm(journal)
+        context = fsm._get_or_create_context("TRUCK_02")
+        context.state = TruckState.MOVING
+        context.mission_id = "MISSION_002"
+        context.mission_phase = MissionPhase.TO_LOADING
+        context.loading_target = "LOAD_A"
+        fsm.record_context("TRUCK_02")
+        journal.close()
+
+        state = StateJournal(self.directory).recover()
+        new_fsm = TruckFSM(command_sender=MagicMock())
+        new_fsm.restore_contexts({tid: context_from_record(r) for tid, r in state["trucks"].items()})
+        self.assertEqual(new_fsm.contexts["TRUCK_02"].state, TruckState.MOVING)
+        self.assertEqual(new_fsm.station_scheduler.get_status()["DISPENSER"]["queue"][0]["truck_id"], "TRUCK_02")
+
+
+    def test_restore_missions(self):
+        """저널의 미션 상태로 KPI 진행 중 미션 재등록, 끝난 미션을 가리키는 트럭 미션 해제"""
+        journal = StateJournal(self.directory)
+        journal.recover()
+        created = datetime(2025, 1, 1, 9, 0, 0)
+        assigned = Mission("MISSION_010", "SAND", 1.0, "LOAD_A", "BELT", timestamp_created=created)
+        assigned.assign_to_truck("TRUCK_01")
+        finished = Mission("MISSION_011", "SAND", 1.0, "LOAD_B", "BELT")
+        finished.assign_to_truck("TRUCK_02")
+        journal.record_mission(assigned)
+        journal.record_mission(finished)
+        finished.cancel()
+        journal.record_mission(finished)
+        journal.close()
+
+        state = StateJournal(self.directory).recover()
+        contexts = {truck_id: context_from_record(_context_record(truck_id, mission_id))
+                    for truck_id, mission_id in (("TRUCK_01", "MISSION_010"), ("TRUCK_02", "MISSION_011"))}
+        manager = MissionManager(MagicMock())
+        manager.kpi_tracker = MissionKPITracker()
+        self.assertEqual(manager.restore_from_journal(state["missions"], contexts), 1)
+
+        self.assertEqual(contexts["TRUCK_01"].mission_id, "MISSION_010")
+        self.assertIsNone(contexts["TRUCK_02"].mission_id)
+        self.assertEqual(contexts["TRUCK_02"].mission_phase, MissionPhase.NONE)
+        self.assertEqual(contexts["TRUCK_02"].state, TruckState.IDLE)
+        self.assertEqual(contexts["TRUCK_01"].state, TruckState.MOVING)
+        pending = manager.kpi_tracker.pending["MISSION_010"]
+        self.assertEqual(pending["truck_id"], "TRUCK_01")
+        self.assertEqual(pending["created_at"], created.timestamp())
+
+    def test_restore_clears_completed_mission_state(self):
+        """완료된 미션을 가리키던 트럭은 재시작 후 미션 없는 작업 상태로 남지 않음"""
+        journal = StateJournal(self.directory)
+        journal.recover()
+        done = Mission("MISSION_020", "SAND", 1.0, "LOAD_A", "BELT")
+        done.assign_to_truck("TRUCK_01")
+        journal.record_mission(done)
+        done.complete()
+        journal.record_mission(done)
+        journal.close()
+
+        state = StateJournal(self.directory).recover()
+        context = context_from_record(_context_record("TRUCK_01", "MISSION_020"))
+        context.target_position = "LOAD_A"
+        manager = MissionManager(MagicMock())
+        manager.kpi_tracker = MissionKPITracker()
+        self.assertEqual(manager.restore_from_journal(state["missions"], {"TRUCK_01": context}), 0)
+
+        self.assertIsNone(context.mission_id)
+        self.assertEqual(context.mission_phase, MissionPhase.NONE)
+        self.assertEqual(context.state, TruckState.IDLE)
+        self.assertIsNone(context.target_position)
+
+
+def _context_record(truck_id, mission_id):
+    fsm = TruckFSM(command_sender=MagicMock())
+    context = fsm._get_or_create_context(truck_id)
+    context.state = TruckState.MOVING
+    context.mission_id = mission_id
+    context.mission_phase = MissionPhase.TO_LOADING
+    return context_to_record(context)
+
+
+if __name__ == "__main__":
+    unittest.main()
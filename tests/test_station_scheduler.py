@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# tests/test_station_scheduler.py
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.track.track_topology import TrackTopology, CLOCKWISE
+from backend.track.station_scheduler import StationScheduler, RESOURCE_DISPENSER, RESOURCE_BELT
+from backend.truck_fsm.truck_fsm import TruckFSM
+
+
+def make_dispenser():
+    dispenser = MagicMock()
+    dispenser.dispenser_position = {"DISPENSER": "ROUTE_A"}
+
+    def move_to_route(dispenser_id, route):
+        dispenser.dispenser_position[dispenser_id] = route
+        return True
+
+    dispenser.move_to_route.side_effect = move_to_route
+    dispenser.send_command.return_value = True
+    return dispenser
+
+
+class TestStationScheduler(unittest.TestCase):
+    def setUp(self):
+        self.dispenser = make_dispenser()
+        self.scheduler = StationScheduler(TrackTopology.default(), self.dispenser)
+
+    def test_single_holder(self):
+        """디스펜서는 한 번에 한 트럭만 점유"""
+        self.scheduler.reserve_mission("TRUCK_01", "LOAD_A", "STANDBY", CLOCKWISE)
+        self.scheduler.reserve_mission("TRUCK_02", "LOAD_B", "STANDBY", CLOCKWISE)
+        self.assertTrue(self.scheduler.acquire(RESOURCE_DISPENSER, "TRUCK_01"))
+        self.assertFalse(self.scheduler.acquire(RESOURCE_DISPENSER, "TRUCK_02"))
+        self.assertTrue(self.scheduler.acquire(RESOURCE_BELT, "TRUCK_02"))
+
+    def test_preposition_on_release(self):
+        """앞 트럭 해제 시 다음 트럭 적재 위치로 사전 이동"""
+        self.scheduler.reserve_mission("TRUCK_01", "LOAD_A", "STANDBY", CLOCKWISE)
+        self.scheduler.reserve_mission("TRUCK_02", "LOAD_B", "CHECKPOINT_A", CLOCKWISE)
+        self.scheduler.acquire(RESOURCE_DISPENSER, "TRUCK_01")
+
+        next_reservation = self.scheduler.release(RESOURCE_DISPENSER, "TRUCK_01")
+        self.scheduler.wait_for_preposition()
+        self.assertEqual(next_reservation.truck_id, "TRUCK_02")
+        self.assertFalse(next_reservation.arrived)
+        self.dispenser.move_to_route.assert_called_once_with("DISPENSER", "ROUTE_B")
+
+    def test_arrived_truck_first(self):
+        """도착한 트럭이 예상 도착 시간보다 우선"""
+        self.scheduler.reserve("DISPENSER", "TRUCK_01", "LOAD_A", 5.0)
+        self.scheduler.reserve("DISPENSER", "TRUCK_02", "LOAD_A", 30.0)
+        self.scheduler.update_position("TRUCK_02", "LOAD_A", CLOCKWISE)
+        queue = self.scheduler.get_status()[RESOURCE_DISPENSER]["queue"]
+        self.assertEqual([r["truck_id"] for r in queue], ["TRUCK_02", "TRUCK_01"])
+
+
+class TestFSMPipelinedLoading(unittest.TestCase):
+    def test_waiting_truck_starts_after_release(self):
+        """대기 트럭은 앞 트럭 적재 완료 후 사전 이동된 디스펜서로 바로 적재 시작"""
+        dispenser = make_dispenser()
+        fsm = TruckFSM(command_sender=MagicMock(), dispenser_controller=dispenser)
+        fsm.station_scheduler.reserve_mission("TRUCK_01", "LOAD_A", "STANDBY", CLOCKWISE)
+        fsm.station_scheduler.reserve_mission("TRUCK_02", "LOAD_B", "STANDBY", CLOCKWISE)
+
+        self.assertTrue(fsm.begin_loading("TRUCK_01", "LOAD_A"))
+        fsm.station_scheduler.update_position("TRUCK_02", "LOAD_B", CLOCKWISE)
+        self.assertFalse(fsm.begin_loading("TRUCK_02", "LOAD_B"))
+
+        fsm.release_dispenser("TRUCK_01")
+        self.assertEqual(fsm.station_scheduler.holder(RESOURCE_DISPENSER), "TRUCK_02")
+        self.assertEqual(dispenser.current_truck_id, "TRUCK_02")
+        self.assertEqual(dispenser.dispenser_position["DISPENSER"], "ROUTE_B")
+        self.assertEqual(dispenser.send_command.call_args_list[-1].args, ("DISPENSER", "OPEN"))
+
+
+if __name__ == "__main__":
+    unittest.main()
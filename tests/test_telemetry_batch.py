@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# tests/test_telemetry_batch.py
+
+import sys
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, call
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.cache.state_versions import DOMAIN_TRUCKS
+from backend.tcpio.protocol import TCPProtocol
+from backend.truck_status.truck_status_manager import TruckStatusManager
+from backend.truck_fsm.truck_controller import TruckController
+from backend.truck_fsm.truck_fsm import TruckFSM
+from backend.truck_fsm.truck_state import TruckState
+
+
+def make_records(count, start_ms=1000, step_ms=200):
+    return [{
+        "timestamp_ms": start_ms + i * step_ms,
+        "position": "CHECKPOINT_A" if i < count - 1 else "CHECKPOINT_B",
+        "battery_level": 80 - i,
+        "run_state": "RUNNING",
+        "is_charging": False,
+        "obstacle_detected": i == 0,
+        "distance_cm": 35 if i == 0 else None
+    } for i in range(count)]
+
+
+class TestTelemetryFrame(unittest.TestCase):
+    def test_round_trip(self):
+        records = make_records(3)
+        raw = TCPProtocol.build_message("TRUCK_01", "SERVER", "TELEMETRY", {"records": records})
+        self.assertEqual(raw[3], 1 + 3 * TCPProtocol.TELEMETRY_RECORD.size)
+        message = TCPProtocol.parse_message(raw)
+        self.assertEqual(message["cmd"], "TELEMETRY")
+        self.assertEqual(message["payload"]["records"], records)
+
+    def test_oversized_batch_keeps_latest(self):
+        records = make_records(40)
+        raw = TCPProtocol.build_message("TRUCK_01", "SERVER", "TELEMETRY", {"records": records})
+        self.assertLessEqual(raw[3], 255)
+        decoded = TCPProtocol.parse_message(raw)["payload"]["records"]
+        self.assertEqual(len(decoded), TCPProtocol.TELEMETRY_MAX_RECORDS)
+        self.assertEqual(decoded[-1], records[-1])
+
+    def test_v2_and_truncated_payload(self):
+        raw = TCPProtocol.build_message("TRUCK_01", "SERVER", "TELEMETRY", {"records": make_records(2)}, seq=9)
+        self.assertEqual(len(TCPProtocol.parse_message(raw, TCPProtocol.PROTOCOL_V2)["payload"]["records"]), 2)
+        # count 가 실제 레코드 수보다 크면 온전한 레코드만
+        payload = TCPProtocol._decode_payload(TCPProtocol.CMD_TELEMETRY, bytes([5]) + bytes(15))
+        self.assertEqual(len(payload["records"]), 1)
+
+
+class TestApplyTelemetry(unittest.TestCase):
+    def test_single_batched_write(self):
+        db = MagicMock()
+        manager = TruckStatusManager(db, serve_from_memory=True)
+        now = datetime(2025, 1, 1, 12, 0, 0)
+        version = manager.versions.get(DOMAIN_TRUCKS)
+
+        manager.apply_telemetry("TRUCK_01", make_records(5), now=now)
+
+        db.log_telemetry_batch.assert_called_once()
+        db.log_battery_status.assert_not_called()
+        db.log_position_status.assert_not_called()
+        truck_id, rows = db.log_telemetry_batch.call_args[0]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0][0], now - timedelta(milliseconds=800))  # 트럭 시각 차이 유지
+        self.assertEqual(rows[-1][0], now)
+        self.assertEqual(rows[-1][4:], ("CHECKPOINT_B", "RUNNING"))
+
+        status = manager.get_truck_status("TRUCK_01")
+        self.assertEqual(status["battery"], {"level": 76, "is_charging": False})
+        self.assertEqual(status["position"], {"location": "CHECKPOINT_B", "status": "RUNNING"})
+        self.assertEqual(manager.versions.get(DOMAIN_TRUCKS), version + 1)
+
+    def test_timestamp_wraparound(self):
+        db = MagicMock()
+        manager = TruckStatusManager(db, serve_from_memory=True)
+        now = datetime(2025, 1, 1, 12, 0, 0)
+        records = make_records(2)
+        records[0]["timestamp_ms"] = 0xFFFFFF00
+        records[1]["timestamp_ms"] = 0x00000064
+        manager.apply_telemetry("TRUCK_01", records, now=now)
+        rows = db.log_telemetry_batch.call_args[0][1]
+        self.assertEqual(rows[0][0], now - timedelta(milliseconds=0x164))
+
+
+class TestTelemetryController(unittest.TestCase):
+    def setUp(self):
+        self.fsm = TruckFSM(command_sender=MagicMock())
+        self.fsm_manager = MagicMock()
+        self.fsm_manager.fsm = self.fsm
+        self.fsm_manager.command_sender = None
+        self.status_manager = MagicMock()
+        self.controller = TruckController(self.fsm_manager)
+        self.controller.set_status_manager(self.status_manager)
+
+    def test_batch_applied_once_and_fsm_sees_changes(self):
+        self.fsm.handle_position_update = MagicMock()
+        records = make_records(4)
+        records[1]["position"] = "UNKNOWN"
+        self.controller.handle_message({"sender": "TRUCK_01", "cmd": "TELEMETRY", "payload": {"records": records}})
+
+        self.status_manager.apply_telemetry.assert_called_once()
+        applied = self.status_manager.apply_telemetry.call_args[0][1]
+        self.assertEqual(applied[1]["position"], "CHECKPOINT_A")  # UNKNOWN → 직전 위치
+        self.assertEqual(self.fsm.contexts["TRUCK_01"].battery_level, 77)
+        self.assertEqual(self.fsm.handle_position_update.call_args_list, [
+            call("TRUCK_01", "CHECKPOINT_A", {"run_state": "RUNNING"}),
+            call("TRUCK_01", "CHECKPOINT_B", {"run_state": "RUNNING"}),
+        ])
+
+    def test_every_checkpoint_in_batch_replayed(self):
+        """한 묶음에 여러 체크포인트를 지나도 FSM 은 순서대로 모두 받고, 저장은 한 번"""
+        context = self.fsm._get_or_create_context("TRUCK_01")
+        positions = ["STANDBY", "CHECKPOINT_A", "CHECKPOINT_A", "GATE_A", "CHECKPOINT_B", "LOAD_A"]
+        records = [{"timestamp_ms": i * 500, "position": position, "battery_level": 90,
+                    "run_state": "RUNNING" if position != "LOAD_A" else "IDLE", "is_charging": False}
+                   for i, position in enumerate(positions)]
+        seen = []
+        original = self.fsm.handle_position_update
+
+        def record_update(truck_id, position, payload=None):
+            seen.append((position, payload["run_state"]))
+            return original(truck_id, position, payload)
+
+        self.fsm.handle_position_update = record_update
+        self.controller.handle_message({"sender": "TRUCK_01", "cmd": "TELEMETRY", "payload": {"records": records}})
+
+        self.status_manager.apply_telemetry.assert_called_once()
+        self.assertEqual(seen, [("CHECKPOINT_A", "RUNNING"), ("GATE_A", "RUNNING"),
+                                ("CHECKPOINT_B", "RUNNING"), ("LOAD_A", "IDLE")])
+        self.assertEqual(context.position, "LOAD_A")
+
+    def test_charge_target_reached(self):
+        context = self.fsm._get_or_create_context("TRUCK_01")
+        context.state = TruckState.CHARGING
+        context.position = "STANDBY"
+        records = [{"timestamp_ms": 0, "position": "STANDBY", "battery_level": 100,
+                    "run_state": "CHARGING", "is_charging": True}]
+        self.controller.handle_message({"sender": "TRUCK_01", "cmd": "TELEMETRY", "payload": {"records": records}})
+
+        self.status_manager.update_battery.assert_called_once_with("TRUCK_01", 100, False)
+        self.fsm_manager.handle_trigger.assert_called_once_with("TRUCK_01", "FINISH_CHARGING", {})
+        self.assertEqual(context.state, TruckState.IDLE)
+
+
+if __name__ == "__main__":
+    unittest.main()
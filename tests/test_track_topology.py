@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# tests/test_track_topology.py
+
+import sys
+import os
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.track.track_topology import TrackTopology, CLOCKWISE, COUNTERCLOCKWISE
+from backend.truck_fsm.truck_state import Direction
+
+
+class TestTrackTopology(unittest.TestCase):
+    def setUp(self):
+        self.topology = TrackTopology.default()
+
+    def test_clockwise_route(self):
+        """시계방향 경로 / 다음 노드"""
+        self.assertEqual(
+            self.topology.route("STANDBY", "BELT", CLOCKWISE),
+            ["STANDBY", "CHECKPOINT_A", "CHECKPOINT_B", "LOAD_A", "CHECKPOINT_C", "CHECKPOINT_D", "BELT"]
+        )
+        self.assertEqual(self.topology.next_hop("CHECKPOINT_B", "LOAD_B", CLOCKWISE), "LOAD_B")
+        self.assertEqual(self.topology.next_position("BELT", Direction.CLOCKWISE), "STANDBY")
+        self.assertEqual(self.topology.next_position("CHECKPOINT_B", Direction.CLOCKWISE, "LOAD_B"), "LOAD_B")
+        self.assertIsNone(self.topology.next_position("CHECKPOINT_B", Direction.CLOCKWISE))
+
+    def test_counterclockwise_route(self):
+        """반시계방향은 역방향 간선"""
+        self.assertEqual(self.topology.next_position("STANDBY", COUNTERCLOCKWISE), "BELT")
+        self.assertEqual(self.topology.next_position("LOAD_A", COUNTERCLOCKWISE), "CHECKPOINT_B")
+        self.assertEqual(self.topology.next_position("CHECKPOINT_C", COUNTERCLOCKWISE, "LOAD_B"), "LOAD_B")
+
+    def test_eta(self):
+        """ETA 는 구간 시간의 합"""
+        self.assertEqual(self.topology.eta("STANDBY", "STANDBY"), 0.0)
+        self.assertEqual(self.topology.eta("STANDBY", "CHECKPOINT_B"), 13.0)
+        self.assertEqual(self.topology.eta("CHECKPOINT_D", "CHECKPOINT_A"), 16.0)
+        self.assertIsNone(self.topology.eta("STANDBY", "GATE_A"))
+
+    def test_gate_actions(self):
+        """게이트 간선에서 유도한 체크포인트 게이트 동작"""
+        cw = self.topology.checkpoint_gate_actions(CLOCKWISE)
+        self.assertEqual(cw["CHECKPOINT_A"], {"open": "GATE_A", "close": None})
+        self.assertEqual(cw["CHECKPOINT_B"], {"open": None, "close": "GATE_A"})
+        self.assertEqual(cw["CHECKPOINT_C"], {"open": "GATE_B", "close": None})
+        self.assertEqual(cw["CHECKPOINT_D"], {"open": None, "close": "GATE_B"})
+
+        ccw = self.topology.checkpoint_gate_actions(Direction.COUNTERCLOCKWISE)
+        self.assertEqual(ccw["CHECKPOINT_D"], {"open": "GATE_B", "close": None})
+        self.assertEqual(ccw["CHECKPOINT_A"], {"open": None, "close": "GATE_A"})
+
+    def test_codes_and_gui_keys(self):
+        """프로토콜 위치 코드 / GUI 노드 키"""
+        self.assertEqual(self.topology.position_codes()["GATE_B"], 0xA2)
+        self.assertEqual(self.topology.position_from_code(0x05), "LOAD_A")
+        self.assertEqual(self.topology.gui_key("LOAD_B"), "B_LOAD")
+        self.assertEqual(self.topology.position_from_gui_key("A_LOAD"), "LOAD_A")
+        self.assertEqual(self.topology.position_from_gui_key("BELT"), "BELT")
+
+
+if __name__ == "__main__":
+    unittest.main()
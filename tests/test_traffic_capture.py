@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# tests/test_traffic_capture.py
+
+import sys
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.capture.traffic_recorder import (
+    TrafficRecorder, read_capture, segment_files, install_traffic_recorder,
+    KIND_TCP_OPEN, KIND_TCP_IN, KIND_TCP_OUT, KIND_TCP_CLOSE, KIND_SERIAL_OUT
+)
+from backend.capture.traffic_replayer import TrafficReplayer
+from backend.serialio.serial_interface import SerialInterface
+from backend.tcpio.connection_registry import ConnectionRegistry
+from backend.tcpio.protocol import TCPProtocol
+from backend.tcpio.tcp_server import TCPServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class _App:
+    def __init__(self):
+        self.connections = ConnectionRegistry()
+        self.messages = []
+
+    def handle_message(self, message):
+        self.messages.append(message)
+
+    def set_tcp_server(self, server):
+        pass
+
+
+class TestTrafficRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        recorder = TrafficRecorder(self.tmp.name, segment_size=4096, clock=self.clock)
+        self.clock.now = 1000
+        recorder.record(KIND_TCP_IN, "tcp:10.0.0.5:5000", b"\x01\x10\xf0\x00")
+        self.clock.now = 2500
+        recorder.record(KIND_SERIAL_OUT, "serial:/dev/ttyACM0", "GATE_A_OPEN")
+        recorder.close()
+
+        records = list(read_capture(self.tmp.name))
+        self.assertEqual(records, [
+            (1000, KIND_TCP_IN, "tcp:10.0.0.5:5000", b"\x01\x10\xf0\x00"),
+            (2500, KIND_SERIAL_OUT, "serial:/dev/ttyACM0", b"GATE_A_OPEN"),
+        ])
+
+    def test_rotation_keeps_streams_and_prunes(self):
+        recorder = TrafficRecorder(self.tmp.name, segment_size=128, max_segments=3, clock=self.clock)
+        for i in range(40):
+            self.clock.now = i
+            recorder.record(KIND_TCP_IN, "tcp:10.0.0.5:5000", bytes([i] * 20))
+        recorder.close()
+
+        self.assertEqual(len(segment_files(self.tmp.name)), 3)
+        records = list(read_capture(self.tmp.name))
+        times = [r[0] for r in records]
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(times[-1], 39)
+        self.assertTrue(all(r[2] == "tcp:10.0.0.5:5000" for r in records))  # 세그먼트마다 스트림 재정의
+
+    def test_unclosed_segment_is_readable(self):
+        recorder = TrafficRecorder(self.tmp.name, segment_size=4096, clock=self.clock)
+        recorder.record(KIND_TCP_IN, "tcp:10.0.0.5:5000", b"abcd")
+        recorder._map.flush()  # 종료 없이 중단된 녹화 - 나머지는 0 으로 채워져 있음
+        self.assertEqual(len(list(read_capture(self.tmp.name))), 1)
+        recorder.close()
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.recorder = TrafficRecorder(self.tmp.name, segment_size=64 * 1024)
+        install_traffic_recorder(self.recorder)
+
+    def tearDown(self):
+        install_traffic_recorder(None)
+        self.recorder.close()
+        self.tmp.cleanup()
+
+    def _run_session(self):
+        """실제 소켓으로 트럭 세션 하나를 녹화"""
+        app = _App()
+        server = TCPServer(app_controller=app)
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        client_sock = socket.create_connection(listener.getsockname())
+        server_sock, addr = listener.accept()
+        listener.close()
+        handler = threading.Thread(target=server.handle_client, args=(server_sock, addr), daemon=True)
+        handler.start()
+
+        client_sock.sendall(TCPProtocol.build_message("TRUCK_01", "SERVER", "HELLO", {}))
+        client_sock.recv(64)  # HEARTBEAT_ACK
+        client_sock.sendall(TCPProtocol.build_message("TRUCK_01", "SERVER", "ARRIVED", {"position": "CHECKPOINT_A"}))
+        client_sock.sendall(TCPProtocol.build_message("TRUCK_01", "SERVER", "TELEMETRY", {"records": [
+            {"timestamp_ms": 10, "position": "CHECKPOINT_B", "battery_level": 90}
+        ]}))
+        client_sock.shutdown(socket.SHUT_WR)
+        handler.join(timeout=5.0)
+        client_sock.close()
+        server.liveness.stop()
+        return app
+
+    def test_replay_reproduces_session(self):
+        live = self._run_session()
+        self.assertEqual(len(live.messages), 2)
+        install_traffic_recorder(None)
+        self.recorder.close()
+
+        kinds = [record[1] for record in read_capture(self.tmp.name)]
+        self.assertEqual(kinds[0], KIND_TCP_OPEN)
+        self.assertEqual(kinds[-1], KIND_TCP_CLOSE)
+        self.assertEqual(kinds.count(KIND_TCP_IN), 3)
+        self.assertEqual(kinds.count(KIND_TCP_OUT), 1)
+
+        replayed = _App()
+        stats = TrafficReplayer(replayed, speed=None).replay(self.tmp.name)
+        self.assertEqual(replayed.messages, live.messages)
+        self.assertEqual(stats["tcp_frames"], 3)
+        self.assertEqual(stats["replayed_out"], stats["recorded_out"])
+        self.assertFalse(replayed.connections.is_connected("TRUCK_01"))
+
+    def test_serial_lines_recorded(self):
+        interface = SerialInterface("/dev/ttyFAKE", use_fake=True)
+        try:
+            interface.send_command("GATE_A", "OPEN")
+        finally:
+            interface.close()
+        install_traffic_recorder(None)
+        self.recorder.close()
+        records = list(read_capture(self.tmp.name))
+        self.assertIn((KIND_SERIAL_OUT, "serial:/dev/ttyFAKE", b"GATE_A_OPEN"), [r[1:] for r in records])
+
+
+class TestReplayTiming(unittest.TestCase):
+    def test_speed_scales_delays(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        clock = FakeClock()
+        recorder = TrafficRecorder(tmp.name, clock=clock)
+        frame = TCPProtocol.build_message("TRUCK_01", "SERVER", "ARRIVED", {"position": "CHECKPOINT_A"})
+        for clock.now in (0, 2_000_000_000, 3_000_000_000):
+            recorder.record(KIND_TCP_IN, "tcp:10.0.0.5:5000", frame)
+        recorder.close()
+
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(round(seconds, 6))
+            now[0] += seconds
+
+        replayer = TrafficReplayer(_App(), speed=2.0, clock=lambda: now[0], sleep=sleep)
+        self.assertEqual(replayer.replay(tmp.name)["tcp_frames"], 3)
+        self.assertEqual(sleeps, [1.0, 0.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# tests/test_truck_context.py
+
+import sys
+import os
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.truck_fsm.truck_state import TruckContext, TruckState, MissionPhase, SNAPSHOT_FIELDS, PHASE_CODES
+from backend.tcpio.protocol import TCPProtocol
+
+
+class TestTruckContext(unittest.TestCase):
+    def test_slotted(self):
+        """선언되지 않은 속성은 추가할 수 없음"""
+        context = TruckContext("TRUCK_01")
+        self.assertFalse(hasattr(context, "__dict__"))
+        with self.assertRaises(AttributeError):
+            context.unknown_field = 1
+
+    def test_position_code_matches_protocol(self):
+        """위치 코드는 TCPProtocol.POS_MAP 과 일치"""
+        context = TruckContext("TRUCK_01")
+        for position, code in TCPProtocol.POS_MAP.items():
+            context.position = position
+            self.assertEqual(context.position_code, code)
+        context.position = "SOMEWHERE"
+        self.assertEqual(context.position_code, TCPProtocol.POS_UNKNOWN)
+
+    def test_snapshot_and_round_trip(self):
+        """snapshot 튜플과 to_dict / from_dict 왕복"""
+        context = TruckContext("TRUCK_02")
+        context.state = TruckState.MOVING
+        context.position = "CHECKPOINT_B"
+        context.mission_phase = MissionPhase.TO_LOADING
+        context.loading_target = "LOAD_A"
+
+        snapshot = context.snapshot()
+        self.assertEqual(len(snapshot), len(SNAPSHOT_FIELDS))
+        self.assertEqual(snapshot[SNAPSHOT_FIELDS.index("phase_code")], PHASE_CODES[MissionPhase.TO_LOADING])
+
+        restored = TruckContext.from_dict(context.to_dict())
+        self.assertEqual(restored.snapshot()[:-1], snapshot[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# tests/test_wsgi_server.py
+
+import sys
+import os
+import threading
+import time
+import unittest
+import urllib.request
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask, request
+
+from backend.rest_api.wsgi_server import PooledWSGIServer, serve
+
+
+class TestPooledWSGIServer(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask("pooled_test")
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+        @self.app.route("/environ")
+        def environ():
+            return str(request.environ["wsgi.multithread"])
+
+        @self.app.route("/slow")
+        def slow():
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.1)
+            with self.lock:
+                self.active -= 1
+            return "ok"
+
+        self.server = PooledWSGIServer("127.0.0.1", 0, self.app, threads=3)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/slow"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_concurrency_bounded_by_pool(self):
+        """동시 요청이 많아도 작업 스레드 수만큼만 처리"""
+        results = []
+
+        def fetch():
+            with urllib.request.urlopen(self.url, timeout=10) as response:
+                results.append(response.read())
+
+        clients = [threading.Thread(target=fetch) for _ in range(9)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+
+        self.assertEqual(results, [b"ok"] * 9)
+        self.assertLessEqual(self.peak, 3)
+        self.assertGreater(self.peak, 1)
+
+    def test_reports_multithreaded_environ(self):
+        url = self.url.replace("/slow", "/environ")
+        with urllib.request.urlopen(url, timeout=10) as response:
+            self.assertEqual(response.read(), b"True")
+            self.assertEqual(response.version, 10)  # keep-alive 로 작업 스레드를 잡지 않음
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            serve(self.app, server="unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()